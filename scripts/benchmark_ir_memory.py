@@ -0,0 +1,125 @@
+"""Compare IR memory use: legacy dict-backed dataclasses vs slotted vs compact."""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from flo.compiler.ir import compact_ir  # noqa: E402
+from flo.compiler.ir.models import IR, Edge, Node  # noqa: E402
+
+
+@dataclass
+class _LegacyNode:
+    """Pre-slots ``Node`` layout: per-instance ``__dict__``, no interning."""
+
+    id: str
+    type: str
+    attrs: dict[str, Any] | None = None
+
+
+@dataclass
+class _LegacyEdge:
+    """Pre-slots ``Edge`` layout."""
+
+    source: str
+    target: str
+    id: str | None = None
+    outcome: str | None = None
+    label: str | None = None
+    edge_type: str | None = None
+    handoff: bool | None = None
+    rework: bool | None = None
+    metadata: dict[str, Any] | None = None
+
+
+@dataclass
+class _LegacyIR:
+    name: str
+    nodes: list[Any]
+    edges: list[Any] = field(default_factory=list)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="benchmark_ir_memory.py")
+    parser.add_argument(
+        "--steps", type=int, default=200_000, help="Process steps per model."
+    )
+    parser.add_argument(
+        "--lanes", type=int, default=12, help="Distinct lanes in the model."
+    )
+    args = parser.parse_args()
+
+    variants: list[tuple[str, Callable[[], Any]]] = [
+        (
+            "legacy",
+            lambda: _build(args.steps, args.lanes, _LegacyNode, _LegacyEdge, _LegacyIR),
+        ),
+        ("slotted", lambda: _build(args.steps, args.lanes, Node, Edge, IR)),
+        ("compact", lambda: compact_ir(_build(args.steps, args.lanes, Node, Edge, IR))),
+    ]
+    baseline: int | None = None
+    for label, build in variants:
+        current, peak = _measure(build)
+        baseline = baseline or current
+        print(
+            f"{label:<8} retained={current / 2**20:8.1f} MiB "
+            f"peak={peak / 2**20:8.1f} MiB ratio={current / baseline:5.2f}"
+        )
+    return 0
+
+
+def _measure(build: Callable[[], Any]) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    model = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del model
+    return current, peak
+
+
+def _build(steps: int, lanes: int, node_cls: Any, edge_cls: Any, ir_cls: Any) -> Any:
+    nodes = [node_cls(id="start", type="start", attrs={})]
+    edges = []
+    previous = "start"
+    for step in range(steps):
+        node_id = f"step_{step}"
+        attrs: dict[str, Any] = {}
+        if step % 4:
+            attrs = {
+                _fresh("name"): f"Step {step}",
+                _fresh("lane"): _fresh(f"lane_{step % lanes}"),
+                _fresh("metadata"): {
+                    _fresh("cycle_time"): {
+                        _fresh("value"): step % 60,
+                        _fresh("unit"): _fresh("min"),
+                    }
+                },
+            }
+        nodes.append(node_cls(id=node_id, type=_fresh("task"), attrs=attrs))
+        edges.append(edge_cls(source=_fresh(previous), target=_fresh(node_id)))
+        previous = node_id
+    nodes.append(node_cls(id="end", type="end", attrs={}))
+    edges.append(edge_cls(source=previous, target="end"))
+    return ir_cls(name="synthetic", nodes=nodes, edges=edges)
+
+
+def _fresh(text: str) -> str:
+    # A YAML loader builds a new string object for every scalar it reads.
+    return "".join([text[:1], text[1:]])
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
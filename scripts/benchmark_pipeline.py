@@ -0,0 +1,418 @@
+"""Time and memory-profile every pipeline stage on synthetic FLO models.
+
+Each case is a ``SyntheticSpec`` (see ``synthetic_flo.py``) written to a
+temporary directory and pushed through the same stages as ``flo render`` and
+``flo export``: parse, compose, compile, validate, schema, scc,
+layout_request, elk, svg, and export. Times are the best of ``--repeat`` runs;
+peak memory comes from one extra run under ``tracemalloc``. The ELK layout
+cache and the include cache are bypassed so every run does the full work.
+
+Results are written as JSON. Every stage is compared against a baseline
+(``--baseline``, by default the tracked ``benchmarks/pipeline_baseline.json``)
+and the script exits 1 when one is slower or larger than the threshold
+allows, or 2 when the baseline is missing or was recorded with another
+result format, diagram, layout engine, or Python feature release. Times are
+scaled by a pure-Python calibration loop recorded with each result, so a
+baseline taken on a faster or slower machine still compares fairly. Refresh
+the baseline with ``--write-baseline`` after an intended performance change;
+the ignored ``.benchmarks/`` directory is for ad-hoc ``--output`` files.
+"""
+
+from __future__ import annotations
+
+import argparse
+from contextlib import contextmanager
+from dataclasses import asdict, replace
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+SCRIPT_DIR = Path(__file__).resolve().parent
+for _path in (SRC_ROOT, SCRIPT_DIR):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+from flo.adapters import load_yaml, parse_adapter_document  # noqa: E402
+from flo.adapters.include_cache import default_include_cache  # noqa: E402
+from flo.compiler import compile_adapter  # noqa: E402
+from flo.compiler.analysis import scc_condense  # noqa: E402
+from flo.compiler.ir import ensure_schema_aligned, validate_ir  # noqa: E402
+from flo.export import export_ir  # noqa: E402
+from flo.render import RenderOptions, render_artifact_and_contract  # noqa: E402
+from flo.render import _svg_sppm, _svg_swimlane  # noqa: E402
+from synthetic_flo import SyntheticSpec, generate_model  # noqa: E402
+
+FORMAT_VERSION = 1
+DEFAULT_BASELINE = REPO_ROOT / "benchmarks" / "pipeline_baseline.json"
+STAGES = (
+    "parse",
+    "compose",
+    "compile",
+    "validate",
+    "schema",
+    "scc",
+    "layout_request",
+    "elk",
+    "svg",
+    "export",
+)
+PRESETS: dict[str, tuple[SyntheticSpec, ...]] = {
+    "small": (
+        SyntheticSpec(steps=100, lanes=3, rework_loops=2),
+        SyntheticSpec(steps=100, lanes=3, subprocess_depth=2, include_fanin=4),
+    ),
+    "medium": (
+        SyntheticSpec(steps=1000, lanes=6, decision_fanout=3, rework_loops=10),
+        SyntheticSpec(
+            steps=1000,
+            lanes=6,
+            decision_fanout=3,
+            rework_loops=10,
+            subprocess_depth=3,
+            include_fanin=20,
+            metadata_density=1.0,
+        ),
+    ),
+    "large": (
+        SyntheticSpec(
+            steps=5000,
+            lanes=10,
+            decision_fanout=4,
+            rework_loops=50,
+            subprocess_depth=4,
+            include_fanin=40,
+            metadata_density=0.8,
+        ),
+    ),
+}
+# Differences below these floors are noise, whatever the ratio says.
+_MIN_SECONDS_DELTA = 0.005
+_MIN_BYTES_DELTA = 256 * 1024
+_RENDERER_MODULES = (_svg_swimlane, _svg_sppm)
+_REQUEST_BUILDERS = (
+    "build_swimlane_elk_layout_request",
+    "build_sppm_elk_layout_request",
+)
+
+
+class _Laps:
+    """Split one pipeline run into consecutive, named time/memory laps."""
+
+    def __init__(self, trace_memory: bool) -> None:
+        self.trace_memory = trace_memory
+        self.seconds: dict[str, float] = {}
+        self.peak_bytes: dict[str, int] = {}
+        self.restart()
+
+    def restart(self) -> None:
+        """Start the next lap now, discarding time and memory since the last."""
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            self._base = tracemalloc.get_traced_memory()[0]
+        self._started = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        self.seconds[stage] = time.perf_counter() - self._started
+        if self.trace_memory:
+            self.peak_bytes[stage] = max(
+                0, tracemalloc.get_traced_memory()[1] - self._base
+            )
+        self.restart()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="benchmark_pipeline.py")
+    parser.add_argument(
+        "--preset",
+        action="append",
+        choices=sorted(PRESETS),
+        help="Case set to run (repeatable; default: small and medium).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per case (best is kept)."
+    )
+    parser.add_argument("--diagram", choices=("swimlane", "sppm"), default="swimlane")
+    parser.add_argument("--layout-engine", choices=("elk", "layered"), default="elk")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the tracemalloc run."
+    )
+    parser.add_argument("--output", type=Path, help="Write results JSON here.")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help=f"Baseline JSON to compare against (default: {DEFAULT_BASELINE}).",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown/growth over the baseline (0.25 = 25%%).",
+    )
+    parser.add_argument(
+        "--write-baseline",
+        action="store_true",
+        help="Store these results as the baseline instead of comparing.",
+    )
+    args = parser.parse_args()
+
+    specs = [
+        spec for name in args.preset or ["small", "medium"] for spec in PRESETS[name]
+    ]
+    results = run_suite(
+        specs,
+        repeat=max(1, args.repeat),
+        diagram=args.diagram,
+        layout_engine=args.layout_engine,
+        memory=not args.no_memory,
+    )
+    for line in format_results(results):
+        print(line)
+    payload = json.dumps(results, indent=2, sort_keys=True) + "\n"
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(payload, encoding="utf-8")
+
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if args.write_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(payload, encoding="utf-8")
+        print(f"Baseline written to {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"Baseline not found: {baseline_path}", file=sys.stderr)
+        return 2
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    try:
+        regressions = compare_results(results, baseline, threshold=args.threshold)
+    except ValueError as exc:
+        print(f"Cannot compare against {baseline_path}: {exc}", file=sys.stderr)
+        return 2
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        return 1
+    print(f"No regressions against {baseline_path} (threshold {args.threshold:.0%}).")
+    return 0
+
+
+def run_suite(
+    specs: list[SyntheticSpec],
+    *,
+    repeat: int,
+    diagram: str,
+    layout_engine: str,
+    memory: bool,
+) -> dict[str, Any]:
+    """Benchmark every spec and return the JSON-ready result document."""
+    options = replace(
+        RenderOptions.from_mapping(
+            {"diagram": diagram, "layout_engine": layout_engine}
+        ),
+        backend="svg",
+        layout_cache=False,
+    )
+    cases: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="flo-bench-") as tmp:
+        for spec in specs:
+            path = generate_model(spec).write(Path(tmp) / spec.label)
+            cases[spec.label] = _run_case(path, spec, options, repeat, memory)
+    return {
+        "format": FORMAT_VERSION,
+        "calibration_seconds": calibration_seconds(),
+        "python": platform.python_version(),
+        "diagram": diagram,
+        "layout_engine": layout_engine,
+        "cases": cases,
+    }
+
+
+def _run_case(
+    path: Path,
+    spec: SyntheticSpec,
+    options: RenderOptions,
+    repeat: int,
+    memory: bool,
+) -> dict[str, Any]:
+    best: dict[str, float] = {}
+    counts: tuple[int, int] = (0, 0)
+    for _ in range(repeat):
+        laps = _Laps(trace_memory=False)
+        counts = _run_pipeline(path, options, laps)
+        for stage, seconds in laps.seconds.items():
+            best[stage] = min(seconds, best.get(stage, seconds))
+    peaks: dict[str, int] = {}
+    if memory:
+        tracemalloc.start()
+        try:
+            laps = _Laps(trace_memory=True)
+            _run_pipeline(path, options, laps)
+            peaks = laps.peak_bytes
+        finally:
+            tracemalloc.stop()
+    stages = {
+        stage: {"seconds": round(best[stage], 6), "peak_bytes": peaks.get(stage)}
+        for stage in STAGES
+        if stage in best
+    }
+    return {
+        "spec": asdict(spec),
+        "nodes": counts[0],
+        "edges": counts[1],
+        "total_seconds": round(sum(best.values()), 6),
+        "stages": stages,
+    }
+
+
+def _run_pipeline(path: Path, options: RenderOptions, laps: _Laps) -> tuple[int, int]:
+    cache = default_include_cache()
+    if cache is not None:
+        cache.clear()
+    content = path.read_text(encoding="utf-8")
+    laps.restart()
+    document = load_yaml(content)
+    laps.lap("parse")
+    model = parse_adapter_document(document, content=content, source_path=str(path))
+    laps.lap("compose")
+    ir = compile_adapter(model)
+    laps.lap("compile")
+    validate_ir(ir)
+    laps.lap("validate")
+    ensure_schema_aligned(ir)
+    laps.lap("schema")
+    processed = scc_condense(ir)
+    laps.lap("scc")
+    with _render_probes(laps):
+        render_artifact_and_contract(processed, options=options)
+    laps.lap("svg")
+    export_ir(ir, options={"export": "json"})
+    laps.lap("export")
+    return len(ir.nodes), len(ir.edges)
+
+
+@contextmanager
+def _render_probes(laps: _Laps) -> Iterator[None]:
+    """Close the layout_request and elk laps from inside the SVG renderers."""
+    originals: list[tuple[Any, str, Callable[..., Any]]] = []
+    for module in _RENDERER_MODULES:
+        for name in (*_REQUEST_BUILDERS, "execute_elk_layout"):
+            original = getattr(module, name, None)
+            if original is None:
+                continue
+            stage = "elk" if name == "execute_elk_layout" else "layout_request"
+            originals.append((module, name, original))
+            setattr(module, name, _lapped(original, laps, stage))
+    try:
+        yield
+    finally:
+        for module, name, original in originals:
+            setattr(module, name, original)
+
+
+def _lapped(func: Callable[..., Any], laps: _Laps, stage: str) -> Callable[..., Any]:
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        result = func(*args, **kwargs)
+        laps.lap(stage)
+        return result
+
+    return wrapper
+
+
+def calibration_seconds(rounds: int = 7) -> float:
+    """Return the best time of a fixed pure-Python workload on this machine."""
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        table: dict[str, int] = {}
+        for index in range(200_000):
+            key = f"k{index % 1000}"
+            table[key] = table.get(key, 0) + index
+        sorted(table.items())
+        best = min(best, time.perf_counter() - started)
+    return round(best, 6)
+
+
+def compare_results(
+    current: dict[str, Any], baseline: dict[str, Any], *, threshold: float
+) -> list[str]:
+    """Return one message per stage that regressed beyond ``threshold``.
+
+    Raises ``ValueError`` when the two results were not produced with the
+    same configuration, since their timings are not comparable.
+    """
+    expected, actual = _configuration(baseline), _configuration(current)
+    mismatches = [
+        f"{key} {expected[key]!r} in the baseline, {actual[key]!r} now"
+        for key in actual
+        if actual[key] != expected[key]
+    ]
+    if mismatches:
+        raise ValueError("; ".join(mismatches) + "; re-record with --write-baseline")
+    scale = current["calibration_seconds"] / max(baseline["calibration_seconds"], 1e-9)
+    regressions = []
+    for label, case in current["cases"].items():
+        base_case = baseline.get("cases", {}).get(label)
+        if base_case is None:
+            continue
+        for stage, stats in case["stages"].items():
+            base_stats = base_case["stages"].get(stage)
+            if base_stats is None:
+                continue
+            allowed = base_stats["seconds"] * scale
+            seconds = stats["seconds"]
+            if (
+                seconds > allowed * (1 + threshold)
+                and seconds - allowed > _MIN_SECONDS_DELTA
+            ):
+                regressions.append(
+                    f"{label} {stage}: {seconds * 1000:.1f} ms vs"
+                    f" {allowed * 1000:.1f} ms expected"
+                )
+            peak, base_peak = stats.get("peak_bytes"), base_stats.get("peak_bytes")
+            if (
+                peak is not None
+                and base_peak is not None
+                and peak > base_peak * (1 + threshold)
+                and peak - base_peak > _MIN_BYTES_DELTA
+            ):
+                regressions.append(
+                    f"{label} {stage}: peak {peak / 1048576:.1f} MiB vs"
+                    f" {base_peak / 1048576:.1f} MiB"
+                )
+    return regressions
+
+
+def _configuration(results: dict[str, Any]) -> dict[str, Any]:
+    # Patch releases of Python are compared as one interpreter.
+    python = results.get("python")
+    return {
+        "format": results.get("format"),
+        "diagram": results.get("diagram"),
+        "layout_engine": results.get("layout_engine"),
+        "python": ".".join(python.split(".")[:2]) if python else None,
+    }
+
+
+def format_results(results: dict[str, Any]) -> list[str]:
+    """Return a per-case table of stage times (ms) and peak memory (MiB)."""
+    lines = [f"calibration {results['calibration_seconds'] * 1000:.1f} ms"]
+    for label, case in results["cases"].items():
+        lines.append(
+            f"{label}  nodes={case['nodes']} edges={case['edges']}"
+            f" total={case['total_seconds'] * 1000:.1f} ms"
+        )
+        for stage, stats in case["stages"].items():
+            peak = stats["peak_bytes"]
+            memory = f"{peak / 1048576:8.2f} MiB" if peak is not None else ""
+            lines.append(f"  {stage:<15}{stats['seconds'] * 1000:10.2f} ms  {memory}")
+    return lines
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
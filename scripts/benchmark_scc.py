@@ -0,0 +1,68 @@
+"""Time SCC condensation on large synthetic graphs."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from flo.compiler.analysis.scc import condense_graph  # noqa: E402
+from flo.compiler.ir.models import IR, Edge, Node  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="benchmark_scc.py")
+    parser.add_argument(
+        "--nodes", type=int, default=100_000, help="Nodes per synthetic graph."
+    )
+    parser.add_argument(
+        "--degree", type=float, default=2.0, help="Mean out-degree of random graphs."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per graph (best is shown)."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random graph seed.")
+    args = parser.parse_args()
+
+    for label, ir in _graphs(args.nodes, args.degree, args.seed):
+        best = float("inf")
+        for _ in range(max(1, args.repeat)):
+            started = time.perf_counter()
+            result = condense_graph(ir)
+            best = min(best, time.perf_counter() - started)
+        print(
+            f"{label:<8} nodes={len(ir.nodes):>7} edges={len(ir.edges):>7} "
+            f"components={len(result.components):>7} "
+            f"dag_edges={len(result.dag_edges):>7} best={best * 1000:8.1f} ms"
+        )
+    return 0
+
+
+def _graphs(count: int, degree: float, seed: int) -> list[tuple[str, IR]]:
+    nodes = [Node(id=f"n{i}", type="task") for i in range(count)]
+    chain = [(i, i + 1) for i in range(count - 1)]
+    rng = random.Random(seed)
+    random_edges = [
+        (rng.randrange(count), rng.randrange(count)) for _ in range(int(count * degree))
+    ]
+    return [
+        ("chain", _ir("chain", nodes, chain)),
+        ("ring", _ir("ring", nodes, chain + [(count - 1, 0)])),
+        ("random", _ir("random", nodes, random_edges)),
+    ]
+
+
+def _ir(name: str, nodes: list[Node], pairs: list[tuple[int, int]]) -> IR:
+    edges = [Edge(source=f"n{s}", target=f"n{t}") for s, t in pairs]
+    return IR(name=name, nodes=nodes, edges=edges)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,9 +8,9 @@ FLO's parser/compiler/validator pipeline, and writes direct SVG artifacts into
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
-import yaml
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -20,9 +20,9 @@ if str(SRC_ROOT) not in sys.path:
 
 
 def _iter_example_files(examples_dir: Path, include_invalid: bool) -> list[Path]:
-    files = sorted(path for path in examples_dir.rglob("*.flo") if path.is_file())
-    included_files = _collect_included_files(files)
-    files = [path for path in files if path.resolve() not in included_files]
+    from flo.core.batch_build import discover_flo_sources
+
+    files = discover_flo_sources(examples_dir)
 
     if include_invalid:
         return files
@@ -33,59 +33,6 @@ def _iter_example_files(examples_dir: Path, include_invalid: bool) -> list[Path]
     ]
 
 
-def _collect_included_files(files: list[Path]) -> set[Path]:
-    file_set = {path.resolve() for path in files}
-    included: set[Path] = set()
-
-    for path in files:
-        include_refs = _include_refs_from_file(path)
-        for include_ref in include_refs:
-            include_path = _resolve_include_ref(
-                current_path=path, include_ref=include_ref
-            )
-            if include_path in file_set:
-                included.add(include_path)
-
-    return included
-
-
-def _include_refs_from_file(path: Path) -> list[str]:
-    try:
-        parsed = yaml.safe_load(path.read_text(encoding="utf-8"))
-    except Exception:
-        return []
-
-    if not isinstance(parsed, dict):
-        return []
-    return _extract_include_refs(parsed)
-
-
-def _extract_include_refs(document: dict[str, object]) -> list[str]:
-    include_value = document.get("includes")
-    if include_value is None:
-        include_value = document.get("include")
-
-    if include_value is None:
-        return []
-    if isinstance(include_value, str):
-        text = include_value.strip()
-        return [text] if text else []
-    if isinstance(include_value, list):
-        return [
-            entry.strip()
-            for entry in include_value
-            if isinstance(entry, str) and entry.strip()
-        ]
-    return []
-
-
-def _resolve_include_ref(current_path: Path, include_ref: str) -> Path:
-    include_path = Path(include_ref)
-    if include_path.is_absolute():
-        return include_path.resolve()
-    return (current_path.parent / include_path).resolve()
-
-
 def _build_one(
     example_file: Path, examples_dir: Path, renders_dir: Path
 ) -> tuple[bool, str]:
@@ -148,6 +95,13 @@ def main() -> int:
         action="store_true",
         help="Include intentionally invalid conformance fixtures.",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Render this many examples concurrently through an ELK worker pool.",
+    )
     args = parser.parse_args()
 
     examples_dir = REPO_ROOT / "examples"
@@ -167,8 +121,7 @@ def main() -> int:
         return 0
 
     failures = 0
-    for example_file in files:
-        ok, message = _build_one(example_file, examples_dir, renders_dir)
+    for ok, message in _build_all(files, examples_dir, renders_dir, jobs=args.jobs):
         print(message)
         if not ok:
             failures += 1
@@ -181,6 +134,26 @@ def main() -> int:
     return 0
 
 
+def _build_all(
+    files: list[Path], examples_dir: Path, renders_dir: Path, *, jobs: int
+) -> list[tuple[bool, str]]:
+    if jobs <= 1:
+        return [_build_one(path, examples_dir, renders_dir) for path in files]
+
+    from flo.render.layout_core import ElkWorkerPool, use_elk_engine
+
+    with (
+        ElkWorkerPool(size=jobs) as pool,
+        use_elk_engine(pool),
+        ThreadPoolExecutor(max_workers=jobs) as executor,
+    ):
+        return list(
+            executor.map(
+                lambda path: _build_one(path, examples_dir, renders_dir), files
+            )
+        )
+
+
 def _render_options_for_example(example_file: Path) -> dict[str, str]:
     name = example_file.stem.lower()
     sppm_defaults: dict[str, dict[str, str]] = {
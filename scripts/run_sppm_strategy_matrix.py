@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 import hashlib
@@ -18,6 +19,8 @@ from flo.adapters import parse_adapter
 from flo.render._diagnostics import RenderDiagnosticsReport
 from flo.render.layout_core import (
     ElkLayoutRequest,
+    ElkWorker,
+    ElkWorkerPool,
     LayoutBounds,
     LayoutPoint,
     LayoutResult,
@@ -25,6 +28,7 @@ from flo.render.layout_core import (
     execute_elk_layout,
     run_elkjs_layout,
     serialize_layout_result,
+    use_elk_engine,
 )
 from flo.render.options import RenderOptions
 
@@ -111,6 +115,17 @@ def main() -> int:
         default=OUT_DIR,
         help="Directory for matrix score outputs.",
     )
+    parser.add_argument(
+        "--elk-worker",
+        action="store_true",
+        help="Serve all layouts from one persistent ELK worker process.",
+    )
+    parser.add_argument(
+        "--elk-pool",
+        type=int,
+        metavar="N",
+        help="Evaluate cases concurrently through a pool of N ELK workers.",
+    )
     args = parser.parse_args()
 
     manifest = _resolve_path(args.manifest)
@@ -118,7 +133,18 @@ def main() -> int:
     out_dir.mkdir(parents=True, exist_ok=True)
 
     cases = _load_cases(manifest)
-    evaluations = _run_matrix(cases)
+    if args.elk_pool:
+        with (
+            ElkWorkerPool(size=args.elk_pool) as pool,
+            use_elk_engine(pool),
+            ThreadPoolExecutor(max_workers=args.elk_pool) as executor,
+        ):
+            evaluations = _run_matrix(cases, executor=executor)
+    elif args.elk_worker:
+        with ElkWorker() as worker, use_elk_engine(worker):
+            evaluations = _run_matrix(cases)
+    else:
+        evaluations = _run_matrix(cases)
     sorted_evaluations = sorted(
         evaluations,
         key=lambda current: (
@@ -203,7 +229,11 @@ def _load_cases(manifest: Path) -> tuple[dict[str, Any], ...]:
     return tuple(cases)
 
 
-def _run_matrix(cases: tuple[dict[str, Any], ...]) -> tuple[StrategyEvaluation, ...]:
+def _run_matrix(
+    cases: tuple[dict[str, Any], ...],
+    *,
+    executor: ThreadPoolExecutor | None = None,
+) -> tuple[StrategyEvaluation, ...]:
     strategies = tuple(
         Strategy(
             partition_mode=partition_mode,
@@ -221,7 +251,20 @@ def _run_matrix(cases: tuple[dict[str, Any], ...]) -> tuple[StrategyEvaluation,
 
     evaluations: list[StrategyEvaluation] = []
     for strategy in strategies:
-        case_results = [_evaluate_case(case=case, strategy=strategy) for case in cases]
+        # Hold the strategy environment across the whole batch so concurrent
+        # cases never observe another case restoring the previous values.
+        with _strategy_environment(strategy):
+            if executor is None:
+                case_results = [
+                    _evaluate_case(case=case, strategy=strategy) for case in cases
+                ]
+            else:
+                case_results = list(
+                    executor.map(
+                        lambda case: _evaluate_case(case=case, strategy=strategy),
+                        cases,
+                    )
+                )
         passed_cases = sum(1 for case_result in case_results if case_result.passed)
         total_failures = sum(len(case_result.failures) for case_result in case_results)
         avg_weighted_crossings = fmean(
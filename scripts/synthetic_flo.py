@@ -0,0 +1,272 @@
+"""Generate deterministic synthetic FLO models for benchmarking.
+
+Models are described by a ``SyntheticSpec`` (step count, lanes, decision
+fan-out, rework loops, subprocess nesting depth, include fan-in, and metadata
+density) plus a seed; the same spec always yields byte-identical files.
+
+With ``include_fanin > 0`` the steps are split across that many part files,
+each of which includes one shared resources file, so composition sees the
+shared file ``include_fanin`` times (a diamond include graph).
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import asdict, dataclass
+import json
+from pathlib import Path
+import random
+import sys
+
+_RESOURCES_FILE = "shared/resources.flo"
+_DECISION_EVERY = 10
+_SUBPROCESS_EVERY = 25
+_SUBPROCESS_CHILDREN = 3
+_MATERIALS = 24
+_LOCATIONS = 6
+_VALUE_CLASSES = ("VA", "RNVA", "NVA")
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """Shape parameters of one synthetic model."""
+
+    steps: int = 200
+    lanes: int = 4
+    decision_fanout: int = 2
+    rework_loops: int = 4
+    subprocess_depth: int = 0
+    include_fanin: int = 0
+    metadata_density: float = 0.5
+    seed: int = 0
+
+    @property
+    def label(self) -> str:
+        """Return a compact, filesystem-safe name for this spec."""
+        return (
+            f"s{self.steps}-l{self.lanes}-f{self.decision_fanout}"
+            f"-r{self.rework_loops}-d{self.subprocess_depth}"
+            f"-i{self.include_fanin}-m{int(self.metadata_density * 100)}"
+        )
+
+
+@dataclass(frozen=True)
+class SyntheticModel:
+    """Generated source text: the main file plus relative include files."""
+
+    spec: SyntheticSpec
+    main: str
+    includes: dict[str, str]
+
+    def write(self, directory: Path, name: str = "model.flo") -> Path:
+        """Write every file under ``directory`` and return the main file path."""
+        directory.mkdir(parents=True, exist_ok=True)
+        for relative, text in self.includes.items():
+            path = directory / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+        main_path = directory / name
+        main_path.write_text(self.main, encoding="utf-8")
+        return main_path
+
+
+def generate_model(spec: SyntheticSpec) -> SyntheticModel:
+    """Return the deterministic synthetic model described by ``spec``."""
+    rng = random.Random(spec.seed)
+    steps = _steps(spec, rng)
+    header = _header(spec)
+    if spec.include_fanin <= 0:
+        main = header + _resources_block() + _steps_block(steps)
+        return SyntheticModel(spec=spec, main=main, includes={})
+
+    includes = {_RESOURCES_FILE: _resources_block()}
+    part_refs = []
+    chunk = -(-len(steps) // spec.include_fanin)
+    for part in range(spec.include_fanin):
+        part_steps = steps[part * chunk : (part + 1) * chunk]
+        if not part_steps:
+            break
+        relative = f"parts/part_{part:03d}.flo"
+        includes[relative] = f"includes:\n  - ../{_RESOURCES_FILE}\n" + _steps_block(
+            part_steps
+        )
+        part_refs.append(relative)
+    main = header + "includes:\n" + "".join(f"  - {ref}\n" for ref in part_refs)
+    return SyntheticModel(spec=spec, main=main, includes=includes)
+
+
+def _header(spec: SyntheticSpec) -> str:
+    lanes = "".join(
+        f"  - id: lane_{lane}\n    name: Lane {lane}\n" for lane in range(spec.lanes)
+    )
+    return (
+        'spec_version: "0.1"\n\n'
+        "process:\n"
+        f"  id: synthetic_{spec.label.replace('-', '_')}\n"
+        f"  name: Synthetic {spec.label}\n"
+        "  version: 1\n\n"
+        f"lanes:\n{lanes}\n"
+    )
+
+
+def _resources_block() -> str:
+    materials = "".join(
+        f"  - id: mat_{index}\n    name: Material {index}\n"
+        for index in range(_MATERIALS)
+    )
+    locations = "".join(
+        f"  - id: loc_{index}\n    name: Location {index}\n"
+        for index in range(_LOCATIONS)
+    )
+    return f"materials:\n{materials}locations:\n{locations}"
+
+
+def _steps_block(steps: list[list[str]]) -> str:
+    return "steps:\n" + "".join("".join(lines) for lines in steps)
+
+
+def _steps(spec: SyntheticSpec, rng: random.Random) -> list[list[str]]:
+    count = max(3, spec.steps)
+    ids = _step_ids(spec, count)
+    rework_sources = _rework_decisions(ids, spec.rework_loops, rng)
+    steps: list[list[str]] = []
+    for index, (step_id, kind, parent) in enumerate(ids):
+        lines = [f"  - id: {step_id}\n", f"    kind: {kind}\n"]
+        lines.append(f"    name: {kind.title()} {index}\n")
+        if kind not in {"start", "end"} and spec.lanes > 0:
+            lines.append(f"    lane: lane_{index % spec.lanes}\n")
+        if parent is not None:
+            lines.append(f"    subprocess_parent: {parent}\n")
+        if kind == "decision":
+            lines.extend(_outcomes(ids, index, spec, rework_sources.get(index)))
+        if kind == "queue":
+            lines.extend(_wait_time(rng))
+        elif kind == "task" and rng.random() < spec.metadata_density:
+            lines.extend(_task_metadata(index, rng))
+        steps.append(lines)
+    return steps
+
+
+def _step_ids(spec: SyntheticSpec, count: int) -> list[tuple[str, str, str | None]]:
+    ids: list[tuple[str, str, str | None]] = [("start", "start", None)]
+    index = 1
+    while len(ids) < count - 1:
+        if spec.subprocess_depth > 0 and index % _SUBPROCESS_EVERY == 0:
+            ids.extend(_subprocess_block(index, spec.subprocess_depth))
+        elif index % _DECISION_EVERY == 0:
+            ids.append((f"decide_{index}", "decision", None))
+        elif index % 7 == 0:
+            ids.append((f"queue_{index}", "queue", None))
+        else:
+            ids.append((f"task_{index}", "task", None))
+        index += 1
+    ids.append(("finish", "end", None))
+    return ids
+
+
+def _subprocess_block(index: int, depth: int) -> list[tuple[str, str, str | None]]:
+    block: list[tuple[str, str, str | None]] = []
+    parent: str | None = None
+    for level in range(depth):
+        step_id = f"sub_{index}_{level}"
+        block.append((step_id, "subprocess", parent))
+        parent = step_id
+    for child in range(_SUBPROCESS_CHILDREN):
+        block.append((f"sub_{index}_task_{child}", "task", parent))
+    return block
+
+
+def _rework_decisions(
+    ids: list[tuple[str, str, str | None]], loops: int, rng: random.Random
+) -> dict[int, int]:
+    decisions = [index for index, (_, kind, _) in enumerate(ids) if kind == "decision"]
+    chosen = sorted(rng.sample(decisions, min(loops, len(decisions))))
+    targets = {}
+    for index in chosen:
+        targets[index] = max(1, index - rng.randint(2, 2 * _DECISION_EVERY))
+    return targets
+
+
+def _outcomes(
+    ids: list[tuple[str, str, str | None]],
+    index: int,
+    spec: SyntheticSpec,
+    rework_target: int | None,
+) -> list[str]:
+    lines = ["    outcomes:\n", f"      next: {ids[index + 1][0]}\n"]
+    fanout = max(2, spec.decision_fanout)
+    for branch in range(1, fanout):
+        if branch == 1 and rework_target is not None:
+            lines.extend(
+                [
+                    "      rework:\n",
+                    f"        target: {ids[rework_target][0]}\n",
+                    "        edge_type: rework\n",
+                    "        rework: true\n",
+                ]
+            )
+            continue
+        target = min(len(ids) - 1, index + 1 + branch * 2)
+        lines.append(f"      branch_{branch}: {ids[target][0]}\n")
+    return lines
+
+
+def _wait_time(rng: random.Random) -> list[str]:
+    return [
+        "    metadata:\n",
+        "      wait_time:\n",
+        f"        value: {rng.randint(1, 30)}\n",
+        "        unit: min\n",
+    ]
+
+
+def _task_metadata(index: int, rng: random.Random) -> list[str]:
+    return [
+        "    consumes:\n",
+        f"      - mat_{index % _MATERIALS}\n",
+        f"    location: loc_{index % _LOCATIONS}\n",
+        "    metadata:\n",
+        f"      value_class: {rng.choice(_VALUE_CLASSES)}\n",
+        f"      description: Synthetic task {index} with generated detail text.\n",
+        "      cycle_time:\n",
+        f"        value: {rng.randint(1, 45)}\n",
+        "        unit: min\n",
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="synthetic_flo.py")
+    parser.add_argument("out_dir", type=Path, help="Directory to write into.")
+    defaults = SyntheticSpec()
+    parser.add_argument("--steps", type=int, default=defaults.steps)
+    parser.add_argument("--lanes", type=int, default=defaults.lanes)
+    parser.add_argument("--decision-fanout", type=int, default=defaults.decision_fanout)
+    parser.add_argument("--rework-loops", type=int, default=defaults.rework_loops)
+    parser.add_argument(
+        "--subprocess-depth", type=int, default=defaults.subprocess_depth
+    )
+    parser.add_argument("--include-fanin", type=int, default=defaults.include_fanin)
+    parser.add_argument(
+        "--metadata-density", type=float, default=defaults.metadata_density
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    spec = SyntheticSpec(
+        steps=args.steps,
+        lanes=args.lanes,
+        decision_fanout=args.decision_fanout,
+        rework_loops=args.rework_loops,
+        subprocess_depth=args.subprocess_depth,
+        include_fanin=args.include_fanin,
+        metadata_density=args.metadata_density,
+        seed=args.seed,
+    )
+    path = generate_model(spec).write(args.out_dir)
+    json.dump({"path": str(path), "spec": asdict(spec)}, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
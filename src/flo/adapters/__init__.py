@@ -3,44 +3,59 @@
 from __future__ import annotations
 
 from typing import Any, Dict
-import yaml
 
 
-from .yaml_loader import load_adapter_from_yaml
-from .composition import resolve_includes
+from .yaml_loader import (
+    adapter_model_from_mapping,
+    is_adapter_envelope,
+    load_adapter_from_yaml,
+    load_yaml,
+)
+from .composition import (
+    include_closure,
+    include_refs,
+    resolve_include_path,
+    resolve_includes,
+)
 
 
 def parse_adapter(content: str, source_path: str | None = None) -> Dict[str, Any]:
     """Parse adapter content and return a validated mapping.
 
-    This dispatcher currently supports YAML input via
-    `load_adapter_from_yaml`. The loader returns an `AdapterModel`
-    which we convert to a plain dict (`model_dump`) so downstream
-    compiler code can continue to operate on mappings.
+    The content is parsed exactly once (see `load_yaml`) and then handed to
+    `parse_adapter_document`.
     """
-    try:
-        model = load_adapter_from_yaml(content)
-    except ValueError:
-        # If the content is YAML mapping-shaped FLO, normalize it to the
-        # compiler-facing contract keys.
-        # Otherwise preserve the previous permissive text fallback.
-        parsed = yaml.safe_load(content)
-        if isinstance(parsed, dict):
-            resolved = resolve_includes(parsed, source_path=source_path)
-            return _normalize_compiler_contract_payload(resolved)
-        return {"name": "parsed", "content": content}
-
-    # `model` supports `model_dump()` for Pydantic compatibility
-    try:
-        payload = model.model_dump()
-        return _normalize_compiler_contract_payload(payload)
-    except Exception:
-        # Fallback: if the model does not implement `model_dump`, try
-        # converting via `dict()` for compatibility with lightweight
-        # fallback models.
-        payload = dict(model)
+    return parse_adapter_document(
+        load_yaml(content), content=content, source_path=source_path
+    )
+
+
+def parse_adapter_document(
+    document: Any, *, content: str = "", source_path: str | None = None
+) -> Dict[str, Any]:
+    """Turn an already-parsed YAML document into the compiler-facing mapping.
+
+    Dispatches on the document shape: a legacy `name`/`content` envelope is
+    validated as an `AdapterModel`; any other mapping is FLO source and has
+    its includes composed; anything else keeps the permissive text fallback.
+    """
+    if is_adapter_envelope(document):
+        model = adapter_model_from_mapping(document)
+        # `model` supports `model_dump()` for Pydantic compatibility
+        try:
+            payload = model.model_dump()
+        except Exception:
+            # Fallback: if the model does not implement `model_dump`, try
+            # converting via `dict()` for compatibility with lightweight
+            # fallback models.
+            payload = dict(model)
         return _normalize_compiler_contract_payload(payload)
 
+    if isinstance(document, dict):
+        resolved = resolve_includes(document, source_path=source_path)
+        return _normalize_compiler_contract_payload(resolved)
+    return {"name": "parsed", "content": content}
+
 
 def _normalize_compiler_contract_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Normalize parser output to strict compiler contract keys."""
@@ -50,4 +65,12 @@ def _normalize_compiler_contract_payload(payload: Dict[str, Any]) -> Dict[str, A
     return normalized
 
 
-__all__ = ["load_adapter_from_yaml", "parse_adapter"]
+__all__ = [
+    "include_closure",
+    "include_refs",
+    "load_adapter_from_yaml",
+    "load_yaml",
+    "parse_adapter",
+    "parse_adapter_document",
+    "resolve_include_path",
+]
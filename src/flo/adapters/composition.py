@@ -5,14 +5,19 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
-import yaml
+from .include_cache import IncludeCache, default_include_cache, thaw
+from .yaml_loader import load_yaml
 
 _RESOURCE_KEYS = ("materials", "equipment", "locations", "workers")
 _LIST_KEYS = ("steps", "transitions", "edges", "lanes")
 
 
 def resolve_includes(
-    document: dict[str, Any], source_path: str | None = None
+    document: dict[str, Any],
+    source_path: str | None = None,
+    *,
+    include_paths: list[Path] | None = None,
+    include_cache: IncludeCache | None = None,
 ) -> dict[str, Any]:
     """Resolve include directives and return a composed mapping.
 
@@ -20,32 +25,62 @@ def resolve_includes(
 
     includes:
       - relative/or/absolute/path.yaml
+
+    When ``include_paths`` is given, every resolved include file is appended
+    to it (depth-first, each file once) so callers can track the document's
+    include closure.
+
+    Include files are loaded through ``include_cache`` (the process-wide
+    cache by default), so a file referenced many times is parsed once; the
+    returned mapping never shares containers with the cache.
     """
     root_path = Path(source_path).resolve() if source_path else None
-    return _compose_document(
-        document=document, current_path=root_path, include_stack=[]
+    cache = include_cache if include_cache is not None else default_include_cache()
+    composed = _compose_document(
+        document=document,
+        current_path=root_path,
+        include_stack=[],
+        include_paths=include_paths,
+        cache=cache,
     )
+    if cache is not None and include_refs(document):
+        return thaw(composed)
+    return composed
+
+
+def include_closure(
+    document: dict[str, Any], source_path: str | None = None
+) -> list[Path]:
+    """Return every file ``document`` pulls in through include directives."""
+    include_paths: list[Path] = []
+    resolve_includes(document, source_path, include_paths=include_paths)
+    return include_paths
 
 
 def _compose_document(
     document: dict[str, Any],
     current_path: Path | None,
     include_stack: list[Path],
+    include_paths: list[Path] | None = None,
+    cache: IncludeCache | None = None,
 ) -> dict[str, Any]:
-    include_paths = _normalize_include_entries(document)
     composed: dict[str, Any] = {}
 
-    for include_ref in include_paths:
-        include_path = _resolve_include_path(
+    for include_ref in include_refs(document):
+        include_path = resolve_include_path(
             include_ref=include_ref, current_path=current_path
         )
         include_doc = _load_include_mapping(
-            include_path=include_path, include_stack=include_stack
+            include_path=include_path, include_stack=include_stack, cache=cache
         )
+        if include_paths is not None and include_path not in include_paths:
+            include_paths.append(include_path)
         nested = _compose_document(
             document=include_doc,
             current_path=include_path,
             include_stack=[*include_stack, include_path],
+            include_paths=include_paths,
+            cache=cache,
         )
         composed = _merge_documents(base=composed, incoming=nested)
 
@@ -58,7 +93,12 @@ def _compose_document(
     return composed
 
 
-def _normalize_include_entries(document: dict[str, Any]) -> list[str]:
+def include_refs(document: dict[str, Any]) -> list[str]:
+    """Return the stripped ``includes``/``include`` entries of ``document``.
+
+    Raises ``ValueError`` when the directive is not a string or a list of
+    non-empty strings.
+    """
     include_value = document.get("includes")
     if include_value is None:
         include_value = document.get("include")
@@ -81,7 +121,8 @@ def _normalize_include_entries(document: dict[str, Any]) -> list[str]:
     return out
 
 
-def _resolve_include_path(include_ref: str, current_path: Path | None) -> Path:
+def resolve_include_path(include_ref: str, current_path: Path | None) -> Path:
+    """Resolve ``include_ref`` against the file that names it (or the cwd)."""
     raw = Path(include_ref)
     if raw.is_absolute():
         return raw.resolve()
@@ -91,7 +132,7 @@ def _resolve_include_path(include_ref: str, current_path: Path | None) -> Path:
 
 
 def _load_include_mapping(
-    include_path: Path, include_stack: list[Path]
+    include_path: Path, include_stack: list[Path], cache: IncludeCache | None = None
 ) -> dict[str, Any]:
     if include_path in include_stack:
         chain = " -> ".join(str(path) for path in [*include_stack, include_path])
@@ -101,13 +142,15 @@ def _load_include_mapping(
         raise ValueError(f"include file not found: {include_path}")
 
     try:
-        content = include_path.read_text(encoding="utf-8")
+        if cache is not None:
+            parsed = cache.load(include_path, load_yaml)
+        else:
+            parsed = load_yaml(include_path.read_text(encoding="utf-8"))
     except OSError as exc:
         raise ValueError(
             f"unable to read include file '{include_path}': {exc}"
         ) from exc
 
-    parsed = yaml.safe_load(content)
     if not isinstance(parsed, dict):
         raise ValueError(f"include file '{include_path}' must contain a YAML mapping")
 
@@ -0,0 +1,173 @@
+"""In-process cache of parsed include files.
+
+Composition loads every include reference, so a shared resources file pulled
+in by many sub-documents (or by every model of a `flo build` run or `flo
+watch` session) would otherwise be read and YAML-parsed once per reference.
+``IncludeCache`` keeps each parsed file keyed by its resolved path and
+revalidates it on every lookup against a digest of the file's bytes (mtime
+granularity is too coarse to catch quick successive saves); reading and
+hashing a file costs a small fraction of parsing it.
+
+Cached documents are frozen: their mappings and lists are read-only ``dict``
+and ``list`` subclasses, so composition can share them between documents.
+Merging already builds new containers where it combines values, and
+``thaw`` turns a composed document back into plain, independently mutable
+containers before it leaves the composition layer.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Callable, NoReturn
+
+from .yaml_loader import load_yaml
+
+_ENV_CACHE = "FLO_INCLUDE_CACHE"
+_DISABLED_VALUES = {"0", "off", "false", "no", "disabled"}
+_DEFAULT_MAX_ENTRIES = 512
+
+
+def _read_only(*_: Any, **__: Any) -> NoReturn:
+    raise TypeError("cached include documents are read-only")
+
+
+class FrozenMapping(dict):
+    """Read-only ``dict`` used for mappings inside cached include documents."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self) -> tuple[type, tuple[dict[Any, Any]]]:
+        """Pickle as a plain ``dict``."""
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only ``list`` used for sequences inside cached include documents."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __reduce__(self) -> tuple[type, tuple[list[Any]]]:
+        """Pickle as a plain ``list``."""
+        return (list, (list(self),))
+
+
+@dataclass
+class IncludeCacheStats:
+    """Lookup counters for one include cache instance."""
+
+    hits: int = 0
+    misses: int = 0
+    reloads: int = 0
+    evictions: int = 0
+
+
+class IncludeCache:
+    """Parsed include files keyed by resolved path, checked by content digest."""
+
+    def __init__(self, max_entries: int = _DEFAULT_MAX_ENTRIES) -> None:
+        """Create an empty cache holding at most ``max_entries`` files."""
+        self.max_entries = max(1, max_entries)
+        self.stats = IncludeCacheStats()
+        self._entries: OrderedDict[Path, tuple[bytes, Any]] = OrderedDict()
+
+    def load(self, path: Path, parse: Callable[[str], Any] = load_yaml) -> Any:
+        """Return the frozen result of ``parse`` over the text of ``path``.
+
+        Raises ``OSError`` when the file cannot be read; YAML errors propagate
+        unchanged and are not cached.
+        """
+        content = path.read_bytes()
+        digest = hashlib.blake2b(content, digest_size=16).digest()
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == digest:
+            self.stats.hits += 1
+            self._entries.move_to_end(path)
+            return entry[1]
+        self.stats.misses += 1
+        if entry is not None:
+            self.stats.reloads += 1
+        parsed = freeze(parse(content.decode("utf-8")))
+        self._entries[path] = (digest, parsed)
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        return parsed
+
+    def clear(self) -> None:
+        """Drop every cached file (counters are kept)."""
+        self._entries.clear()
+
+    def describe(self) -> dict[str, Any]:
+        """Return the entry count, capacity, and lookup counters."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            **asdict(self.stats),
+        }
+
+
+def freeze(value: Any) -> Any:
+    """Return ``value`` with every mapping and list replaced by a frozen copy."""
+    if isinstance(value, dict):
+        return FrozenMapping({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a plain, independently mutable copy of a (partly) frozen value."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+def include_cache_enabled() -> bool:
+    """Return whether ``FLO_INCLUDE_CACHE`` leaves the include cache on."""
+    value = os.getenv(_ENV_CACHE, "on").strip().lower()
+    return value not in _DISABLED_VALUES
+
+
+def default_include_cache() -> IncludeCache | None:
+    """Return the process-wide include cache, or None when it is disabled."""
+    if not include_cache_enabled():
+        return None
+    return _shared_cache()
+
+
+def include_cache_counters() -> tuple[int, int]:
+    """Return ``(hits, misses)`` of the process-wide cache (zeros when off)."""
+    cache = default_include_cache()
+    if cache is None:
+        return 0, 0
+    return cache.stats.hits, cache.stats.misses
+
+
+@lru_cache(maxsize=1)
+def _shared_cache() -> IncludeCache:
+    return IncludeCache()
+
+
+__all__ = [
+    "FrozenList",
+    "FrozenMapping",
+    "IncludeCache",
+    "IncludeCacheStats",
+    "default_include_cache",
+    "freeze",
+    "include_cache_counters",
+    "include_cache_enabled",
+    "thaw",
+]
@@ -0,0 +1,67 @@
+"""Import and storage of observed process-event traces (`flo_trace.json`)."""
+
+from .duplicates import DuplicateIdFinder
+from .importer import (
+    LIFECYCLES,
+    TRACE_SCHEMA_VERSION,
+    EventChecker,
+    TraceEvent,
+    TraceEventError,
+    TraceEventIssue,
+    TraceFormatError,
+    TraceImportStats,
+    event_checker,
+    iter_trace_events,
+    parse_rfc3339_us,
+)
+from .normalize import (
+    STORE_SUFFIX,
+    TraceNormalizeStats,
+    iter_sorted_events,
+    normalize_trace,
+    write_trace_dataset,
+)
+from .store import (
+    DICTIONARY_COLUMNS,
+    LIFECYCLE_CODES,
+    MISSING_CODE,
+    DictionaryColumn,
+    StringTable,
+    TraceStore,
+    TraceStoreBuilder,
+    format_timestamp_us,
+    is_trace_store,
+    open_trace_store,
+    write_trace_store,
+)
+
+__all__ = [
+    "DICTIONARY_COLUMNS",
+    "LIFECYCLES",
+    "LIFECYCLE_CODES",
+    "MISSING_CODE",
+    "STORE_SUFFIX",
+    "TRACE_SCHEMA_VERSION",
+    "DictionaryColumn",
+    "DuplicateIdFinder",
+    "EventChecker",
+    "StringTable",
+    "TraceEvent",
+    "TraceEventError",
+    "TraceEventIssue",
+    "TraceFormatError",
+    "TraceImportStats",
+    "TraceNormalizeStats",
+    "TraceStore",
+    "TraceStoreBuilder",
+    "event_checker",
+    "format_timestamp_us",
+    "is_trace_store",
+    "iter_sorted_events",
+    "iter_trace_events",
+    "normalize_trace",
+    "open_trace_store",
+    "parse_rfc3339_us",
+    "write_trace_dataset",
+    "write_trace_store",
+]
@@ -0,0 +1,105 @@
+"""Incremental JSON value reader used by the streaming trace importer."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, TextIO
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class JsonStreamError(ValueError):
+    """Raised when the stream is not well-formed JSON at the read position."""
+
+
+class JsonValueReader:
+    """Chunked reader that decodes one JSON value at a time from a text stream.
+
+    Only the unread tail of the current chunk and the value being decoded
+    are held in memory; a value larger than ``max_value_chars`` is rejected
+    rather than buffered. While a value spans chunks, each refill reads at
+    least as much as is already pending, so the buffer doubles and re-decoding
+    it after every refill stays linear in the value size.
+    """
+
+    __slots__ = ("_stream", "_chunk", "_limit", "_buf", "_pos", "_base", "_eof")
+
+    def __init__(
+        self, stream: TextIO, *, chunk_size: int, max_value_chars: int
+    ) -> None:
+        """Read ``stream`` in ``chunk_size`` pieces."""
+        self._stream = stream
+        self._chunk = chunk_size
+        self._limit = max_value_chars
+        self._buf = ""
+        self._pos = 0
+        self._base = 0
+        self._eof = False
+
+    @property
+    def offset(self) -> int:
+        """Return the absolute character offset of the read position."""
+        return self._base + self._pos
+
+    def _fill(self, size: int = 0) -> bool:
+        if self._eof:
+            return False
+        if self._pos:
+            self._base += self._pos
+            self._buf = self._buf[self._pos :]
+            self._pos = 0
+        chunk = self._stream.read(max(self._chunk, size))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at end of input)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consume and return the next character, which must be in ``chars``."""
+        char = self.peek()
+        if not char or char not in chars:
+            found = repr(char) if char else "end of input"
+            wanted = " or ".join(repr(c) for c in chars)
+            raise JsonStreamError(
+                f"expected {wanted} at character {self.offset}, found {found}"
+            )
+        self._pos += 1
+        return char
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as exc:
+                if self._refill_for_value():
+                    continue
+                raise JsonStreamError(
+                    f"invalid JSON at character {self._base + exc.pos}: {exc.msg}"
+                ) from None
+            # A number that ends the buffer may continue in the next chunk.
+            if end == len(self._buf) and self._refill_for_value():
+                continue
+            self._pos = end
+            return value
+
+    def _refill_for_value(self) -> bool:
+        pending = len(self._buf) - self._pos
+        if pending > self._limit:
+            raise JsonStreamError(
+                f"JSON value at character {self.offset} is malformed or larger "
+                f"than {self._limit} characters"
+            )
+        return self._fill(pending)
@@ -0,0 +1,213 @@
+"""Bounded-memory detection of repeated event IDs.
+
+Event IDs must be unique across a dataset, but a dataset of tens of millions
+of events would not fit its ID set in memory. ``DuplicateIdFinder`` keeps a
+plain in-memory set until it holds ``max_in_memory`` IDs, then spills every
+ID to hash-partitioned temporary files and finds repeats one partition at a
+time when asked for the result. A partition that ends up holding more than
+``max_in_memory`` IDs is split again with a differently seeded hash before it
+is loaded, so the budget holds however many IDs were spilled.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import heapq
+from pathlib import Path
+import tempfile
+from typing import BinaryIO
+import zlib
+
+_LENGTH_BYTES = 4
+
+
+class DuplicateIdFinder:
+    """Collect IDs and report the ones seen more than once.
+
+    IDs are ``bytes`` (the UTF-8 encoding of the event ID). Spill files live
+    in a private temporary directory under ``spill_dir`` that ``close``
+    removes.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_in_memory: int = 1_000_000,
+        partitions: int = 64,
+        spill_dir: str | Path | None = None,
+    ) -> None:
+        """Keep up to ``max_in_memory`` IDs in memory before spilling."""
+        self.max_in_memory = max(1, max_in_memory)
+        self.partitions = max(1, partitions)
+        self._spill_root = spill_dir
+        self._seen: set[bytes] = set()
+        self._duplicates: set[bytes] = set()
+        self._tempdir: tempfile.TemporaryDirectory[str] | None = None
+        self._files: list[BinaryIO] = []
+        self._counts: list[int] = []
+
+    @property
+    def spilled(self) -> bool:
+        """Return whether IDs have been spilled to disk."""
+        return self._tempdir is not None
+
+    def __enter__(self) -> DuplicateIdFinder:
+        """Return the finder."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Remove any spill files."""
+        self.close()
+
+    def add(self, event_id: bytes) -> None:
+        """Record one occurrence of ``event_id``."""
+        if self._files:
+            self._write(event_id)
+            return
+        if event_id in self._seen:
+            self._duplicates.add(event_id)
+            return
+        self._seen.add(event_id)
+        if len(self._seen) >= self.max_in_memory:
+            self._spill()
+
+    def update(self, event_ids: Iterable[bytes]) -> None:
+        """Record every ID in ``event_ids``."""
+        if self._files:
+            for event_id in event_ids:
+                self._write(event_id)
+            return
+        for event_id in event_ids:
+            self.add(event_id)
+
+    def result(self, *, limit: int | None = None) -> tuple[int, list[str]]:
+        """Return the number of repeated IDs and the smallest ``limit`` of them.
+
+        The listed IDs are decoded and sorted, so the report is the same for
+        any input order and spill threshold.
+        """
+        counted: _Counted | None = None
+        ids: Iterable[bytes] = self._duplicates
+        if self._files:
+            ids = counted = _Counted(self._iter_spilled_duplicates())
+        listed = sorted(ids) if limit is None else heapq.nsmallest(limit, ids)
+        if counted is None:
+            count = len(self._duplicates)
+        else:
+            for _ in counted:
+                pass
+            count = counted.count
+        return count, [value.decode("utf-8") for value in listed]
+
+    def close(self) -> None:
+        """Close and delete spill files."""
+        for fh in self._files:
+            fh.close()
+        self._files.clear()
+        self._counts.clear()
+        if self._tempdir is not None:
+            self._tempdir.cleanup()
+            self._tempdir = None
+
+    def _spill(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory(
+            prefix="flo-trace-ids-", dir=self._spill_root
+        )
+        root = Path(self._tempdir.name)
+        self._files = [
+            (root / f"{index:03d}.ids").open("w+b", buffering=1 << 16)
+            for index in range(self.partitions)
+        ]
+        self._counts = [0] * self.partitions
+        # A repeat already found appears twice in its partition so the
+        # per-partition pass finds it again.
+        for event_id in self._seen:
+            self._write(event_id)
+        for event_id in self._duplicates:
+            self._write(event_id)
+        self._seen.clear()
+        self._duplicates.clear()
+
+    def _write(self, event_id: bytes) -> None:
+        index = zlib.crc32(event_id) % self.partitions
+        _write_id(self._files[index], event_id)
+        self._counts[index] += 1
+
+    def _iter_spilled_duplicates(self) -> Iterator[bytes]:
+        for fh, count in zip(self._files, self._counts):
+            fh.flush()
+            fh.seek(0)
+            yield from self._partition_duplicates(fh, count, 1)
+            fh.seek(0, 2)
+
+    def _partition_duplicates(
+        self, fh: BinaryIO, count: int, level: int
+    ) -> Iterator[bytes]:
+        if count <= self.max_in_memory:
+            yield from _repeated_ids(_read_ids(fh))
+            return
+        assert self._tempdir is not None
+        fanout = -(-count // self.max_in_memory)
+        root = Path(self._tempdir.name)
+        parts = [
+            (root / f"{level}-{index:03d}.ids").open("w+b", buffering=1 << 16)
+            for index in range(fanout)
+        ]
+        counts = [0] * fanout
+        try:
+            for event_id in _read_ids(fh):
+                index = hash((level, event_id)) % fanout
+                _write_id(parts[index], event_id)
+                counts[index] += 1
+            if max(counts) == count:
+                # Every ID landed in one part, so there are very few distinct
+                # IDs and the set stays small; splitting again would not help.
+                fh.seek(0)
+                yield from _repeated_ids(_read_ids(fh))
+                return
+            for part, part_count in zip(parts, counts):
+                part.flush()
+                part.seek(0)
+                yield from self._partition_duplicates(part, part_count, level + 1)
+        finally:
+            for part in parts:
+                part.close()
+                Path(part.name).unlink()
+
+
+class _Counted(Iterator[bytes]):
+    """Iterator wrapper that counts the items it yields."""
+
+    def __init__(self, items: Iterator[bytes]) -> None:
+        self._items = items
+        self.count = 0
+
+    def __next__(self) -> bytes:
+        item = next(self._items)
+        self.count += 1
+        return item
+
+
+def _repeated_ids(event_ids: Iterable[bytes]) -> set[bytes]:
+    seen: set[bytes] = set()
+    repeated: set[bytes] = set()
+    for event_id in event_ids:
+        if event_id in seen:
+            repeated.add(event_id)
+        else:
+            seen.add(event_id)
+    return repeated
+
+
+def _write_id(fh: BinaryIO, event_id: bytes) -> None:
+    fh.write(len(event_id).to_bytes(_LENGTH_BYTES, "little"))
+    fh.write(event_id)
+
+
+def _read_ids(fh: BinaryIO) -> Iterator[bytes]:
+    read = fh.read
+    while header := read(_LENGTH_BYTES):
+        yield read(int.from_bytes(header, "little"))
+
+
+__all__ = ["DuplicateIdFinder"]
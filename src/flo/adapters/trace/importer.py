@@ -0,0 +1,477 @@
+"""Streaming importer for ``flo_trace.json`` process-event datasets.
+
+Trace exports can be far larger than memory, so the dataset is never loaded
+whole. ``iter_trace_events`` reads the envelope in fixed-size chunks, decodes
+one element of the ``events`` array at a time, and checks it against a
+validator compiled once from ``$defs/event`` in the trace schema. Memory use
+is bounded by the chunk size plus the largest single event, not by the
+number of events.
+
+Event-ID uniqueness is a dataset-wide property and is left to the alignment
+and normalization stages; this module validates each event on its own.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import gzip
+import json
+from pathlib import Path
+import re
+import sys
+import time
+from typing import Any, TextIO
+
+from flo.errors import ParseError, ValidationError
+from flo.schema.registry import load_schema
+
+from ._json_stream import JsonStreamError, JsonValueReader
+
+TRACE_SCHEMA = "flo_trace.json"
+TRACE_SCHEMA_VERSION = "0.1"
+LIFECYCLES: tuple[str, ...] = ("start", "complete", "cancel", "fail")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_RFC3339 = re.compile(
+    r"(\d{4}-\d{2}-\d{2})[Tt](\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?([Zz]|[+-]\d{2}:\d{2})"
+)
+
+
+class TraceFormatError(ParseError):
+    """Raised when a trace document is not a well-formed dataset envelope."""
+
+    def __init__(self, message: str) -> None:
+        """Initialize with the ``trace_import`` error stage."""
+        super().__init__(message, error_stage="trace_import")
+
+
+class TraceEventError(ValidationError):
+    """Raised in strict mode when an event violates the event contract."""
+
+    def __init__(self, issue: TraceEventIssue) -> None:
+        """Initialize from the first violation found in the event."""
+        super().__init__(str(issue), error_stage="trace_import")
+        self.issue = issue
+
+
+@dataclass(slots=True)
+class TraceEvent:
+    """One validated process event.
+
+    ``timestamp`` keeps the source text; ``timestamp_us`` is the same instant
+    as integer microseconds since the Unix epoch in UTC.
+    """
+
+    event_id: str
+    process_id: str
+    case_id: str
+    activity_key: str
+    timestamp: str
+    timestamp_us: int
+    lifecycle: str
+    process_version: str | None = None
+    correlation_id: str | None = None
+    source: str | None = None
+    attributes: dict[str, Any] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TraceEventIssue:
+    """A contract violation in the event at ``position`` in ``events``."""
+
+    position: int
+    event_id: str | None
+    field: str | None
+    message: str
+
+    def __str__(self) -> str:
+        """Return a one-line, location-prefixed description."""
+        where = f"events[{self.position}]"
+        if self.field:
+            where += f".{self.field}"
+        return f"{where}: {self.message}"
+
+
+@dataclass(slots=True)
+class TraceImportStats:
+    """Counters filled in while a trace is streamed.
+
+    Only the first ``max_issues`` violations are kept; ``invalid_events``
+    counts all of them.
+    """
+
+    schema_version: str | None = None
+    events: int = 0
+    invalid_events: int = 0
+    characters: int = 0
+    elapsed_seconds: float = 0.0
+    max_issues: int = 100
+    issues: list[TraceEventIssue] = field(default_factory=list)
+
+    @property
+    def events_per_second(self) -> float:
+        """Return valid and invalid events decoded per second of import."""
+        total = self.events + self.invalid_events
+        if self.elapsed_seconds <= 0.0:
+            return 0.0
+        return total / self.elapsed_seconds
+
+    def record(self, issue: TraceEventIssue) -> None:
+        """Count ``issue`` and keep it when under the retention cap."""
+        self.invalid_events += 1
+        if len(self.issues) < self.max_issues:
+            self.issues.append(issue)
+
+
+class _EventViolation(Exception):
+    def __init__(self, field_name: str | None, message: str) -> None:
+        super().__init__(message)
+        self.field_name = field_name
+        self.message = message
+
+
+@lru_cache(maxsize=4096)
+def _minute_us(minute: str, offset: str) -> tuple[int, bool]:
+    """Return the UTC epoch microseconds of ``minute`` and whether it is 23:59 UTC.
+
+    Trace events cluster in time, so caching per minute turns most timestamp
+    conversions into integer arithmetic on the seconds field.
+    """
+    suffix = "+00:00" if offset in ("Z", "z") else offset
+    try:
+        instant = datetime.fromisoformat(f"{minute}:00{suffix}")
+    except ValueError as exc:
+        raise ValueError(f"timestamp is not a valid date-time: {exc}") from None
+    utc = instant.astimezone(timezone.utc)
+    return (instant - _EPOCH) // _MICROSECOND, (utc.hour, utc.minute) == (23, 59)
+
+
+def parse_rfc3339_us(value: str) -> int:
+    """Return UTC microseconds since the epoch for an RFC 3339 date-time.
+
+    The value must carry an explicit ``Z`` or numeric UTC offset. Fractions
+    beyond microseconds are truncated, and a leap second (``:60``) is folded
+    onto the following second.
+    """
+    match = _RFC3339.fullmatch(value)
+    if match is None:
+        raise ValueError("timestamp must be an RFC 3339 date-time with a UTC offset")
+    date, hour, minute, second, fraction, offset = match.groups()
+    base_us, last_utc_minute = _minute_us(f"{date}T{hour}:{minute}", offset)
+    seconds = int(second)
+    if seconds > 59 and not (seconds == 60 and last_utc_minute):
+        raise ValueError(
+            "timestamp seconds must be 00-59 (60 only at 23:59:60 UTC leap seconds)"
+        )
+    micros = int(fraction[:6].ljust(6, "0")) if fraction else 0
+    return base_us + seconds * 1_000_000 + micros
+
+
+def _string_rule(name: str, spec: dict[str, Any]) -> Callable[[Any], None]:
+    min_length = int(spec.get("minLength", 0))
+    allowed = frozenset(spec["enum"]) if "enum" in spec else None
+    is_datetime = spec.get("format") == "date-time"
+
+    def check(value: Any) -> None:
+        if type(value) is not str:
+            raise _EventViolation(name, "must be a string")
+        if len(value) < min_length:
+            raise _EventViolation(name, "must be non-empty")
+        if allowed is not None and value not in allowed:
+            choices = ", ".join(sorted(allowed))
+            raise _EventViolation(name, f"must be one of: {choices}")
+        if is_datetime:
+            try:
+                parse_rfc3339_us(value)
+            except ValueError as exc:
+                raise _EventViolation(name, str(exc)) from None
+
+    return check
+
+
+def _object_rule(name: str, _spec: dict[str, Any]) -> Callable[[Any], None]:
+    def check(value: Any) -> None:
+        if type(value) is not dict:
+            raise _EventViolation(name, "must be an object")
+
+    return check
+
+
+_RULE_BUILDERS: dict[str, Callable[[str, dict[str, Any]], Callable[[Any], None]]] = {
+    "string": _string_rule,
+    "object": _object_rule,
+}
+
+
+class EventChecker:
+    """Validator for ``$defs/event`` specialized from the trace schema.
+
+    The schema is walked once into flat tables of string, enum, date-time,
+    and object properties, so a valid event costs two key-set comparisons
+    and a handful of type checks instead of a general JSON Schema
+    evaluation. Only an invalid event takes the slower per-property path
+    that names the first violation.
+    """
+
+    __slots__ = (
+        "required",
+        "_rules",
+        "_required_keys",
+        "_allowed_keys",
+        "_strings",
+        "_enums",
+        "_objects",
+    )
+
+    def __init__(self, event_schema: dict[str, Any]) -> None:
+        """Compile per-property checks from the ``event`` definition."""
+        properties: dict[str, Any] = event_schema.get("properties", {})
+        self.required: tuple[str, ...] = tuple(event_schema.get("required", ()))
+        self._required_keys = frozenset(self.required)
+        self._allowed_keys = (
+            frozenset(properties)
+            if event_schema.get("additionalProperties") is False
+            else None
+        )
+        self._rules: dict[str, Callable[[Any], None]] = {}
+        strings: list[tuple[str, int]] = []
+        enums: list[tuple[str, frozenset[str]]] = []
+        objects: list[str] = []
+        for name, spec in properties.items():
+            kind = spec.get("type")
+            if kind not in _RULE_BUILDERS:
+                raise ValueError(f"unsupported trace event property type: {kind!r}")
+            self._rules[name] = _RULE_BUILDERS[kind](name, spec)
+            if kind == "object":
+                objects.append(name)
+                continue
+            strings.append((name, int(spec.get("minLength", 0))))
+            if "enum" in spec:
+                enums.append((name, frozenset(spec["enum"])))
+        if properties.get("timestamp", {}).get("format") != "date-time":
+            raise ValueError("trace event schema must define a date-time timestamp")
+        self._strings = tuple(strings)
+        self._enums = tuple(enums)
+        self._objects = tuple(objects)
+
+    def decode(self, raw: Any) -> TraceEvent:
+        """Return ``raw`` as a ``TraceEvent`` or raise on the first violation."""
+        timestamp_us = self._fast_check(raw)
+        if timestamp_us is None:
+            raise self._violation(raw)
+        get = raw.get
+        return TraceEvent(
+            raw["event_id"],
+            sys.intern(raw["process_id"]),
+            raw["case_id"],
+            sys.intern(raw["activity_key"]),
+            raw["timestamp"],
+            timestamp_us,
+            sys.intern(raw["lifecycle"]),
+            get("process_version"),
+            get("correlation_id"),
+            get("source"),
+            get("attributes"),
+        )
+
+    def _fast_check(self, raw: Any) -> int | None:
+        if type(raw) is not dict:
+            return None
+        keys = raw.keys()
+        if not self._required_keys <= keys:
+            return None
+        if self._allowed_keys is not None and not keys <= self._allowed_keys:
+            return None
+        if not self._values_pass(raw):
+            return None
+        try:
+            return parse_rfc3339_us(raw["timestamp"])
+        except ValueError:
+            return None
+
+    def _values_pass(self, raw: dict[str, Any]) -> bool:
+        for name, min_length in self._strings:
+            value = raw.get(name)
+            if type(value) is not str or len(value) < min_length:
+                if value is None and name not in raw:
+                    continue
+                return False
+        for name, allowed in self._enums:
+            if name in raw and raw[name] not in allowed:
+                return False
+        for name in self._objects:
+            if name in raw and type(raw[name]) is not dict:
+                return False
+        return True
+
+    def _violation(self, raw: Any) -> _EventViolation:
+        if type(raw) is not dict:
+            return _EventViolation(None, "event must be an object")
+        for name in self.required:
+            if name not in raw:
+                return _EventViolation(name, "is required")
+        for name, value in raw.items():
+            rule = self._rules.get(name)
+            if rule is None:
+                if self._allowed_keys is not None:
+                    return _EventViolation(name, "is not an allowed event field")
+                continue
+            try:
+                rule(value)
+            except _EventViolation as exc:
+                return exc
+        return _EventViolation(None, "event does not match the trace schema")
+
+
+@lru_cache(maxsize=1)
+def event_checker() -> EventChecker:
+    """Return the shared checker compiled from the packaged trace schema."""
+    return EventChecker(load_schema(TRACE_SCHEMA)["$defs"]["event"])
+
+
+def _open_trace(source: str | Path) -> TextIO:
+    path = Path(source)
+    if path.suffix.lower() == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open("r", encoding="utf-8")
+
+
+def iter_trace_events(
+    source: str | Path | TextIO,
+    *,
+    strict: bool = True,
+    stats: TraceImportStats | None = None,
+    chunk_size: int = 1 << 20,
+    max_event_chars: int = 1 << 24,
+) -> Iterator[TraceEvent]:
+    """Yield validated events from a ``flo_trace.json`` dataset, in file order.
+
+    ``source`` is a path (``.gz`` paths are decompressed on the fly) or an
+    open text stream. In strict mode the first invalid event raises
+    ``TraceEventError``; otherwise invalid events are skipped and recorded
+    in ``stats``. Envelope problems always raise ``TraceFormatError``.
+    """
+    stats = stats if stats is not None else TraceImportStats()
+    if isinstance(source, (str, Path)):
+        with _open_trace(source) as stream:
+            yield from _iter_stream(stream, strict, stats, chunk_size, max_event_chars)
+    else:
+        yield from _iter_stream(source, strict, stats, chunk_size, max_event_chars)
+
+
+def _iter_stream(
+    stream: TextIO,
+    strict: bool,
+    stats: TraceImportStats,
+    chunk_size: int,
+    max_event_chars: int,
+) -> Iterator[TraceEvent]:
+    reader = JsonValueReader(
+        stream, chunk_size=chunk_size, max_value_chars=max_event_chars
+    )
+    started = time.perf_counter()
+    try:
+        yield from _iter_envelope(reader, strict, stats)
+    except JsonStreamError as exc:
+        raise TraceFormatError(str(exc)) from None
+    finally:
+        stats.characters = reader.offset
+        stats.elapsed_seconds = time.perf_counter() - started
+
+
+def _iter_envelope(
+    reader: JsonValueReader, strict: bool, stats: TraceImportStats
+) -> Iterator[TraceEvent]:
+    decoder = json.JSONDecoder()
+    seen: set[str] = set()
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.expect("}")
+    else:
+        while True:
+            key = reader.value(decoder)
+            if type(key) is not str:
+                raise TraceFormatError("dataset keys must be strings")
+            if key in seen:
+                raise TraceFormatError(f"duplicate dataset key {key!r}")
+            seen.add(key)
+            reader.expect(":")
+            if key == "events":
+                yield from _iter_events(reader, decoder, strict, stats)
+            elif key == "schema_version":
+                _check_schema_version(reader.value(decoder), stats)
+            else:
+                raise TraceFormatError(f"unexpected dataset key {key!r}")
+            if reader.expect(",}") == "}":
+                break
+    if reader.peek():
+        raise TraceFormatError(
+            f"unexpected content after dataset at character {reader.offset}"
+        )
+    for key in ("schema_version", "events"):
+        if key not in seen:
+            raise TraceFormatError(f"dataset is missing required key {key!r}")
+
+
+def _check_schema_version(value: Any, stats: TraceImportStats) -> None:
+    if value != TRACE_SCHEMA_VERSION:
+        raise TraceFormatError(
+            f"unsupported trace schema_version {value!r} "
+            f"(expected {TRACE_SCHEMA_VERSION!r})"
+        )
+    stats.schema_version = value
+
+
+def _iter_events(
+    reader: JsonValueReader,
+    decoder: json.JSONDecoder,
+    strict: bool,
+    stats: TraceImportStats,
+) -> Iterator[TraceEvent]:
+    decode = event_checker().decode
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.expect("]")
+        return
+    position = 0
+    while True:
+        raw = reader.value(decoder)
+        try:
+            event = decode(raw)
+        except _EventViolation as exc:
+            event_id = raw.get("event_id") if type(raw) is dict else None
+            issue = TraceEventIssue(
+                position=position,
+                event_id=event_id if type(event_id) is str else None,
+                field=exc.field_name,
+                message=exc.message,
+            )
+            if strict:
+                raise TraceEventError(issue) from None
+            stats.record(issue)
+        else:
+            stats.events += 1
+            yield event
+        position += 1
+        if reader.expect(",]") == "]":
+            return
+
+
+__all__ = [
+    "EventChecker",
+    "LIFECYCLES",
+    "TRACE_SCHEMA",
+    "TRACE_SCHEMA_VERSION",
+    "TraceEvent",
+    "TraceEventError",
+    "TraceEventIssue",
+    "TraceFormatError",
+    "TraceImportStats",
+    "event_checker",
+    "iter_trace_events",
+    "parse_rfc3339_us",
+]
@@ -0,0 +1,347 @@
+"""External-memory sort and dedupe of trace datasets into canonical order.
+
+The trace contract orders events by UTC timestamp then ``event_id`` and
+requires event IDs to be unique. Raw exports arrive unsorted and may be far
+larger than memory, so ``iter_sorted_events`` runs an external merge sort:
+the input is cut into runs of at most ``max_events_in_memory`` events, each
+run is sorted and spilled to a temporary file (in worker processes when
+``jobs > 1``), and the runs are combined with a k-way heap merge. The merge
+reads one block per run, so when there are more runs than the budget allows
+blocks for, groups of runs are first merged into longer runs. Input that
+fits in a single run is sorted in memory and never touches disk.
+
+The merge sees every copy of an event ID, so duplicates are handled there:
+exact copies of an event are dropped, and IDs that still repeat with
+different content are kept and reported.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+import gzip
+import heapq
+from itertools import batched
+import json
+import marshal
+from operator import itemgetter
+import os
+from pathlib import Path
+import tempfile
+import time
+from typing import Any, TextIO
+
+from .duplicates import DuplicateIdFinder
+from .importer import TRACE_SCHEMA_VERSION, TraceEvent
+from .store import write_trace_store
+
+STORE_SUFFIX = ".flotrace"
+
+# Records are plain tuples, sort key first, so runs marshal quickly.
+_Record = tuple[Any, ...]
+_SORT_KEY = itemgetter(0, 1)
+_RUN_CHUNK = 4096
+_OPTIONAL_FIELDS = ("process_version", "correlation_id", "source", "attributes")
+
+
+@dataclass(slots=True)
+class TraceNormalizeStats:
+    """Counters filled in while events are sorted and deduplicated.
+
+    ``duplicate_event_ids`` lists at most ``max_listed`` of the
+    ``duplicate_event_id_count`` IDs that repeat with different content.
+    """
+
+    events: int = 0
+    written: int = 0
+    runs: int = 0
+    dropped_copies: int = 0
+    duplicate_event_id_count: int = 0
+    duplicate_event_ids: list[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+
+def iter_sorted_events(
+    events: Iterable[TraceEvent],
+    *,
+    max_events_in_memory: int = 500_000,
+    jobs: int = 1,
+    spill_dir: str | Path | None = None,
+    stats: TraceNormalizeStats | None = None,
+    max_listed: int = 1000,
+) -> Iterator[TraceEvent]:
+    """Yield ``events`` in canonical order with exact copies removed.
+
+    At most ``max_events_in_memory`` events are buffered at once; with
+    ``jobs > 1`` that budget is shared between the run being filled and the
+    runs being sorted by worker processes. Spill files live in a private
+    temporary directory under ``spill_dir``. ``stats`` is complete once the
+    iterator is exhausted.
+    """
+    stats = stats if stats is not None else TraceNormalizeStats()
+    jobs = max(1, jobs)
+    run_size = max(1, max_events_in_memory // (jobs + 1 if jobs > 1 else 1))
+    fan_in = max(2, max_events_in_memory // min(_RUN_CHUNK, run_size))
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="flo-trace-sort-", dir=spill_dir) as tmp:
+        with DuplicateIdFinder(
+            max_in_memory=max_events_in_memory, spill_dir=tmp
+        ) as finder:
+            records = _sorted_records(events, Path(tmp), run_size, fan_in, jobs, stats)
+            for record in _unique_records(records, finder, stats):
+                yield TraceEvent(*record[1:6], record[0], *record[6:])
+            count, listed = finder.result(limit=max_listed)
+    stats.duplicate_event_id_count = count
+    stats.duplicate_event_ids = listed
+    stats.elapsed_seconds = time.perf_counter() - started
+
+
+def normalize_trace(
+    events: Iterable[TraceEvent],
+    output: str | Path,
+    *,
+    max_events_in_memory: int = 500_000,
+    jobs: int = 1,
+    spill_dir: str | Path | None = None,
+    max_listed: int = 1000,
+) -> TraceNormalizeStats:
+    """Sort and dedupe ``events`` into ``output`` and return the counters.
+
+    A ``.flotrace`` output is written as a trace store; any other path gets
+    a canonical ``flo_trace.json`` dataset (gzip-compressed for ``.gz``).
+    Both are streamed from the merge, so neither output buffers more than
+    ``max_events_in_memory`` events.
+    """
+    stats = TraceNormalizeStats()
+    ordered = iter_sorted_events(
+        events,
+        max_events_in_memory=max_events_in_memory,
+        jobs=jobs,
+        spill_dir=spill_dir,
+        stats=stats,
+        max_listed=max_listed,
+    )
+    target = Path(output)
+    if target.suffix == STORE_SUFFIX:
+        write_trace_store(
+            ordered,
+            target,
+            presorted=True,
+            max_rows_in_memory=max_events_in_memory,
+            spill_dir=spill_dir,
+        )
+    else:
+        write_trace_dataset(ordered, target)
+    return stats
+
+
+def write_trace_dataset(events: Iterable[TraceEvent], path: str | Path) -> Path:
+    """Atomically write ``events`` as a ``flo_trace.json`` dataset at ``path``.
+
+    Events are written in the order given, one per line, with absent
+    optional fields omitted.
+    """
+    target = Path(path)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{target.name}.", suffix=".tmp", dir=target.parent
+    )
+    os.close(fd)
+    try:
+        with _open_dataset(Path(tmp_name), compressed=target.suffix == ".gz") as fh:
+            fh.write(f'{{"schema_version": "{TRACE_SCHEMA_VERSION}", "events": [')
+            separator = "\n"
+            for event in events:
+                fh.write(separator)
+                fh.write(json.dumps(_event_document(event), ensure_ascii=False))
+                separator = ",\n"
+            fh.write("\n]}\n")
+        os.replace(tmp_name, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return target
+
+
+def _open_dataset(path: Path, *, compressed: bool) -> TextIO:
+    if compressed:
+        return gzip.open(path, "wt", encoding="utf-8")
+    return path.open("w", encoding="utf-8")
+
+
+def _event_document(event: TraceEvent) -> dict[str, Any]:
+    document: dict[str, Any] = {
+        "event_id": event.event_id,
+        "process_id": event.process_id,
+        "case_id": event.case_id,
+        "activity_key": event.activity_key,
+        "timestamp": event.timestamp,
+        "lifecycle": event.lifecycle,
+    }
+    for name in _OPTIONAL_FIELDS:
+        value = getattr(event, name)
+        if value is not None:
+            document[name] = value
+    return document
+
+
+def _record(event: TraceEvent) -> _Record:
+    return (
+        event.timestamp_us,
+        event.event_id,
+        event.process_id,
+        event.case_id,
+        event.activity_key,
+        event.timestamp,
+        event.lifecycle,
+        event.process_version,
+        event.correlation_id,
+        event.source,
+        event.attributes,
+    )
+
+
+def _sorted_records(
+    events: Iterable[TraceEvent],
+    root: Path,
+    run_size: int,
+    fan_in: int,
+    jobs: int,
+    stats: TraceNormalizeStats,
+) -> Iterator[_Record]:
+    """Consume ``events`` into sorted runs and return their merged records.
+
+    At most ``fan_in`` runs are merged at once; more runs are first merged
+    in groups into longer run files.
+    """
+    buffer: list[_Record] = []
+    with _RunSpiller(root, jobs) as spiller:
+        for event in events:
+            buffer.append(_record(event))
+            if len(buffer) >= run_size:
+                stats.events += len(buffer)
+                spiller.spill(buffer)
+                buffer = []
+        stats.events += len(buffer)
+        if not spiller.paths:
+            buffer.sort(key=_SORT_KEY)
+            return iter(buffer)
+        if buffer:
+            spiller.spill(buffer)
+    stats.runs = len(spiller.paths)
+    paths = spiller.paths
+    block_size = min(_RUN_CHUNK, run_size)
+    while len(paths) > fan_in:
+        groups = [
+            paths[start : start + fan_in] for start in range(0, len(paths), fan_in)
+        ]
+        paths = [_merge_runs(group, block_size) for group in groups]
+    return heapq.merge(*map(_read_run, paths), key=_SORT_KEY)
+
+
+def _unique_records(
+    records: Iterator[_Record],
+    finder: DuplicateIdFinder,
+    stats: TraceNormalizeStats,
+) -> Iterator[_Record]:
+    """Drop exact copies and feed every kept event ID to ``finder``.
+
+    Exact copies share their timestamp and ID, so they are adjacent in the
+    merged order; only that small group is compared.
+    """
+    group: list[_Record] = []
+    for record in records:
+        if group and record[0] == group[0][0] and record[1] == group[0][1]:
+            if record in group:
+                stats.dropped_copies += 1
+                continue
+            group.append(record)
+        else:
+            group = [record]
+        finder.add(record[1].encode("utf-8"))
+        stats.written += 1
+        yield record
+
+
+class _RunSpiller:
+    """Sort record buffers and write them to run files, optionally in parallel.
+
+    At most ``jobs`` runs are in flight, so buffered events stay within the
+    caller's memory budget.
+    """
+
+    def __init__(self, root: Path, jobs: int) -> None:
+        self.paths: list[Path] = []
+        self._root = root
+        self._jobs = jobs
+        self._executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+        self._pending: deque[Future[None]] = deque()
+
+    def __enter__(self) -> _RunSpiller:
+        return self
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        if self._executor is None:
+            return
+        try:
+            if exc_type is None:
+                for future in self._pending:
+                    future.result()
+        finally:
+            self._executor.shutdown(cancel_futures=True)
+
+    def spill(self, records: list[_Record]) -> None:
+        path = self._root / f"run-{len(self.paths):06d}.marshal"
+        self.paths.append(path)
+        if self._executor is None:
+            _write_run(records, path)
+            return
+        while len(self._pending) >= self._jobs:
+            self._pending.popleft().result()
+        self._pending.append(self._executor.submit(_write_run, records, path))
+
+
+def _write_run(records: list[_Record], path: Path) -> None:
+    records.sort(key=_SORT_KEY)
+    _write_blocks(records, path, _RUN_CHUNK)
+
+
+def _merge_runs(paths: list[Path], block_size: int) -> Path:
+    """Merge the run files ``paths`` into the first one's place and return it."""
+    if len(paths) == 1:
+        return paths[0]
+    target = paths[0].with_suffix(".merged")
+    merged = heapq.merge(*map(_read_run, paths), key=_SORT_KEY)
+    _write_blocks(merged, target, block_size)
+    for path in paths:
+        path.unlink()
+    return target.replace(paths[0])
+
+
+def _write_blocks(records: Iterable[_Record], path: Path, block_size: int) -> None:
+    with path.open("wb") as fh:
+        for records_block in batched(records, block_size):
+            block = marshal.dumps(records_block)
+            fh.write(len(block).to_bytes(8, "little"))
+            fh.write(block)
+
+
+def _read_run(path: Path) -> Iterator[_Record]:
+    # Whole blocks are read and decoded at once: marshal.load on a file
+    # object reads in small pieces and is several times slower.
+    with path.open("rb") as fh:
+        while header := fh.read(8):
+            yield from marshal.loads(fh.read(int.from_bytes(header, "little")))
+
+
+__all__ = [
+    "STORE_SUFFIX",
+    "TraceNormalizeStats",
+    "iter_sorted_events",
+    "normalize_trace",
+    "write_trace_dataset",
+]
@@ -0,0 +1,566 @@
+"""Columnar, memory-mapped on-disk store for imported trace events.
+
+Parsing JSON is the dominant cost of reading a trace, so analyses that run
+repeatedly over one dataset read this store instead. A store file holds one
+fixed-width column per field, in the spec's canonical event order (ascending
+UTC timestamp, then ``event_id``):
+
+- ``timestamp_us``: int64 UTC microseconds since the epoch
+- ``lifecycle``: uint8 index into ``LIFECYCLES``
+- ``process_id``, ``process_version``, ``case_id``, ``activity_key``,
+  ``source``: uint32 codes into sorted string dictionaries (``MISSING_CODE``
+  marks an absent optional value)
+- ``event_id``: a string table in row order
+
+Reopening maps the file read-only and exposes every column as a
+``memoryview`` over the mapping, so no column is copied or decoded until it
+is read. ``correlation_id`` and ``attributes`` are not stored: they are not
+used by alignment or aggregate analysis, and ``attributes`` may hold
+sensitive source data.
+
+``TraceStoreBuilder`` sorts in memory. Input that is already in canonical
+order (the output of ``iter_sorted_events``) can be written with
+``write_trace_store(..., presorted=True)`` instead, which streams the
+columns to spill files and keeps only a bounded chunk of rows plus the
+distinct dictionary values in memory.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import json
+import mmap
+import os
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+from typing import Any, BinaryIO
+
+from .importer import (
+    LIFECYCLES,
+    TraceEvent,
+    TraceFormatError,
+    TraceImportStats,
+    iter_trace_events,
+)
+
+STORE_MAGIC = b"FLOTRACE"
+STORE_FORMAT = 1
+MISSING_CODE = 0xFFFFFFFF
+LIFECYCLE_CODES: dict[str, int] = {name: code for code, name in enumerate(LIFECYCLES)}
+DICTIONARY_COLUMNS: tuple[str, ...] = (
+    "process_id",
+    "process_version",
+    "case_id",
+    "activity_key",
+    "source",
+)
+
+_CODE_TYPE = "I" if array("I").itemsize == 4 else "L"
+_OFFSET_TYPE = "q"
+_SPILL_ROWS = 65_536
+_ALIGN = 8
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class StringTable(Sequence[str]):
+    """Read-only strings stored as an offsets column over a UTF-8 blob."""
+
+    __slots__ = ("_offsets", "_data", "_sorted")
+
+    def __init__(self, offsets: Any, data: Any, *, is_sorted: bool) -> None:
+        """Wrap ``offsets`` (``len + 1`` int64 entries) and the UTF-8 ``data``."""
+        self._offsets = offsets
+        self._data = data
+        self._sorted = is_sorted
+
+    def __len__(self) -> int:
+        """Return the number of strings."""
+        return max(len(self._offsets) - 1, 0)
+
+    def __getitem__(self, index: Any) -> Any:
+        """Decode the string (or strings) at ``index``."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("string table index out of range")
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return str(self._data[start:end], "utf-8")
+
+    def __contains__(self, value: object) -> bool:
+        """Return whether ``value`` is in the table."""
+        return self.code_of(value) != MISSING_CODE if isinstance(value, str) else False
+
+    def iter_bytes(self, start: int = 0, stop: int | None = None) -> Iterator[bytes]:
+        """Yield the undecoded UTF-8 bytes of entries ``start`` to ``stop``."""
+        offsets, data = self._offsets, self._data
+        stop = len(self) if stop is None else min(stop, len(self))
+        begin = offsets[start] if start < stop else 0
+        for index in range(start + 1, stop + 1):
+            end = offsets[index]
+            yield bytes(data[begin:end])
+            begin = end
+
+    def code_of(self, value: str) -> int:
+        """Return the index of ``value`` or ``MISSING_CODE`` when absent.
+
+        Dictionary tables are sorted, so this is a binary search.
+        """
+        if self._sorted:
+            code = bisect_left(self, value)
+            return code if code < len(self) and self[code] == value else MISSING_CODE
+        for code, item in enumerate(self):
+            if item == value:
+                return code
+        return MISSING_CODE
+
+
+@dataclass(frozen=True, slots=True)
+class DictionaryColumn:
+    """A dictionary-encoded column: per-row codes plus the sorted values."""
+
+    codes: Any
+    values: StringTable
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.codes)
+
+    def value(self, row: int) -> str | None:
+        """Return the decoded value at ``row`` (None when it was absent)."""
+        code = self.codes[row]
+        return None if code == MISSING_CODE else self.values[code]
+
+
+class TraceStore:
+    """A memory-mapped, read-only view of a trace store file.
+
+    Use as a context manager (or call ``close``) to unmap the file; columns
+    obtained from the store are invalid afterwards.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Map ``path`` and expose its columns without copying them."""
+        self.path = Path(path)
+        with self.path.open("rb") as fh:
+            header = _read_header(fh, self.path)
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = []
+        base = memoryview(self._map)
+        self._views.append(base)
+        sections = header["sections"]
+
+        def column(name: str) -> memoryview:
+            offset, size, typecode = sections[name]
+            view = base[offset : offset + size].cast(typecode)
+            self._views.append(view)
+            return view
+
+        def table(name: str, *, is_sorted: bool) -> StringTable:
+            offsets = column(f"{name}.offsets")
+            offset, size, _ = sections[f"{name}.data"]
+            data = base[offset : offset + size]
+            self._views.append(data)
+            return StringTable(offsets, data, is_sorted=is_sorted)
+
+        self.rows: int = header["rows"]
+        self.timestamps_us = column("timestamp_us")
+        self.lifecycles = column("lifecycle")
+        self.event_ids = table("event_id", is_sorted=False)
+        self.columns: dict[str, DictionaryColumn] = {
+            name: DictionaryColumn(column(name), table(name, is_sorted=True))
+            for name in DICTIONARY_COLUMNS
+        }
+
+    def __len__(self) -> int:
+        """Return the number of events."""
+        return self.rows
+
+    def __enter__(self) -> TraceStore:
+        """Return the open store."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Unmap the store."""
+        self.close()
+
+    def close(self) -> None:
+        """Release every column view and unmap the file."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        if not self._map.closed:
+            self._map.close()
+
+    def event(self, row: int) -> TraceEvent:
+        """Return the event at ``row`` with its timestamp rendered in UTC."""
+        columns = self.columns
+        timestamp_us = self.timestamps_us[row]
+        return TraceEvent(
+            self.event_ids[row],
+            columns["process_id"].value(row) or "",
+            columns["case_id"].value(row) or "",
+            columns["activity_key"].value(row) or "",
+            format_timestamp_us(timestamp_us),
+            timestamp_us,
+            LIFECYCLES[self.lifecycles[row]],
+            process_version=columns["process_version"].value(row),
+            source=columns["source"].value(row),
+        )
+
+    def iter_events(self) -> Iterator[TraceEvent]:
+        """Yield every event in canonical order."""
+        for row in range(self.rows):
+            yield self.event(row)
+
+
+def format_timestamp_us(timestamp_us: int) -> str:
+    """Return ``timestamp_us`` as an RFC 3339 UTC date-time ending in ``Z``."""
+    instant = _EPOCH + timedelta(microseconds=timestamp_us)
+    return instant.isoformat().replace("+00:00", "Z")
+
+
+class TraceStoreBuilder:
+    """Accumulate events into columns, then write them as a sorted store."""
+
+    def __init__(self) -> None:
+        """Start with empty columns."""
+        self._timestamps = array("q")
+        self._lifecycles = array("B")
+        self._event_ids: list[str] = []
+        self._codes = {name: array(_CODE_TYPE) for name in DICTIONARY_COLUMNS}
+        self._dictionaries: dict[str, dict[str, int]] = {
+            name: {} for name in DICTIONARY_COLUMNS
+        }
+
+    def __len__(self) -> int:
+        """Return the number of events added so far."""
+        return len(self._timestamps)
+
+    def add(self, event: TraceEvent) -> None:
+        """Append one event."""
+        self._timestamps.append(event.timestamp_us)
+        self._lifecycles.append(LIFECYCLE_CODES[event.lifecycle])
+        self._event_ids.append(event.event_id)
+        self._encode("process_id", event.process_id)
+        self._encode("process_version", event.process_version)
+        self._encode("case_id", event.case_id)
+        self._encode("activity_key", event.activity_key)
+        self._encode("source", event.source)
+
+    def extend(self, events: Iterable[TraceEvent]) -> None:
+        """Append every event in ``events``."""
+        for event in events:
+            self.add(event)
+
+    def _encode(self, name: str, value: str | None) -> None:
+        if value is None:
+            self._codes[name].append(MISSING_CODE)
+            return
+        dictionary = self._dictionaries[name]
+        code = dictionary.get(value)
+        if code is None:
+            code = dictionary[value] = len(dictionary)
+        self._codes[name].append(code)
+
+    def write(self, path: str | Path) -> Path:
+        """Sort into canonical order and atomically write the store to ``path``."""
+        timestamps, event_ids = self._timestamps, self._event_ids
+        order = sorted(
+            range(len(timestamps)), key=lambda i: (timestamps[i], event_ids[i])
+        )
+        sections: list[tuple[str, str, bytes]] = [
+            ("timestamp_us", "q", _permuted(timestamps, order).tobytes()),
+            ("lifecycle", "B", _permuted(self._lifecycles, order).tobytes()),
+        ]
+        sections.extend(_string_sections("event_id", [event_ids[i] for i in order]))
+        for name in DICTIONARY_COLUMNS:
+            values, remap = _sorted_dictionary(self._dictionaries[name])
+            codes = self._codes[name]
+            sorted_codes = array(
+                _CODE_TYPE,
+                (
+                    MISSING_CODE if codes[i] == MISSING_CODE else remap[codes[i]]
+                    for i in order
+                ),
+            )
+            sections.append((name, _CODE_TYPE, sorted_codes.tobytes()))
+            sections.extend(_string_sections(name, values))
+        return _write_sections(Path(path), len(timestamps), sections)
+
+
+class _PresortedStoreBuilder(TraceStoreBuilder):
+    """Stream events that arrive in canonical order to per-column spill files.
+
+    The inherited column arrays only buffer up to ``max_rows_in_memory``
+    rows between flushes. Dictionary codes are spilled in first-seen order
+    and remapped to sorted-dictionary order, one chunk at a time, by
+    ``write``.
+    """
+
+    def __init__(self, root: Path, max_rows_in_memory: int = _SPILL_ROWS) -> None:
+        """Spill into the existing directory ``root``."""
+        super().__init__()
+        self._root = root
+        self._max_rows = max(1, max_rows_in_memory)
+        self._rows = 0
+        self._blob_size = 0
+        self._last: tuple[int, str] | None = None
+        names = ("timestamp_us", "lifecycle", "event_id.offsets", "event_id.data")
+        self._files: dict[str, BinaryIO] = {
+            name: (root / name).open("wb") for name in names + DICTIONARY_COLUMNS
+        }
+        array(_OFFSET_TYPE, [0]).tofile(self._files["event_id.offsets"])
+
+    def __len__(self) -> int:
+        """Return the number of events added so far."""
+        return self._rows + len(self._timestamps)
+
+    def add(self, event: TraceEvent) -> None:
+        """Append one event; it must not sort before the previous one."""
+        key = (event.timestamp_us, event.event_id)
+        if self._last is not None and key < self._last:
+            raise TraceFormatError(
+                f"event {event.event_id!r} is out of canonical order; "
+                "presorted input must be sorted by timestamp, then event_id"
+            )
+        self._last = key
+        super().add(event)
+        if len(self._timestamps) >= self._max_rows:
+            self._flush()
+
+    def close(self) -> None:
+        """Close the spill files; the directory is left to the caller."""
+        for fh in self._files.values():
+            fh.close()
+
+    def write(self, path: str | Path) -> Path:
+        """Atomically write the spilled columns as a store at ``path``."""
+        self._flush()
+        self.close()
+        root = self._root
+        sections: list[tuple[str, str, bytes | Path]] = [
+            ("timestamp_us", "q", root / "timestamp_us"),
+            ("lifecycle", "B", root / "lifecycle"),
+            ("event_id.offsets", _OFFSET_TYPE, root / "event_id.offsets"),
+            ("event_id.data", "B", root / "event_id.data"),
+        ]
+        for name in DICTIONARY_COLUMNS:
+            values, remap = _sorted_dictionary(self._dictionaries[name])
+            sections.append((name, _CODE_TYPE, self._remapped(name, remap)))
+            sections.extend(_string_sections(name, values))
+        return _write_sections(Path(path), self._rows, sections)
+
+    def _flush(self) -> None:
+        files = self._files
+        self._timestamps.tofile(files["timestamp_us"])
+        self._lifecycles.tofile(files["lifecycle"])
+        offsets = array(_OFFSET_TYPE)
+        blob = bytearray()
+        for event_id in self._event_ids:
+            blob += event_id.encode("utf-8")
+            offsets.append(self._blob_size + len(blob))
+        offsets.tofile(files["event_id.offsets"])
+        files["event_id.data"].write(blob)
+        self._blob_size += len(blob)
+        for name in DICTIONARY_COLUMNS:
+            self._codes[name].tofile(files[name])
+            del self._codes[name][:]
+        self._rows += len(self._timestamps)
+        del self._timestamps[:]
+        del self._lifecycles[:]
+        self._event_ids.clear()
+
+    def _remapped(self, name: str, remap: list[int]) -> Path:
+        target = self._root / f"{name}.sorted"
+        chunk_bytes = self._max_rows * array(_CODE_TYPE).itemsize
+        with (self._root / name).open("rb") as src, target.open("wb") as dst:
+            while chunk := src.read(chunk_bytes):
+                codes = array(_CODE_TYPE)
+                codes.frombytes(chunk)
+                array(
+                    _CODE_TYPE,
+                    (
+                        MISSING_CODE if code == MISSING_CODE else remap[code]
+                        for code in codes
+                    ),
+                ).tofile(dst)
+        return target
+
+
+def write_trace_store(
+    events: Iterable[TraceEvent],
+    path: str | Path,
+    *,
+    presorted: bool = False,
+    max_rows_in_memory: int = _SPILL_ROWS,
+    spill_dir: str | Path | None = None,
+) -> Path:
+    """Write ``events`` to a canonical-order store at ``path`` and return it.
+
+    With ``presorted=True`` the events must already be in canonical order
+    (``TraceFormatError`` otherwise); they are streamed through spill files
+    under ``spill_dir`` with at most ``max_rows_in_memory`` rows buffered.
+    """
+    if not presorted:
+        builder = TraceStoreBuilder()
+        builder.extend(events)
+        return builder.write(path)
+    with tempfile.TemporaryDirectory(prefix="flo-trace-store-", dir=spill_dir) as tmp:
+        presorted_builder = _PresortedStoreBuilder(Path(tmp), max_rows_in_memory)
+        try:
+            presorted_builder.extend(events)
+            return presorted_builder.write(path)
+        finally:
+            presorted_builder.close()
+
+
+def is_trace_store(path: str | Path) -> bool:
+    """Return whether ``path`` starts with the trace store magic bytes."""
+    with Path(path).open("rb") as fh:
+        return fh.read(len(STORE_MAGIC)) == STORE_MAGIC
+
+
+@contextmanager
+def open_trace_store(
+    path: str | Path, *, stats: TraceImportStats | None = None
+) -> Iterator[TraceStore]:
+    """Open ``path`` as a store, importing a JSON dataset into a temp store.
+
+    Datasets are imported leniently; ``stats`` receives the import counters
+    and skipped-event issues.
+    """
+    if is_trace_store(path):
+        with TraceStore(path) as store:
+            yield store
+        return
+    with tempfile.TemporaryDirectory(prefix="flo-trace-") as tmp:
+        events = iter_trace_events(path, strict=False, stats=stats)
+        target = write_trace_store(events, Path(tmp) / "trace.flotrace")
+        with TraceStore(target) as store:
+            yield store
+
+
+def _permuted(values: array, order: list[int]) -> array:
+    return array(values.typecode, (values[i] for i in order))
+
+
+def _sorted_dictionary(dictionary: dict[str, int]) -> tuple[list[str], list[int]]:
+    values = sorted(dictionary)
+    remap = [0] * len(values)
+    for code, value in enumerate(values):
+        remap[dictionary[value]] = code
+    return values, remap
+
+
+def _string_sections(name: str, values: list[str]) -> list[tuple[str, str, bytes]]:
+    offsets = array(_OFFSET_TYPE, [0])
+    blob = bytearray()
+    for value in values:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return [
+        (f"{name}.offsets", _OFFSET_TYPE, offsets.tobytes()),
+        (f"{name}.data", "B", bytes(blob)),
+    ]
+
+
+def _padded(size: int) -> int:
+    return -(-size // _ALIGN) * _ALIGN
+
+
+def _write_sections(
+    target: Path, rows: int, sections: list[tuple[str, str, bytes | Path]]
+) -> Path:
+    # A payload is either the section bytes or a spill file holding them.
+    # Section offsets depend on the header length and the header lists the
+    # offsets, so lay out again until the header length stops changing.
+    layout: dict[str, list[Any]] = {}
+    header_size = -1
+    header_bytes = b""
+    while len(header_bytes) != header_size:
+        header_size = len(header_bytes)
+        offset = _padded(len(STORE_MAGIC) + 8 + header_size)
+        for name, typecode, payload in sections:
+            size = payload.stat().st_size if isinstance(payload, Path) else len(payload)
+            layout[name] = [offset, size, typecode]
+            offset = _padded(offset + size)
+        header_bytes = _encode_header(rows, layout)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{target.name}.", suffix=".tmp", dir=target.parent
+    )
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(STORE_MAGIC)
+            fh.write(len(header_bytes).to_bytes(8, "little"))
+            fh.write(header_bytes)
+            for name, _typecode, payload in sections:
+                fh.write(b"\0" * (layout[name][0] - fh.tell()))
+                if isinstance(payload, Path):
+                    with payload.open("rb") as src:
+                        shutil.copyfileobj(src, fh)
+                else:
+                    fh.write(payload)
+        os.replace(tmp_name, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return target
+
+
+def _encode_header(rows: int, layout: dict[str, list[Any]]) -> bytes:
+    header = {
+        "format": STORE_FORMAT,
+        "byteorder": sys.byteorder,
+        "rows": rows,
+        "order": ["timestamp_us", "event_id"],
+        "sections": layout,
+    }
+    text = json.dumps(header, sort_keys=True, separators=(",", ":"))
+    return text.encode("utf-8").ljust(_padded(len(text)), b" ")
+
+
+def _read_header(fh: BinaryIO, path: Path) -> dict[str, Any]:
+    if fh.read(len(STORE_MAGIC)) != STORE_MAGIC:
+        raise TraceFormatError(f"{path} is not a FLO trace store")
+    size = int.from_bytes(fh.read(8), "little")
+    try:
+        header = json.loads(fh.read(size))
+    except ValueError as exc:
+        raise TraceFormatError(f"{path} has a corrupt store header: {exc}") from None
+    if header.get("format") != STORE_FORMAT:
+        raise TraceFormatError(
+            f"{path} uses trace store format {header.get('format')!r} "
+            f"(expected {STORE_FORMAT})"
+        )
+    if header.get("byteorder") != sys.byteorder:
+        raise TraceFormatError(
+            f"{path} was written on a {header.get('byteorder')}-endian host"
+        )
+    return header
+
+
+__all__ = [
+    "DICTIONARY_COLUMNS",
+    "DictionaryColumn",
+    "LIFECYCLE_CODES",
+    "MISSING_CODE",
+    "StringTable",
+    "TraceStore",
+    "TraceStoreBuilder",
+    "format_timestamp_us",
+    "is_trace_store",
+    "open_trace_store",
+    "write_trace_store",
+]
@@ -2,14 +2,41 @@
 
 Parses YAML content and returns an `AdapterModel` instance when
 Pydantic is available, otherwise returns a simple fallback model.
+All FLO YAML goes through `load_yaml`, which uses libyaml's
+`CSafeLoader` when PyYAML was built with it and the pure-Python
+`SafeLoader` otherwise; both construct identical safe objects.
 """
 
 from __future__ import annotations
 
+from typing import Any
+
 import yaml
 
 from .models import AdapterModel
 
+_SAFE_LOADER: type[yaml.SafeLoader] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_yaml(content: str) -> Any:
+    """Safely parse YAML text, preferring the libyaml-accelerated loader."""
+    return yaml.load(content, Loader=_SAFE_LOADER)
+
+
+def is_adapter_envelope(data: object) -> bool:
+    """Return True for the legacy `name`/`content` adapter mapping shape."""
+    return (
+        isinstance(data, dict)
+        and isinstance(data.get("name"), str)
+        and isinstance(data.get("content"), str)
+    )
+
+
+def adapter_model_from_mapping(data: dict[str, Any]) -> AdapterModel:
+    """Validate an already-parsed `name`/`content` mapping as an `AdapterModel`."""
+    # Both the Pydantic model and our fallback implement `model_validate`.
+    return AdapterModel.model_validate(data)
+
 
 def load_adapter_from_yaml(content: str) -> AdapterModel:
     """Parse YAML content and return an `AdapterModel`.
@@ -19,11 +46,10 @@ def load_adapter_from_yaml(content: str) -> AdapterModel:
     model-compatible `model_validate` API (works with Pydantic and
     our fallback model).
     """
-    data = yaml.safe_load(content)
+    data = load_yaml(content)
     if not isinstance(data, dict):
         raise ValueError(
             "YAML content must be a mapping with keys 'name' and 'content'"
         )
 
-    # Both the Pydantic model and our fallback implement `model_validate`.
-    return AdapterModel.model_validate(data)
+    return adapter_model_from_mapping(data)
@@ -1,6 +1,6 @@
 """Analysis package nested under the compiler layer."""
 
-from .scc import scc_condense
+from .scc import SCCCondensation, condense_edges, condense_graph, scc_condense
 from .movement import (
     infer_material_movements,
     aggregate_material_movements,
@@ -10,8 +10,25 @@ from .movement import (
     extract_location_spatial_index,
 )
 from .process_metadata import extract_process_metadata
+from .trace_alignment import (
+    ActivityIndex,
+    AlignmentReport,
+    TraceAlignment,
+    TraceAlignmentError,
+    align_trace_store,
+)
+from .transitions import (
+    TransitionCounts,
+    TransitionFrequency,
+    TransitionReport,
+    count_transitions,
+    transition_frequencies,
+)
 
 __all__ = [
+    "SCCCondensation",
+    "condense_edges",
+    "condense_graph",
     "scc_condense",
     "infer_material_movements",
     "aggregate_material_movements",
@@ -20,4 +37,14 @@ __all__ = [
     "aggregate_people_movements_by_worker",
     "extract_location_spatial_index",
     "extract_process_metadata",
+    "ActivityIndex",
+    "AlignmentReport",
+    "TraceAlignment",
+    "TraceAlignmentError",
+    "align_trace_store",
+    "TransitionCounts",
+    "TransitionFrequency",
+    "TransitionReport",
+    "count_transitions",
+    "transition_frequencies",
 ]
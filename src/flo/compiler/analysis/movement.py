@@ -5,6 +5,9 @@ from __future__ import annotations
 from math import sqrt
 from typing import Any, TypeGuard
 
+from flo.compiler.ir.index import ir_index
+from flo.compiler.ir.models import IR
+
 from .process_metadata import extract_process_metadata
 
 
@@ -303,6 +306,8 @@ def extract_location_spatial_index(process: Any) -> dict[str, dict[str, Any]]:
 
 
 def _extract_node_attrs_by_id(process: Any) -> dict[str, dict[str, Any]]:
+    if isinstance(process, IR):
+        return ir_index(process).attrs_by_id()
     nodes = _extract_nodes(process)
     out: dict[str, dict[str, Any]] = {}
     for node in nodes:
@@ -343,18 +348,12 @@ def _extract_nodes(process: Any) -> list[dict[str, Any]]:
 
 
 def _extract_edges(process: Any) -> list[dict[str, Any]]:
+    if isinstance(process, IR):
+        return ir_index(process).memo(
+            "movement.edges", lambda: _edge_records(process.edges)
+        )
     if hasattr(process, "edges"):
-        edges: list[dict[str, Any]] = []
-        for edge in getattr(process, "edges", []) or []:
-            edges.append(
-                {
-                    "source": getattr(edge, "source", None),
-                    "target": getattr(edge, "target", None),
-                    "outcome": getattr(edge, "outcome", None),
-                    "label": getattr(edge, "label", None),
-                }
-            )
-        return edges
+        return _edge_records(getattr(process, "edges", []) or [])
 
     if isinstance(process, dict):
         edges_raw = process.get("edges") or process.get("transitions")
@@ -363,6 +362,18 @@ def _extract_edges(process: Any) -> list[dict[str, Any]]:
     return []
 
 
+def _edge_records(edges: Any) -> list[dict[str, Any]]:
+    return [
+        {
+            "source": getattr(edge, "source", None),
+            "target": getattr(edge, "target", None),
+            "outcome": getattr(edge, "outcome", None),
+            "label": getattr(edge, "label", None),
+        }
+        for edge in edges
+    ]
+
+
 def _iter_resource_items(collection: Any):
     if isinstance(collection, list):
         for item in collection:
@@ -1,14 +1,195 @@
-"""SCC condensation utilities moved under compiler.analysis."""
+"""SCC condensation utilities moved under compiler.analysis.
+
+``condense_graph`` computes strongly connected components of ``IR.edges`` with
+an iterative Tarjan pass over an integer-indexed adjacency list, so graph
+depth is bounded by memory rather than the interpreter recursion limit. The
+resulting ``SCCCondensation`` (component per node plus the condensation DAG)
+is meant to be shared by analyses that need cycle structure.
+
+``scc_condense`` is the render postprocess. It keeps its historical contract
+of condensing only the successor lists declared in ``node.attrs["edges"]``;
+canonical ``IR.edges`` rework loops are intentionally left for the renderers.
+"""
 
 from __future__ import annotations
 
-from typing import List, Dict, Any, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Sequence
+
+from flo.compiler.ir.index import ir_index
 from flo.compiler.ir.models import IR, Node
 
 
-def _build_adjacency(ir: IR) -> Tuple[Dict[str, Node], Dict[str, List[str]], bool]:
-    id_to_node: Dict[str, Node] = {n.id: n for n in ir.nodes}
-    adj: Dict[str, List[str]] = {}
+@dataclass(frozen=True)
+class SCCCondensation:
+    """Strongly connected components of a graph and its condensation DAG.
+
+    Components are numbered in the order Tarjan's algorithm completes them,
+    which is a reverse topological order of the condensation: every DAG edge
+    ``(a, b)`` has ``a > b``.
+    """
+
+    node_ids: tuple[str, ...]
+    component_of: tuple[int, ...]
+    components: tuple[tuple[int, ...], ...]
+    dag_edges: tuple[tuple[int, int], ...]
+    self_loops: frozenset[int] = frozenset()
+    _component_by_id: dict[str, int] = field(
+        init=False, repr=False, compare=False, hash=False
+    )
+
+    def __post_init__(self) -> None:
+        """Index components by node id; a repeated id keeps its first node."""
+        by_id: dict[str, int] = {}
+        for node_id, component in zip(self.node_ids, self.component_of):
+            by_id.setdefault(node_id, component)
+        object.__setattr__(self, "_component_by_id", by_id)
+
+    def component_for(self, node_id: str) -> int:
+        """Return the component index containing ``node_id``."""
+        try:
+            return self._component_by_id[node_id]
+        except KeyError:
+            raise ValueError(f"{node_id!r} is not a node of the graph") from None
+
+    def component_map(self) -> dict[str, int]:
+        """Return ``{node_id: component_index}`` for every node."""
+        return dict(zip(self.node_ids, self.component_of))
+
+    def members(self, component: int) -> list[str]:
+        """Return the node ids of ``component``."""
+        return [self.node_ids[index] for index in self.components[component]]
+
+    def is_cyclic(self, component: int) -> bool:
+        """Return True when ``component`` contains a cycle (or a self-loop)."""
+        return len(self.components[component]) > 1 or component in self.self_loops
+
+    def cyclic_components(self) -> list[int]:
+        """Return the indexes of components that contain a cycle."""
+        return [
+            component
+            for component in range(len(self.components))
+            if self.is_cyclic(component)
+        ]
+
+    def topological_order(self) -> list[int]:
+        """Return component indexes so that every DAG edge points forward."""
+        return list(range(len(self.components) - 1, -1, -1))
+
+
+def condense_graph(ir: IR) -> SCCCondensation:
+    """Compute SCCs and the condensation DAG of ``ir`` from ``IR.edges``.
+
+    Edges whose endpoints are not nodes of ``ir`` are ignored. The adjacency
+    comes from the shared ``IRIndex`` and the result is memoized on it.
+    """
+    index = ir_index(ir)
+    return index.memo(
+        "scc.condensation",
+        lambda: _condense_adjacency(index.node_ids, index.successor_lists()),
+    )
+
+
+def condense_edges(
+    node_ids: Sequence[str], edges: Iterable[tuple[str, str]]
+) -> SCCCondensation:
+    """Compute SCCs and the condensation DAG for an explicit edge list."""
+    index_of = {node_id: index for index, node_id in enumerate(node_ids)}
+    adjacency: list[list[int]] = [[] for _ in node_ids]
+    for source, target in edges:
+        source_index = index_of.get(source)
+        target_index = index_of.get(target)
+        if source_index is None or target_index is None:
+            continue
+        adjacency[source_index].append(target_index)
+    return _condense_adjacency(node_ids, adjacency)
+
+
+def _condense_adjacency(
+    node_ids: Sequence[str], adjacency: Sequence[Sequence[int]]
+) -> SCCCondensation:
+    components = tarjan_components(adjacency)
+    component_of = [0] * len(node_ids)
+    for component, members in enumerate(components):
+        for member in members:
+            component_of[member] = component
+    dag_edges: dict[tuple[int, int], None] = {}
+    self_loops: set[int] = set()
+    for source_index, targets in enumerate(adjacency):
+        source_component = component_of[source_index]
+        for target_index in targets:
+            target_component = component_of[target_index]
+            if source_component != target_component:
+                dag_edges[(source_component, target_component)] = None
+            elif source_index == target_index:
+                self_loops.add(source_component)
+    return SCCCondensation(
+        node_ids=tuple(node_ids),
+        component_of=tuple(component_of),
+        components=tuple(tuple(members) for members in components),
+        dag_edges=tuple(dag_edges),
+        self_loops=frozenset(self_loops),
+    )
+
+
+def tarjan_components(adjacency: Sequence[Sequence[int]]) -> list[list[int]]:
+    """Return SCCs of an integer-indexed graph using an explicit DFS stack.
+
+    Produces the same components, in the same order, as the textbook
+    recursive Tarjan algorithm visiting roots and successors in index order.
+    """
+    count = len(adjacency)
+    index = [-1] * count
+    lowlink = [0] * count
+    on_stack = [False] * count
+    stack: list[int] = []
+    components: list[list[int]] = []
+    counter = 0
+
+    for root in range(count):
+        if index[root] != -1:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(adjacency[root]))]
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if index[successor] == -1:
+                    index[successor] = lowlink[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack[successor] = True
+                    work.append((successor, iter(adjacency[successor])))
+                    break
+                if on_stack[successor] and index[successor] < lowlink[node]:
+                    lowlink[node] = index[successor]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+                if lowlink[node] == index[node]:
+                    components.append(_pop_component(stack, on_stack, node))
+    return components
+
+
+def _pop_component(stack: list[int], on_stack: list[bool], root: int) -> list[int]:
+    component: list[int] = []
+    while True:
+        member = stack.pop()
+        on_stack[member] = False
+        component.append(member)
+        if member == root:
+            return component
+
+
+def _build_adjacency(ir: IR) -> tuple[dict[str, Node], dict[str, list[str]], bool]:
+    id_to_node: dict[str, Node] = {n.id: n for n in ir.nodes}
+    adj: dict[str, list[str]] = {}
     has_edges = False
     for n in ir.nodes:
         if n.attrs and isinstance(n.attrs, dict) and "edges" in n.attrs:
@@ -23,50 +204,29 @@ def _build_adjacency(ir: IR) -> Tuple[Dict[str, Node], Dict[str, List[str]], boo
     return id_to_node, adj, has_edges
 
 
-def _tarjan_scc(adj: Dict[str, List[str]]) -> List[List[str]]:
-    index = 0
-    index_map: Dict[str, int] = {}
-    lowlink: Dict[str, int] = {}
-    stack: List[str] = []
-    onstack: Dict[str, bool] = {}
-    sccs: List[List[str]] = []
-
-    def strongconnect(v: str) -> None:
-        nonlocal index
-        index_map[v] = index
-        lowlink[v] = index
-        index += 1
-        stack.append(v)
-        onstack[v] = True
-
-        for w in adj.get(v, []):
-            if w not in index_map:
-                strongconnect(w)
-                lowlink[v] = min(lowlink[v], lowlink[w])
-            elif onstack.get(w):
-                lowlink[v] = min(lowlink[v], index_map[w])
-
-        if lowlink[v] == index_map[v]:
-            comp: List[str] = []
-            while True:
-                w = stack.pop()
-                onstack[w] = False
-                comp.append(w)
-                if w == v:
-                    break
-            sccs.append(comp)
-
-    for nid in adj:
-        if nid not in index_map:
-            strongconnect(nid)
-    return sccs
+def _tarjan_scc(adj: dict[str, list[str]]) -> list[list[str]]:
+    # Targets that are not declared nodes still take part, as they always have.
+    ids = list(adj)
+    index_of = {node_id: index for index, node_id in enumerate(ids)}
+    for targets in list(adj.values()):
+        for target in targets:
+            if target not in index_of:
+                index_of[target] = len(ids)
+                ids.append(target)
+    adjacency = [
+        [index_of[target] for target in adj.get(node_id, [])] for node_id in ids
+    ]
+    return [
+        [ids[member] for member in component]
+        for component in tarjan_components(adjacency)
+    ]
 
 
 def _build_condensed_nodes(
-    sccs: List[List[str]], id_to_node: Dict[str, Node]
-) -> Tuple[List[Node], Dict[str, str]]:
-    new_nodes: List[Node] = []
-    scc_map: Dict[str, str] = {}
+    sccs: list[list[str]], id_to_node: dict[str, Node]
+) -> tuple[list[Node], dict[str, str]]:
+    new_nodes: list[Node] = []
+    scc_map: dict[str, str] = {}
     for i, comp in enumerate(sccs):
         if len(comp) == 1:
             nid = comp[0]
@@ -83,11 +243,11 @@ def _build_condensed_nodes(
 
 
 def _rebuild_edges(
-    new_nodes: List[Node], adj: Dict[str, List[str]], scc_map: Dict[str, str]
+    new_nodes: list[Node], adj: dict[str, list[str]], scc_map: dict[str, str]
 ) -> None:
     for node in new_nodes:
         if node.attrs and node.attrs.get("members"):
-            outs: List[str] = []
+            outs: list[str] = []
             for member in node.attrs["members"]:
                 for tgt in adj.get(member, []):
                     tgt_rep = scc_map.get(tgt, tgt)
@@ -0,0 +1,296 @@
+"""Deterministic alignment of trace events to canonical IR nodes.
+
+Alignment follows ``docs/specs/telemetry_events.md``: an ``activity_key``
+equal to a node ID aligns to that node, any other key needs an explicit
+mapping, and nothing is inferred from names or labels. Events are read from
+a ``TraceStore``, so keys are resolved once per distinct dictionary value
+and each batch of rows is translated by indexing a code-to-node table
+rather than by looking up strings per event.
+
+The result keeps one int32 per event (a node index, or ``UNRESOLVED``,
+``UNVERSIONED`` or ``EXCLUDED``) for downstream analysis, plus the report
+the spec requires.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+import json
+from pathlib import Path
+from typing import Any
+
+from flo.adapters.trace import (
+    MISSING_CODE,
+    DuplicateIdFinder,
+    TraceImportStats,
+    TraceStore,
+)
+from flo.compiler.ir.models import IR
+from flo.errors import ValidationError
+from flo.schema.render_metadata import PROCESS_METADATA_PROCESS_ID_KEY
+
+UNRESOLVED = -1
+EXCLUDED = -2
+UNVERSIONED = -3
+
+
+class TraceAlignmentError(ValidationError):
+    """Raised by strict alignment when any selected event is unresolved."""
+
+    def __init__(self, report: AlignmentReport) -> None:
+        """Summarize the unresolved counts from ``report``."""
+        super().__init__(
+            f"trace alignment left {report.unresolved_events} of "
+            f"{report.selected_events} selected events unresolved",
+            error_stage="trace_align",
+        )
+        self.report = report
+
+
+@dataclass(frozen=True)
+class ActivityIndex:
+    """Hash map from activity key to node index for one IR.
+
+    Keys that name a node align to it; ``mapping`` adds explicit aliases.
+    A mapped key that is also the ID of a different node is ambiguous and
+    never resolves.
+    """
+
+    node_ids: tuple[str, ...]
+    by_key: dict[str, int]
+    ambiguous: frozenset[str] = frozenset()
+
+    @classmethod
+    def build(cls, ir: IR, mapping: Mapping[str, str] | None = None) -> ActivityIndex:
+        """Index ``ir`` node IDs and validate ``mapping`` against them."""
+        node_ids = tuple(node.id for node in ir.nodes)
+        positions = {node_id: index for index, node_id in enumerate(node_ids)}
+        by_key = dict(positions)
+        ambiguous: set[str] = set()
+        for key, node_id in sorted((mapping or {}).items()):
+            target = positions.get(node_id)
+            if target is None:
+                raise ValidationError(
+                    f"trace mapping for activity key {key!r} targets unknown "
+                    f"node {node_id!r}",
+                    error_stage="trace_align",
+                )
+            if key in positions and positions[key] != target:
+                ambiguous.add(key)
+                continue
+            by_key[key] = target
+        for key in ambiguous:
+            del by_key[key]
+        return cls(node_ids, by_key, frozenset(ambiguous))
+
+
+@dataclass(frozen=True)
+class AlignmentReport:
+    """The alignment report required by the telemetry event contract."""
+
+    process_id: str
+    process_version: str | None
+    strict: bool
+    total_events: int
+    selected_events: int
+    excluded_events: int
+    resolved_events: int
+    unresolved_events: int
+    unversioned_events: int
+    unknown_activity_keys: list[str] = field(default_factory=list)
+    ambiguous_activity_keys: list[str] = field(default_factory=list)
+    duplicate_event_id_count: int = 0
+    duplicate_event_ids: list[str] = field(default_factory=list)
+    validation_failure_count: int = 0
+    validation_failures: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the report as a JSON-ready mapping."""
+        return asdict(self)
+
+    def to_json(self) -> str:
+        """Return the report as indented JSON."""
+        return json.dumps(self.to_dict(), indent=2)
+
+
+@dataclass(frozen=True)
+class TraceAlignment:
+    """Per-event node indices for a store, plus the alignment report."""
+
+    report: AlignmentReport
+    node_ids: tuple[str, ...]
+    node_indices: array = field(repr=False)
+
+
+def align_trace_store(
+    store: TraceStore,
+    ir: IR,
+    *,
+    process_version: str | None = None,
+    process_id: str | None = None,
+    mapping: Mapping[str, str] | None = None,
+    strict: bool = False,
+    import_stats: TraceImportStats | None = None,
+    batch_size: int = 1 << 16,
+    max_ids_in_memory: int = 1_000_000,
+    spill_dir: str | Path | None = None,
+    max_listed: int = 1000,
+) -> TraceAlignment:
+    """Align every event in ``store`` to ``ir`` and build the report.
+
+    Events of another process, or of another version when
+    ``process_version`` is given, are excluded. Without an explicit
+    ``process_version`` any event version is accepted, but events that carry
+    none are unresolved (``UNVERSIONED``): the model version is never
+    guessed. Strict mode raises ``TraceAlignmentError`` when any selected
+    event is unresolved. ``import_stats`` contributes the import's
+    lifecycle and timestamp validation failures to the report.
+    """
+    index = ActivityIndex.build(ir, mapping)
+    target_process = process_id or _model_process_id(ir)
+    activity = store.columns["activity_key"]
+    code_nodes = [index.by_key.get(key, UNRESOLVED) for key in activity.values]
+    select = _row_selector(store, code_nodes, target_process, process_version)
+    node_indices, counts, unknown_codes = _translate_rows(
+        store, select, max(1, batch_size)
+    )
+
+    stats = import_stats or TraceImportStats()
+    duplicate_count, duplicate_ids = _duplicate_event_ids(
+        store,
+        max_ids_in_memory=max_ids_in_memory,
+        spill_dir=spill_dir,
+        limit=max_listed,
+    )
+    unknown_keys = [activity.values[code] for code in sorted(unknown_codes)]
+    excluded = counts[EXCLUDED]
+    unresolved = counts[UNRESOLVED] + counts[UNVERSIONED]
+    report = AlignmentReport(
+        process_id=target_process,
+        process_version=process_version,
+        strict=strict,
+        total_events=len(store),
+        selected_events=len(store) - excluded,
+        excluded_events=excluded,
+        resolved_events=len(store) - excluded - unresolved,
+        unresolved_events=unresolved,
+        unversioned_events=counts[UNVERSIONED],
+        unknown_activity_keys=[
+            key for key in unknown_keys if key not in index.ambiguous
+        ],
+        ambiguous_activity_keys=[key for key in unknown_keys if key in index.ambiguous],
+        duplicate_event_id_count=duplicate_count,
+        duplicate_event_ids=duplicate_ids,
+        validation_failure_count=stats.invalid_events,
+        validation_failures=[str(issue) for issue in stats.issues[:max_listed]],
+    )
+    if strict and unresolved:
+        raise TraceAlignmentError(report)
+    return TraceAlignment(report, index.node_ids, node_indices)
+
+
+def _translate_rows(
+    store: TraceStore, select: Any, batch_size: int
+) -> tuple[array, Counter[int], set[int]]:
+    """Run ``select`` over ``store`` in batches, tallying outcomes."""
+    node_indices = array("i")
+    unknown_codes: set[int] = set()
+    counts: Counter[int] = Counter()
+    codes = store.columns["activity_key"].codes
+    for start in range(0, len(store), batch_size):
+        stop = min(start + batch_size, len(store))
+        batch = select(start, stop)
+        batch_counts = Counter(batch)
+        if UNRESOLVED in batch_counts:
+            unknown_codes.update(
+                code
+                for code, node in zip(codes[start:stop], batch)
+                if node == UNRESOLVED
+            )
+        counts.update(batch_counts)
+        node_indices.extend(batch)
+    return node_indices, counts, unknown_codes
+
+
+def _model_process_id(ir: IR) -> str:
+    metadata = ir.process_metadata if isinstance(ir.process_metadata, dict) else {}
+    value = metadata.get(PROCESS_METADATA_PROCESS_ID_KEY)
+    return value if isinstance(value, str) and value.strip() else ir.name
+
+
+def _row_selector(
+    store: TraceStore,
+    code_nodes: list[int],
+    process_id: str,
+    process_version: str | None,
+) -> Any:
+    """Return ``select(start, stop)`` mapping a row range to node indices."""
+    activity_codes = store.columns["activity_key"].codes
+    process = store.columns["process_id"]
+    version = store.columns["process_version"]
+    process_code = process.values.code_of(process_id)
+    if process_version is None:
+        accepted = None
+    else:
+        accepted = {version.values.code_of(process_version), MISSING_CODE}
+    lookup = code_nodes.__getitem__
+
+    def row_node(activity_code: int, process_code_: int, version_code: int) -> int:
+        if process_code_ != process_code:
+            return EXCLUDED
+        if accepted is None:
+            if version_code == MISSING_CODE:
+                return UNVERSIONED
+        elif version_code not in accepted:
+            return EXCLUDED
+        return code_nodes[activity_code]
+
+    single_process = len(process.values) == 1 and process_code == 0
+    if single_process and _versions_trivially_match(version, process_version):
+        # Every row is selected: translate the codes column directly.
+        return lambda start, stop: array("i", map(lookup, activity_codes[start:stop]))
+    return lambda start, stop: array(
+        "i",
+        map(
+            row_node,
+            activity_codes[start:stop],
+            process.codes[start:stop],
+            version.codes[start:stop],
+        ),
+    )
+
+
+def _versions_trivially_match(version: Any, process_version: str | None) -> bool:
+    values = version.values
+    if process_version is None:
+        return MISSING_CODE not in version.codes
+    return len(values) == 0 or (len(values) == 1 and values[0] == process_version)
+
+
+def _duplicate_event_ids(
+    store: TraceStore,
+    *,
+    max_ids_in_memory: int,
+    spill_dir: str | Path | None,
+    limit: int,
+) -> tuple[int, list[str]]:
+    with DuplicateIdFinder(
+        max_in_memory=max_ids_in_memory, spill_dir=spill_dir
+    ) as finder:
+        finder.update(store.event_ids.iter_bytes())
+        return finder.result(limit=limit)
+
+
+__all__ = [
+    "EXCLUDED",
+    "UNRESOLVED",
+    "UNVERSIONED",
+    "ActivityIndex",
+    "AlignmentReport",
+    "TraceAlignment",
+    "TraceAlignmentError",
+    "align_trace_store",
+]
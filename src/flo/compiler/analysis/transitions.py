@@ -0,0 +1,283 @@
+"""Aggregate transition frequencies over aligned trace events.
+
+The events of each case, in canonical order, form a sequence of node visits
+and each consecutive pair of visits is one observed transition. A visit
+starts at a ``start`` event, or at any other lifecycle event that does not
+close the open ``start`` of the same node: sources that emit both starts and
+completions count an activity once, and completion-only sources still get
+one visit per event. Unresolved and excluded events are skipped.
+
+Transitions are counted under the integer key ``source * node_count +
+target`` and matched against ``IR.edges`` through the edge arrays of the
+shared ``IRIndex``, so no node ID is compared while counting. With
+``jobs > 1`` the parent assigns each case to a partition by a CRC-32 of
+``case_id`` and writes the row numbers of every partition to a spill file;
+each worker process counts only the rows of its own partition and the
+partial ``TransitionCounts`` are merged.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from functools import partial
+import json
+import mmap
+from pathlib import Path
+import tempfile
+from typing import Any
+import zlib
+
+from flo.adapters.trace import LIFECYCLE_CODES, TraceStore
+from flo.compiler.ir.index import ir_index
+from flo.compiler.ir.models import IR
+
+from .trace_alignment import AlignmentReport, TraceAlignment
+
+_START = LIFECYCLE_CODES["start"]
+
+
+@dataclass
+class TransitionCounts:
+    """Mergeable partial aggregate of observed transitions.
+
+    ``pairs`` counts transitions by ``source * node_count + target``.
+    Partials must come from disjoint sets of cases.
+    """
+
+    node_count: int
+    cases: int = 0
+    visits: int = 0
+    pairs: Counter[int] = field(default_factory=Counter)
+
+    def merge(self, other: TransitionCounts) -> TransitionCounts:
+        """Add ``other`` into this aggregate and return it."""
+        if other.node_count != self.node_count:
+            raise ValueError("cannot merge transition counts of different models")
+        self.cases += other.cases
+        self.visits += other.visits
+        self.pairs.update(other.pairs)
+        return self
+
+
+@dataclass(frozen=True)
+class TransitionFrequency:
+    """How often one node-to-node transition was observed."""
+
+    source: str
+    target: str
+    count: int
+
+
+@dataclass(frozen=True)
+class TransitionReport:
+    """Transition frequencies of a trace against one model.
+
+    ``edges`` lists every distinct modeled (source, target) pair in
+    ``IR.edges`` order with its observed count; ``unobserved_edges`` is the
+    subset never observed. ``unmodeled_transitions`` are observed pairs with
+    no edge, most frequent first.
+    """
+
+    process_id: str
+    process_version: str | None
+    cases: int
+    visits: int
+    observed_transitions: int
+    modeled_transitions: int
+    edges: list[TransitionFrequency] = field(default_factory=list)
+    unobserved_edges: list[TransitionFrequency] = field(default_factory=list)
+    unmodeled_transitions: list[TransitionFrequency] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the report as a JSON-ready mapping."""
+        return asdict(self)
+
+    def to_json(self, *, indent: int | None = 2) -> str:
+        """Return the report as JSON."""
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+def transition_frequencies(
+    store: TraceStore,
+    alignment: TraceAlignment,
+    ir: IR,
+    *,
+    jobs: int = 1,
+    spill_dir: str | Path | None = None,
+) -> TransitionReport:
+    """Count the transitions of ``store`` as aligned to ``ir``."""
+    counts = count_transitions(
+        store,
+        alignment.node_indices,
+        len(alignment.node_ids),
+        jobs=jobs,
+        spill_dir=spill_dir,
+    )
+    return _build_report(counts, ir, alignment.report)
+
+
+def count_transitions(
+    store: TraceStore,
+    node_indices: Sequence[int],
+    node_count: int,
+    *,
+    jobs: int = 1,
+    spill_dir: str | Path | None = None,
+) -> TransitionCounts:
+    """Count transitions per case, given one node index per store row.
+
+    Negative node indices mark events that do not take part. With
+    ``jobs > 1`` the node indices and the row numbers of each partition are
+    written to temporary files under ``spill_dir``; a worker memory-maps the
+    node indices and reads only the rows of its partition.
+    """
+    if len(node_indices) != len(store):
+        raise ValueError(
+            f"got {len(node_indices)} node indices for {len(store)} store rows"
+        )
+    case_codes = store.columns["case_id"].codes
+    if jobs <= 1 or len(store) == 0:
+        return _count_rows(case_codes, store.lifecycles, node_indices, node_count)
+    if not (isinstance(node_indices, array) and node_indices.typecode == "i"):
+        node_indices = array("i", node_indices)
+    partition_of = [
+        zlib.crc32(case_id) % jobs
+        for case_id in store.columns["case_id"].values.iter_bytes()
+    ]
+    partitions = _partition_rows(case_codes, node_indices, partition_of, jobs)
+    with tempfile.TemporaryDirectory(prefix="flo-transitions-", dir=spill_dir) as tmp:
+        nodes_path = Path(tmp) / "nodes.i32"
+        with nodes_path.open("wb") as fh:
+            node_indices.tofile(fh)
+        rows_paths = []
+        for partition, rows in enumerate(partitions):
+            if rows:
+                rows_paths.append(Path(tmp) / f"rows-{partition:04d}.i64")
+                with rows_paths[-1].open("wb") as fh:
+                    rows.tofile(fh)
+        task = partial(_count_partition, store.path, nodes_path, node_count=node_count)
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            partials = list(executor.map(task, rows_paths))
+    total = TransitionCounts(node_count)
+    for counts in partials:
+        total.merge(counts)
+    return total
+
+
+def _partition_rows(
+    case_codes: Sequence[int],
+    node_indices: Sequence[int],
+    partition_of: Sequence[int],
+    partitions: int,
+) -> list[array[int]]:
+    """Return the participating row numbers of each partition, in row order."""
+    rows: list[array[int]] = [array("q") for _ in range(partitions)]
+    for row, (case, node) in enumerate(zip(case_codes, node_indices)):
+        if node >= 0:
+            rows[partition_of[case]].append(row)
+    return rows
+
+
+def _count_partition(
+    store_path: Path, nodes_path: Path, rows_path: Path, *, node_count: int
+) -> TransitionCounts:
+    """Count the store rows listed in ``rows_path``."""
+    with TraceStore(store_path) as store, _mapped(nodes_path, "i") as nodes:
+        with _mapped(rows_path, "q") as rows:
+            case_codes = store.columns["case_id"].codes
+            lifecycles = store.lifecycles
+            return _count_rows(
+                (case_codes[row] for row in rows),
+                (lifecycles[row] for row in rows),
+                (nodes[row] for row in rows),
+                node_count,
+            )
+
+
+@contextmanager
+def _mapped(path: Path, typecode: str) -> Iterator[memoryview]:
+    with path.open("rb") as fh:
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped).cast(typecode)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+def _count_rows(
+    case_codes: Iterable[int],
+    lifecycles: Iterable[int],
+    nodes: Iterable[int],
+    node_count: int,
+) -> TransitionCounts:
+    last_visit: dict[int, int] = {}
+    open_start: dict[int, int] = {}
+    pairs: Counter[int] = Counter()
+    visits = 0
+    for case, lifecycle, node in zip(case_codes, lifecycles, nodes):
+        if node < 0:
+            continue
+        if lifecycle == _START:
+            open_start[case] = node
+        elif open_start.pop(case, -1) == node:
+            continue
+        visits += 1
+        previous = last_visit.get(case, -1)
+        last_visit[case] = node
+        if previous >= 0:
+            pairs[previous * node_count + node] += 1
+    return TransitionCounts(node_count, len(last_visit), visits, pairs)
+
+
+def _build_report(
+    counts: TransitionCounts, ir: IR, alignment: AlignmentReport
+) -> TransitionReport:
+    index = ir_index(ir)
+    node_ids, node_count = index.node_ids, counts.node_count
+    edges: list[TransitionFrequency] = []
+    modeled: set[int] = set()
+    for source, target in zip(index.edge_sources, index.edge_targets):
+        key = source * node_count + target
+        if source < 0 or target < 0 or key in modeled:
+            continue
+        modeled.add(key)
+        edges.append(
+            TransitionFrequency(node_ids[source], node_ids[target], counts.pairs[key])
+        )
+    unmodeled = sorted(
+        (
+            TransitionFrequency(
+                node_ids[key // node_count], node_ids[key % node_count], count
+            )
+            for key, count in counts.pairs.items()
+            if key not in modeled
+        ),
+        key=lambda item: (-item.count, item.source, item.target),
+    )
+    observed = sum(counts.pairs.values())
+    return TransitionReport(
+        process_id=alignment.process_id,
+        process_version=alignment.process_version,
+        cases=counts.cases,
+        visits=counts.visits,
+        observed_transitions=observed,
+        modeled_transitions=observed - sum(item.count for item in unmodeled),
+        edges=edges,
+        unobserved_edges=[edge for edge in edges if edge.count == 0],
+        unmodeled_transitions=unmodeled,
+    )
+
+
+__all__ = [
+    "TransitionCounts",
+    "TransitionFrequency",
+    "TransitionReport",
+    "count_transitions",
+    "transition_frequencies",
+]
@@ -5,12 +5,14 @@ This package mirrors the previous `flo.ir` package but lives under
 """
 
 from .models import IR, Node
+from .compact import compact_ir
 from .validate import validate_ir, ensure_schema_aligned
 from .enums import NodeKind, LaneType, ValueClass, ProcessValueClass
 
 __all__ = [
     "IR",
     "Node",
+    "compact_ir",
     "validate_ir",
     "ensure_schema_aligned",
     "NodeKind",
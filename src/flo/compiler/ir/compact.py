@@ -0,0 +1,99 @@
+"""Memory-compact IR mode for very large models.
+
+``Node``, ``Edge``, and ``IR`` are slotted dataclasses whose ids, types, and
+edge endpoints are interned on construction. ``compact_ir`` goes further for
+models with hundreds of thousands of steps: it interns every string key and
+value inside node attrs and edge metadata, points nodes without attrs at one
+shared immutable empty mapping, and drops empty edge metadata. The public
+``IR``/``Node``/``Edge`` API is unchanged; a compacted IR is meant to be read,
+so code that edits nodes in place should build a new IR instead.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from typing import Any, NoReturn
+
+from .index import invalidate_ir_index
+from .models import IR
+
+_ENV_COMPACT = "FLO_IR_COMPACT"
+_ENABLED_VALUES = {"1", "on", "true", "yes", "enabled"}
+
+
+class _EmptyAttrs(dict):
+    """Shared, immutable empty ``attrs`` mapping (still a ``dict`` instance)."""
+
+    __slots__ = ()
+
+    def _read_only(self, *_: Any, **__: Any) -> NoReturn:
+        raise TypeError("compact IR node attrs are read-only; build a new Node")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def __copy__(self) -> dict[str, Any]:
+        return {}
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        return {}
+
+    def __reduce__(self) -> tuple[type, tuple[()]]:
+        return (dict, ())
+
+
+EMPTY_ATTRS: dict[str, Any] = _EmptyAttrs()
+
+
+def compact_ir(ir: IR) -> IR:
+    """Rewrite ``ir`` in place into its memory-compact form and return it."""
+    for node in ir.nodes:
+        attrs = node.attrs
+        if not attrs:
+            node.attrs = EMPTY_ATTRS
+        elif attrs is not EMPTY_ATTRS:
+            node.attrs = _intern_mapping(attrs)
+    for edge in ir.edges:
+        for name in ("id", "outcome", "label", "edge_type"):
+            value = getattr(edge, name)
+            if type(value) is str:
+                setattr(edge, name, sys.intern(value))
+        metadata = edge.metadata
+        edge.metadata = _intern_mapping(metadata) if metadata else None
+    if ir.process_metadata:
+        ir.process_metadata = _intern_mapping(ir.process_metadata)
+    invalidate_ir_index(ir)
+    return ir
+
+
+def ir_compact_enabled() -> bool:
+    """Return whether ``FLO_IR_COMPACT`` turns compact IR mode on (off by default)."""
+    return os.getenv(_ENV_COMPACT, "off").strip().lower() in _ENABLED_VALUES
+
+
+def _intern_mapping(mapping: dict[Any, Any]) -> dict[Any, Any]:
+    return {_intern_key(key): _intern_value(value) for key, value in mapping.items()}
+
+
+def _intern_key(key: Any) -> Any:
+    return sys.intern(key) if type(key) is str else key
+
+
+def _intern_value(value: Any) -> Any:
+    if type(value) is str:
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return _intern_mapping(value)
+    if isinstance(value, list):
+        return [_intern_value(item) for item in value]
+    return value
+
+
+__all__ = ["EMPTY_ATTRS", "compact_ir", "ir_compact_enabled"]
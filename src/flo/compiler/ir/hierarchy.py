@@ -0,0 +1,157 @@
+"""Subprocess hierarchy built once from ``subprocess_parent`` links.
+
+``SubprocessHierarchy`` turns flat ``(node_id, parent_id)`` pairs into parent
+and children maps, per-node depth, and a pre-order interval index, so that
+"is X nested inside Y" is O(1) and listing everything under Y is O(k).
+Parent chains that loop are detected in the same pass and left out of the
+tree. Validation builds the hierarchy from the shared ``IRIndex``; render
+projections build it from node dictionaries.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from .index import IRIndex
+
+_IN_PROGRESS = 1
+_ACYCLIC = 2
+_CYCLIC = 3
+
+
+class SubprocessHierarchy:
+    """Read-only subprocess tree over a set of node ids.
+
+    ``parent`` returns the declared parent even when it does not resolve to a
+    known id; such nodes are roots of the tree. Nodes whose parent chain loops
+    (or leads into a loop) are listed in ``cyclic_ids`` and have no depth,
+    children, or descendants.
+    """
+
+    __slots__ = (
+        "node_ids",
+        "cyclic_ids",
+        "_parents",
+        "_children",
+        "_depth",
+        "_order",
+        "_end",
+        "_preorder",
+    )
+
+    def __init__(self, pairs: Iterable[tuple[str, str | None]]) -> None:
+        """Build from ``(node_id, parent_id)`` pairs; the first pair per id wins."""
+        parents: dict[str, str | None] = {}
+        for node_id, parent_id in pairs:
+            parents.setdefault(node_id, parent_id)
+        self._parents = parents
+        self.node_ids: tuple[str, ...] = tuple(parents)
+        self._depth: dict[str, int] = {}
+        self.cyclic_ids: tuple[str, ...] = self._resolve_chains()
+        self._children = self._collect_children()
+        self._order: dict[str, int] = {}
+        self._end: dict[str, int] = {}
+        self._preorder: list[str] = []
+        self._number_subtrees()
+
+    def _resolved_parent(self, node_id: str) -> str | None:
+        parent_id = self._parents[node_id]
+        return parent_id if parent_id in self._parents else None
+
+    def _resolve_chains(self) -> tuple[str, ...]:
+        # Each id is walked at most once: a chain stops at the first id that
+        # is already classified, so the whole pass is linear.
+        state: dict[str, int] = {}
+        depth = self._depth
+        for node_id in self.node_ids:
+            path: list[str] = []
+            current: str | None = node_id
+            while current is not None and current not in state:
+                state[current] = _IN_PROGRESS
+                path.append(current)
+                current = self._resolved_parent(current)
+            if current is not None and state[current] != _ACYCLIC:
+                for member in path:
+                    state[member] = _CYCLIC
+                continue
+            level = -1 if current is None else depth[current]
+            for member in reversed(path):
+                level += 1
+                depth[member] = level
+                state[member] = _ACYCLIC
+        return tuple(node_id for node_id in self.node_ids if state[node_id] == _CYCLIC)
+
+    def _collect_children(self) -> dict[str, tuple[str, ...]]:
+        children: dict[str, list[str]] = {}
+        for node_id in self.node_ids:
+            parent_id = self._resolved_parent(node_id)
+            if parent_id is not None and node_id in self._depth:
+                children.setdefault(parent_id, []).append(node_id)
+        return {key: tuple(value) for key, value in children.items()}
+
+    def _number_subtrees(self) -> None:
+        roots = [
+            node_id
+            for node_id in self.node_ids
+            if node_id in self._depth and self._resolved_parent(node_id) is None
+        ]
+        stack = list(reversed(roots))
+        while stack:
+            node_id = stack.pop()
+            self._order[node_id] = len(self._preorder)
+            self._preorder.append(node_id)
+            stack.extend(reversed(self._children.get(node_id, ())))
+        for node_id in reversed(self._preorder):
+            end = self._order[node_id] + 1
+            for child in self._children.get(node_id, ()):
+                end = max(end, self._end[child])
+            self._end[node_id] = end
+
+    @property
+    def has_cycles(self) -> bool:
+        """Return True when some parent chain loops."""
+        return bool(self.cyclic_ids)
+
+    def parent(self, node_id: str) -> str | None:
+        """Return the declared parent of ``node_id``, or None."""
+        return self._parents.get(node_id)
+
+    def children(self, node_id: str) -> tuple[str, ...]:
+        """Return the direct children of ``node_id`` in input order."""
+        return self._children.get(node_id, ())
+
+    def depth(self, node_id: str) -> int | None:
+        """Return how deeply ``node_id`` is nested (roots are 0); None if cyclic."""
+        return self._depth.get(node_id)
+
+    def nested_ids(self) -> tuple[str, ...]:
+        """Return ids that declare a parent, in input order."""
+        return tuple(
+            node_id for node_id, parent in self._parents.items() if parent is not None
+        )
+
+    def is_descendant(self, node_id: str, ancestor_id: str) -> bool:
+        """Return True when ``node_id`` sits anywhere under ``ancestor_id``."""
+        ancestor = self._order.get(ancestor_id)
+        position = self._order.get(node_id)
+        if ancestor is None or position is None:
+            return False
+        return ancestor < position < self._end[ancestor_id]
+
+    def descendants(self, node_id: str) -> tuple[str, ...]:
+        """Return every id nested under ``node_id``, in pre-order."""
+        start = self._order.get(node_id)
+        if start is None:
+            return ()
+        return tuple(self._preorder[start + 1 : self._end[node_id]])
+
+
+def subprocess_hierarchy(index: IRIndex) -> SubprocessHierarchy:
+    """Return the hierarchy of an indexed IR (memoized on the index)."""
+    return index.memo(
+        "subprocess.hierarchy",
+        lambda: SubprocessHierarchy(zip(index.node_ids, index.subprocess_parents)),
+    )
+
+
+__all__ = ["SubprocessHierarchy", "subprocess_hierarchy"]
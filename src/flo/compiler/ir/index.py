@@ -0,0 +1,253 @@
+"""Shared integer-indexed view of an IR graph.
+
+Validation, analysis, and rendering all need the same derived structures
+(node positions, adjacency, degrees, type and lane buckets). ``ir_index``
+builds them once per ``IR`` instance and caches the result on the instance.
+Assigning, appending to, or truncating ``IR.nodes`` / ``IR.edges`` invalidates
+the cached index automatically; code that edits a node or edge in place must
+call ``invalidate_ir_index``.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Callable, Iterable, TypeVar
+
+from .models import IR, Node
+
+_T = TypeVar("_T")
+
+
+class IRIndex:
+    """Read-only indexed view of one ``IR``'s nodes and edges.
+
+    Nodes are interned as integer positions in ``IR.nodes`` order. Forward
+    and reverse adjacency are stored CSR-style: the successors of node ``i``
+    are ``out_targets[out_offsets[i]:out_offsets[i + 1]]``. Edges whose
+    endpoints do not resolve are left out of the adjacency and listed in
+    ``unresolved_edges``. When ids repeat, the first node wins ``positions``.
+    """
+
+    __slots__ = (
+        "nodes",
+        "node_ids",
+        "positions",
+        "node_types",
+        "edge_sources",
+        "edge_targets",
+        "unresolved_edges",
+        "out_offsets",
+        "out_targets",
+        "in_offsets",
+        "in_sources",
+        "type_buckets",
+        "lane_members",
+        "subprocess_parents",
+        "subprocess_children",
+        "_source",
+        "_memo",
+    )
+
+    def __init__(self, ir: IR) -> None:
+        """Index ``ir``; the IR is not copied and must not be edited in place."""
+        self.nodes: tuple[Node, ...] = tuple(ir.nodes)
+        self.node_ids: tuple[str, ...] = tuple(node.id for node in self.nodes)
+        self.positions: dict[str, int] = {}
+        for position, node_id in enumerate(self.node_ids):
+            self.positions.setdefault(node_id, position)
+        self.node_types: tuple[str, ...] = tuple(
+            (node.type or "").lower() for node in self.nodes
+        )
+        self._index_edges(ir)
+        self._index_memberships()
+        # The lists themselves are held, not their ids: a freed list's id can
+        # be reused by the next list assigned to ``ir.nodes``.
+        self._source = (ir.nodes, len(ir.nodes), ir.edges, len(ir.edges))
+        self._memo: dict[str, Any] = {}
+
+    def _index_edges(self, ir: IR) -> None:
+        positions = self.positions
+        sources = array("i")
+        targets = array("i")
+        unresolved: list[int] = []
+        for edge_index, edge in enumerate(ir.edges):
+            source = positions.get(edge.source, -1)
+            target = positions.get(edge.target, -1)
+            sources.append(source)
+            targets.append(target)
+            if source < 0 or target < 0:
+                unresolved.append(edge_index)
+        self.edge_sources = sources
+        self.edge_targets = targets
+        self.unresolved_edges: tuple[int, ...] = tuple(unresolved)
+        count = len(self.nodes)
+        self.out_offsets, self.out_targets = _csr(count, sources, targets)
+        self.in_offsets, self.in_sources = _csr(count, targets, sources)
+
+    def _index_memberships(self) -> None:
+        type_buckets: dict[str, list[int]] = {}
+        lanes: dict[str, list[int]] = {}
+        children: dict[str, list[int]] = {}
+        parents: list[str | None] = []
+        for position, node in enumerate(self.nodes):
+            type_buckets.setdefault(self.node_types[position], []).append(position)
+            attrs = node.attrs if isinstance(node.attrs, dict) else {}
+            lane = _normalized_text(attrs.get("lane"))
+            if lane is not None:
+                lanes.setdefault(lane, []).append(position)
+            parent = _normalized_text(attrs.get("subprocess_parent"))
+            parents.append(parent)
+            if parent is not None:
+                children.setdefault(parent, []).append(position)
+        self.type_buckets = {key: tuple(value) for key, value in type_buckets.items()}
+        self.lane_members = {key: tuple(value) for key, value in lanes.items()}
+        self.subprocess_parents: tuple[str | None, ...] = tuple(parents)
+        self.subprocess_children = {
+            key: tuple(value) for key, value in children.items()
+        }
+
+    @property
+    def node_count(self) -> int:
+        """Return the number of indexed nodes (duplicates included)."""
+        return len(self.nodes)
+
+    @property
+    def has_duplicate_ids(self) -> bool:
+        """Return True when two nodes share an id."""
+        return len(self.positions) != len(self.node_ids)
+
+    def matches(self, ir: IR) -> bool:
+        """Return True while this index still describes ``ir``'s node/edge lists."""
+        nodes, node_count, edges, edge_count = self._source
+        return (
+            ir.nodes is nodes
+            and len(nodes) == node_count
+            and ir.edges is edges
+            and len(edges) == edge_count
+        )
+
+    def node(self, node_id: str) -> Node | None:
+        """Return the node with ``node_id``, or None."""
+        position = self.positions.get(node_id)
+        return None if position is None else self.nodes[position]
+
+    def out_degree(self, position: int) -> int:
+        """Return the number of resolved outgoing edges of node ``position``."""
+        return self.out_offsets[position + 1] - self.out_offsets[position]
+
+    def in_degree(self, position: int) -> int:
+        """Return the number of resolved incoming edges of node ``position``."""
+        return self.in_offsets[position + 1] - self.in_offsets[position]
+
+    def successors(self, position: int) -> array:
+        """Return successor positions of node ``position`` (one per edge)."""
+        return self.out_targets[
+            self.out_offsets[position] : self.out_offsets[position + 1]
+        ]
+
+    def predecessors(self, position: int) -> array:
+        """Return predecessor positions of node ``position`` (one per edge)."""
+        return self.in_sources[
+            self.in_offsets[position] : self.in_offsets[position + 1]
+        ]
+
+    def positions_of_type(self, node_type: str) -> tuple[int, ...]:
+        """Return positions of nodes whose lowercased type is ``node_type``."""
+        return self.type_buckets.get(node_type, ())
+
+    def ids_of_type(self, node_type: str) -> list[str]:
+        """Return ids of nodes whose lowercased type is ``node_type``."""
+        return [self.node_ids[p] for p in self.positions_of_type(node_type)]
+
+    def reachable(self, seeds: Iterable[int], *, reverse: bool = False) -> bytearray:
+        """Return a per-position flag array of nodes reachable from ``seeds``.
+
+        With ``reverse`` the walk follows edges backwards (nodes that can
+        reach a seed).
+        """
+        offsets, neighbours = (
+            (self.in_offsets, self.in_sources)
+            if reverse
+            else (self.out_offsets, self.out_targets)
+        )
+        seen = bytearray(len(self.nodes))
+        stack = list(seeds)
+        while stack:
+            current = stack.pop()
+            if seen[current]:
+                continue
+            seen[current] = 1
+            for offset in range(offsets[current], offsets[current + 1]):
+                neighbour = neighbours[offset]
+                if not seen[neighbour]:
+                    stack.append(neighbour)
+        return seen
+
+    def successor_lists(self) -> list[array]:
+        """Return per-node successor arrays (memoized)."""
+        return self.memo(
+            "successor_lists",
+            lambda: [self.successors(p) for p in range(len(self.nodes))],
+        )
+
+    def attrs_by_id(self) -> dict[str, dict[str, Any]]:
+        """Return ``{node_id: attrs}`` (memoized; last duplicate wins)."""
+        return self.memo(
+            "attrs_by_id",
+            lambda: {
+                node.id: node.attrs if isinstance(node.attrs, dict) else {}
+                for node in self.nodes
+            },
+        )
+
+    def memo(self, key: str, factory: Callable[[], _T]) -> _T:
+        """Return a value derived from this index, computing it once per key.
+
+        Callers own their key namespace and must treat the value as read-only.
+        """
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = factory()
+            return value
+
+
+def ir_index(ir: IR) -> IRIndex:
+    """Return the cached ``IRIndex`` for ``ir``, building it when stale."""
+    cached = ir._index
+    if isinstance(cached, IRIndex) and cached.matches(ir):
+        return cached
+    index = IRIndex(ir)
+    ir._index = index
+    return index
+
+
+def invalidate_ir_index(ir: IR) -> None:
+    """Drop the cached index after editing nodes or edges of ``ir`` in place."""
+    ir._index = None
+
+
+def _csr(count: int, sources: array, targets: array) -> tuple[array, array]:
+    offsets = array("i", [0]) * (count + 1)
+    for source, target in zip(sources, targets):
+        if source >= 0 and target >= 0:
+            offsets[source + 1] += 1
+    for position in range(count):
+        offsets[position + 1] += offsets[position]
+    fill = array("i", offsets[:-1])
+    packed = array("i", [0]) * offsets[count]
+    for source, target in zip(sources, targets):
+        if source >= 0 and target >= 0:
+            packed[fill[source]] = target
+            fill[source] += 1
+    return offsets, packed
+
+
+def _normalized_text(value: Any) -> str | None:
+    if not isinstance(value, str):
+        return None
+    text = value.strip()
+    return text or None
+
+
+__all__ = ["IRIndex", "invalidate_ir_index", "ir_index"]
@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+import sys
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     """A node in the FLO IR."""
 
@@ -16,12 +17,12 @@ class Node:
 
     def __post_init__(self) -> None:
         """Normalize scalar and mapping fields after dataclass initialization."""
-        self.id = str(self.id)
-        self.type = str(self.type)
+        self.id = sys.intern(str(self.id))
+        self.type = sys.intern(str(self.type))
         self.attrs = _normalize_object_mapping(self.attrs, default={})
 
 
-@dataclass
+@dataclass(slots=True)
 class Edge:
     """A directed edge in the FLO IR."""
 
@@ -37,12 +38,12 @@ class Edge:
 
     def __post_init__(self) -> None:
         """Normalize endpoint identifiers and optional metadata mapping."""
-        self.source = str(self.source)
-        self.target = str(self.target)
+        self.source = sys.intern(str(self.source))
+        self.target = sys.intern(str(self.target))
         self.metadata = _normalize_object_mapping(self.metadata, default=None)
 
 
-@dataclass
+@dataclass(slots=True)
 class IR:
     """Represents a FLO intermediate representation (IR)."""
 
@@ -50,6 +51,8 @@ class IR:
     nodes: list[Node]
     edges: list[Edge] = field(default_factory=list)
     process_metadata: dict[str, Any] | None = None
+    # Lazily built ``IRIndex``; see ``flo.compiler.ir.index.ir_index``.
+    _index: Any = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Coerce nested node/edge entries and normalize optional metadata."""
@@ -2,37 +2,51 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, MutableMapping
 
 from .models import IR
 from .enums import ProcessValueClass
 from .schema_projection import ir_to_schema_dict
 from .validate_relations import validate_item_relations, validate_resource_relations
 from .validate_structure import validate_parallel_structure
-from .validate_subprocess import validate_subprocess_metadata
+from .validate_subprocess import (
+    validate_subprocess_detail_refs,
+    validate_subprocess_parent_cycles,
+    validate_subprocess_parent_link,
+)
 from .validate_render_intent import validate_render_intent
-from ._graph_utils import build_adjacency_maps, traverse
-from .metadata import extract_node_metadata
+from .index import IRIndex, ir_index
+from .validate_rules import (
+    GraphRule,
+    NodeRule,
+    NodeView,
+    run_graph_rules,
+    run_node_rules,
+)
 from flo.errors import ValidationError
-from pathlib import Path
-import json
+from flo.schema.registry import (
+    JSONSCHEMA_AVAILABLE as _JSONSCHEMA_AVAILABLE,
+    SchemaNotFoundError,
+    first_schema_error,
+    iter_schema_errors,
+    schema_validator,
+)
 
 _MEASURE_UNITS = {"mg", "g", "kg", "ml", "l", "mm", "cm", "m"}
 _TIME_UNITS = {"s", "m", "min", "hr", "d"}
 _SPATIAL_UNITS = {"mm", "cm", "m", "in", "ft"}
+_NODE_IO_FIELDS = ("inputs", "outputs", "consumes", "produces", "performed_by", "uses")
+_VALUE_CLASSES = frozenset(vc.value for vc in ProcessValueClass)
 
-try:
-    import jsonschema  # type: ignore
 
-    _JSONSCHEMA_AVAILABLE = True
-except Exception:  # pragma: no cover - optional
-    jsonschema = None  # type: ignore
-    _JSONSCHEMA_AVAILABLE = False
-
-
-def validate_ir(obj: Any) -> None:
+def validate_ir(obj: Any, *, timings: MutableMapping[str, float] | None = None) -> None:
     """Validate a basic IR instance for structural correctness.
 
+    Graph preconditions run first, then every node-level rule in one fused
+    pass over the nodes, then the remaining graph-level rules. When
+    ``timings`` is given, the seconds spent in each rule are added to it
+    under the rule name.
+
     Raises `ValidationError` on failure.
     """
     if not isinstance(obj, IR):
@@ -41,89 +55,59 @@ def validate_ir(obj: Any) -> None:
     if not obj.nodes:
         raise ValidationError("E1001: IR must contain at least one node")
 
-    ids = [n.id for n in obj.nodes]
-    if len(ids) != len(set(ids)):
+    index = ir_index(obj)
+    if index.has_duplicate_ids:
         raise ValidationError("E1002: node ids must be unique")
 
-    _validate_start_nodes(obj)
-    _validate_edge_resolution(obj, ids)
-    incoming_counts, outgoing_counts = _build_edge_degree_maps(obj, ids)
-    _validate_decision_nodes(obj, outgoing_counts)
-    _validate_queue_nodes(obj, incoming_counts, outgoing_counts)
-    _validate_queue_wait_time_semantics(obj)
-    _validate_node_io_lists(obj)
-    _validate_node_time_metadata(obj)
-    _validate_node_value_class(obj)
-    validate_subprocess_metadata(obj)
-    _validate_edge_metadata(obj)
-    _validate_process_resources(obj)
-    validate_item_relations(obj)
-    validate_resource_relations(obj)
-    validate_parallel_structure(obj, incoming_counts, outgoing_counts)
-    _validate_node_connectivity(obj, incoming_counts, outgoing_counts)
-    _validate_global_reachability(obj)
-
-
-def _validate_start_nodes(obj: IR) -> None:
-    start_nodes = [n for n in obj.nodes if (n.type or "").lower() == "start"]
-    if len(start_nodes) != 1:
-        raise ValidationError("E1003: IR must contain exactly one start node")
+    run_graph_rules(_PREFLIGHT_RULES, obj, index, timings)
+    run_node_rules(_NODE_RULES, index, timings)
+    run_graph_rules(_GRAPH_RULES, obj, index, timings)
 
 
-def _validate_edge_resolution(obj: IR, ids: list[str]) -> None:
-    known_ids = set(ids)
-    for edge in obj.edges:
-        if edge.source not in known_ids or edge.target not in known_ids:
-            raise ValidationError(
-                f"E1004: edge endpoint unresolved: {edge.source} -> {edge.target}"
-            )
+def validation_rule_names() -> list[str]:
+    """Return registered validation rule names in evaluation order."""
+    return [rule.name for rule in (*_PREFLIGHT_RULES, *_NODE_RULES, *_GRAPH_RULES)]
 
 
-def _build_edge_degree_maps(
-    obj: IR, ids: list[str]
-) -> tuple[dict[str, int], dict[str, int]]:
-    known_ids = set(ids)
-    incoming_counts: dict[str, int] = {node_id: 0 for node_id in known_ids}
-    outgoing_counts: dict[str, int] = {node_id: 0 for node_id in known_ids}
-    for edge in obj.edges:
-        if edge.target in incoming_counts:
-            incoming_counts[edge.target] += 1
-        if edge.source in outgoing_counts:
-            outgoing_counts[edge.source] += 1
-    return incoming_counts, outgoing_counts
+def _validate_start_nodes(index: IRIndex) -> None:
+    if len(index.positions_of_type("start")) != 1:
+        raise ValidationError("E1003: IR must contain exactly one start node")
 
 
-def _validate_decision_nodes(obj: IR, outgoing_counts: dict[str, int]) -> None:
-    for node in obj.nodes:
-        if (node.type or "").lower() != "decision":
-            continue
-        if outgoing_counts.get(node.id, 0) < 2:
-            raise ValidationError(
-                f"E1005: decision node '{node.id}' must have at least two outgoing edges"
-            )
+def _validate_edge_resolution(obj: IR, index: IRIndex) -> None:
+    if index.unresolved_edges:
+        edge = obj.edges[index.unresolved_edges[0]]
+        raise ValidationError(
+            f"E1004: edge endpoint unresolved: {edge.source} -> {edge.target}"
+        )
 
 
-def _validate_queue_nodes(
-    obj: IR, incoming_counts: dict[str, int], outgoing_counts: dict[str, int]
-) -> None:
-    for node in obj.nodes:
-        if (node.type or "").lower() != "queue":
-            continue
+def _validate_decision_node(view: NodeView) -> None:
+    if view.node_type != "decision":
+        return
+    if view.index.out_degree(view.position) < 2:
+        raise ValidationError(
+            f"E1005: decision node '{view.node.id}' must have at least two outgoing edges"
+        )
 
-        metadata = extract_node_metadata(node)
-        _validate_queue_metadata(node_id=node.id, metadata=metadata)
 
-        if incoming_counts.get(node.id, 0) < 1:
-            raise ValidationError(
-                f"E1103: queue node '{node.id}' must have at least one incoming edge"
-            )
-        if outgoing_counts.get(node.id, 0) < 1:
-            raise ValidationError(
-                f"E1104: queue node '{node.id}' must have at least one outgoing edge"
-            )
+def _validate_queue_node(view: NodeView) -> None:
+    if view.node_type != "queue":
+        return
+    node_id = view.node.id
+    _validate_queue_metadata(node_id=node_id, metadata=view.metadata)
+
+    if view.index.in_degree(view.position) < 1:
+        raise ValidationError(
+            f"E1103: queue node '{node_id}' must have at least one incoming edge"
+        )
+    if view.index.out_degree(view.position) < 1:
+        raise ValidationError(
+            f"E1104: queue node '{node_id}' must have at least one outgoing edge"
+        )
 
 
-def _validate_queue_wait_time_semantics(obj: IR) -> None:
+def _validate_queue_wait_time_semantics(view: NodeView) -> None:
     """Enforce queue/task semantic constraint: wait_time only on queue nodes.
 
     - Queue nodes (kind: queue) may have wait_time (queue delays).
@@ -131,103 +115,78 @@ def _validate_queue_wait_time_semantics(obj: IR) -> None:
     - Task nodes may have cycle_time and crossover_time (work duration and setup).
     - Queue nodes must NOT have cycle_time or crossover_time.
     """
-    for node in obj.nodes:
-        node_type = (node.type or "").lower()
-        metadata = extract_node_metadata(node)
+    node = view.node
+    node_type = view.node_type
+    metadata = view.metadata
 
-        if node_type == "queue":
-            # Queue nodes: reject cycle_time and crossover_time
-            if "cycle_time" in metadata:
-                raise ValidationError(
-                    f"E1501: queue node '{node.id}' has cycle_time metadata. "
-                    f"Queues represent delays only; use wait_time. "
-                    f"Cycle time belongs on task nodes."
-                )
-            if (
-                "crossover_time" in metadata
-                or "transfer_time" in metadata
-                or "changeover_time" in metadata
-            ):
-                raise ValidationError(
-                    f"E1502: queue node '{node.id}' has crossover/transfer/changeover_time metadata. "
-                    f"Queues represent delays only; use wait_time. "
-                    f"Setup time belongs on task nodes."
-                )
-        elif node_type in {"task", "system_task", "subprocess"}:
-            # Task nodes: reject wait_time
-            if "wait_time" in metadata:
-                raise ValidationError(
-                    f"E1503: {node_type} node '{node.id}' has wait_time metadata. "
-                    f"wait_time is only valid on queue nodes. "
-                    f"Restructure: insert a queue node before this task to represent the delay."
-                )
+    if node_type == "queue":
+        # Queue nodes: reject cycle_time and crossover_time
+        if "cycle_time" in metadata:
+            raise ValidationError(
+                f"E1501: queue node '{node.id}' has cycle_time metadata. "
+                f"Queues represent delays only; use wait_time. "
+                f"Cycle time belongs on task nodes."
+            )
+        if (
+            "crossover_time" in metadata
+            or "transfer_time" in metadata
+            or "changeover_time" in metadata
+        ):
+            raise ValidationError(
+                f"E1502: queue node '{node.id}' has crossover/transfer/changeover_time metadata. "
+                f"Queues represent delays only; use wait_time. "
+                f"Setup time belongs on task nodes."
+            )
+    elif node_type in {"task", "system_task", "subprocess"}:
+        # Task nodes: reject wait_time
+        if "wait_time" in metadata:
+            raise ValidationError(
+                f"E1503: {node_type} node '{node.id}' has wait_time metadata. "
+                f"wait_time is only valid on queue nodes. "
+                f"Restructure: insert a queue node before this task to represent the delay."
+            )
 
 
-def _validate_node_connectivity(
-    obj: IR,
-    incoming_counts: dict[str, int],
-    outgoing_counts: dict[str, int],
-) -> None:
-    for node in obj.nodes:
-        node_type = (node.type or "").lower()
+def _validate_node_connectivity(index: IRIndex) -> None:
+    for position, node_id in enumerate(index.node_ids):
+        node_type = index.node_types[position]
 
-        if node_type != "start" and incoming_counts.get(node.id, 0) < 1:
+        if node_type != "start" and index.in_degree(position) < 1:
             raise ValidationError(
-                f"E1006: node '{node.id}' must have at least one predecessor"
+                f"E1006: node '{node_id}' must have at least one predecessor"
             )
 
-        if node_type != "end" and outgoing_counts.get(node.id, 0) < 1:
+        if node_type != "end" and index.out_degree(position) < 1:
             raise ValidationError(
-                f"E1007: node '{node.id}' must have at least one successor"
+                f"E1007: node '{node_id}' must have at least one successor"
             )
 
 
-def _validate_global_reachability(obj: IR) -> None:
-    node_ids = [node.id for node in obj.nodes]
-    adjacency, reverse_adjacency = build_adjacency_maps(
-        node_ids=node_ids, edges=obj.edges
-    )
-    start_nodes = _collect_node_ids_by_type(obj=obj, node_type="start")
-    end_nodes = _collect_node_ids_by_type(obj=obj, node_type="end")
+def _validate_global_reachability(index: IRIndex) -> None:
+    end_nodes = index.positions_of_type("end")
 
     _ensure_end_nodes_present(end_nodes=end_nodes)
-    _ensure_all_nodes_reachable_from_start(
-        obj=obj, start_nodes=start_nodes, adjacency=adjacency
-    )
-    _ensure_all_nodes_can_reach_end(
-        obj=obj, end_nodes=end_nodes, reverse_adjacency=reverse_adjacency
-    )
-
-
-def _collect_node_ids_by_type(obj: IR, node_type: str) -> list[str]:
-    return [node.id for node in obj.nodes if (node.type or "").lower() == node_type]
+    _ensure_all_nodes_reachable_from_start(index)
+    _ensure_all_nodes_can_reach_end(index, end_nodes=end_nodes)
 
 
-def _ensure_end_nodes_present(end_nodes: list[str]) -> None:
+def _ensure_end_nodes_present(end_nodes: tuple[int, ...]) -> None:
     if not end_nodes:
         raise ValidationError("E1010: IR must contain at least one end node")
 
 
-def _ensure_all_nodes_reachable_from_start(
-    obj: IR,
-    start_nodes: list[str],
-    adjacency: dict[str, set[str]],
-) -> None:
-    reachable_from_start = traverse(start_nodes, adjacency)
-    for node in obj.nodes:
-        if node.id not in reachable_from_start:
-            raise ValidationError(f"E1008: node '{node.id}' is unreachable from start")
+def _ensure_all_nodes_reachable_from_start(index: IRIndex) -> None:
+    reachable_from_start = index.reachable(index.positions_of_type("start"))
+    for position, node_id in enumerate(index.node_ids):
+        if not reachable_from_start[position]:
+            raise ValidationError(f"E1008: node '{node_id}' is unreachable from start")
 
 
-def _ensure_all_nodes_can_reach_end(
-    obj: IR,
-    end_nodes: list[str],
-    reverse_adjacency: dict[str, set[str]],
-) -> None:
-    can_reach_end = traverse(end_nodes, reverse_adjacency)
-    for node in obj.nodes:
-        if node.id not in can_reach_end:
-            raise ValidationError(f"E1009: node '{node.id}' cannot reach any end node")
+def _ensure_all_nodes_can_reach_end(index: IRIndex, end_nodes: tuple[int, ...]) -> None:
+    can_reach_end = index.reachable(end_nodes, reverse=True)
+    for position, node_id in enumerate(index.node_ids):
+        if not can_reach_end[position]:
+            raise ValidationError(f"E1009: node '{node_id}' cannot reach any end node")
 
 
 def _validate_queue_metadata(node_id: str, metadata: dict[str, Any]) -> None:
@@ -242,41 +201,29 @@ def _validate_queue_metadata(node_id: str, metadata: dict[str, Any]) -> None:
         )
 
 
-def _validate_node_io_lists(obj: IR) -> None:
-    for node in obj.nodes:
-        attrs = getattr(node, "attrs", None)
-        if not isinstance(attrs, dict):
+def _validate_node_io_lists(view: NodeView) -> None:
+    attrs = view.attrs
+    node_id = view.node.id
+    for field in _NODE_IO_FIELDS:
+        value = attrs.get(field)
+        if value is None:
             continue
 
-        for field in (
-            "inputs",
-            "outputs",
-            "consumes",
-            "produces",
-            "performed_by",
-            "uses",
-        ):
-            value = attrs.get(field)
-            if value is None:
-                continue
-
-            if not isinstance(value, list):
-                raise ValidationError(f"E1310: node '{node.id}' {field} must be a list")
+        if not isinstance(value, list):
+            raise ValidationError(f"E1310: node '{node_id}' {field} must be a list")
 
-            for index, item in enumerate(value):
-                if not isinstance(item, str) or not item.strip():
-                    raise ValidationError(
-                        f"E1311: node '{node.id}' {field}[{index}] must be a non-empty string"
-                    )
+        for index, item in enumerate(value):
+            if not isinstance(item, str) or not item.strip():
+                raise ValidationError(
+                    f"E1311: node '{node_id}' {field}[{index}] must be a non-empty string"
+                )
 
 
-def _validate_node_time_metadata(obj: IR) -> None:
-    for node in obj.nodes:
-        metadata = extract_node_metadata(node)
-        for key, value in metadata.items():
-            if not _is_node_time_metadata_key(key):
-                continue
-            _validate_node_time_metadata_value(node_id=node.id, key=key, value=value)
+def _validate_node_time_metadata(view: NodeView) -> None:
+    for key, value in view.metadata.items():
+        if not _is_node_time_metadata_key(key):
+            continue
+        _validate_node_time_metadata_value(node_id=view.node.id, key=key, value=value)
 
 
 def _is_node_time_metadata_key(key: Any) -> bool:
@@ -543,18 +490,15 @@ def _validate_canonical_quantity(
         )
 
 
-def _validate_node_value_class(obj: IR) -> None:
-    valid_values = {vc.value for vc in ProcessValueClass}
-    for node in obj.nodes:
-        metadata = extract_node_metadata(node)
-        raw = metadata.get("value_class")
-        if raw is None:
-            continue
-        if not isinstance(raw, str) or raw not in valid_values:
-            raise ValidationError(
-                f"E1320: node '{node.id}' metadata.value_class '{raw}' "
-                f"must be one of {sorted(valid_values)}"
-            )
+def _validate_node_value_class(view: NodeView) -> None:
+    raw = view.metadata.get("value_class")
+    if raw is None:
+        return
+    if not isinstance(raw, str) or raw not in _VALUE_CLASSES:
+        raise ValidationError(
+            f"E1320: node '{view.node.id}' metadata.value_class '{raw}' "
+            f"must be one of {sorted(_VALUE_CLASSES)}"
+        )
 
 
 def _validate_edge_metadata(obj: IR) -> None:
@@ -612,28 +556,85 @@ def _validate_rework_edge_metadata(*, edge: Any, metadata: dict[str, Any]) -> No
             )
 
 
-def validate_against_schema(ir: IR) -> None:
+# Evaluation order is error precedence: structural preconditions, then all
+# per-node rules in one fused traversal, then whole-graph rules.
+_PREFLIGHT_RULES: tuple[GraphRule, ...] = (
+    GraphRule("start_nodes", lambda obj, index: _validate_start_nodes(index)),
+    GraphRule("edge_resolution", _validate_edge_resolution),
+)
+_NODE_RULES: tuple[NodeRule, ...] = (
+    NodeRule("decision_nodes", _validate_decision_node),
+    NodeRule("queue_nodes", _validate_queue_node),
+    NodeRule("queue_wait_time_semantics", _validate_queue_wait_time_semantics),
+    NodeRule("node_io_lists", _validate_node_io_lists),
+    NodeRule("node_time_metadata", _validate_node_time_metadata),
+    NodeRule("node_value_class", _validate_node_value_class),
+    NodeRule("subprocess_parent_links", validate_subprocess_parent_link),
+)
+_GRAPH_RULES: tuple[GraphRule, ...] = (
+    GraphRule(
+        "subprocess_parent_cycles",
+        lambda obj, index: validate_subprocess_parent_cycles(index),
+    ),
+    GraphRule(
+        "subprocess_detail_refs",
+        lambda obj, index: validate_subprocess_detail_refs(index),
+    ),
+    GraphRule("edge_metadata", lambda obj, index: _validate_edge_metadata(obj)),
+    GraphRule("process_resources", lambda obj, index: _validate_process_resources(obj)),
+    GraphRule("item_relations", lambda obj, index: validate_item_relations(obj)),
+    GraphRule(
+        "resource_relations", lambda obj, index: validate_resource_relations(obj)
+    ),
+    GraphRule("parallel_structure", validate_parallel_structure),
+    GraphRule(
+        "node_connectivity", lambda obj, index: _validate_node_connectivity(index)
+    ),
+    GraphRule(
+        "global_reachability",
+        lambda obj, index: _validate_global_reachability(index),
+    ),
+)
+
+
+def validate_against_schema(ir: IR, *, collect_all: bool = False) -> None:
     """Validate an `IR` instance against the JSON schema file.
 
+    Uses the shared validator from `flo.schema.registry`, so the schema is
+    read and compiled once per process. With ``collect_all`` every violation
+    is reported in one message instead of only the most relevant one.
+
     Raises `ValidationError` on schema validation failure.
     """
-    schema_path = _locate_schema("flo_ir.json")
-
     if not _JSONSCHEMA_AVAILABLE:
         raise RuntimeError("jsonschema package not available for schema validation")
 
-    with schema_path.open("r", encoding="utf-8") as fh:
-        schema = json.load(fh)
+    try:
+        schema_validator("flo_ir.json")
+    except SchemaNotFoundError as exc:
+        raise ValidationError(str(exc)) from exc
 
     instance = ir_to_schema_dict(ir)
-    validate_fn = getattr(jsonschema, "validate", None)
-    if not callable(validate_fn):
-        raise RuntimeError("jsonschema.validate is not available for schema validation")
+    if collect_all:
+        errors = [
+            _format_schema_error(error)
+            for error in iter_schema_errors(instance, "flo_ir.json")
+        ]
+        if errors:
+            raise ValidationError(
+                f"schema validation failed with {len(errors)} error(s): "
+                + "; ".join(errors)
+            )
+        return
 
-    try:
-        validate_fn(instance=instance, schema=schema)
-    except Exception as e:
-        raise ValidationError(f"schema validation failed: {e}")
+    error = first_schema_error(instance, "flo_ir.json")
+    if error is not None:
+        raise ValidationError(f"schema validation failed: {error}")
+
+
+def _format_schema_error(error: Any) -> str:
+    location = "/".join(str(part) for part in error.absolute_path) or "<root>"
+    return f"{location}: {error.message}"
 
 
 def ensure_schema_aligned(ir: object) -> None:
@@ -643,21 +644,3 @@ def ensure_schema_aligned(ir: object) -> None:
 
     validate_against_schema(ir)
     validate_render_intent(ir)
-
-
-def _locate_schema(name: str) -> Path:
-    here = Path(__file__).resolve()
-    candidates = [
-        # Preferred: packaged schema payload at flo/schema/*.json
-        here.parents[2] / "schema" / name,
-        # Legacy wheel layout used by earlier lookup logic.
-        here.parents[3] / "schema" / name,
-        # Local repo layout when running from source tree.
-        here.parents[4] / "schema" / name,
-    ]
-
-    for candidate in candidates:
-        if candidate.exists():
-            return candidate
-
-    raise ValidationError(f"schema file not found: {candidates[0]}")
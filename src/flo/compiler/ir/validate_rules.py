@@ -0,0 +1,112 @@
+"""Rule registry and fused traversal for IR validation.
+
+Graph-level rules receive the IR and its shared ``IRIndex``; node-level rules
+run together in one pass over ``IR.nodes`` and receive a ``NodeView`` whose
+type and metadata are resolved once per node. Rules raise ``ValidationError``
+on the first violation, so rule order is the error precedence.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, MutableMapping, Sequence
+
+from .index import IRIndex
+from .metadata import extract_node_metadata
+from .models import IR, Node
+
+
+class NodeView:
+    """Per-node facts shared by every node-level rule in the fused pass."""
+
+    __slots__ = ("node", "position", "node_type", "attrs", "metadata", "index")
+
+    def __init__(self, node: Node, position: int, index: IRIndex) -> None:
+        """Resolve the node's type, attrs, and metadata once."""
+        self.node = node
+        self.position = position
+        self.node_type = index.node_types[position]
+        self.attrs: dict[str, Any] = node.attrs if isinstance(node.attrs, dict) else {}
+        self.metadata = extract_node_metadata(node)
+        self.index = index
+
+
+GraphCheck = Callable[[IR, IRIndex], None]
+NodeCheck = Callable[[NodeView], None]
+
+
+@dataclass(frozen=True)
+class GraphRule:
+    """A validation rule evaluated once over the whole IR."""
+
+    name: str
+    check: GraphCheck
+
+
+@dataclass(frozen=True)
+class NodeRule:
+    """A validation rule evaluated for each node in the fused pass."""
+
+    name: str
+    check: NodeCheck
+
+
+def run_graph_rules(
+    rules: Sequence[GraphRule],
+    obj: IR,
+    index: IRIndex,
+    timings: MutableMapping[str, float] | None = None,
+) -> None:
+    """Run ``rules`` in order, adding elapsed seconds to ``timings`` if given."""
+    for rule in rules:
+        if timings is None:
+            rule.check(obj, index)
+            continue
+        started = perf_counter()
+        try:
+            rule.check(obj, index)
+        finally:
+            _add(timings, rule.name, perf_counter() - started)
+
+
+def run_node_rules(
+    rules: Sequence[NodeRule],
+    index: IRIndex,
+    timings: MutableMapping[str, float] | None = None,
+) -> None:
+    """Run every node rule for each node in one traversal of ``index.nodes``."""
+    checks = [rule.check for rule in rules]
+    if timings is None:
+        for position, node in enumerate(index.nodes):
+            view = NodeView(node, position, index)
+            for check in checks:
+                check(view)
+        return
+
+    elapsed = [0.0] * len(rules)
+    try:
+        for position, node in enumerate(index.nodes):
+            view = NodeView(node, position, index)
+            for slot, check in enumerate(checks):
+                started = perf_counter()
+                try:
+                    check(view)
+                finally:
+                    elapsed[slot] += perf_counter() - started
+    finally:
+        for rule, seconds in zip(rules, elapsed):
+            _add(timings, rule.name, seconds)
+
+
+def _add(timings: MutableMapping[str, float], name: str, seconds: float) -> None:
+    timings[name] = timings.get(name, 0.0) + seconds
+
+
+__all__ = [
+    "GraphRule",
+    "NodeRule",
+    "NodeView",
+    "run_graph_rules",
+    "run_node_rules",
+]
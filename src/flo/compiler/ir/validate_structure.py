@@ -3,60 +3,46 @@
 from __future__ import annotations
 
 from .models import IR
-from ._graph_utils import build_adjacency_maps, traverse
+from .index import IRIndex, ir_index
 from flo.errors import ValidationError
 
 
-def validate_parallel_structure(
-    obj: IR,
-    incoming_counts: dict[str, int],
-    outgoing_counts: dict[str, int],
-) -> None:
+def validate_parallel_structure(obj: IR, index: IRIndex | None = None) -> None:
     """Validate structural constraints for explicit parallel split/join nodes."""
-    split_ids = [
-        node.id for node in obj.nodes if (node.type or "").lower() == "parallel_split"
-    ]
-    join_ids = {
-        node.id for node in obj.nodes if (node.type or "").lower() == "parallel_join"
-    }
+    index = index or ir_index(obj)
+    split_positions = index.positions_of_type("parallel_split")
+    join_positions = index.positions_of_type("parallel_join")
 
-    if not split_ids and not join_ids:
+    if not split_positions and not join_positions:
         return
 
-    node_ids = [node.id for node in obj.nodes]
-    adjacency, reverse_adjacency = build_adjacency_maps(
-        node_ids=node_ids, edges=obj.edges
-    )
-
     _validate_parallel_splits(
-        split_ids=split_ids,
-        join_ids=join_ids,
-        outgoing_counts=outgoing_counts,
-        adjacency=adjacency,
+        index=index,
+        split_positions=split_positions,
+        join_positions=join_positions,
     )
     _validate_parallel_joins(
-        split_ids=split_ids,
-        join_ids=join_ids,
-        incoming_counts=incoming_counts,
-        reverse_adjacency=reverse_adjacency,
+        index=index,
+        split_positions=split_positions,
+        join_positions=join_positions,
     )
 
 
 def _validate_parallel_splits(
     *,
-    split_ids: list[str],
-    join_ids: set[str],
-    outgoing_counts: dict[str, int],
-    adjacency: dict[str, set[str]],
+    index: IRIndex,
+    split_positions: tuple[int, ...],
+    join_positions: tuple[int, ...],
 ) -> None:
-    for split_id in split_ids:
-        if outgoing_counts.get(split_id, 0) < 2:
+    for split in split_positions:
+        split_id = index.node_ids[split]
+        if index.out_degree(split) < 2:
             raise ValidationError(
                 f"E1011: parallel_split node '{split_id}' must have at least two outgoing edges"
             )
 
-        reachable_from_split = traverse([split_id], adjacency)
-        if not any(candidate in join_ids for candidate in reachable_from_split):
+        reachable_from_split = index.reachable([split])
+        if not any(reachable_from_split[join] for join in join_positions):
             raise ValidationError(
                 f"E1012: parallel_split node '{split_id}' must reach at least one parallel_join node"
             )
@@ -64,19 +50,19 @@ def _validate_parallel_splits(
 
 def _validate_parallel_joins(
     *,
-    split_ids: list[str],
-    join_ids: set[str],
-    incoming_counts: dict[str, int],
-    reverse_adjacency: dict[str, set[str]],
+    index: IRIndex,
+    split_positions: tuple[int, ...],
+    join_positions: tuple[int, ...],
 ) -> None:
-    for join_id in join_ids:
-        if incoming_counts.get(join_id, 0) < 2:
+    for join in join_positions:
+        join_id = index.node_ids[join]
+        if index.in_degree(join) < 2:
             raise ValidationError(
                 f"E1013: parallel_join node '{join_id}' must have at least two incoming edges"
             )
 
-        upstream_for_join = traverse([join_id], reverse_adjacency)
-        if not any(candidate in split_ids for candidate in upstream_for_join):
+        upstream_for_join = index.reachable([join], reverse=True)
+        if not any(upstream_for_join[split] for split in split_positions):
             raise ValidationError(
                 f"E1014: parallel_join node '{join_id}' must be reachable from at least one parallel_split node"
             )
@@ -7,39 +7,57 @@ from typing import Any
 from flo.schema.subprocess_refs import iter_subprocess_detail_map_reference_values
 
 from .models import IR
+from .hierarchy import subprocess_hierarchy
+from .index import IRIndex, ir_index
 from .metadata import extract_node_metadata
+from .validate_rules import NodeView
 from flo.errors import ValidationError
 
 
 def validate_subprocess_metadata(obj: IR) -> None:
     """Validate subprocess hierarchy links and detail-map reference metadata."""
-    nodes_by_id = {node.id: node for node in obj.nodes}
-    subprocess_ids = {
-        node.id for node in obj.nodes if (node.type or "").lower() == "subprocess"
-    }
+    index = ir_index(obj)
+    for position, node in enumerate(index.nodes):
+        validate_subprocess_parent_link(NodeView(node, position, index))
+    validate_subprocess_parent_cycles(index)
+    validate_subprocess_detail_refs(index)
 
-    for node in obj.nodes:
-        parent_id = extract_subprocess_parent(node)
-        if parent_id is None:
-            continue
-        if parent_id not in nodes_by_id:
-            raise ValidationError(
-                f"E1330: node '{node.id}' subprocess_parent '{parent_id}' must resolve to an existing node"
-            )
-        if parent_id not in subprocess_ids:
-            raise ValidationError(
-                f"E1331: node '{node.id}' subprocess_parent '{parent_id}' must refer to a subprocess node"
-            )
-        if parent_id == node.id:
-            raise ValidationError(
-                f"E1332: node '{node.id}' subprocess_parent cannot refer to itself"
-            )
 
-    _validate_subprocess_parent_cycles(obj=obj, nodes_by_id=nodes_by_id)
+def validate_subprocess_parent_link(view: NodeView) -> None:
+    """Validate that one node's subprocess_parent names another subprocess."""
+    index = view.index
+    parent_id = index.subprocess_parents[view.position]
+    if parent_id is None:
+        return
+    node_id = view.node.id
+    parent_position = index.positions.get(parent_id)
+    if parent_position is None:
+        raise ValidationError(
+            f"E1330: node '{node_id}' subprocess_parent '{parent_id}' must resolve to an existing node"
+        )
+    if index.node_types[parent_position] != "subprocess":
+        raise ValidationError(
+            f"E1331: node '{node_id}' subprocess_parent '{parent_id}' must refer to a subprocess node"
+        )
+    if parent_id == node_id:
+        raise ValidationError(
+            f"E1332: node '{node_id}' subprocess_parent cannot refer to itself"
+        )
 
-    for node in obj.nodes:
-        if (node.type or "").lower() != "subprocess":
-            continue
+
+def validate_subprocess_parent_cycles(index: IRIndex) -> None:
+    """Reject circular subprocess_parent chains."""
+    cyclic_ids = subprocess_hierarchy(index).cyclic_ids
+    if cyclic_ids:
+        raise ValidationError(
+            f"E1334: node '{cyclic_ids[0]}' participates in a circular subprocess_parent chain"
+        )
+
+
+def validate_subprocess_detail_refs(index: IRIndex) -> None:
+    """Validate detail-map reference metadata on subprocess nodes."""
+    for position in index.positions_of_type("subprocess"):
+        node = index.nodes[position]
         metadata = extract_node_metadata(node)
         for key, value in iter_subprocess_detail_map_reference_values(metadata):
             if not value:
@@ -48,25 +66,6 @@ def validate_subprocess_metadata(obj: IR) -> None:
                 )
 
 
-def _validate_subprocess_parent_cycles(*, obj: IR, nodes_by_id: dict[str, Any]) -> None:
-    for node in obj.nodes:
-        seen: set[str] = set()
-        current = node
-        while True:
-            parent_id = extract_subprocess_parent(current)
-            if parent_id is None:
-                break
-            if parent_id in seen:
-                raise ValidationError(
-                    f"E1334: node '{node.id}' participates in a circular subprocess_parent chain"
-                )
-            seen.add(parent_id)
-            parent = nodes_by_id.get(parent_id)
-            if parent is None:
-                break
-            current = parent
-
-
 def extract_subprocess_parent(node: Any) -> str | None:
     """Return normalized subprocess_parent for a node, if present."""
     attrs = getattr(node, "attrs", None)
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 from dataclasses import replace
 from pathlib import Path
-from typing import Any, Tuple
+from typing import Any, TextIO, Tuple
 
 from flo.services.errors import (
     CLIError,
@@ -24,8 +24,14 @@ from flo.adapters import parse_adapter
 from flo.compiler import compile_adapter
 from flo.compiler.ir import validate_ir, IR
 from flo.compiler.ir import ensure_schema_aligned
+from flo.compiler.ir.compact import compact_ir, ir_compact_enabled
 from flo.compiler.analysis import scc_condense
-from flo.render import RenderArtifact, render_artifact_and_contract, RenderOptions
+from flo.render import (
+    RenderArtifact,
+    RenderOptions,
+    render_artifact_and_contract,
+    render_artifact_to_stream,
+)
 from flo.export import export_ir
 from flo.core._flo_config import merge_diagrams_toml_sppm_defaults
 from flo.core._option_validation import (
@@ -33,8 +39,10 @@ from flo.core._option_validation import (
     ensure_render_options_compatible_with_output,
 )
 from flo.core._capability_validation import ensure_render_projection_supported
+from flo.core.ir_cache import default_ir_cache
 from flo.core.render_intent import RenderIntentResolver
-from flo.services.io import write_output
+from flo.services.io import atomic_output_stream
+from flo.services.telemetry import validate_with_rule_timings
 
 _FAIL_OPEN_SCC_PREFIX = "fail-open postprocess: scc_condense failed"
 
@@ -113,18 +121,19 @@ def _run_render_output(
     )
     ensure_render_projection_supported(render_options)
 
-    artifact, contract, warning = _render_artifact_with_postprocess(
-        ir,
-        render_options=render_options,
-    )
     if render_to:
-        _write_render_artifact(
-            artifact=artifact,
+        warning = _stream_render_artifact(
+            ir,
+            render_options=render_options,
             render_to=render_to,
-            contract=contract,
         )
         return EXIT_SUCCESS, "", warning or ""
 
+    artifact, contract, warning = _render_artifact_with_postprocess(
+        ir,
+        render_options=render_options,
+    )
+
     return (
         EXIT_SUCCESS,
         _render_artifact_for_stdout(
@@ -152,14 +161,42 @@ def _parse_compile_validate(content: str, source_path: str | None = None) -> IR:
         adapter_model = parse_adapter(content, source_path=source_path)
     except Exception as exc:
         raise ParseError(str(exc), error_stage="parse") from exc
+    return _compile_validate_cached(adapter_model)
+
+
+def _compile_validate_cached(adapter_model: Any) -> IR:
+    # The composed document determines everything below, so it is the key.
+    cache = default_ir_cache()
+    key = (
+        cache.key_for(adapter_model)
+        if cache is not None and isinstance(adapter_model, dict)
+        else None
+    )
+    if cache is not None and key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return _maybe_compact(cached)
+
+    ir = _compile_validate(adapter_model)
+    if cache is not None and key is not None and isinstance(ir, IR):
+        cache.put(key, ir)
+    return _maybe_compact(ir)
 
+
+def _maybe_compact(ir: IR) -> IR:
+    if isinstance(ir, IR) and ir_compact_enabled():
+        return compact_ir(ir)
+    return ir
+
+
+def _compile_validate(adapter_model: Any) -> IR:
     try:
         ir = compile_adapter(adapter_model)
     except Exception as exc:
         raise CompileError(str(exc), error_stage="compile") from exc
 
     try:
-        validate_ir(ir)
+        validate_with_rule_timings(validate_ir, ir)
     except ValidationError as exc:
         if getattr(exc, "error_stage", None) is None:
             exc.error_stage = "validate"
@@ -197,7 +234,7 @@ def _resolve_output_format(command: str, options: dict | None) -> str:
         return str(output_format)
     render_to = (options or {}).get("render_to")
     if output_format is None and isinstance(render_to, str):
-        if Path(render_to).suffix.lower() == ".svg":
+        if Path(render_to).suffix.lower() in {".svg", ".svgz"}:
             return "svg"
     return "svg"
 
@@ -322,9 +359,13 @@ def _collect_changed_inverted_boolean_overrides(
 
 
 def _render_artifact_with_postprocess(
-    ir: IR, render_options: RenderOptions
+    ir: IR, render_options: RenderOptions, sink: TextIO | None = None
 ) -> tuple[RenderArtifact, None, str | None]:
-    """SCC-condense then render, returning (artifact, backend contract)."""
+    """SCC-condense then render, returning (artifact, backend contract).
+
+    With ``sink`` the rendered content is streamed there instead of being
+    held in the returned artifact.
+    """
     processed = ir
     warning: str | None = None
 
@@ -336,34 +377,42 @@ def _render_artifact_with_postprocess(
         warning = f"{_FAIL_OPEN_SCC_PREFIX}: {exc}"
 
     try:
-        artifact, contract = render_artifact_and_contract(
-            processed, options=render_options
-        )
+        if sink is None:
+            artifact, contract = render_artifact_and_contract(
+                processed, options=render_options
+            )
+        else:
+            artifact, contract = render_artifact_to_stream(
+                processed, sink, options=render_options
+            )
     except Exception as e:
         raise RenderError(str(e))
 
     return artifact, contract, warning
 
 
-def _write_render_artifact(
-    *,
-    artifact: RenderArtifact,
-    render_to: str,
-    contract: None,
-) -> None:
-    kind = artifact.kind
-    content = artifact.content
-    if kind == "svg":
-        if Path(render_to).suffix.lower() != ".svg":
-            raise RenderError(
-                "Direct SVG rendering currently supports only .svg output paths. "
-                "Use a .svg target for rendered diagram output."
+def _stream_render_artifact(
+    ir: IR, *, render_options: RenderOptions, render_to: str
+) -> str | None:
+    """Render straight into ``render_to``; ``.svgz`` targets are gzip-compressed.
+
+    The file is replaced only after rendering succeeds, so a failed render
+    leaves any previous output in place.
+    """
+    suffix = Path(render_to).suffix.lower()
+    if suffix not in {".svg", ".svgz"}:
+        raise RenderError(
+            "Direct SVG rendering currently supports only .svg and .svgz output "
+            "paths. Use a .svg or .svgz target for rendered diagram output."
+        )
+    try:
+        with atomic_output_stream(render_to, compress=suffix == ".svgz") as sink:
+            _artifact, _contract, warning = _render_artifact_with_postprocess(
+                ir, render_options=render_options, sink=sink
             )
-        write_rc, write_err = write_output(content, render_to)
-        if write_rc != 0:
-            raise RenderError(write_err)
-        return
-    raise RenderError(f"Unsupported render artifact kind: {kind or 'unknown'}")
+    except OSError as e:
+        raise RenderError(f"I/O error writing {render_to}: {e}") from e
+    return warning
 
 
 def _render_artifact_for_stdout(
@@ -0,0 +1,120 @@
+"""Render options shared by the Click commands that render diagrams."""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import click
+from flo.core.render_option_schema import iter_render_option_specs
+
+
+def build_render_opts(
+    verbose: bool,
+    output: Optional[str],
+    export_fmt: Optional[str],
+    diagram: Optional[str],
+    render_backend: Optional[str],
+    profile: Optional[str],
+    detail: Optional[str],
+    orientation: Optional[str],
+    show_notes: bool,
+    no_header: bool,
+    no_footer: bool,
+    subprocess_view: Optional[str],
+    sppm_projection: Optional[str],
+    sppm_focus_subprocess: Optional[str],
+    spaghetti_channel: Optional[str],
+    spaghetti_people_mode: Optional[str],
+    sppm_theme: Optional[str],
+    layout_wrap: Optional[str],
+    layout_fit: Optional[str],
+    layout_spacing: Optional[str],
+    publication_page_format: Optional[str],
+    sppm_step_numbering: Optional[str],
+    sppm_label_density: Optional[str],
+    sppm_wrap_strategy: Optional[str],
+    sppm_truncation_policy: Optional[str],
+    sppm_output_profile: Optional[str],
+    render_to: Optional[str],
+    layout_max_width_px: Optional[str],
+    layout_target_columns: Optional[int],
+    sppm_max_label_step_name: Optional[int],
+    sppm_max_label_workers: Optional[int],
+    sppm_max_label_ctwt: Optional[int],
+    layout_engine: Optional[str],
+    no_layout_cache: bool,
+) -> dict:  # pragma: no cover - thin helper
+    """Build a normalized options dict from Click-parsed render parameters."""
+    opts: dict = {"verbose": verbose, "output": output}
+    if export_fmt:
+        opts["export"] = export_fmt
+    for key, value in (
+        ("diagram", diagram),
+        ("render_backend", render_backend),
+        ("profile", profile),
+        ("detail", detail),
+        ("orientation", orientation),
+        ("subprocess_view", subprocess_view),
+        ("sppm_projection", sppm_projection),
+        ("sppm_focus_subprocess", sppm_focus_subprocess),
+        ("spaghetti_channel", spaghetti_channel),
+        ("spaghetti_people_mode", spaghetti_people_mode),
+        ("sppm_theme", sppm_theme),
+        ("layout_wrap", layout_wrap),
+        ("layout_fit", layout_fit),
+        ("layout_spacing", layout_spacing),
+        ("publication_page_format", publication_page_format),
+        ("sppm_step_numbering", sppm_step_numbering),
+        ("sppm_label_density", sppm_label_density),
+        ("sppm_wrap_strategy", sppm_wrap_strategy),
+        ("sppm_truncation_policy", sppm_truncation_policy),
+        ("sppm_output_profile", sppm_output_profile),
+        ("layout_engine", layout_engine),
+        ("render_to", render_to),
+    ):
+        if value is not None:
+            opts[key] = value
+    for key, value in (
+        ("layout_max_width_px", layout_max_width_px),
+        ("layout_target_columns", layout_target_columns),
+        ("sppm_max_label_step_name", sppm_max_label_step_name),
+        ("sppm_max_label_workers", sppm_max_label_workers),
+        ("sppm_max_label_ctwt", sppm_max_label_ctwt),
+    ):
+        if value is not None:
+            opts[key] = value
+    if show_notes:
+        opts["show_notes"] = True
+    if no_header:
+        opts["no_header"] = True
+    if no_footer:
+        opts["no_footer"] = True
+    if no_layout_cache:
+        opts["no_layout_cache"] = True
+    return opts
+
+
+def apply_render_click_options(*, include_render_to: bool) -> Any:
+    """Apply shared render click options from the canonical option schema."""
+
+    def _decorator(func: Any) -> Any:
+        for spec in reversed(
+            iter_render_option_specs(include_render_to=include_render_to)
+        ):
+            kwargs: dict[str, Any] = {"help": spec.help_text}
+            if spec.is_flag:
+                kwargs["is_flag"] = True
+            else:
+                if spec.choices is not None:
+                    kwargs["type"] = click.Choice(list(spec.choices))
+                elif spec.value_type is not None:
+                    kwargs["type"] = spec.value_type
+                if spec.metavar is not None:
+                    kwargs["metavar"] = spec.metavar
+            func = click.option(spec.flag, **kwargs)(func)
+        return func
+
+    return _decorator
+
+
+__all__ = ["apply_render_click_options", "build_render_opts"]
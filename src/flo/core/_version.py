@@ -0,0 +1,18 @@
+"""Installed FLO distribution version lookup."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import importlib.metadata
+
+# The import package is ``flo``; the distribution in pyproject.toml is not.
+DISTRIBUTION_NAME = "flo-lang"
+
+
+@lru_cache(maxsize=1)
+def flo_version() -> str:
+    """Return the installed FLO version or 'unknown' when not resolvable."""
+    try:
+        return importlib.metadata.version(DISTRIBUTION_NAME)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
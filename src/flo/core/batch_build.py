@@ -0,0 +1,399 @@
+"""Batch rendering of a whole tree of FLO models (`flo build`).
+
+Discovers `.flo` sources under a root directory, skips include-only fragments,
+and renders each remaining model through the same pipeline as `flo render`
+(``run_content``) into a mirrored output tree. With ``jobs > 1`` models are
+spread over a process pool; every process, including the parent in the
+sequential case, keeps one persistent ELK worker alive for all of its models
+so Node.js and elkjs load once per process instead of once per diagram.
+
+Given a ``BuildManifest``, builds are incremental: sources whose content,
+include closure, ``diagrams.toml``, and render options are unchanged since the
+last successful build are reported as skipped instead of re-rendered.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, replace
+import os
+from pathlib import Path
+import time
+from typing import Any, Iterator, Literal
+
+import yaml
+
+from flo.adapters import (
+    include_closure,
+    include_refs,
+    load_yaml,
+    resolve_include_path,
+)
+from flo.adapters.include_cache import include_cache_counters
+from flo.core._flo_config import _resolve_diagrams_toml_path
+from flo.core.build_manifest import (
+    BuildInputs,
+    BuildManifest,
+    file_digest,
+    options_fingerprint,
+)
+from flo.errors import DomainError, ParseError
+
+BuildStatus = Literal["ok", "failed", "skipped"]
+
+_ENV_ELK_ENGINE = "FLO_ELK_ENGINE"
+_SUMMARY_STATUS = {"ok": "ok  ", "failed": "FAIL", "skipped": "skip"}
+
+
+@dataclass(frozen=True)
+class BuildResult:
+    """Outcome of building one source file."""
+
+    source: str
+    output: str
+    status: BuildStatus
+    seconds: float
+    error: str | None = None
+    warning: str | None = None
+    dependencies: tuple[str, ...] = ()
+    dependency_digests: tuple[str, ...] = ()
+    include_cache_hits: int = 0
+    include_cache_misses: int = 0
+
+
+@dataclass
+class BuildReport:
+    """Per-file results plus totals for one `flo build` run."""
+
+    source_root: str
+    output_root: str
+    jobs: int
+    results: list[BuildResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def failures(self) -> list[BuildResult]:
+        """Return the results that did not produce an output file."""
+        return [result for result in self.results if result.status == "failed"]
+
+    @property
+    def built(self) -> list[BuildResult]:
+        """Return the results that were rendered in this run."""
+        return [result for result in self.results if result.status == "ok"]
+
+    @property
+    def skipped(self) -> list[BuildResult]:
+        """Return the results that were up to date and not rebuilt."""
+        return [result for result in self.results if result.status == "skipped"]
+
+    @property
+    def ok(self) -> bool:
+        """Return True when every discovered source built successfully."""
+        return not self.failures
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable report."""
+        return {
+            "source_root": self.source_root,
+            "output_root": self.output_root,
+            "jobs": self.jobs,
+            "seconds": round(self.seconds, 4),
+            "total": len(self.results),
+            "succeeded": len(self.built),
+            "failed": len(self.failures),
+            "skipped": len(self.skipped),
+            "include_cache": {
+                "hits": sum(result.include_cache_hits for result in self.results),
+                "misses": sum(result.include_cache_misses for result in self.results),
+            },
+            "results": [_result_dict(result) for result in self.results],
+        }
+
+
+def _result_dict(result: BuildResult) -> dict[str, Any]:
+    data = asdict(result)
+    del data["dependency_digests"]
+    data["seconds"] = round(result.seconds, 4)
+    return data
+
+
+def discover_flo_sources(source_root: Path) -> list[Path]:
+    """Return buildable `.flo` files under ``source_root``, sorted.
+
+    Files referenced from another file's ``include``/``includes`` key are
+    fragments rather than standalone models and are skipped.
+    """
+    files = sorted(path for path in source_root.rglob("*.flo") if path.is_file())
+    included = collect_included_files(files)
+    return [path for path in files if path.resolve() not in included]
+
+
+def collect_included_files(files: list[Path]) -> set[Path]:
+    """Return the resolved paths in ``files`` that another file includes."""
+    file_set = {path.resolve() for path in files}
+    included: set[Path] = set()
+    for path in files:
+        for include_ref in _include_refs_from_file(path):
+            include_path = resolve_include_path(include_ref, current_path=path)
+            if include_path in file_set:
+                included.add(include_path)
+    return included
+
+
+def build_tree(
+    source_root: Path,
+    output_root: Path,
+    *,
+    jobs: int = 1,
+    options: dict[str, Any] | None = None,
+    sources: list[Path] | None = None,
+    manifest: BuildManifest | None = None,
+    force: bool = False,
+) -> BuildReport:
+    """Render every buildable source under ``source_root`` into ``output_root``.
+
+    Each ``<source_root>/a/b.flo`` is written to ``<output_root>/a/b.svg``.
+    ``options`` are render options as accepted by ``flo render``. A failing
+    model is recorded in the report and does not stop the others. With a
+    ``manifest``, up-to-date sources are skipped and the manifest is updated
+    (but not saved) with the inputs of every successful build; ``force``
+    rebuilds everything while still refreshing the manifest.
+    """
+    started = time.perf_counter()
+    selected = sources if sources is not None else discover_flo_sources(source_root)
+    render_options = dict(options or {})
+    options_digest = options_fingerprint(render_options)
+    report = BuildReport(
+        source_root=str(source_root),
+        output_root=str(output_root),
+        jobs=max(1, jobs),
+    )
+    planned: dict[str, BuildInputs] = {}
+    tasks: list[tuple[str, str, str, dict[str, Any]]] = []
+    results: dict[str, BuildResult] = {}
+    for path in selected:
+        label = path.relative_to(source_root).as_posix()
+        output = str(output_path_for(path, source_root, output_root))
+        inputs = _probe_inputs(path, output, options_digest)
+        planned[label] = inputs
+        if manifest is not None and not force and manifest.is_up_to_date(label, inputs):
+            results[label] = BuildResult(
+                source=label, output=output, status="skipped", seconds=0.0
+            )
+        else:
+            tasks.append((str(path), output, label, render_options))
+    for result in _run_tasks(tasks, jobs=report.jobs):
+        results[result.source] = result
+    report.results = [results[label] for label in planned]
+    if manifest is not None:
+        _update_manifest(manifest, report.results, planned)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def build_depfile_rules(
+    report: BuildReport, manifest: BuildManifest | None = None
+) -> list[tuple[str, list[str]]]:
+    """Return ``(output, inputs)`` rules for a make/ninja depfile.
+
+    Targets and inputs are both absolute, resolved paths.
+    """
+    source_root = Path(report.source_root)
+    rules = []
+    for result in report.results:
+        deps = manifest.dependencies(result.source) if manifest is not None else []
+        if not deps:
+            deps = [
+                str((source_root / result.source).resolve()),
+                *result.dependencies,
+            ]
+        rules.append((str(Path(result.output).resolve()), deps))
+    return rules
+
+
+def output_path_for(source: Path, source_root: Path, output_root: Path) -> Path:
+    """Map a source file onto its mirrored SVG path under ``output_root``."""
+    return (output_root / source.relative_to(source_root)).with_suffix(".svg")
+
+
+def format_build_summary(report: BuildReport) -> list[str]:
+    """Return human-readable per-file timing lines followed by a total line."""
+    lines = []
+    for result in report.results:
+        status = _SUMMARY_STATUS[result.status]
+        line = f"{status} {result.seconds * 1000:8.1f} ms  {result.source}"
+        if result.error:
+            line += f"  ({result.error})"
+        lines.append(line)
+    lines.append(
+        f"Built {len(report.built)}/{len(report.results) - len(report.skipped)}"
+        f" file(s) in {report.seconds:.2f}s with {report.jobs} job(s);"
+        f" {len(report.skipped)} up to date, {len(report.failures)} failure(s)."
+    )
+    return lines
+
+
+def _run_tasks(
+    tasks: list[tuple[str, str, str, dict[str, Any]]], *, jobs: int
+) -> list[BuildResult]:
+    if jobs == 1 or len(tasks) < 2:
+        with _persistent_elk_engine():
+            return [_build_one(*task) for task in tasks]
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(tasks)),
+        initializer=_init_build_process,
+    ) as executor:
+        return list(executor.map(_build_one_task, tasks))
+
+
+def _probe_inputs(source: Path, output: str, options_digest: str) -> BuildInputs:
+    """Hash the inputs known before building: the source and its config."""
+    source_key = str(source.resolve())
+    files = {source_key: file_digest(source) or ""}
+    config = _resolve_diagrams_toml_path({"source_path": str(source)})
+    config_key = str(config) if config is not None else None
+    if config is not None:
+        files[str(config)] = file_digest(config) or ""
+    return BuildInputs(
+        output=output, config=config_key, options=options_digest, files=files
+    )
+
+
+def _update_manifest(
+    manifest: BuildManifest,
+    results: list[BuildResult],
+    planned: dict[str, BuildInputs],
+) -> None:
+    for result in results:
+        if result.status == "failed":
+            manifest.forget(result.source)
+        elif result.status == "ok":
+            inputs = planned[result.source]
+            files = dict(inputs.files)
+            files.update(zip(result.dependencies, result.dependency_digests))
+            manifest.record(result.source, replace(inputs, files=files))
+    manifest.retain(planned)
+
+
+def _build_one_task(task: tuple[str, str, str, dict[str, Any]]) -> BuildResult:
+    return _build_one(*task)
+
+
+def _build_one(
+    source: str, output: str, label: str, options: dict[str, Any]
+) -> BuildResult:
+    hits, misses = include_cache_counters()
+    result = _render_one(source, output, label, options)
+    after_hits, after_misses = include_cache_counters()
+    return replace(
+        result,
+        include_cache_hits=after_hits - hits,
+        include_cache_misses=after_misses - misses,
+    )
+
+
+def _render_one(
+    source: str, output: str, label: str, options: dict[str, Any]
+) -> BuildResult:
+    from flo.core import run_content
+
+    started = time.perf_counter()
+    try:
+        content = Path(source).read_text(encoding="utf-8")
+        # Hash the include closure before rendering: an edit made while the
+        # render runs must leave a stale digest behind, not an up-to-date one.
+        dependencies = _include_dependencies(content, source)
+        digests = tuple(file_digest(Path(dep)) or "" for dep in dependencies)
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        rc, _out, err = run_content(
+            content,
+            command="render",
+            options={**options, "source_path": source, "render_to": output},
+        )
+    except (DomainError, OSError, UnicodeDecodeError) as exc:
+        return BuildResult(
+            source=label,
+            output=output,
+            status="failed",
+            seconds=time.perf_counter() - started,
+            error=str(exc) or type(exc).__name__,
+        )
+    elapsed = time.perf_counter() - started
+    if rc != 0:
+        return BuildResult(
+            source=label,
+            output=output,
+            status="failed",
+            seconds=elapsed,
+            error=err or f"exit code {rc}",
+        )
+    return BuildResult(
+        source=label,
+        output=output,
+        status="ok",
+        seconds=elapsed,
+        warning=err or None,
+        dependencies=dependencies,
+        dependency_digests=digests,
+    )
+
+
+def _include_dependencies(content: str, source: str) -> tuple[str, ...]:
+    try:
+        document = load_yaml(content)
+        if not isinstance(document, dict):
+            return ()
+        return tuple(str(path) for path in include_closure(document, source))
+    except (yaml.YAMLError, ValueError) as exc:
+        raise ParseError(str(exc), error_stage="parse") from exc
+
+
+def _init_build_process() -> None:
+    """Keep one ELK worker alive per pool process unless an engine was chosen."""
+    if _default_elk_engine_selected():
+        os.environ[_ENV_ELK_ENGINE] = "worker"
+
+
+@contextmanager
+def _persistent_elk_engine() -> Iterator[None]:
+    if not _default_elk_engine_selected():
+        yield
+        return
+    from flo.render.layout_core import (
+        shared_elk_worker,
+        shutdown_shared_elk_worker,
+        use_elk_engine,
+    )
+
+    try:
+        with use_elk_engine(shared_elk_worker()):
+            yield
+    finally:
+        shutdown_shared_elk_worker()
+
+
+def _default_elk_engine_selected() -> bool:
+    return os.getenv(_ENV_ELK_ENGINE, "").strip().lower() in {"", "subprocess"}
+
+
+def _include_refs_from_file(path: Path) -> list[str]:
+    # A file that cannot be read or parsed stays a build source, so its own
+    # render reports the error instead of discovery dropping it silently.
+    try:
+        parsed = load_yaml(path.read_text(encoding="utf-8"))
+        return include_refs(parsed) if isinstance(parsed, dict) else []
+    except OSError, UnicodeDecodeError, yaml.YAMLError, ValueError:
+        return []
+
+
+__all__ = [
+    "BuildReport",
+    "BuildResult",
+    "build_depfile_rules",
+    "build_tree",
+    "collect_included_files",
+    "discover_flo_sources",
+    "format_build_summary",
+    "output_path_for",
+]
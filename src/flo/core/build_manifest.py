@@ -0,0 +1,177 @@
+"""Content-hash manifest and depfiles for incremental `flo build` runs.
+
+For every successfully built source the manifest records the SHA-256 of each
+input that can change its output: the source file itself, every file in its
+include closure (``adapters.include_closure``), and the ``diagrams.toml`` that
+``_resolve_diagrams_toml_path`` picks for it. It also records a fingerprint of
+the render options and the FLO version. A later build skips a source when its
+output still exists and none of those inputs changed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+MANIFEST_FILENAME = ".flo-build-manifest.json"
+_MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True)
+class BuildInputs:
+    """Everything a single output depends on, with content hashes."""
+
+    output: str
+    config: str | None
+    options: str
+    files: dict[str, str]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the manifest entry for these inputs."""
+        return {
+            "output": self.output,
+            "config": self.config,
+            "options": self.options,
+            "files": dict(self.files),
+        }
+
+
+class BuildManifest:
+    """Per-source input hashes persisted next to the build outputs."""
+
+    def __init__(
+        self,
+        path: Path,
+        entries: dict[str, dict[str, Any]] | None = None,
+        *,
+        toolchain: str = "",
+    ) -> None:
+        """Create a manifest stored at ``path``."""
+        self.path = path
+        self.toolchain = toolchain
+        self._entries: dict[str, dict[str, Any]] = dict(entries or {})
+
+    @classmethod
+    def load(cls, path: Path, *, toolchain: str) -> "BuildManifest":
+        """Read ``path``; start empty if it is missing, corrupt, or stale."""
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except OSError, ValueError:
+            return cls(path, toolchain=toolchain)
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != _MANIFEST_VERSION
+            or data.get("toolchain") != toolchain
+            or not isinstance(data.get("entries"), dict)
+        ):
+            return cls(path, toolchain=toolchain)
+        return cls(path, data["entries"], toolchain=toolchain)
+
+    def is_up_to_date(self, source: str, inputs: BuildInputs) -> bool:
+        """Return True when ``source`` was built from exactly these inputs.
+
+        ``inputs.files`` only needs the source and config hashes; the recorded
+        include closure is re-hashed from disk, since the closure can only
+        change if one of its recorded members (or the source) changed.
+        """
+        entry = self._entries.get(source)
+        if not isinstance(entry, dict):
+            return False
+        if (
+            entry.get("output") != inputs.output
+            or entry.get("config") != inputs.config
+            or entry.get("options") != inputs.options
+            or not Path(inputs.output).is_file()
+        ):
+            return False
+        recorded = entry.get("files")
+        if not isinstance(recorded, dict):
+            return False
+        for path, digest in inputs.files.items():
+            if recorded.get(path) != digest:
+                return False
+        return all(
+            file_digest(Path(path)) == digest
+            for path, digest in recorded.items()
+            if path not in inputs.files
+        )
+
+    def record(self, source: str, inputs: BuildInputs) -> None:
+        """Remember the inputs ``source`` was just built from."""
+        self._entries[source] = inputs.to_dict()
+
+    def forget(self, source: str) -> None:
+        """Drop ``source`` so its next build always runs."""
+        self._entries.pop(source, None)
+
+    def retain(self, sources: Iterable[str]) -> None:
+        """Drop entries for sources that no longer exist."""
+        keep = set(sources)
+        self._entries = {
+            source: entry for source, entry in self._entries.items() if source in keep
+        }
+
+    def dependencies(self, source: str) -> list[str]:
+        """Return the recorded input files of ``source``."""
+        entry = self._entries.get(source) or {}
+        return list((entry.get("files") or {}).keys())
+
+    def output_for(self, source: str) -> str | None:
+        """Return the recorded output path of ``source``."""
+        entry = self._entries.get(source) or {}
+        return entry.get("output")
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": _MANIFEST_VERSION,
+            "toolchain": self.toolchain,
+            "entries": dict(sorted(self._entries.items())),
+        }
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def file_digest(path: Path) -> str | None:
+    """Return the SHA-256 hex digest of ``path``, or None if it is unreadable."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def options_fingerprint(options: dict[str, Any]) -> str:
+    """Return a stable digest of render options."""
+    encoded = json.dumps(options, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def write_depfile(path: Path, rules: Iterable[tuple[str, list[str]]]) -> None:
+    """Write a make/ninja compatible depfile with one rule per output."""
+    lines = [
+        f"{_escape_depfile_path(target)}:"
+        + "".join(f" \\\n  {_escape_depfile_path(dep)}" for dep in deps)
+        for target, deps in rules
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+
+
+def _escape_depfile_path(path: str) -> str:
+    return path.replace(" ", "\\ ").replace("#", "\\#").replace("$", "$$")
+
+
+__all__ = [
+    "BuildInputs",
+    "BuildManifest",
+    "MANIFEST_FILENAME",
+    "file_digest",
+    "options_fingerprint",
+    "write_depfile",
+]
@@ -7,7 +7,13 @@ import uuid
 from typing import Any, Optional
 
 import click
-from flo.core.render_option_schema import iter_render_option_specs
+from flo.core._cli_render_options import (
+    apply_render_click_options,
+    build_render_opts,
+)
+from flo.core.cli_build import build_cmd, watch_cmd
+from flo.core.cli_cache import cache_group
+from flo.core.cli_trace import trace_group
 from structlog.contextvars import bind_contextvars, unbind_contextvars
 
 
@@ -38,14 +44,11 @@ def _emit_error(services: Any, message: str, **event_fields: object) -> None:
                 pass
 
 
-def _get_flo_version() -> str:  # pragma: no cover - importlib optional
+def _get_flo_version() -> str:
     """Return the installed FLO version or 'unknown' when not resolvable."""
-    try:
-        import importlib.metadata as _meta
+    from flo.core._version import flo_version
 
-        return _meta.version("flo")
-    except Exception:
-        return "unknown"
+    return flo_version()
 
 
 def _safe_set_span_attr(span: Any, key: str, value: object) -> None:
@@ -350,110 +353,6 @@ def _execute_request(request: Any) -> int:  # pragma: no cover - integration
             pass
 
 
-def _build_render_opts(
-    verbose: bool,
-    output: Optional[str],
-    export_fmt: Optional[str],
-    diagram: Optional[str],
-    render_backend: Optional[str],
-    profile: Optional[str],
-    detail: Optional[str],
-    orientation: Optional[str],
-    show_notes: bool,
-    no_header: bool,
-    no_footer: bool,
-    subprocess_view: Optional[str],
-    sppm_projection: Optional[str],
-    sppm_focus_subprocess: Optional[str],
-    spaghetti_channel: Optional[str],
-    spaghetti_people_mode: Optional[str],
-    sppm_theme: Optional[str],
-    layout_wrap: Optional[str],
-    layout_fit: Optional[str],
-    layout_spacing: Optional[str],
-    publication_page_format: Optional[str],
-    sppm_step_numbering: Optional[str],
-    sppm_label_density: Optional[str],
-    sppm_wrap_strategy: Optional[str],
-    sppm_truncation_policy: Optional[str],
-    sppm_output_profile: Optional[str],
-    render_to: Optional[str],
-    layout_max_width_px: Optional[str],
-    layout_target_columns: Optional[int],
-    sppm_max_label_step_name: Optional[int],
-    sppm_max_label_workers: Optional[int],
-    sppm_max_label_ctwt: Optional[int],
-) -> dict:  # pragma: no cover - thin helper
-    """Build a normalized options dict from Click-parsed render parameters."""
-    opts: dict = {"verbose": verbose, "output": output}
-    if export_fmt:
-        opts["export"] = export_fmt
-    for key, value in (
-        ("diagram", diagram),
-        ("render_backend", render_backend),
-        ("profile", profile),
-        ("detail", detail),
-        ("orientation", orientation),
-        ("subprocess_view", subprocess_view),
-        ("sppm_projection", sppm_projection),
-        ("sppm_focus_subprocess", sppm_focus_subprocess),
-        ("spaghetti_channel", spaghetti_channel),
-        ("spaghetti_people_mode", spaghetti_people_mode),
-        ("sppm_theme", sppm_theme),
-        ("layout_wrap", layout_wrap),
-        ("layout_fit", layout_fit),
-        ("layout_spacing", layout_spacing),
-        ("publication_page_format", publication_page_format),
-        ("sppm_step_numbering", sppm_step_numbering),
-        ("sppm_label_density", sppm_label_density),
-        ("sppm_wrap_strategy", sppm_wrap_strategy),
-        ("sppm_truncation_policy", sppm_truncation_policy),
-        ("sppm_output_profile", sppm_output_profile),
-        ("render_to", render_to),
-    ):
-        if value is not None:
-            opts[key] = value
-    for key, value in (
-        ("layout_max_width_px", layout_max_width_px),
-        ("layout_target_columns", layout_target_columns),
-        ("sppm_max_label_step_name", sppm_max_label_step_name),
-        ("sppm_max_label_workers", sppm_max_label_workers),
-        ("sppm_max_label_ctwt", sppm_max_label_ctwt),
-    ):
-        if value is not None:
-            opts[key] = value
-    if show_notes:
-        opts["show_notes"] = True
-    if no_header:
-        opts["no_header"] = True
-    if no_footer:
-        opts["no_footer"] = True
-    return opts
-
-
-def _apply_render_click_options(*, include_render_to: bool) -> Any:
-    """Apply shared render click options from the canonical option schema."""
-
-    def _decorator(func: Any) -> Any:
-        for spec in reversed(
-            iter_render_option_specs(include_render_to=include_render_to)
-        ):
-            kwargs: dict[str, Any] = {"help": spec.help_text}
-            if spec.is_flag:
-                kwargs["is_flag"] = True
-            else:
-                if spec.choices is not None:
-                    kwargs["type"] = click.Choice(list(spec.choices))
-                elif spec.value_type is not None:
-                    kwargs["type"] = spec.value_type
-                if spec.metavar is not None:
-                    kwargs["metavar"] = spec.metavar
-            func = click.option(spec.flag, **kwargs)(func)
-        return func
-
-    return _decorator
-
-
 # ---------------------------------------------------------------------------
 # Click command group
 # ---------------------------------------------------------------------------
@@ -476,7 +375,7 @@ def cli() -> None:  # pragma: no cover - thin CLI layer
     type=click.Choice(["svg", "json", "ingredients", "movement"]),
     help="Export format (svg for diagrams, json for machine-readable output)",
 )
-@_apply_render_click_options(include_render_to=True)
+@apply_render_click_options(include_render_to=True)
 def render_cmd(
     path: Optional[str],
     validate: bool,
@@ -512,12 +411,14 @@ def render_cmd(
     sppm_max_label_ctwt: Optional[int],
     sppm_output_profile: Optional[str],
     render_to: Optional[str],
+    layout_engine: Optional[str],
+    no_layout_cache: bool,
 ) -> None:  # pragma: no cover - integration
     """Render a FLO diagram as SVG by default."""
     from flo.core._cli_contract import CLIExecutionRequest
 
     command = "validate" if validate else "render"
-    opts = _build_render_opts(
+    opts = build_render_opts(
         verbose=verbose,
         output=output,
         export_fmt=export_fmt,
@@ -550,6 +451,8 @@ def render_cmd(
         sppm_max_label_step_name=sppm_max_label_step_name,
         sppm_max_label_workers=sppm_max_label_workers,
         sppm_max_label_ctwt=sppm_max_label_ctwt,
+        layout_engine=layout_engine,
+        no_layout_cache=no_layout_cache,
     )
     rc = _execute_request(CLIExecutionRequest(path=path, command=command, options=opts))
     raise SystemExit(rc)
@@ -582,7 +485,7 @@ def validate_cmd(
 )
 @click.option("-v", "--verbose", is_flag=True, help="Verbose output")
 @click.option("-o", "--output", help="Write output to file")
-@_apply_render_click_options(include_render_to=False)
+@apply_render_click_options(include_render_to=False)
 def export_cmd(
     path: Optional[str],
     export_fmt: str,
@@ -616,11 +519,13 @@ def export_cmd(
     sppm_max_label_workers: Optional[int],
     sppm_max_label_ctwt: Optional[int],
     sppm_output_profile: Optional[str],
+    layout_engine: Optional[str],
+    no_layout_cache: bool,
 ) -> None:  # pragma: no cover - integration
     """Export FLO input as SVG, JSON, or text summaries."""
     from flo.core._cli_contract import CLIExecutionRequest
 
-    opts = _build_render_opts(
+    opts = build_render_opts(
         verbose=verbose,
         output=output,
         export_fmt=export_fmt,
@@ -653,6 +558,8 @@ def export_cmd(
         sppm_max_label_step_name=sppm_max_label_step_name,
         sppm_max_label_workers=sppm_max_label_workers,
         sppm_max_label_ctwt=sppm_max_label_ctwt,
+        layout_engine=layout_engine,
+        no_layout_cache=no_layout_cache,
     )
     rc = _execute_request(
         CLIExecutionRequest(path=path, command="export", options=opts)
@@ -660,6 +567,27 @@ def export_cmd(
     raise SystemExit(rc)
 
 
+cli.add_command(build_cmd)
+cli.add_command(cache_group)
+cli.add_command(trace_group)
+cli.add_command(watch_cmd)
+
+# Maintenance commands that only exist on the Click group.
+_CLICK_ONLY_COMMANDS = frozenset({"build", "cache", "trace", "watch"})
+
+
+def _run_click_command(argv: list[str]) -> int:
+    """Dispatch a Click-only command from the argparse-based entry point."""
+    try:
+        rc = cli.main(args=argv, prog_name="flo", standalone_mode=False)
+    except click.ClickException as exc:
+        exc.show()
+        return exc.exit_code
+    except click.Abort:
+        return 1
+    return rc if isinstance(rc, int) else 0
+
+
 # ---------------------------------------------------------------------------
 # Argparse-based entry (for `flo <path>` without explicit subcommand)
 # ---------------------------------------------------------------------------
@@ -675,6 +603,8 @@ def console_main(argv: list | None = None) -> int:
 
     if argv is None:
         argv = sys.argv[1:]
+    if argv and argv[0] in _CLICK_ONLY_COMMANDS:
+        return _run_click_command(list(argv))
 
     try:
         parsed = parse_cli_args(argv)
@@ -0,0 +1,284 @@
+"""`flo build` and `flo watch` commands that keep SVG outputs up to date."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import click
+from flo.core._cli_render_options import (
+    apply_render_click_options,
+    build_render_opts,
+)
+
+
+@click.command("build")
+@click.argument(
+    "source_dir", type=click.Path(exists=True, file_okay=False, path_type=Path)
+)
+@click.option(
+    "-o",
+    "--out-dir",
+    "out_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    required=True,
+    help="Directory that receives the mirrored SVG tree",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes",
+)
+@click.option(
+    "--report",
+    "report_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write a JSON build report to this file",
+)
+@click.option(
+    "--depfile",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write a make/ninja depfile listing each output's inputs",
+)
+@click.option(
+    "--manifest",
+    "manifest_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Build manifest location (default: OUT_DIR/.flo-build-manifest.json)",
+)
+@click.option("--force", is_flag=True, help="Rebuild even up-to-date outputs")
+@click.option("--json", "as_json", is_flag=True, help="Print the report as JSON")
+@apply_render_click_options(include_render_to=False)
+def build_cmd(
+    source_dir: Path,
+    out_dir: Path,
+    jobs: int,
+    report_path: Optional[Path],
+    depfile: Optional[Path],
+    manifest_path: Optional[Path],
+    force: bool,
+    as_json: bool,
+    diagram: Optional[str],
+    render_backend: Optional[str],
+    profile: Optional[str],
+    detail: Optional[str],
+    orientation: Optional[str],
+    show_notes: bool,
+    no_header: bool,
+    no_footer: bool,
+    subprocess_view: Optional[str],
+    sppm_projection: Optional[str],
+    sppm_focus_subprocess: Optional[str],
+    spaghetti_channel: Optional[str],
+    spaghetti_people_mode: Optional[str],
+    sppm_theme: Optional[str],
+    layout_wrap: Optional[str],
+    layout_fit: Optional[str],
+    layout_spacing: Optional[str],
+    publication_page_format: Optional[str],
+    sppm_step_numbering: Optional[str],
+    sppm_label_density: Optional[str],
+    sppm_wrap_strategy: Optional[str],
+    sppm_truncation_policy: Optional[str],
+    layout_max_width_px: Optional[str],
+    layout_target_columns: Optional[int],
+    sppm_max_label_step_name: Optional[int],
+    sppm_max_label_workers: Optional[int],
+    sppm_max_label_ctwt: Optional[int],
+    sppm_output_profile: Optional[str],
+    layout_engine: Optional[str],
+    no_layout_cache: bool,
+) -> None:  # pragma: no cover - thin CLI layer
+    """Render every .flo model under SOURCE_DIR into a mirrored SVG tree.
+
+    Outputs whose source, includes, diagrams.toml, and options are unchanged
+    since the previous build are skipped.
+    """
+    import json
+
+    from flo.core.batch_build import (
+        build_depfile_rules,
+        build_tree,
+        format_build_summary,
+    )
+    from flo.core._version import flo_version
+    from flo.core.build_manifest import MANIFEST_FILENAME, BuildManifest, write_depfile
+
+    opts = build_render_opts(
+        verbose=False,
+        output=None,
+        export_fmt=None,
+        diagram=diagram,
+        render_backend=render_backend,
+        profile=profile,
+        detail=detail,
+        orientation=orientation,
+        show_notes=show_notes,
+        no_header=no_header,
+        no_footer=no_footer,
+        subprocess_view=subprocess_view,
+        sppm_projection=sppm_projection,
+        sppm_focus_subprocess=sppm_focus_subprocess,
+        spaghetti_channel=spaghetti_channel,
+        spaghetti_people_mode=spaghetti_people_mode,
+        sppm_theme=sppm_theme,
+        layout_wrap=layout_wrap,
+        layout_fit=layout_fit,
+        layout_spacing=layout_spacing,
+        publication_page_format=publication_page_format,
+        sppm_step_numbering=sppm_step_numbering,
+        sppm_label_density=sppm_label_density,
+        sppm_wrap_strategy=sppm_wrap_strategy,
+        sppm_truncation_policy=sppm_truncation_policy,
+        sppm_output_profile=sppm_output_profile,
+        render_to=None,
+        layout_max_width_px=layout_max_width_px,
+        layout_target_columns=layout_target_columns,
+        sppm_max_label_step_name=sppm_max_label_step_name,
+        sppm_max_label_workers=sppm_max_label_workers,
+        sppm_max_label_ctwt=sppm_max_label_ctwt,
+        layout_engine=layout_engine,
+        no_layout_cache=no_layout_cache,
+    )
+    manifest = BuildManifest.load(
+        manifest_path or out_dir / MANIFEST_FILENAME, toolchain=flo_version()
+    )
+    report = build_tree(
+        source_dir, out_dir, jobs=jobs, options=opts, manifest=manifest, force=force
+    )
+    manifest.save()
+    if depfile is not None:
+        write_depfile(depfile, build_depfile_rules(report, manifest))
+    payload = json.dumps(report.to_dict(), indent=2)
+    if report_path is not None:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(payload + "\n", encoding="utf-8")
+    if as_json:
+        click.echo(payload)
+    else:
+        for line in format_build_summary(report):
+            click.echo(line)
+    if not report.ok:
+        click.get_current_context().exit(1)
+
+
+@click.command("watch")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="SVG file to keep up to date (default: PATH with a .svg suffix)",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0.01),
+    default=0.25,
+    show_default=True,
+    help="Seconds between checks of the watched files",
+)
+@click.option(
+    "--debounce",
+    type=click.FloatRange(min=0.0),
+    default=0.2,
+    show_default=True,
+    help="Quiet period in seconds after a change before rebuilding",
+)
+@apply_render_click_options(include_render_to=False)
+def watch_cmd(
+    path: Path,
+    output: Optional[Path],
+    interval: float,
+    debounce: float,
+    diagram: Optional[str],
+    render_backend: Optional[str],
+    profile: Optional[str],
+    detail: Optional[str],
+    orientation: Optional[str],
+    show_notes: bool,
+    no_header: bool,
+    no_footer: bool,
+    subprocess_view: Optional[str],
+    sppm_projection: Optional[str],
+    sppm_focus_subprocess: Optional[str],
+    spaghetti_channel: Optional[str],
+    spaghetti_people_mode: Optional[str],
+    sppm_theme: Optional[str],
+    layout_wrap: Optional[str],
+    layout_fit: Optional[str],
+    layout_spacing: Optional[str],
+    publication_page_format: Optional[str],
+    sppm_step_numbering: Optional[str],
+    sppm_label_density: Optional[str],
+    sppm_wrap_strategy: Optional[str],
+    sppm_truncation_policy: Optional[str],
+    layout_max_width_px: Optional[str],
+    layout_target_columns: Optional[int],
+    sppm_max_label_step_name: Optional[int],
+    sppm_max_label_workers: Optional[int],
+    sppm_max_label_ctwt: Optional[int],
+    sppm_output_profile: Optional[str],
+    layout_engine: Optional[str],
+    no_layout_cache: bool,
+) -> None:  # pragma: no cover - thin CLI layer
+    """Re-render PATH whenever it, its includes, or diagrams.toml change.
+
+    Runs until interrupted, printing per-stage latency for every rebuild.
+    """
+    from flo.core.watch import WatchSession, format_watch_cycle
+
+    target = output or path.with_suffix(".svg")
+    if target.suffix.lower() != ".svg":
+        raise click.BadParameter("watch output must be a .svg file", param_hint="-o")
+    opts = build_render_opts(
+        verbose=False,
+        output=None,
+        export_fmt=None,
+        diagram=diagram,
+        render_backend=render_backend,
+        profile=profile,
+        detail=detail,
+        orientation=orientation,
+        show_notes=show_notes,
+        no_header=no_header,
+        no_footer=no_footer,
+        subprocess_view=subprocess_view,
+        sppm_projection=sppm_projection,
+        sppm_focus_subprocess=sppm_focus_subprocess,
+        spaghetti_channel=spaghetti_channel,
+        spaghetti_people_mode=spaghetti_people_mode,
+        sppm_theme=sppm_theme,
+        layout_wrap=layout_wrap,
+        layout_fit=layout_fit,
+        layout_spacing=layout_spacing,
+        publication_page_format=publication_page_format,
+        sppm_step_numbering=sppm_step_numbering,
+        sppm_label_density=sppm_label_density,
+        sppm_wrap_strategy=sppm_wrap_strategy,
+        sppm_truncation_policy=sppm_truncation_policy,
+        sppm_output_profile=sppm_output_profile,
+        render_to=None,
+        layout_max_width_px=layout_max_width_px,
+        layout_target_columns=layout_target_columns,
+        sppm_max_label_step_name=sppm_max_label_step_name,
+        sppm_max_label_workers=sppm_max_label_workers,
+        sppm_max_label_ctwt=sppm_max_label_ctwt,
+        layout_engine=layout_engine,
+        no_layout_cache=no_layout_cache,
+    )
+    session = WatchSession(path, target, options=opts)
+    click.echo(f"Watching {path} -> {target} (Ctrl+C to stop)")
+    try:
+        session.run(
+            on_cycle=lambda cycle: click.echo(format_watch_cycle(cycle)),
+            interval=interval,
+            debounce=debounce,
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+__all__ = ["build_cmd", "watch_cmd"]
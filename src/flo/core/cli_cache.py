@@ -0,0 +1,65 @@
+"""`flo cache` commands for inspecting and clearing the ELK layout cache."""
+
+from __future__ import annotations
+
+import json
+
+import click
+
+
+def _format_bytes(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024.0:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024.0
+    return f"{value:.1f} GiB"
+
+
+@click.group("cache")
+def cache_group() -> None:  # pragma: no cover - thin CLI layer
+    """Inspect or clear the on-disk ELK layout cache."""
+
+
+@cache_group.command("stats")
+@click.option("--json", "as_json", is_flag=True, help="Emit stats as JSON")
+def cache_stats_cmd(as_json: bool) -> None:
+    """Show layout cache location, size, and entry count."""
+    from flo.render.layout_core.elk_cache import (
+        default_elk_layout_cache,
+        elk_layout_cache_enabled,
+    )
+
+    description = default_elk_layout_cache().describe()
+    stats = {
+        "enabled": elk_layout_cache_enabled(),
+        "directory": description["directory"],
+        "entries": description["entries"],
+        "bytes": description["bytes"],
+        "max_bytes": description["max_bytes"],
+        "fingerprint": description["fingerprint"],
+    }
+    if as_json:
+        click.echo(json.dumps(stats, indent=2))
+        return
+    click.echo(f"directory:   {stats['directory']}")
+    click.echo(f"enabled:     {'yes' if stats['enabled'] else 'no'}")
+    click.echo(f"entries:     {stats['entries']}")
+    click.echo(
+        f"size:        {_format_bytes(stats['bytes'])}"
+        f" / {_format_bytes(stats['max_bytes'])}"
+    )
+    click.echo(f"fingerprint: {stats['fingerprint']}")
+
+
+@cache_group.command("clear")
+def cache_clear_cmd() -> None:
+    """Delete every cached layout."""
+    from flo.render.layout_core.elk_cache import default_elk_layout_cache
+
+    cache = default_elk_layout_cache()
+    removed = cache.clear()
+    click.echo(f"Removed {removed} cached layout(s) from {cache.directory}")
+
+
+__all__ = ["cache_group"]
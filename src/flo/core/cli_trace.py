@@ -0,0 +1,279 @@
+"""`flo trace` commands for importing, normalizing, and analyzing traces."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import NoReturn, Optional
+
+import click
+
+from flo.errors import DomainError
+
+
+def _fail(exc: DomainError) -> NoReturn:
+    error = click.ClickException(str(exc))
+    error.exit_code = exc.exit_code
+    raise error
+
+
+def _default_store_path(source: Path) -> Path:
+    name = source.name
+    for suffix in (".gz", ".json"):
+        name = name.removesuffix(suffix)
+    return source.with_name(f"{name}.flotrace")
+
+
+def _load_mapping(path: Path) -> dict[str, str]:
+    try:
+        mapping = json.loads(path.read_text("utf-8"))
+    except ValueError as exc:
+        raise click.BadParameter(
+            f"invalid JSON: {exc}", param_hint="--mapping"
+        ) from exc
+    if not isinstance(mapping, dict) or not all(
+        isinstance(key, str) and isinstance(value, str)
+        for key, value in mapping.items()
+    ):
+        raise click.BadParameter(
+            "must be a JSON object of activity key to node ID strings",
+            param_hint="--mapping",
+        )
+    return mapping
+
+
+@click.group("trace")
+def trace_group() -> None:  # pragma: no cover - thin CLI layer
+    """Import observed process-event traces and align them to a model."""
+
+
+@trace_group.command("import")
+@click.argument("source", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Store file to write (default: SOURCE with a .flotrace suffix)",
+)
+@click.option("--lenient", is_flag=True, help="Skip invalid events instead of failing")
+def trace_import_cmd(source: Path, output: Optional[Path], lenient: bool) -> None:
+    """Validate a flo_trace.json dataset and write it as a trace store."""
+    from flo.adapters.trace import (
+        TraceImportStats,
+        iter_trace_events,
+        write_trace_store,
+    )
+
+    stats = TraceImportStats()
+    target = output or _default_store_path(source)
+    try:
+        write_trace_store(
+            iter_trace_events(source, strict=not lenient, stats=stats), target
+        )
+    except DomainError as exc:
+        _fail(exc)
+    for issue in stats.issues:
+        click.echo(f"skipped {issue}", err=True)
+    click.echo(
+        f"Imported {stats.events} event(s) into {target} "
+        f"({stats.invalid_events} invalid, "
+        f"{stats.events_per_second:,.0f} events/s)"
+    )
+
+
+@trace_group.command("normalize")
+@click.argument("source", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=True,
+    help="Sorted dataset (.json, .json.gz) or trace store (.flotrace) to write",
+)
+@click.option(
+    "--max-events-in-memory",
+    type=click.IntRange(min=1),
+    default=500_000,
+    show_default=True,
+    help="Events buffered before a sorted run is spilled to disk",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Worker processes that sort and spill runs",
+)
+@click.option(
+    "--spill-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Directory for temporary run files (default: system temp dir)",
+)
+@click.option("--lenient", is_flag=True, help="Skip invalid events instead of failing")
+def trace_normalize_cmd(
+    source: Path,
+    output: Path,
+    max_events_in_memory: int,
+    jobs: int,
+    spill_dir: Optional[Path],
+    lenient: bool,
+) -> None:
+    """Sort a dataset into canonical order and drop exact duplicate events."""
+    from flo.adapters.trace import (
+        TraceImportStats,
+        iter_trace_events,
+        normalize_trace,
+    )
+
+    stats = TraceImportStats()
+    try:
+        result = normalize_trace(
+            iter_trace_events(source, strict=not lenient, stats=stats),
+            output,
+            max_events_in_memory=max_events_in_memory,
+            jobs=jobs,
+            spill_dir=spill_dir,
+        )
+    except DomainError as exc:
+        _fail(exc)
+    for issue in stats.issues:
+        click.echo(f"skipped {issue}", err=True)
+    for event_id in result.duplicate_event_ids:
+        click.echo(f"duplicate event_id {event_id!r}", err=True)
+    click.echo(
+        f"Wrote {result.written} event(s) to {output} from {result.runs} run(s) "
+        f"({result.dropped_copies} exact copies dropped, "
+        f"{result.duplicate_event_id_count} conflicting duplicate ID(s), "
+        f"{result.elapsed_seconds:.2f}s)"
+    )
+
+
+@trace_group.command("align")
+@click.argument("model", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("trace", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--mapping",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="JSON object mapping activity keys to canonical node IDs",
+)
+@click.option("--process-id", help="Process to select (default: the model's)")
+@click.option(
+    "--process-version",
+    help="Model version to align against; required for events without one",
+)
+@click.option("--strict", is_flag=True, help="Fail if any selected event is unresolved")
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the JSON report to a file instead of stdout",
+)
+def trace_align_cmd(
+    model: Path,
+    trace: Path,
+    mapping: Optional[Path],
+    process_id: Optional[str],
+    process_version: Optional[str],
+    strict: bool,
+    output: Optional[Path],
+) -> None:
+    """Align a trace (dataset or store) to MODEL and print the report."""
+    from flo.adapters.trace import TraceImportStats, open_trace_store
+    from flo.compiler.analysis import TraceAlignmentError, align_trace_store
+    from flo.core import _parse_compile_validate
+    from flo.services.io import write_output_atomic
+
+    activity_mapping = _load_mapping(mapping) if mapping else None
+    stats = TraceImportStats()
+    failure: DomainError | None = None
+    try:
+        ir = _parse_compile_validate(model.read_text("utf-8"), source_path=str(model))
+        with open_trace_store(trace, stats=stats) as store:
+            try:
+                report = align_trace_store(
+                    store,
+                    ir,
+                    process_version=process_version,
+                    process_id=process_id,
+                    mapping=activity_mapping,
+                    strict=strict,
+                    import_stats=stats,
+                ).report
+            except TraceAlignmentError as exc:
+                report, failure = exc.report, exc
+    except DomainError as exc:
+        _fail(exc)
+    if output is None:
+        click.echo(report.to_json())
+    else:
+        rc, err = write_output_atomic(report.to_json() + "\n", str(output))
+        if rc:
+            raise click.ClickException(err)
+    if failure is not None:
+        _fail(failure)
+
+
+@trace_group.command("transitions")
+@click.argument("model", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("trace", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--mapping",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="JSON object mapping activity keys to canonical node IDs",
+)
+@click.option("--process-id", help="Process to select (default: the model's)")
+@click.option(
+    "--process-version",
+    help="Model version to align against; required for events without one",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Worker processes; cases are partitioned by a hash of case_id",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the JSON export to a file instead of stdout",
+)
+def trace_transitions_cmd(
+    model: Path,
+    trace: Path,
+    mapping: Optional[Path],
+    process_id: Optional[str],
+    process_version: Optional[str],
+    jobs: int,
+    output: Optional[Path],
+) -> None:
+    """Export transition frequencies of a trace against MODEL as JSON."""
+    from flo.core import _parse_compile_validate
+    from flo.export import export_ir
+    from flo.services.io import write_output_atomic
+
+    options = {
+        "export": "transitions",
+        "trace": str(trace),
+        "trace_mapping": _load_mapping(mapping) if mapping else None,
+        "process_id": process_id,
+        "process_version": process_version,
+        "jobs": jobs,
+    }
+    try:
+        ir = _parse_compile_validate(model.read_text("utf-8"), source_path=str(model))
+        content = export_ir(ir, options)
+    except DomainError as exc:
+        _fail(exc)
+    if output is None:
+        click.echo(content)
+    else:
+        rc, err = write_output_atomic(content + "\n", str(output))
+        if rc:
+            raise click.ClickException(err)
+
+
+__all__ = ["trace_group"]
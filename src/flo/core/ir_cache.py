@@ -0,0 +1,223 @@
+"""Cache of validated IR keyed by the composed source document.
+
+Compilation, validation, and schema alignment are deterministic in the
+composed document that ``parse_adapter`` returns, so a validated ``IR`` can be
+reused whenever the same document is rendered or exported again. Entries are
+the ``ir_to_internal_dict`` shape stored in the same two-tier store as ELK
+layouts (in-process LRU plus a size-bounded on-disk directory), so separate
+`flo` processes share them. Values JSON cannot represent faithfully (YAML
+``yes``/``no`` mapping keys load as booleans, plus tuples and timestamps) are
+stored in a small tagged form. Keys also cover a fingerprint of the installed
+adapter/compiler/schema code; editing or upgrading FLO invalidates old entries.
+"""
+
+from __future__ import annotations
+
+import datetime
+from functools import lru_cache
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from flo.compiler.ir import IR
+from flo.compiler.ir._internal_shape import ir_from_internal_dict, ir_to_internal_dict
+from flo.core._version import flo_version
+from flo.render.layout_core.elk_cache import ElkLayoutCache
+
+_ENV_CACHE = "FLO_IR_CACHE"
+_ENV_CACHE_DIR = "FLO_IR_CACHE_DIR"
+_ENV_CACHE_MAX_BYTES = "FLO_IR_CACHE_MAX_BYTES"
+_DISABLED_VALUES = {"0", "off", "false", "no", "disabled"}
+_DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_DEFAULT_MEMORY_ENTRIES = 64
+# Bump when the entry shape or key derivation changes.
+_CACHE_FORMAT_VERSION = "1"
+_FINGERPRINT_PACKAGES = ("adapters", "compiler", "schema")
+# Single-key wrapper objects for values plain JSON would change or reject.
+_TAG = "\u0000"
+_TAG_PAIRS = f"{_TAG}pairs"
+_TAG_TUPLE = f"{_TAG}tuple"
+_TAG_DATE = f"{_TAG}date"
+_TAG_DATETIME = f"{_TAG}datetime"
+
+
+class IRCache:
+    """Content-addressed store of validated IR objects."""
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_bytes: int = _DEFAULT_MAX_BYTES,
+        memory_entries: int = _DEFAULT_MEMORY_ENTRIES,
+        fingerprint: str | None = None,
+    ) -> None:
+        """Configure the cache rooted at ``directory``; nothing is created yet."""
+        self.fingerprint = fingerprint or ir_cache_fingerprint()
+        # The ELK layout store is a generic key -> JSON-object store; only its
+        # key derivation is ELK-specific, and ``key_for`` below replaces it.
+        self.store = ElkLayoutCache(
+            directory,
+            max_bytes=max_bytes,
+            memory_entries=memory_entries,
+            fingerprint=self.fingerprint,
+        )
+
+    @property
+    def directory(self) -> Path:
+        """Return the on-disk cache directory."""
+        return self.store.directory
+
+    def key_for(self, document: dict[str, Any]) -> str | None:
+        """Return the content address of a composed document.
+
+        Returns None when the document holds values without a canonical
+        form, in which case it is simply not cached.
+        """
+        try:
+            canonical = json.dumps(
+                _encode(document),
+                sort_keys=True,
+                separators=(",", ":"),
+                ensure_ascii=False,
+            )
+        except TypeError, ValueError:
+            return None
+        digest = hashlib.sha256()
+        digest.update(f"flo-ir-cache/{_CACHE_FORMAT_VERSION}\0".encode())
+        digest.update(self.fingerprint.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(canonical.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> IR | None:
+        """Return a fresh ``IR`` for ``key``, or None on a miss."""
+        payload = self.store.get(key)
+        if payload is None:
+            return None
+        try:
+            return ir_from_internal_dict(_decode(payload))
+        except Exception:
+            return None
+
+    def put(self, key: str, ir: IR) -> None:
+        """Store ``ir``; IR holding values without a tagged form is skipped."""
+        payload = ir_to_internal_dict(ir)
+        payload["process_metadata"] = ir.process_metadata
+        try:
+            encoded = _encode(payload)
+        except TypeError:
+            return
+        self.store.put(key, encoded)
+
+    def clear(self) -> int:
+        """Delete every entry and return the number of disk entries removed."""
+        return self.store.clear()
+
+    def describe(self) -> dict[str, Any]:
+        """Return configuration, disk usage, and lookup counters."""
+        return self.store.describe()
+
+
+def ir_cache_enabled() -> bool:
+    """Return whether ``FLO_IR_CACHE`` leaves the IR cache switched on."""
+    value = os.getenv(_ENV_CACHE, "on").strip().lower()
+    return value not in _DISABLED_VALUES
+
+
+def default_ir_cache_dir() -> Path:
+    """Return the IR cache directory from the environment or XDG default."""
+    explicit = os.getenv(_ENV_CACHE_DIR, "").strip()
+    if explicit:
+        return Path(explicit).expanduser()
+    xdg_cache = os.getenv("XDG_CACHE_HOME", "").strip()
+    base = Path(xdg_cache).expanduser() if xdg_cache else Path.home() / ".cache"
+    return base / "flo" / "ir"
+
+
+def default_ir_cache() -> IRCache | None:
+    """Return the process-wide IR cache, or None when it is disabled."""
+    if not ir_cache_enabled():
+        return None
+    return _shared_cache(
+        str(default_ir_cache_dir()), _env_max_bytes(), ir_cache_fingerprint()
+    )
+
+
+@lru_cache(maxsize=1)
+def ir_cache_fingerprint() -> str:
+    """Return a digest of the FLO version and the code that produces IR."""
+    digest = hashlib.sha256()
+    digest.update(flo_version().encode("utf-8"))
+    package_root = Path(__file__).resolve().parents[1]
+    for package in _FINGERPRINT_PACKAGES:
+        for path in sorted((package_root / package).rglob("*")):
+            if path.suffix not in {".py", ".json"}:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            relative = path.relative_to(package_root).as_posix()
+            digest.update(f"{relative}:{stat.st_size}:{stat.st_mtime_ns}\0".encode())
+    return digest.hexdigest()[:16]
+
+
+@lru_cache(maxsize=8)
+def _shared_cache(directory: str, max_bytes: int, fingerprint: str) -> IRCache:
+    return IRCache(Path(directory), max_bytes=max_bytes, fingerprint=fingerprint)
+
+
+def _env_max_bytes() -> int:
+    raw = os.getenv(_ENV_CACHE_MAX_BYTES, "").strip()
+    try:
+        return int(raw) if raw else _DEFAULT_MAX_BYTES
+    except ValueError:
+        return _DEFAULT_MAX_BYTES
+
+
+def _encode(value: Any) -> Any:
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, tuple):
+        return {_TAG_TUPLE: [_encode(item) for item in value]}
+    if isinstance(value, dict):
+        if all(isinstance(k, str) and not k.startswith(_TAG) for k in value):
+            return {k: _encode(v) for k, v in value.items()}
+        return {_TAG_PAIRS: [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, datetime.datetime):
+        return {_TAG_DATETIME: value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {_TAG_DATE: value.isoformat()}
+    raise TypeError(f"{type(value).__name__} values have no cache encoding")
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if len(value) == 1:
+        ((tag, inner),) = value.items()
+        if tag == _TAG_PAIRS:
+            return {_decode(k): _decode(v) for k, v in inner}
+        if tag == _TAG_TUPLE:
+            return tuple(_decode(item) for item in inner)
+        if tag == _TAG_DATETIME:
+            return datetime.datetime.fromisoformat(inner)
+        if tag == _TAG_DATE:
+            return datetime.date.fromisoformat(inner)
+    return {k: _decode(v) for k, v in value.items()}
+
+
+__all__ = [
+    "IRCache",
+    "default_ir_cache",
+    "default_ir_cache_dir",
+    "ir_cache_enabled",
+    "ir_cache_fingerprint",
+]
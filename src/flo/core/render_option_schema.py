@@ -174,10 +174,22 @@ _RENDER_OPTION_SPECS: tuple[RenderOptionSpec, ...] = (
         "SPPM publication: output profile preset",
         choices=("default", "book", "web", "print", "slide"),
     ),
+    RenderOptionSpec(
+        "layout_engine",
+        "--layout-engine",
+        "Layout engine: elk (elkjs via Node.js) or layered (pure Python)",
+        choices=("elk", "layered"),
+    ),
+    RenderOptionSpec(
+        "no_layout_cache",
+        "--no-layout-cache",
+        "Bypass the on-disk ELK layout cache for this run",
+        is_flag=True,
+    ),
     RenderOptionSpec(
         "render_to",
         "--render-to",
-        "Write the rendered SVG artifact to a file",
+        "Write the rendered SVG artifact to a file (.svg, or .svgz for gzip)",
         metavar="FILE",
     ),
 )
@@ -0,0 +1,315 @@
+"""Warm-process watch mode (`flo watch`).
+
+A ``WatchSession`` renders one source file to one SVG and keeps the results
+of every pipeline stage between rebuilds: the composed document, the compiled
+IR, and the resolved render options. ``poll`` compares mtime/size snapshots of
+the source, its include closure, and ``diagrams.toml``; ``rebuild`` then
+re-runs only the stages whose inputs changed:
+
+* only ``diagrams.toml`` changed: the document and IR are reused and only the
+  render options are resolved again;
+* the source or an include changed but composes to the same document (for
+  example a comment edit): the IR is reused;
+* neither the IR nor the render options changed: nothing is re-rendered.
+
+Re-rendering after a label or style edit reuses the previous layout through
+the ELK layout cache, which is keyed by the layout request itself. Outputs are
+replaced atomically so viewers never load a half-written SVG.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+import time
+from typing import Any, Callable, Iterable
+
+from flo.adapters import include_closure, load_yaml, parse_adapter_document
+from flo.adapters.include_cache import include_cache_counters
+from flo.compiler.ir import IR
+from flo.core import (
+    _compile_validate_cached,
+    _merge_render_intent_options,
+    _render_artifact_with_postprocess,
+    _resolve_render_options_for_output,
+)
+from flo.core._capability_validation import ensure_render_projection_supported
+from flo.core._flo_config import (
+    _resolve_diagrams_toml_path,
+    merge_diagrams_toml_sppm_defaults,
+)
+from flo.core._option_validation import validate_sppm_numeric_render_options
+from flo.core.batch_build import _persistent_elk_engine
+from flo.render import RenderOptions
+from flo.services.errors import ParseError, RenderError
+from flo.services.io import write_output_atomic
+
+WATCH_STAGES = ("parse", "compile", "options", "render", "write")
+
+_FileStamp = tuple[int, int] | None
+_UNSET: Any = object()
+
+
+@dataclass(frozen=True)
+class WatchCycle:
+    """Outcome of one watch rebuild.
+
+    ``stages`` holds the elapsed seconds of every stage that ran; ``reused``
+    lists the stages whose previous result was kept instead.
+    """
+
+    changed: tuple[str, ...]
+    stages: dict[str, float] = field(default_factory=dict)
+    reused: tuple[str, ...] = ()
+    written: bool = False
+    layout_cache: str | None = None
+    include_cache_hits: int = 0
+    include_cache_misses: int = 0
+    warning: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return True when the rebuild did not fail."""
+        return self.error is None
+
+    @property
+    def seconds(self) -> float:
+        """Return the total time spent in the stages that ran."""
+        return sum(self.stages.values())
+
+
+class WatchSession:
+    """Incrementally re-render one FLO source into one SVG file."""
+
+    def __init__(
+        self, source: Path, output: Path, *, options: dict[str, Any] | None = None
+    ) -> None:
+        """Prepare a session; nothing is read until the first ``rebuild``."""
+        self.source = Path(source).resolve()
+        self.output = Path(output)
+        self.options: dict[str, Any] = {
+            **(options or {}),
+            "source_path": str(self.source),
+        }
+        self._document: Any = _UNSET
+        self._ir: IR | None = None
+        self._render_options: RenderOptions | None = None
+        self._rendered = False
+        self._includes: tuple[Path, ...] = ()
+        self._snapshot: dict[Path, _FileStamp] = {}
+
+    def watched_paths(self) -> tuple[Path, ...]:
+        """Return the source, its include closure, and diagrams.toml locations."""
+        paths = [self.source, *self._includes, *self._config_paths()]
+        return tuple(dict.fromkeys(paths))
+
+    def poll(self) -> tuple[Path, ...]:
+        """Return watched paths that changed since the last poll or rebuild."""
+        changed = []
+        for path in self.watched_paths():
+            stamp = _stamp(path)
+            if path not in self._snapshot or self._snapshot[path] != stamp:
+                self._snapshot[path] = stamp
+                changed.append(path)
+        return tuple(changed)
+
+    def rebuild(self, changed: Iterable[Path] | None = None) -> WatchCycle:
+        """Re-run the stages affected by ``changed`` (everything when None)."""
+        changed_paths = None if changed is None else set(changed)
+        config_paths = set(self._config_paths())
+        source_dirty = changed_paths is None or bool(changed_paths - config_paths)
+        config_dirty = changed_paths is None or bool(changed_paths & config_paths)
+        stages: dict[str, float] = {}
+        reused: list[str] = []
+        names = tuple(sorted(path.name for path in changed_paths or (self.source,)))
+        hits, misses = include_cache_counters()
+        try:
+            outcome = self._run_stages(
+                source_dirty=source_dirty,
+                config_dirty=config_dirty,
+                stages=stages,
+                reused=reused,
+            )
+        except Exception as exc:
+            return WatchCycle(
+                changed=names, stages=stages, reused=tuple(reused), error=str(exc)
+            )
+        finally:
+            for path in self.watched_paths():
+                self._snapshot.setdefault(path, _stamp(path))
+        written, layout_cache, warning = outcome
+        after_hits, after_misses = include_cache_counters()
+        return WatchCycle(
+            changed=names,
+            stages=stages,
+            reused=tuple(reused),
+            written=written,
+            layout_cache=layout_cache,
+            include_cache_hits=after_hits - hits,
+            include_cache_misses=after_misses - misses,
+            warning=warning,
+        )
+
+    def run(
+        self,
+        *,
+        on_cycle: Callable[[WatchCycle], None],
+        interval: float = 0.25,
+        debounce: float = 0.2,
+        should_stop: Callable[[], bool] = lambda: False,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Build once, then rebuild after each debounced burst of changes.
+
+        A burst ends once a poll ``debounce`` seconds after the last change
+        finds nothing new. One ELK worker stays alive for the whole session.
+        """
+        with _persistent_elk_engine():
+            self.poll()
+            on_cycle(self.rebuild())
+            while not should_stop():
+                sleep(interval)
+                pending = set(self.poll())
+                if not pending:
+                    continue
+                while True:
+                    sleep(debounce)
+                    burst = self.poll()
+                    if not burst:
+                        break
+                    pending.update(burst)
+                on_cycle(self.rebuild(pending))
+
+    def _run_stages(
+        self,
+        *,
+        source_dirty: bool,
+        config_dirty: bool,
+        stages: dict[str, float],
+        reused: list[str],
+    ) -> tuple[bool, str | None, str | None]:
+        ir_changed = False
+        if source_dirty:
+            document = _timed(stages, "parse", self._parse)
+            if self._ir is not None and document == self._document:
+                reused.append("compile")
+            else:
+                self._ir = _timed(
+                    stages, "compile", lambda: _compile_validate_cached(document)
+                )
+                self._document = document
+                ir_changed = True
+        else:
+            reused.extend(("parse", "compile"))
+
+        options_changed = False
+        if ir_changed or config_dirty or self._render_options is None:
+            render_options = _timed(stages, "options", self._resolve_options)
+            options_changed = render_options != self._render_options
+            self._render_options = render_options
+        else:
+            reused.append("options")
+
+        if self._rendered and not (ir_changed or options_changed):
+            reused.extend(("render", "write"))
+            return False, None, None
+
+        self._rendered = False
+        artifact, _, warning = _timed(
+            stages,
+            "render",
+            lambda: _render_artifact_with_postprocess(
+                self._ir, render_options=self._render_options
+            ),
+        )
+        _timed(stages, "write", lambda: self._write(artifact.content))
+        self._rendered = True
+        layout = artifact.metadata.get("layout_cache")
+        status = layout.get("status") if isinstance(layout, dict) else None
+        return True, status, warning
+
+    def _parse(self) -> Any:
+        content = self.source.read_text(encoding="utf-8")
+        source_path = str(self.source)
+        try:
+            document = load_yaml(content)
+            model = parse_adapter_document(
+                document, content=content, source_path=source_path
+            )
+        except Exception as exc:
+            raise ParseError(str(exc), error_stage="parse") from exc
+        if isinstance(document, dict):
+            self._includes = tuple(include_closure(document, source_path))
+        else:
+            self._includes = ()
+        return model
+
+    def _resolve_options(self) -> RenderOptions:
+        resolved = merge_diagrams_toml_sppm_defaults(options=self.options)
+        validate_sppm_numeric_render_options(options=resolved)
+        resolved = _merge_render_intent_options(ir=self._ir, options=resolved)
+        render_options = _resolve_render_options_for_output(
+            resolved_options=resolved, output_format="svg"
+        )
+        ensure_render_projection_supported(render_options)
+        return render_options
+
+    def _write(self, content: str) -> None:
+        rc, err = write_output_atomic(content, str(self.output))
+        if rc != 0:
+            raise RenderError(err, error_stage="write")
+
+    def _config_paths(self) -> tuple[Path, ...]:
+        # Watch the sibling diagrams.toml even before it exists so that
+        # creating one triggers a rebuild; also watch the resolved fallback.
+        paths = [self.source.parent / "diagrams.toml"]
+        resolved = _resolve_diagrams_toml_path(self.options)
+        if resolved is not None:
+            paths.append(resolved.resolve())
+        return tuple(dict.fromkeys(paths))
+
+
+def format_watch_cycle(cycle: WatchCycle) -> str:
+    """Return a one-line, per-stage latency summary of ``cycle``."""
+    changed = ", ".join(cycle.changed)
+    if cycle.error is not None:
+        return f"FAIL {cycle.seconds * 1000:8.1f} ms  {changed}: {cycle.error}"
+    status = "ok  " if cycle.written else "same"
+    parts = [
+        f"{name} {cycle.stages[name] * 1000:.1f} ms"
+        if name in cycle.stages
+        else f"{name} reused"
+        for name in WATCH_STAGES
+        if name in cycle.stages or name in cycle.reused
+    ]
+    line = f"{status} {cycle.seconds * 1000:8.1f} ms  {changed}  ({', '.join(parts)})"
+    if cycle.layout_cache is not None:
+        line += f" layout cache {cycle.layout_cache}"
+    if cycle.include_cache_hits or cycle.include_cache_misses:
+        line += (
+            f" includes {cycle.include_cache_hits} cached"
+            f"/{cycle.include_cache_misses} parsed"
+        )
+    if cycle.warning:
+        line += f"  [{cycle.warning}]"
+    return line
+
+
+def _timed(stages: dict[str, float], name: str, func: Callable[[], Any]) -> Any:
+    started = time.perf_counter()
+    try:
+        return func()
+    finally:
+        stages[name] = time.perf_counter() - started
+
+
+def _stamp(path: Path) -> _FileStamp:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+__all__ = ["WATCH_STAGES", "WatchCycle", "WatchSession", "format_watch_cycle"]
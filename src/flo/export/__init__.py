@@ -8,6 +8,7 @@ from .json_export import ir_to_schema_json
 from .materials_export import ir_to_ingredients_text
 from .movement_export import ir_to_movement_text
 from .options import ExportOptions
+from .transitions_export import ir_to_transitions_json
 
 _Exporter = Callable[[Any, ExportOptions], str]
 
@@ -28,6 +29,7 @@ _EXPORTERS: dict[str, _Exporter] = {
     "json": _json_exporter,
     "ingredients": _ingredients_exporter,
     "movement": _movement_exporter,
+    "transitions": ir_to_transitions_json,
 }
 
 
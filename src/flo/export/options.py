@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Literal, Mapping
 
-ExportFormat = Literal["json", "ingredients", "movement"]
+ExportFormat = Literal["json", "ingredients", "movement", "transitions"]
 ExportProfile = Literal["default"]
 
 
@@ -14,12 +14,19 @@ class ExportOptions:
     """Configuration for exporter registry dispatch.
 
     The exporter layer is intentionally separate from renderers: exporter
-    outputs are machine-readable contract projections.
+    outputs are machine-readable contract projections. The ``trace_*``,
+    ``process_*`` and ``jobs`` fields configure the ``transitions`` export,
+    which aligns an observed trace to the IR.
     """
 
     export_format: ExportFormat = "json"
     profile: ExportProfile = "default"
     indent: int = 2
+    trace_path: str | None = None
+    trace_mapping: Mapping[str, str] | None = None
+    process_id: str | None = None
+    process_version: str | None = None
+    jobs: int = 1
 
     @classmethod
     def from_mapping(cls, options: Mapping[str, Any] | None) -> "ExportOptions":
@@ -35,6 +42,8 @@ class ExportOptions:
             export_format: ExportFormat = "ingredients"
         elif export_format_raw == "movement":
             export_format = "movement"
+        elif export_format_raw == "transitions":
+            export_format = "transitions"
         else:
             export_format = "json"
         profile: ExportProfile = "default" if profile_raw == "default" else "default"
@@ -45,4 +54,22 @@ class ExportOptions:
             indent = 2
         indent = 2 if indent < 0 else indent
 
-        return cls(export_format=export_format, profile=profile, indent=indent)
+        try:
+            jobs = max(1, int(options.get("jobs") or 1))
+        except Exception:
+            jobs = 1
+
+        return cls(
+            export_format=export_format,
+            profile=profile,
+            indent=indent,
+            trace_path=_optional_text(options.get("trace")),
+            trace_mapping=options.get("trace_mapping") or None,
+            process_id=_optional_text(options.get("process_id")),
+            process_version=_optional_text(options.get("process_version")),
+            jobs=jobs,
+        )
+
+
+def _optional_text(value: Any) -> str | None:
+    return str(value) if value is not None else None
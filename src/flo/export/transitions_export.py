@@ -0,0 +1,43 @@
+"""Transition-frequency JSON export of an observed trace against the IR."""
+
+from __future__ import annotations
+
+import json
+
+from flo.adapters.trace import TraceImportStats, open_trace_store
+from flo.compiler.analysis import align_trace_store, transition_frequencies
+from flo.compiler.ir.models import IR
+from flo.errors import ValidationError
+
+from .options import ExportOptions
+
+
+def ir_to_transitions_json(ir: IR, options: ExportOptions) -> str:
+    """Align ``options.trace_path`` to ``ir`` and serialize its transitions.
+
+    The payload holds the alignment report and the transition report, so
+    unresolved events behind low counts stay visible. Alignment is
+    non-strict; the IR is not modified.
+    """
+    if options.trace_path is None:
+        raise ValidationError(
+            "the transitions export requires a trace", error_stage="export"
+        )
+    stats = TraceImportStats()
+    with open_trace_store(options.trace_path, stats=stats) as store:
+        alignment = align_trace_store(
+            store,
+            ir,
+            process_version=options.process_version,
+            process_id=options.process_id,
+            mapping=options.trace_mapping,
+            import_stats=stats,
+        )
+        report = transition_frequencies(store, alignment, ir, jobs=options.jobs)
+    payload = {
+        "alignment": alignment.report.to_dict(),
+        "transitions": report.to_dict(),
+    }
+    if options.indent <= 0:
+        return json.dumps(payload, separators=(",", ":"))
+    return json.dumps(payload, indent=options.indent)
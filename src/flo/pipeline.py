@@ -20,7 +20,11 @@ from flo.services.errors import (
 )
 import time
 
-from flo.services.telemetry import get_tracer, record_span_error
+from flo.services.telemetry import (
+    get_tracer,
+    record_span_error,
+    validate_with_rule_timings,
+)
 
 
 _FAIL_OPEN_SCC_PREFIX = "fail-open postprocess: scc_condense failed"
@@ -101,7 +105,7 @@ class ValidateStep:
         if rc != 0:
             return rc, ir, err
         try:
-            validate_ir(ir)
+            validate_with_rule_timings(validate_ir, ir)
             return 0, ir, None
         except Exception as e:
             return _step_error(e, services, EXIT_VALIDATION_ERROR)
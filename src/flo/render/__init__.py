@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import replace
-from typing import Any
+from typing import Any, TextIO
 
 from ._artifact import RenderArtifact
 from ._backend_selector import render_with_selected_backend
@@ -30,6 +30,20 @@ def render_artifact_and_contract(
     return render_with_selected_backend(ir, render_options)
 
 
+def render_artifact_to_stream(
+    ir: Any, sink: TextIO, options: RenderOptions | dict | None = None
+) -> tuple[RenderArtifact, None]:
+    """Render an artifact, writing its content to ``sink`` as it is produced.
+
+    The returned artifact carries the kind, backend, and metadata; its
+    ``content`` is empty because the rendered text has already gone to
+    ``sink``. ``render_artifact_and_contract`` is this path over an
+    in-memory buffer.
+    """
+    render_options = _coerce_render_options(options)
+    return render_with_selected_backend(ir, render_options, sink=sink)
+
+
 def _coerce_render_options(
     options: RenderOptions | dict | None, force_backend: str | None = None
 ) -> RenderOptions:
@@ -46,6 +60,7 @@ def _coerce_render_options(
 __all__ = [
     "render_artifact",
     "render_artifact_and_contract",
+    "render_artifact_to_stream",
     "RenderArtifact",
     "RenderOptions",
 ]
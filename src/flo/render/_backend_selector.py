@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable
+from typing import Any, Callable, TextIO
 
 from ._artifact import RenderArtifact
 from ._svg_sppm import render_sppm_svg_artifact
@@ -10,15 +10,15 @@ from ._svg_spaghetti import render_spaghetti_svg_artifact
 from ._svg_swimlane import render_swimlane_svg_artifact
 from .options import RenderOptions
 
-_ArtifactRenderer = Callable[[Any, RenderOptions], tuple[RenderArtifact, Any]]
+_ArtifactRenderer = Callable[..., tuple[RenderArtifact, Any]]
 
 
 def render_with_selected_backend(
-    ir: Any, render_options: RenderOptions
+    ir: Any, render_options: RenderOptions, sink: TextIO | None = None
 ) -> tuple[RenderArtifact, None]:
-    """Render with the selected SVG renderer."""
+    """Render with the selected SVG renderer, streaming to ``sink`` if given."""
     renderer = _select_artifact_renderer(render_options)
-    return renderer(ir, render_options)
+    return renderer(ir, render_options, sink=sink)
 
 
 def _select_artifact_renderer(render_options: RenderOptions) -> _ArtifactRenderer:
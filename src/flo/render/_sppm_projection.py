@@ -5,6 +5,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
+from flo.compiler.ir.hierarchy import SubprocessHierarchy
+
 from .layout_core.elk_support import project_parent_only_subprocess_view
 from .options import RenderOptions
 
@@ -38,12 +40,18 @@ def project_sppm_subprocess_view(
             nodes,
             edges,
             nodes_by_id=nodes_by_id,
+            hierarchy=_hierarchy(nodes_by_id),
             focus_id=focus_id,
             requested_mode=requested_mode,
         )
     if requested_mode == "inline":
         return _project_inline(
-            nodes, edges, nodes_by_id=nodes_by_id, focus_id=focus_id, options=options
+            nodes,
+            edges,
+            nodes_by_id=nodes_by_id,
+            hierarchy=_hierarchy(nodes_by_id),
+            focus_id=focus_id,
+            options=options,
         )
     projected_nodes, projected_edges = project_parent_only_subprocess_view(nodes, edges)
     return (
@@ -61,6 +69,7 @@ def _project_child_map(
     edges: list[dict[str, Any]],
     *,
     nodes_by_id: dict[str, dict[str, Any]],
+    hierarchy: SubprocessHierarchy,
     focus_id: str | None,
     requested_mode: str,
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], SppmProjectionContext]:
@@ -79,8 +88,7 @@ def _project_child_map(
         )
     assert focus_id is not None
 
-    descendant_ids = _descendant_ids(focus_id, nodes_by_id=nodes_by_id)
-    subtree_ids = {focus_id, *descendant_ids}
+    subtree_ids = {focus_id, *hierarchy.descendants(focus_id)}
     entry_ids = _incoming_neighbor_ids(subtree_ids, edges)
     exit_ids = _outgoing_neighbor_ids(subtree_ids, edges)
     visible_ids = subtree_ids | entry_ids | exit_ids
@@ -88,7 +96,7 @@ def _project_child_map(
         nodes, edges, visible_ids=visible_ids
     )
 
-    parent_subprocess = _subprocess_parent(nodes_by_id.get(focus_id, {}))
+    parent_subprocess = hierarchy.parent(focus_id)
     return (
         projected_nodes,
         projected_edges,
@@ -108,6 +116,7 @@ def _project_inline(
     edges: list[dict[str, Any]],
     *,
     nodes_by_id: dict[str, dict[str, Any]],
+    hierarchy: SubprocessHierarchy,
     focus_id: str | None,
     options: RenderOptions,
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], SppmProjectionContext]:
@@ -126,12 +135,13 @@ def _project_inline(
         )
     assert focus_id is not None
 
-    descendant_ids = _descendant_ids(focus_id, nodes_by_id=nodes_by_id)
+    descendant_ids = set(hierarchy.descendants(focus_id))
     if len(descendant_ids) > _inline_budget(options):
         projected_nodes, projected_edges, context = _project_child_map(
             nodes,
             edges,
             nodes_by_id=nodes_by_id,
+            hierarchy=hierarchy,
             focus_id=focus_id,
             requested_mode="inline",
         )
@@ -150,9 +160,7 @@ def _project_inline(
         )
 
     top_level_ids = {
-        node_id
-        for node_id, node in nodes_by_id.items()
-        if _subprocess_parent(node) is None
+        node_id for node_id in hierarchy.node_ids if hierarchy.parent(node_id) is None
     }
     visible_ids = top_level_ids | descendant_ids
     projected_nodes, projected_edges = _project_subprocess_visible_ids(
@@ -165,7 +173,7 @@ def _project_inline(
             requested_mode="inline",
             effective_mode="inline",
             focus_subprocess=focus_id,
-            parent_subprocess=_subprocess_parent(nodes_by_id.get(focus_id, {})),
+            parent_subprocess=hierarchy.parent(focus_id),
         ),
     )
 
@@ -181,6 +189,12 @@ def _nodes_by_id(nodes: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
     return {str(node.get("id") or ""): node for node in nodes if node.get("id")}
 
 
+def _hierarchy(nodes_by_id: dict[str, dict[str, Any]]) -> SubprocessHierarchy:
+    return SubprocessHierarchy(
+        (node_id, _subprocess_parent(node)) for node_id, node in nodes_by_id.items()
+    )
+
+
 def _project_subprocess_visible_ids(
     nodes: list[dict[str, Any]],
     edges: list[dict[str, Any]],
@@ -199,23 +213,6 @@ def _project_subprocess_visible_ids(
     return projected_nodes, projected_edges
 
 
-def _descendant_ids(
-    focus_id: str, *, nodes_by_id: dict[str, dict[str, Any]]
-) -> set[str]:
-    descendants: set[str] = set()
-    pending = [focus_id]
-    while pending:
-        current = pending.pop()
-        for node_id, node in nodes_by_id.items():
-            if node_id in descendants or node_id == focus_id:
-                continue
-            if _subprocess_parent(node) != current:
-                continue
-            descendants.add(node_id)
-            pending.append(node_id)
-    return descendants
-
-
 def _incoming_neighbor_ids(
     visible_ids: set[str], edges: list[dict[str, Any]]
 ) -> set[str]:
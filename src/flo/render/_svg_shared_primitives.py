@@ -8,6 +8,7 @@ from typing import Any
 from ._svg_sppm_edges import _edge_svg
 from ._svg_sppm_nodes import _node_svg
 from .layout_core.models import LayoutBounds
+from .layout_core.spatial import BoundsGrid
 from .options import RenderOptions
 
 
@@ -61,7 +62,7 @@ def standard_edge_svg(
     target_bounds: LayoutBounds | None,
     source_kind: str,
     target_kind: str,
-    avoid_bounds: tuple[Any, ...],
+    avoid_bounds: tuple[Any, ...] | BoundsGrid,
     canvas_bounds: LayoutBounds,
     diagnostics: list[Any],
     render_as_rework_style: bool = False,
@@ -84,14 +85,6 @@ def raw_node_lookup(
     process: dict[str, Any] | Any, *, options: RenderOptions
 ) -> dict[str, dict[str, Any]]:
     """Return raw node payloads keyed by node id for direct SVG rendering."""
-    from .layout_core.elk_support import (
-        extract_nodes_and_edges,
-        project_parent_only_subprocess_view,
-    )
+    from .layout_core.render_context import RenderContext
 
-    nodes, edges = extract_nodes_and_edges(process)
-    if options.subprocess_view == "parent_only":
-        nodes, edges = project_parent_only_subprocess_view(nodes, edges)
-    return {
-        str(node.get("id") or ""): node for node in nodes if str(node.get("id") or "")
-    }
+    return RenderContext.build(process, options).node_by_id
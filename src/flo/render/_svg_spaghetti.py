@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import hashlib
 from html import escape
-from typing import Any
+from typing import Any, TextIO
 
 from flo.compiler.analysis import (
     aggregate_material_movements,
@@ -17,6 +17,7 @@ from flo.compiler.analysis import (
 )
 
 from ._artifact import RenderArtifact
+from ._svg_stream import SvgWriter
 from .options import RenderOptions
 
 _PADDING = 40.0
@@ -26,9 +27,15 @@ _NODE_HEIGHT = 48.0
 
 
 def render_spaghetti_svg_artifact(
-    process: dict[str, Any] | Any, options: RenderOptions
+    process: dict[str, Any] | Any,
+    options: RenderOptions,
+    *,
+    sink: TextIO | None = None,
 ) -> tuple[RenderArtifact, None]:
-    """Render a minimal standalone SVG for spaghetti maps with spatial metadata."""
+    """Render a minimal standalone SVG for spaghetti maps with spatial metadata.
+
+    With ``sink`` the SVG is streamed there and the artifact content is empty.
+    """
     material_movements = infer_material_movements(process)
     people_movements = infer_people_movements(process)
     material_routes = aggregate_material_movements(material_movements)
@@ -49,23 +56,22 @@ def render_spaghetti_svg_artifact(
     boundary = _extract_spaghetti_boundary(process)
     width, height, project = _projection(locations=locations, boundary=boundary)
 
-    parts = [
-        (
-            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" '
-            f'height="{height:.0f}" viewBox="0 0 {width:.0f} {height:.0f}" '
-            'data-flo-artifact-kind="svg" data-flo-backend="svg">'
-        ),
-        '<rect width="100%" height="100%" fill="white" />',
-    ]
+    out = SvgWriter(sink)
+    out.append(
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" '
+        f'height="{height:.0f}" viewBox="0 0 {width:.0f} {height:.0f}" '
+        'data-flo-artifact-kind="svg" data-flo-backend="svg">'
+    )
+    out.append('<rect width="100%" height="100%" fill="white" />')
 
     if boundary is not None:
         boundary_svg = _boundary_svg(boundary=boundary, project=project)
         if boundary_svg:
-            parts.extend(boundary_svg)
+            out.extend(boundary_svg)
 
     if include_material:
         for route in material_routes:
-            parts.extend(
+            out.extend(
                 _route_svg(
                     route=route,
                     options=options,
@@ -76,7 +82,7 @@ def render_spaghetti_svg_artifact(
             )
     if include_people:
         for route in people_routes:
-            parts.extend(
+            out.extend(
                 _route_svg(
                     route=route,
                     options=options,
@@ -88,10 +94,10 @@ def render_spaghetti_svg_artifact(
 
     for location_id in location_ids:
         info = locations.get(location_id, {"name": location_id})
-        parts.extend(_location_svg(location_id=location_id, info=info, project=project))
+        out.extend(_location_svg(location_id=location_id, info=info, project=project))
 
-    parts.append("</svg>")
-    return RenderArtifact(kind="svg", content="\n".join(parts), backend="svg"), None
+    out.append("</svg>")
+    return RenderArtifact(kind="svg", content=out.content(), backend="svg"), None
 
 
 def _ensure_spatial_coordinates(
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from html import escape
-from typing import Any
+from typing import Any, TextIO
 
 from flo.services.errors import RenderError
 
@@ -14,13 +14,13 @@ from ._diagnostics import (
     serialize_render_diagnostics,
     serialize_render_diagnostics_report,
 )
+from ._svg_stream import SvgWriter
 from ._svg_sppm_edges import _annotation_bounds_for_placement
 from ._svg_sppm_edges import _edge_callout_placement
 from ._svg_sppm_edges import _is_synthetic_sppm_lane
 from ._svg_sppm_edges import _label_placement
 from ._svg_sppm_edges import _lane_header_avoid_bounds
 from ._svg_shared_primitives import (
-    raw_node_lookup,
     standard_edge_svg,
     standard_lane_svg,
     standard_node_svg,
@@ -32,9 +32,10 @@ from ._svg_sppm_rows import _sppm_row_ids
 from ._svg_sppm_rows import rework_alignment_diagnostics
 from ._svg_sppm_rows import row_gap_diagnostics
 from .layout_core import build_sppm_elk_layout_request, execute_elk_layout
-from .layout_core.elk_support import extract_nodes_and_edges
+from .layout_core.elk_adapter import select_layout_engine
 from .layout_core.elk_runtime import run_elkjs_layout
-from .layout_core.models import LayoutBounds
+from .layout_core.render_context import RenderContext, render_context
+from .layout_core.spatial import BoundsGrid
 from .options import RenderOptions
 from ._sppm_publication import build_sppm_publication_plan
 
@@ -59,17 +60,26 @@ __all__ = [
 
 
 def render_sppm_svg_artifact(
-    process: dict[str, Any] | Any, options: RenderOptions
+    process: dict[str, Any] | Any,
+    options: RenderOptions,
+    *,
+    sink: TextIO | None = None,
 ) -> tuple[RenderArtifact, None]:
     """Render a minimal standalone SVG for SPPM diagrams using ELK layout."""
-    request = build_sppm_elk_layout_request(process, options=options)
-    result = execute_elk_layout(request, engine=run_elkjs_layout)
-    return render_sppm_svg_artifact_from_layout(
+    context = RenderContext.build(process, options)
+    request = build_sppm_elk_layout_request(process, options=options, context=context)
+    engine = select_layout_engine(options, elk_engine=run_elkjs_layout)
+    result = execute_elk_layout(request, engine=engine)
+    artifact, _ = render_sppm_svg_artifact_from_layout(
         process=process,
         options=options,
         request=request,
         result=result,
+        sink=sink,
+        context=context,
     )
+    artifact.metadata["layout_cache"] = engine.metadata()
+    return artifact, None
 
 
 def render_sppm_svg_artifact_from_layout(
@@ -78,8 +88,15 @@ def render_sppm_svg_artifact_from_layout(
     options: RenderOptions,
     request: Any,
     result: Any,
+    sink: TextIO | None = None,
+    context: RenderContext | None = None,
 ) -> tuple[RenderArtifact, None]:
-    """Render SPPM SVG using a precomputed ELK request/result pair."""
+    """Render SPPM SVG using a precomputed ELK request/result pair.
+
+    With ``sink`` the SVG is streamed there and the artifact content is empty.
+    ``context`` reuses the graph records the request was built from.
+    """
+    context = render_context(process, options, context)
     display_node_bounds, display_edge_paths = _enforce_sppm_row_alignment(
         node_bounds=result.node_bounds,
         edge_paths=result.edge_paths,
@@ -104,10 +121,9 @@ def render_sppm_svg_artifact_from_layout(
         node_bounds=display_node_bounds,
         edge_paths=display_edge_paths,
     )
-    raw_node_by_id = _raw_node_lookup(process, options=options)
+    raw_node_by_id = context.node_by_id
     publication_plan = _build_sppm_publication_plan(
-        process=process,
-        options=options,
+        context=context,
         request=request,
     )
     publication_page = publication_plan.primary_series().pages[0]
@@ -126,20 +142,21 @@ def render_sppm_svg_artifact_from_layout(
     )
     content_top = _PADDING + header_height
 
-    parts = [
+    out = SvgWriter(sink)
+    out.append(
         (
             f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" '
             f'height="{height:.0f}" viewBox="0 0 {width:.0f} {height:.0f}" '
             'data-flo-artifact-kind="svg" data-flo-backend="svg" '
-            'data-flo-diagram="sppm" data-flo-layout-engine="elk" '
+            f'data-flo-diagram="sppm" data-flo-layout-engine="{options.layout_engine}" '
             f'data-sppm-publication-page-id="{escape(publication_page.page_id)}"'
             ">"
-        ),
-        '<rect width="100%" height="100%" fill="#fffdf8" />',
-    ]
-    parts[1:1] = standard_svg_defs()
+        )
+    )
+    out.extend(standard_svg_defs())
+    out.append('<rect width="100%" height="100%" fill="#fffdf8" />')
 
-    parts.extend(
+    out.extend(
         _publication_band_svg(
             band=header_band,
             x=_PADDING,
@@ -148,13 +165,13 @@ def render_sppm_svg_artifact_from_layout(
         )
     )
 
-    parts.append(f'<g transform="translate({_PADDING:.1f},{content_top:.1f})">')
+    out.append(f'<g transform="translate({_PADDING:.1f},{content_top:.1f})">')
 
     visible_lanes = tuple(
         lane for lane in result.lanes if not _is_synthetic_sppm_lane(lane.id)
     )
     for lane in visible_lanes:
-        parts.extend(standard_lane_svg(lane))
+        out.extend(standard_lane_svg(lane))
 
     avoid_bounds = tuple(display_node_bounds.values()) + _lane_header_avoid_bounds(
         visible_lanes
@@ -168,7 +185,7 @@ def render_sppm_svg_artifact_from_layout(
         node_bounds=display_node_bounds,
         edge_paths=display_edge_paths,
     )
-    occupied_annotation_bounds: list[LayoutBounds] = []
+    avoid_grid = BoundsGrid(avoid_bounds)
     for edge_key in sorted(display_edge_paths.keys()):
         source_id, target_id = edge_key
         edge_parts, annotation_bounds = standard_edge_svg(
@@ -177,15 +194,15 @@ def render_sppm_svg_artifact_from_layout(
             target_bounds=display_node_bounds.get(target_id),
             source_kind=node_kind_by_id.get(source_id, "task"),
             target_kind=node_kind_by_id.get(target_id, "task"),
-            avoid_bounds=avoid_bounds + tuple(occupied_annotation_bounds),
+            avoid_bounds=avoid_grid,
             canvas_bounds=canvas_bounds,
             diagnostics=postprocess_diagnostics,
             render_as_rework_style=(
                 source_id in rework_ids and target_id in rework_ids
             ),
         )
-        parts.extend(edge_parts)
-        occupied_annotation_bounds.extend(annotation_bounds)
+        out.extend(edge_parts)
+        avoid_grid.extend(annotation_bounds)
 
     diagnostics = tuple(result.diagnostics) + tuple(postprocess_diagnostics)
     _raise_for_strict_postprocess_diagnostics(
@@ -206,7 +223,7 @@ def render_sppm_svg_artifact_from_layout(
         if bounds is None:
             continue
         raw_node = raw_node_by_id.get(node.id, {})
-        parts.extend(
+        out.extend(
             standard_node_svg(
                 node=node,
                 raw_node=raw_node,
@@ -218,8 +235,8 @@ def render_sppm_svg_artifact_from_layout(
             )
         )
 
-    parts.append("</g>")
-    parts.extend(
+    out.append("</g>")
+    out.extend(
         _publication_band_svg(
             band=footer_band,
             x=_PADDING,
@@ -227,11 +244,11 @@ def render_sppm_svg_artifact_from_layout(
             width=width - (_PADDING * 2.0),
         )
     )
-    parts.append("</svg>")
+    out.append("</svg>")
     return (
         RenderArtifact(
             kind="svg",
-            content="\n".join(parts),
+            content=out.content(),
             backend="svg",
             metadata={
                 "render_diagnostics": serialize_render_diagnostics(diagnostics),
@@ -267,29 +284,22 @@ def _raise_for_strict_postprocess_diagnostics(
     )
 
 
-def _raw_node_lookup(
-    process: dict[str, Any] | Any, *, options: RenderOptions
-) -> dict[str, dict[str, Any]]:
-    return raw_node_lookup(process, options=options)
-
-
-def _build_sppm_publication_plan(
-    *, process: dict[str, Any] | Any, options: RenderOptions, request: Any
-) -> Any:
-    source_nodes, source_edges = extract_nodes_and_edges(process)
+def _build_sppm_publication_plan(*, context: RenderContext, request: Any) -> Any:
     visible_node_ids = {str(node.id) for node in request.nodes}
     nodes = [
-        node for node in source_nodes if str(node.get("id") or "") in visible_node_ids
+        node
+        for node in context.source_nodes
+        if str(node.get("id") or "") in visible_node_ids
     ]
     edges = [
         edge
-        for edge in source_edges
+        for edge in context.source_edges
         if str(edge.get("source") or "") in visible_node_ids
         and str(edge.get("target") or "") in visible_node_ids
     ]
     return build_sppm_publication_plan(
-        process=process,
-        options=options,
+        process=context.process,
+        options=context.options,
         nodes=nodes,
         edges=edges,
     )
@@ -14,11 +14,14 @@ from ._svg_sppm_edge_segments import (
     _longest_segment_index,
 )
 from .layout_core.models import LayoutBounds, LayoutPoint
+from .layout_core.spatial import BoundsGrid
 
 _LANE_HEADER_AVOID_HEIGHT_PX = 34.0
 _SPPM_SYNTHETIC_ROW_PREFIX = "__sppm_row_"
 _ATTACHMENT_MISS_WARN_PX = 24.0
 
+AvoidBounds = tuple[Any, ...] | BoundsGrid
+
 
 @dataclass(frozen=True)
 class _LabelPlacement:
@@ -34,12 +37,13 @@ def _edge_svg(
     target_bounds: LayoutBounds | None = None,
     source_kind: str = "task",
     target_kind: str = "task",
-    avoid_bounds: tuple[Any, ...] = (),
+    avoid_bounds: AvoidBounds = (),
     canvas_bounds: Any | None = None,
     diagnostics: list[RenderDiagnostic] | None = None,
     render_as_rework_style: bool = False,
 ) -> tuple[list[str], tuple[LayoutBounds, ...]]:
     rework_edge = bool(edge_path.is_rework or render_as_rework_style)
+    avoid_grid = _bounds_grid(avoid_bounds)
     original_points = _normalize_rework_edge_points(
         edge_path.points,
         is_rework=rework_edge,
@@ -97,7 +101,7 @@ def _edge_svg(
                     edge_path.callout_lines and edge_path.callout_near_source
                 ),
                 prefer_near_source=source_kind.lower() == "decision",
-                avoid_bounds=avoid_bounds,
+                avoid_bounds=avoid_grid,
                 box_width=label_width,
                 box_height=18.0,
                 canvas_bounds=canvas_bounds,
@@ -128,7 +132,7 @@ def _edge_svg(
             near_source=bool(edge_path.callout_near_source),
             has_label=bool(edge_path.label),
             rework_edge=rework_edge,
-            avoid_bounds=avoid_bounds + tuple(annotation_bounds),
+            avoid_bounds=avoid_grid.layered(annotation_bounds),
             canvas_bounds=canvas_bounds,
             diagnostics=diagnostics,
             diagnostic_context={
@@ -163,7 +167,7 @@ def _label_placement(
     *,
     avoid_near_source: bool = False,
     prefer_near_source: bool = False,
-    avoid_bounds: tuple[Any, ...] = (),
+    avoid_bounds: AvoidBounds = (),
     box_width: float = 28.0,
     box_height: float = 18.0,
     canvas_bounds: Any | None = None,
@@ -229,7 +233,7 @@ def _edge_callout_svg(
     near_source: bool,
     has_label: bool,
     rework_edge: bool,
-    avoid_bounds: tuple[Any, ...] = (),
+    avoid_bounds: AvoidBounds = (),
     canvas_bounds: Any | None = None,
     diagnostics: list[RenderDiagnostic] | None = None,
     diagnostic_context: dict[str, Any] | None = None,
@@ -281,7 +285,7 @@ def _edge_callout_placement(
     near_source: bool,
     has_label: bool,
     rework_edge: bool = False,
-    avoid_bounds: tuple[Any, ...] = (),
+    avoid_bounds: AvoidBounds = (),
     box_width: float = 88.0,
     box_height: float = 40.0,
     canvas_bounds: Any | None = None,
@@ -345,13 +349,14 @@ def _avoid_bounds_overlap(
     *,
     box_width: float,
     box_height: float,
-    avoid_bounds: tuple[Any, ...],
+    avoid_bounds: AvoidBounds,
     segment_dx: float,
     segment_dy: float,
     canvas_bounds: Any | None,
     diagnostics: list[RenderDiagnostic] | None = None,
     diagnostic_context: dict[str, Any] | None = None,
 ) -> _LabelPlacement:
+    avoid_bounds = _bounds_grid(avoid_bounds)
     if not avoid_bounds:
         final_candidate = _clamp_placement_to_canvas(
             placement,
@@ -448,7 +453,7 @@ def _record_overlap_fallback_diagnostic(
     placement: _LabelPlacement,
     box_width: float,
     box_height: float,
-    avoid_bounds: tuple[Any, ...],
+    avoid_bounds: AvoidBounds,
     diagnostics: list[RenderDiagnostic] | None,
     diagnostic_context: dict[str, Any] | None,
 ) -> None:
@@ -522,19 +527,19 @@ def _placement_overlaps_bounds(
     *,
     box_width: float,
     box_height: float,
-    avoid_bounds: tuple[Any, ...],
+    avoid_bounds: AvoidBounds,
 ) -> bool:
     left = placement.x - (box_width / 2.0)
     right = placement.x + (box_width / 2.0)
     top = placement.y - 12.0
     bottom = top + box_height
-    for bounds in avoid_bounds:
-        if right <= float(bounds.x_px) or left >= float(bounds.x_px + bounds.width_px):
-            continue
-        if bottom <= float(bounds.y_px) or top >= float(bounds.y_px + bounds.height_px):
-            continue
-        return True
-    return False
+    return _bounds_grid(avoid_bounds).overlaps(left, top, right, bottom)
+
+
+def _bounds_grid(avoid_bounds: AvoidBounds) -> BoundsGrid:
+    if isinstance(avoid_bounds, BoundsGrid):
+        return avoid_bounds
+    return BoundsGrid(avoid_bounds)
 
 
 def _annotation_bounds_for_placement(
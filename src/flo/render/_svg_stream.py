@@ -0,0 +1,43 @@
+"""Incremental SVG fragment writer shared by the direct SVG renderers."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import io
+from typing import TextIO
+
+
+class SvgWriter:
+    """Write SVG fragments to a text sink, separated by newlines.
+
+    The text written is exactly the fragments joined with newlines, so
+    renderers can stream straight to a file instead of collecting every
+    fragment in a list. Without a sink the writer buffers in memory and
+    ``content()`` returns the text.
+    """
+
+    __slots__ = ("_sink", "_owned", "_started")
+
+    def __init__(self, sink: TextIO | None = None) -> None:
+        """Write to ``sink``, or to an in-memory buffer when it is None."""
+        self._owned = sink is None
+        self._sink: TextIO = io.StringIO() if sink is None else sink
+        self._started = False
+
+    def append(self, fragment: str) -> None:
+        """Write one fragment."""
+        if self._started:
+            self._sink.write("\n")
+        self._started = True
+        self._sink.write(fragment)
+
+    def extend(self, fragments: Iterable[str]) -> None:
+        """Write every fragment in order."""
+        for fragment in fragments:
+            self.append(fragment)
+
+    def content(self) -> str:
+        """Return the buffered SVG text ("" when writing to an external sink)."""
+        if isinstance(self._sink, io.StringIO) and self._owned:
+            return self._sink.getvalue()
+        return ""
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, TextIO
 
 from ._artifact import RenderArtifact
 from ._diagnostics import (
@@ -10,26 +10,39 @@ from ._diagnostics import (
     serialize_render_diagnostics,
     serialize_render_diagnostics_report,
 )
+from ._svg_stream import SvgWriter
 from ._svg_shared_primitives import (
-    raw_node_lookup,
     standard_edge_svg,
     standard_lane_svg,
     standard_node_svg,
     standard_svg_defs,
 )
 from .layout_core import build_swimlane_elk_layout_request, execute_elk_layout
+from .layout_core.elk_adapter import select_layout_engine
 from .layout_core.elk_runtime import run_elkjs_layout
+from .layout_core.render_context import RenderContext
+from .layout_core.spatial import BoundsGrid
 from .options import RenderOptions
 
 _PADDING = 24.0
 
 
 def render_swimlane_svg_artifact(
-    process: dict[str, Any] | Any, options: RenderOptions
+    process: dict[str, Any] | Any,
+    options: RenderOptions,
+    *,
+    sink: TextIO | None = None,
 ) -> tuple[RenderArtifact, None]:
-    """Render a standalone SVG swimlane diagram using ELK layout."""
-    request = build_swimlane_elk_layout_request(process, options=options)
-    result = execute_elk_layout(request, engine=run_elkjs_layout)
+    """Render a standalone SVG swimlane diagram using ELK layout.
+
+    With ``sink`` the SVG is streamed there and the artifact content is empty.
+    """
+    context = RenderContext.build(process, options)
+    request = build_swimlane_elk_layout_request(
+        process, options=options, context=context
+    )
+    engine = select_layout_engine(options, elk_engine=run_elkjs_layout)
+    result = execute_elk_layout(request, engine=engine)
     diagnostics_report = result.diagnostics_report(
         diagram="swimlane",
         backend="svg",
@@ -38,26 +51,27 @@ def render_swimlane_svg_artifact(
     )
     log_render_diagnostics(diagnostics_report)
     node_by_id = {node.id: node for node in request.nodes}
-    raw_node_by_id = raw_node_lookup(process, options=options)
+    raw_node_by_id = context.node_by_id
 
     width = max(1.0, result.canvas_bounds.width_px + (_PADDING * 2.0))
     height = max(1.0, result.canvas_bounds.height_px + (_PADDING * 2.0))
 
-    parts = [
-        (
-            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" '
-            f'height="{height:.0f}" viewBox="0 0 {width:.0f} {height:.0f}" '
-            'data-flo-artifact-kind="svg" data-flo-backend="svg" '
-            'data-flo-diagram="swimlane" data-flo-layout-engine="elk">'
-        ),
-        '<rect width="100%" height="100%" fill="#fffdf8" />',
-        f'<g transform="translate({_PADDING:.1f},{_PADDING:.1f})">',
-    ]
-    parts[1:1] = standard_svg_defs()
+    out = SvgWriter(sink)
+    out.append(
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" '
+        f'height="{height:.0f}" viewBox="0 0 {width:.0f} {height:.0f}" '
+        'data-flo-artifact-kind="svg" data-flo-backend="svg" '
+        'data-flo-diagram="swimlane" '
+        f'data-flo-layout-engine="{options.layout_engine}">'
+    )
+    out.extend(standard_svg_defs())
+    out.append('<rect width="100%" height="100%" fill="#fffdf8" />')
+    out.append(f'<g transform="translate({_PADDING:.1f},{_PADDING:.1f})">')
 
     for lane in result.lanes:
-        parts.extend(standard_lane_svg(lane))
+        out.extend(standard_lane_svg(lane))
 
+    avoid_grid = BoundsGrid(result.node_bounds.values())
     for edge_key in sorted(result.edge_paths.keys()):
         source_id, target_id = edge_key
         edge_parts, _annotation_bounds = standard_edge_svg(
@@ -70,19 +84,19 @@ def render_swimlane_svg_artifact(
             target_kind=str(
                 getattr(node_by_id.get(target_id), "kind", "task") or "task"
             ).lower(),
-            avoid_bounds=tuple(result.node_bounds.values()),
+            avoid_bounds=avoid_grid,
             canvas_bounds=result.canvas_bounds,
             diagnostics=[],
             render_as_rework_style=False,
         )
-        parts.extend(edge_parts)
+        out.extend(edge_parts)
 
     for node_id in [node.id for node in request.nodes]:
         bounds = result.bounds_for(node_id)
         node = node_by_id.get(node_id)
         if bounds is None or node is None:
             continue
-        parts.extend(
+        out.extend(
             standard_node_svg(
                 node=node,
                 raw_node=raw_node_by_id.get(node.id, {}),
@@ -94,18 +108,19 @@ def render_swimlane_svg_artifact(
             )
         )
 
-    parts.append("</g>")
-    parts.append("</svg>")
+    out.append("</g>")
+    out.append("</svg>")
     return (
         RenderArtifact(
             kind="svg",
-            content="\n".join(parts),
+            content=out.content(),
             backend="svg",
             metadata={
                 "render_diagnostics": serialize_render_diagnostics(result.diagnostics),
                 "render_diagnostics_report": serialize_render_diagnostics_report(
                     diagnostics_report
                 ),
+                "layout_cache": engine.metadata(),
             },
         ),
         None,
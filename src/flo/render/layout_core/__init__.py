@@ -3,7 +3,12 @@
 from flo.render._diagnostics import RenderDiagnostic
 
 from .corridors import CorridorAnchor, CorridorLane, CorridorPlan, build_corridor_plan
-from .elk_adapter import ElkEngine, layout_sppm_with_elk, layout_swimlane_with_elk
+from .elk_adapter import (
+    ElkEngine,
+    layout_sppm_with_elk,
+    layout_swimlane_with_elk,
+    select_layout_engine,
+)
 from .elk_errors import (
     ElkEngineError,
     ElkEngineProtocolError,
@@ -22,7 +27,20 @@ from .elk import (
     normalize_elk_layout_result,
     serialize_elk_layout_request,
 )
-from .elk_runtime import run_elkjs_layout
+from .elk_cache import (
+    CachingElkEngine,
+    ElkLayoutCache,
+    cached_elk_engine,
+    default_elk_layout_cache,
+)
+from .elk_runtime import install_elk_engine, run_elkjs_layout, use_elk_engine
+from .elk_worker import ElkWorker, shared_elk_worker, shutdown_shared_elk_worker
+from .elk_worker_pool import (
+    ElkWorkerPool,
+    shared_elk_worker_pool,
+    shutdown_shared_elk_worker_pool,
+)
+from .layered import layered_layout_engine
 from .models import (
     LayoutBounds,
     LayoutLaneFrame,
@@ -37,6 +55,7 @@ from .models import (
 )
 from .placement import build_placement_plan
 from .ports import PortSpec, build_port_assignments
+from .spatial import BoundsGrid
 from .routing import (
     EdgeRoute,
     RouteConflict,
@@ -46,6 +65,7 @@ from .routing import (
 )
 
 __all__ = [
+    "BoundsGrid",
     "CorridorLane",
     "CorridorAnchor",
     "CorridorPlan",
@@ -55,6 +75,12 @@ __all__ = [
     "ElkEngineSubprocessError",
     "ElkEngineTimeoutError",
     "ElkEngineProtocolError",
+    "ElkWorker",
+    "ElkWorkerPool",
+    "ElkLayoutCache",
+    "CachingElkEngine",
+    "cached_elk_engine",
+    "default_elk_layout_cache",
     "ElkLayoutLane",
     "ElkLayoutNode",
     "ElkLayoutEdge",
@@ -76,12 +102,20 @@ __all__ = [
     "LinePlacement",
     "PlacementPlan",
     "build_corridor_plan",
+    "install_elk_engine",
     "build_swimlane_elk_layout_request",
+    "layered_layout_engine",
     "layout_sppm_with_elk",
     "layout_swimlane_with_elk",
     "normalize_elk_layout_result",
     "run_elkjs_layout",
+    "select_layout_engine",
     "serialize_elk_layout_request",
+    "shared_elk_worker",
+    "shutdown_shared_elk_worker",
+    "shared_elk_worker_pool",
+    "shutdown_shared_elk_worker_pool",
+    "use_elk_engine",
     "build_port_assignments",
     "build_placement_plan",
     "build_route_plan",
@@ -18,17 +18,13 @@ from .elk_contracts import (
 from .elk_errors import ElkEngineProtocolError
 from .elk_validation import validate_elk_request_namespaces
 from .elk_support import (
-    extract_nodes_and_edges,
     lane_specs,
     ordered_edges,
     ordered_nodes,
-    ordered_sppm_nodes,
-    project_parent_only_subprocess_view,
     serialize_edge,
     serialize_node,
 )
 from .elk_sppm_helpers import (
-    _node_kind_map,
     _preserves_lane_structure,
     _sppm_branch_anchor_helpers,
     _root_layout_options,
@@ -40,6 +36,7 @@ from .elk_sppm_helpers import (
     _sppm_synthetic_row_lanes,
 )
 from .sppm_strategy import should_emit_sppm_branch_anchors
+from .render_context import RenderContext, render_context
 from .models import (
     LayoutBounds,
     LayoutLaneFrame,
@@ -52,16 +49,18 @@ from flo.services.errors import RenderError
 
 
 def build_swimlane_elk_layout_request(
-    process: dict[str, Any] | Any, options: RenderOptions | None = None
+    process: dict[str, Any] | Any,
+    options: RenderOptions | None = None,
+    *,
+    context: RenderContext | None = None,
 ) -> ElkLayoutRequest:
     """Build the first ELK layout request slice for swimlane diagrams."""
     render_options = options or RenderOptions(diagram="swimlane")
     if render_options.diagram != "swimlane":
         raise ValueError("Swimlane ELK request builder requires diagram='swimlane'.")
 
-    nodes, edges = extract_nodes_and_edges(process)
-    if render_options.subprocess_view == "parent_only":
-        nodes, edges = project_parent_only_subprocess_view(nodes, edges)
+    context = render_context(process, render_options, context)
+    nodes, edges = context.nodes, context.edges
 
     request = ElkLayoutRequest(
         diagram="swimlane",
@@ -70,7 +69,7 @@ def build_swimlane_elk_layout_request(
         nodes=ordered_nodes(nodes),
         edges=ordered_edges(
             edges,
-            node_kinds=_node_kind_map(nodes),
+            node_kinds=context.node_kinds,
             diagram="swimlane",
             direction=_elk_direction(render_options),
         ),
@@ -81,24 +80,26 @@ def build_swimlane_elk_layout_request(
 
 
 def build_sppm_elk_layout_request(
-    process: dict[str, Any] | Any, options: RenderOptions | None = None
+    process: dict[str, Any] | Any,
+    options: RenderOptions | None = None,
+    *,
+    context: RenderContext | None = None,
 ) -> ElkLayoutRequest:
     """Build the first ELK layout request slice for SPPM diagrams."""
     render_options = options or RenderOptions(diagram="sppm")
     if render_options.diagram != "sppm":
         raise ValueError("SPPM ELK request builder requires diagram='sppm'.")
 
-    nodes, edges = extract_nodes_and_edges(process)
-    if render_options.subprocess_view == "parent_only":
-        nodes, edges = project_parent_only_subprocess_view(nodes, edges)
+    context = render_context(process, render_options, context)
+    nodes, edges = context.nodes, context.edges
 
     edge_specs = ordered_edges(
         edges,
-        node_kinds=_node_kind_map(nodes),
+        node_kinds=context.node_kinds,
         diagram="sppm",
         direction=_elk_direction(render_options),
     )
-    sppm_nodes = ordered_sppm_nodes(nodes, options=render_options)
+    sppm_nodes = context.sppm_layout_nodes()
     if _preserves_lane_structure(process, nodes):
         lanes = lane_specs(process=process, nodes=nodes)
         partition_overrides: dict[str, int] = {}
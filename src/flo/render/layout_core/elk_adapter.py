@@ -10,7 +10,9 @@ from .elk import (
     build_swimlane_elk_layout_request,
     execute_elk_layout,
 )
+from .elk_cache import CachingElkEngine, cached_elk_engine
 from .elk_runtime import run_elkjs_layout
+from .layered import layered_layout_engine
 from .models import LayoutResult
 from flo.render.options import RenderOptions
 
@@ -23,6 +25,22 @@ class ElkEngine(Protocol):
         ...
 
 
+def select_layout_engine(
+    options: RenderOptions,
+    *,
+    elk_engine: ElkEngine | Callable[[dict[str, Any]], dict[str, Any]],
+) -> CachingElkEngine:
+    """Return the layout engine chosen by ``options.layout_engine``.
+
+    ``elk`` wraps ``elk_engine`` in the on-disk layout cache (unless disabled);
+    ``layered`` runs the in-process engine uncached, since its output is cheap
+    to recompute and must not share cache entries with elkjs.
+    """
+    if options.layout_engine == "layered":
+        return CachingElkEngine(layered_layout_engine, None)
+    return cached_elk_engine(elk_engine, enabled=options.layout_cache)
+
+
 def layout_swimlane_with_elk(
     process: dict[str, Any] | Any,
     *,
@@ -39,7 +57,7 @@ def layout_swimlane_with_elk(
         request,
         diagram="swimlane",
         strict=render_options.layout_fit == "fit-strict",
-        engine=engine or run_elkjs_layout,
+        engine=engine or _default_engine(render_options),
     )
 
 
@@ -59,10 +77,18 @@ def layout_sppm_with_elk(
         request,
         diagram="sppm",
         strict=render_options.layout_fit == "fit-strict",
-        engine=engine or run_elkjs_layout,
+        engine=engine or _default_engine(render_options),
     )
 
 
+def _default_engine(
+    options: RenderOptions,
+) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    if options.layout_engine == "layered":
+        return layered_layout_engine
+    return run_elkjs_layout
+
+
 def _execute_and_log_layout(
     request: Any,
     *,
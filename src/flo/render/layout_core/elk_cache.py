@@ -0,0 +1,409 @@
+"""Content-addressed cache for raw ELK layout responses."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+from typing import Any, Callable, Literal
+
+_ENV_CACHE = "FLO_ELK_CACHE"
+_ENV_CACHE_DIR = "FLO_ELK_CACHE_DIR"
+_ENV_CACHE_MAX_BYTES = "FLO_ELK_CACHE_MAX_BYTES"
+_ENV_ELKJS_PATH = "FLO_ELKJS_PATH"
+_DISABLED_VALUES = {"0", "off", "false", "no", "disabled"}
+_DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+_DEFAULT_MEMORY_ENTRIES = 256
+# Bump when the on-disk entry layout or key derivation changes.
+_CACHE_FORMAT_VERSION = "1"
+_ENTRY_SUFFIX = ".json"
+
+_Engine = Callable[[dict[str, Any]], dict[str, Any]]
+LayoutCacheLookup = Literal["hit", "miss", "disabled", "unused"]
+
+
+@dataclass
+class ElkLayoutCacheStats:
+    """Per-process lookup counters for one layout cache instance."""
+
+    hits: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+
+class ElkLayoutCache:
+    """Two-tier (in-process LRU + on-disk) store of raw ELK responses.
+
+    Entries are addressed by a SHA-256 over the canonical request payload and
+    a fingerprint of the ELK runtime (elkjs version plus ``elk_runtime.mjs``
+    digest), so upgrading either silently invalidates old entries. The disk
+    tier is bounded by ``max_bytes`` and evicts least-recently-used files.
+    Cache I/O failures degrade to misses and never fail a render.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_bytes: int = _DEFAULT_MAX_BYTES,
+        memory_entries: int = _DEFAULT_MEMORY_ENTRIES,
+        fingerprint: str | None = None,
+    ) -> None:
+        """Configure the cache rooted at ``directory``; nothing is created yet."""
+        self.directory = Path(directory)
+        self.max_bytes = max(0, int(max_bytes))
+        self.memory_entries = max(0, int(memory_entries))
+        self.fingerprint = fingerprint or elk_runtime_fingerprint()
+        self.stats = ElkLayoutCacheStats()
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes: int | None = None
+
+    def key_for(self, payload: dict[str, Any]) -> str:
+        """Return the content address for an ELK request payload."""
+        digest = hashlib.sha256()
+        digest.update(f"flo-elk-cache/{_CACHE_FORMAT_VERSION}\0".encode())
+        digest.update(self.fingerprint.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(_canonical_json(payload).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return a fresh copy of the cached response for ``key``, if any."""
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self.stats.hits += 1
+                self.stats.memory_hits += 1
+                return json.loads(text)
+
+        path = self._entry_path(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+            response = json.loads(text)
+        except FileNotFoundError:
+            response = None
+        except OSError, ValueError:
+            _unlink_quietly(path)
+            response = None
+        if not isinstance(response, dict):
+            with self._lock:
+                self.stats.misses += 1
+            return None
+
+        _touch_quietly(path)
+        with self._lock:
+            self._remember_locked(key, text)
+            self.stats.hits += 1
+            self.stats.disk_hits += 1
+        return response
+
+    def put(self, key: str, response: dict[str, Any]) -> None:
+        """Store ``response`` under ``key`` in both tiers."""
+        text = json.dumps(response, separators=(",", ":"))
+        with self._lock:
+            self._remember_locked(key, text)
+            self.stats.stores += 1
+        if self.max_bytes <= 0:
+            return
+
+        path = self._entry_path(key)
+        try:
+            previous = path.stat().st_size
+        except OSError:
+            previous = 0
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write(path, text)
+        except OSError:
+            return
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_usage()[1]
+            else:
+                # Replacing an entry only changes usage by the size delta.
+                self._disk_bytes += len(text.encode("utf-8")) - previous
+            if self._disk_bytes > self.max_bytes:
+                self._evict_locked()
+
+    def clear(self) -> int:
+        """Delete every entry from both tiers and return the disk entry count."""
+        removed = 0
+        with self._lock:
+            self._memory.clear()
+            for path in self._iter_entries():
+                if _unlink_quietly(path):
+                    removed += 1
+            for shard in self._iter_shards():
+                try:
+                    shard.rmdir()
+                except OSError:
+                    pass
+            self._disk_bytes = 0
+        return removed
+
+    def usage(self) -> tuple[int, int]:
+        """Return ``(entry_count, total_bytes)`` for the disk tier."""
+        with self._lock:
+            return self._scan_usage()
+
+    def describe(self) -> dict[str, Any]:
+        """Return configuration, disk usage, and lookup counters."""
+        entries, total_bytes = self.usage()
+        return {
+            "directory": str(self.directory),
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "memory_entries": len(self._memory),
+            "fingerprint": self.fingerprint,
+            **asdict(self.stats),
+        }
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{_ENTRY_SUFFIX}"
+
+    def _remember_locked(self, key: str, text: str) -> None:
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _iter_shards(self) -> list[Path]:
+        try:
+            return [
+                child
+                for child in self.directory.iterdir()
+                if child.is_dir() and len(child.name) == 2
+            ]
+        except OSError:
+            return []
+
+    def _iter_entries(self) -> list[Path]:
+        entries: list[Path] = []
+        for shard in self._iter_shards():
+            try:
+                entries.extend(shard.glob(f"*{_ENTRY_SUFFIX}"))
+            except OSError:
+                continue
+        return entries
+
+    def _scan_usage(self) -> tuple[int, int]:
+        count = 0
+        total = 0
+        for path in self._iter_entries():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+            count += 1
+        return count, total
+
+    def _evict_locked(self) -> None:
+        aged: list[tuple[float, int, Path]] = []
+        for path in self._iter_entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            aged.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _mtime, size, _path in aged)
+        aged.sort(key=lambda item: item[0])
+        for _mtime, size, path in aged:
+            if total <= self.max_bytes:
+                break
+            if _unlink_quietly(path):
+                total -= size
+                self.stats.evictions += 1
+        self._disk_bytes = total
+
+
+class CachingElkEngine:
+    """ELK engine wrapper that consults an ``ElkLayoutCache`` before layout.
+
+    One instance is meant to serve one render so ``lookup`` reflects whether
+    that render's layout came from the cache. With ``cache=None`` it simply
+    forwards to ``engine``.
+    """
+
+    def __init__(self, engine: _Engine, cache: ElkLayoutCache | None) -> None:
+        """Wrap ``engine``; pass ``cache=None`` to bypass caching."""
+        self.engine = engine
+        self.cache = cache
+        self.lookup: LayoutCacheLookup = "disabled" if cache is None else "unused"
+
+    def __call__(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Return a cached ELK response, or lay out and remember the result."""
+        if self.cache is None:
+            return self.engine(payload)
+        key = self.cache.key_for(payload)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.lookup = "hit"
+            return cached
+        response = self.engine(payload)
+        if isinstance(response, dict):
+            self.cache.put(key, response)
+        self.lookup = "miss"
+        return response
+
+    def metadata(self) -> dict[str, Any]:
+        """Return artifact-friendly cache metadata for the last lookup."""
+        if self.cache is None:
+            return {"status": self.lookup}
+        return {
+            "status": self.lookup,
+            "hits": self.cache.stats.hits,
+            "misses": self.cache.stats.misses,
+        }
+
+
+def elk_layout_cache_enabled() -> bool:
+    """Return whether ``FLO_ELK_CACHE`` leaves the layout cache switched on."""
+    value = os.getenv(_ENV_CACHE, "on").strip().lower()
+    return value not in _DISABLED_VALUES
+
+
+def default_elk_layout_cache_dir() -> Path:
+    """Return the layout cache directory from the environment or XDG default."""
+    explicit = os.getenv(_ENV_CACHE_DIR, "").strip()
+    if explicit:
+        return Path(explicit).expanduser()
+    xdg_cache = os.getenv("XDG_CACHE_HOME", "").strip()
+    base = Path(xdg_cache).expanduser() if xdg_cache else Path.home() / ".cache"
+    return base / "flo" / "elk-layout"
+
+
+def default_elk_layout_cache() -> ElkLayoutCache:
+    """Return the process-wide cache for the current environment settings."""
+    return _shared_cache(
+        str(default_elk_layout_cache_dir()),
+        _env_max_bytes(),
+        elk_runtime_fingerprint(),
+    )
+
+
+def cached_elk_engine(engine: _Engine, *, enabled: bool = True) -> CachingElkEngine:
+    """Wrap ``engine`` with the default layout cache unless caching is off."""
+    cache = (
+        default_elk_layout_cache() if enabled and elk_layout_cache_enabled() else None
+    )
+    return CachingElkEngine(engine, cache)
+
+
+def elk_runtime_fingerprint() -> str:
+    """Return a digest identifying the elkjs build and runtime script in use."""
+    return _runtime_fingerprint(os.getenv(_ENV_ELKJS_PATH, "").strip())
+
+
+@lru_cache(maxsize=8)
+def _runtime_fingerprint(explicit_elkjs_path: str) -> str:
+    script_path = Path(__file__).with_name("elk_runtime.mjs")
+    digest = hashlib.sha256()
+    digest.update(_file_digest(script_path).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(_elkjs_identity(explicit_elkjs_path, script_path).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _elkjs_identity(explicit_elkjs_path: str, script_path: Path) -> str:
+    if explicit_elkjs_path:
+        return f"path:{_file_digest(Path(explicit_elkjs_path))}"
+    repo_root = script_path.resolve().parents[4]
+    for package_json in (
+        repo_root / "node_modules" / "elkjs" / "package.json",
+        Path.cwd() / "node_modules" / "elkjs" / "package.json",
+    ):
+        version = _json_field(package_json, ("version",))
+        if version:
+            return f"elkjs:{version}"
+    pinned = _json_field(repo_root / "package.json", ("dependencies", "elkjs"))
+    return f"elkjs:{pinned or 'unknown'}"
+
+
+@lru_cache(maxsize=8)
+def _shared_cache(directory: str, max_bytes: int, fingerprint: str) -> ElkLayoutCache:
+    return ElkLayoutCache(Path(directory), max_bytes=max_bytes, fingerprint=fingerprint)
+
+
+def _env_max_bytes() -> int:
+    raw = os.getenv(_ENV_CACHE_MAX_BYTES, "").strip()
+    try:
+        return int(raw) if raw else _DEFAULT_MAX_BYTES
+    except ValueError:
+        return _DEFAULT_MAX_BYTES
+
+
+def _canonical_json(payload: dict[str, Any]) -> str:
+    return json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+
+
+def _file_digest(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return "missing"
+
+
+def _json_field(path: Path, keys: tuple[str, ...]) -> str | None:
+    try:
+        value: Any = json.loads(path.read_text(encoding="utf-8"))
+    except OSError, ValueError:
+        return None
+    for key in keys:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return str(value) if value else None
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".part")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp_name, path)
+    except OSError:
+        _unlink_quietly(Path(tmp_name))
+        raise
+
+
+def _touch_quietly(path: Path) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _unlink_quietly(path: Path) -> bool:
+    try:
+        path.unlink()
+    except OSError:
+        return False
+    return True
+
+
+__all__ = [
+    "CachingElkEngine",
+    "ElkLayoutCache",
+    "ElkLayoutCacheStats",
+    "cached_elk_engine",
+    "default_elk_layout_cache",
+    "default_elk_layout_cache_dir",
+    "elk_layout_cache_enabled",
+    "elk_runtime_fingerprint",
+]
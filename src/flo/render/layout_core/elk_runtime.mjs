@@ -1,4 +1,5 @@
 import path from 'node:path';
+import readline from 'node:readline';
 import { fileURLToPath, pathToFileURL } from 'node:url';
 
 const resolveElkSpecifiers = () => {
@@ -47,15 +48,48 @@ const readStdin = async () => {
   return input;
 };
 
-try {
-  const ELK = await loadElk();
+const writeLine = (message) => {
+  process.stdout.write(`${JSON.stringify(message)}\n`);
+};
+
+const serve = async (ELK) => {
+  const elk = new ELK();
+  const lines = readline.createInterface({ input: process.stdin, terminal: false });
+  writeLine({ ready: true });
+  for await (const line of lines) {
+    if (!line.trim()) {
+      continue;
+    }
+    let id = null;
+    try {
+      const message = JSON.parse(line);
+      id = message?.id ?? null;
+      const result = await elk.layout(message?.graph ?? {});
+      writeLine({ id, result });
+    } catch (error) {
+      const text = error instanceof Error ? error.message : String(error);
+      writeLine({ id, error: text });
+    }
+  }
+};
+
+const runOnce = async (ELK) => {
   const raw = await readStdin();
   const payload = JSON.parse(raw || '{}');
   const elk = new ELK();
   const result = await elk.layout(payload);
   process.stdout.write(JSON.stringify(result));
+};
+
+try {
+  const ELK = await loadElk();
+  if (process.argv.includes('--serve')) {
+    await serve(ELK);
+  } else {
+    await runOnce(ELK);
+  }
 } catch (error) {
   const message = error instanceof Error ? error.message : String(error);
   process.stderr.write(message);
   process.exitCode = 1;
-}
\ No newline at end of file
+}
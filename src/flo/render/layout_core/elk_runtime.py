@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+from contextlib import contextmanager
 import json
+import os
 from pathlib import Path
 import shutil
 import subprocess
-from typing import Any
+from typing import Any, Callable, Iterator
 
 from .elk_errors import (
     ElkEngineProtocolError,
@@ -16,15 +18,57 @@ from .elk_errors import (
 )
 
 _DEFAULT_TIMEOUT_SECONDS = 10.0
+_ENV_ELK_ENGINE = "FLO_ELK_ENGINE"
+
+_InstalledEngine = Callable[[dict[str, Any]], dict[str, Any]]
+_installed_engine: _InstalledEngine | None = None
+
+
+def install_elk_engine(engine: _InstalledEngine | None) -> _InstalledEngine | None:
+    """Route ``run_elkjs_layout`` through ``engine``; return the previous one.
+
+    Passing ``None`` restores the default one-process-per-layout behavior.
+    """
+    global _installed_engine
+    previous = _installed_engine
+    _installed_engine = engine
+    return previous
+
+
+@contextmanager
+def use_elk_engine(engine: _InstalledEngine) -> Iterator[_InstalledEngine]:
+    """Install ``engine`` for the duration of a ``with`` block."""
+    previous = install_elk_engine(engine)
+    try:
+        yield engine
+    finally:
+        install_elk_engine(previous)
 
 
 def run_elkjs_layout(
     payload: dict[str, Any],
     *,
-    node_command: str = "node",
-    timeout_seconds: float = _DEFAULT_TIMEOUT_SECONDS,
+    node_command: str | None = None,
+    timeout_seconds: float | None = None,
 ) -> dict[str, Any]:
-    """Execute ELK via the local Node runtime and return the JSON response."""
+    """Execute ELK via the local Node runtime and return the JSON response.
+
+    When an engine has been installed (``install_elk_engine``) or
+    ``FLO_ELK_ENGINE`` is ``worker`` or ``pool``, the payload is delegated to
+    that long-lived engine instead of spawning a fresh Node process. Long-lived
+    engines carry their own command and timeout, so a call that passes
+    ``node_command`` or ``timeout_seconds`` at all skips delegation and runs a
+    one-shot process with exactly those settings (``node`` and 10 seconds
+    when omitted).
+    """
+    if node_command is None and timeout_seconds is None:
+        delegate = _resolve_installed_engine()
+        if delegate is not None:
+            return delegate(payload)
+    node_command = node_command or "node"
+    if timeout_seconds is None:
+        timeout_seconds = _DEFAULT_TIMEOUT_SECONDS
+
     if not shutil.which(node_command):
         raise ElkRuntimeUnavailableError(
             f"Node.js executable '{node_command}' not found on PATH."
@@ -72,3 +116,18 @@ def run_elkjs_layout(
     if not isinstance(response, dict):
         raise ElkEngineProtocolError("ELK runtime returned a non-object JSON payload.")
     return response
+
+
+def _resolve_installed_engine() -> _InstalledEngine | None:
+    if _installed_engine is not None:
+        return _installed_engine
+    mode = os.getenv(_ENV_ELK_ENGINE, "subprocess").strip().lower()
+    if mode == "worker":
+        from .elk_worker import shared_elk_worker
+
+        return shared_elk_worker()
+    if mode == "pool":
+        from .elk_worker_pool import shared_elk_worker_pool
+
+        return shared_elk_worker_pool()
+    return None
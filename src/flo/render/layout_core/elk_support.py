@@ -4,6 +4,9 @@ from __future__ import annotations
 
 from typing import Any
 
+from flo.compiler.ir.hierarchy import SubprocessHierarchy
+from flo.compiler.ir.index import ir_index
+from flo.compiler.ir.models import IR
 from flo.render._sppm_continuation_tokens import (
     resolve_explicit_sppm_continuation_tokens,
 )
@@ -141,6 +144,13 @@ def extract_nodes_and_edges(
     """Extract graph nodes and edges from supported FLO process representations."""
     if process is None:
         return [], []
+    if isinstance(process, IR):
+        # Each render extracts several times; build the records once per IR
+        # and hand out copies so callers may still edit what they receive.
+        nodes, edges = ir_index(process).memo(
+            "render.elk_records", lambda: _extract_from_ir_object(process)
+        )
+        return [dict(node) for node in nodes], [dict(edge) for edge in edges]
     if hasattr(process, "nodes") and hasattr(process, "edges"):
         return _extract_from_ir_object(process)
     if isinstance(process, dict):
@@ -172,11 +182,12 @@ def project_parent_only_subprocess_view(
 
 
 def _hidden_subprocess_parent_ids(nodes: list[dict[str, Any]]) -> set[str]:
-    return {
-        node_id
+    hierarchy = SubprocessHierarchy(
+        (node_id, _subprocess_parent(node))
         for node in nodes
-        if (node_id := str(node.get("id") or "")) and _subprocess_parent(node)
-    }
+        if (node_id := str(node.get("id") or ""))
+    )
+    return set(hierarchy.nested_ids())
 
 
 def _visible_non_hidden_nodes(
@@ -0,0 +1,316 @@
+"""Long-lived ELK worker engine backed by a persistent Node process."""
+
+from __future__ import annotations
+
+import atexit
+from collections import deque
+from dataclasses import dataclass, field
+import itertools
+import json
+from pathlib import Path
+import shutil
+import subprocess
+import threading
+from typing import IO, Any
+
+from .elk_errors import (
+    ElkEngineError,
+    ElkEngineProtocolError,
+    ElkEngineSubprocessError,
+    ElkEngineTimeoutError,
+    ElkRuntimeUnavailableError,
+)
+
+_DEFAULT_TIMEOUT_SECONDS = 10.0
+_DEFAULT_STARTUP_TIMEOUT_SECONDS = 15.0
+_SHUTDOWN_GRACE_SECONDS = 2.0
+_STDERR_TAIL_LINES = 20
+
+
+@dataclass
+class _PendingLayout:
+    process: subprocess.Popen[str]
+    event: threading.Event = field(default_factory=threading.Event)
+    response: dict[str, Any] | None = None
+    error: ElkEngineError | None = None
+
+
+class ElkWorker:
+    """ELK engine that serves layouts from one persistent ``node`` process.
+
+    The worker loads elkjs once and exchanges newline-delimited JSON messages
+    (``{"id", "graph"}`` in, ``{"id", "result" | "error"}`` out) over
+    stdin/stdout. A crashed or timed-out process is discarded and a fresh one
+    is started on the next request. Instances satisfy the ``ElkEngine``
+    protocol and are safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        *,
+        node_command: str = "node",
+        timeout_seconds: float = _DEFAULT_TIMEOUT_SECONDS,
+        startup_timeout_seconds: float = _DEFAULT_STARTUP_TIMEOUT_SECONDS,
+        script_path: Path | None = None,
+    ) -> None:
+        """Configure the worker; the Node process starts on first use."""
+        self.node_command = node_command
+        self.timeout_seconds = timeout_seconds
+        self.startup_timeout_seconds = startup_timeout_seconds
+        self.script_path = script_path or Path(__file__).with_name("elk_runtime.mjs")
+        self.restart_count = 0
+        self._process: subprocess.Popen[str] | None = None
+        self._lock = threading.Lock()
+        self._pending: dict[str, _PendingLayout] = {}
+        self._stderr_tail: deque[str] = deque(maxlen=_STDERR_TAIL_LINES)
+        self._request_ids = itertools.count(1)
+        self._started_once = False
+        self._closed = False
+
+    def __call__(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Run one ELK-shaped payload through the worker and return the response."""
+        request_id = str(next(self._request_ids))
+        with self._lock:
+            process = self._ensure_process_locked()
+            pending = _PendingLayout(process=process)
+            self._pending[request_id] = pending
+            try:
+                _write_message(process.stdin, {"id": request_id, "graph": payload})
+            except (OSError, ValueError) as exc:
+                self._pending.pop(request_id, None)
+                self._discard_process_locked(process)
+                raise ElkEngineSubprocessError(
+                    f"ELK worker stopped accepting requests: {exc}"
+                ) from exc
+
+        if not pending.event.wait(self.timeout_seconds):
+            with self._lock:
+                self._pending.pop(request_id, None)
+                if self._process is process:
+                    # A stuck layout blocks every later request on this process.
+                    self._discard_process_locked(process)
+            raise ElkEngineTimeoutError(
+                f"ELK worker timed out after {self.timeout_seconds:g}s."
+            )
+        if pending.error is not None:
+            raise pending.error
+        if not isinstance(pending.response, dict):
+            raise ElkEngineProtocolError(
+                "ELK worker returned a non-object JSON payload."
+            )
+        return pending.response
+
+    @property
+    def is_alive(self) -> bool:
+        """Return whether the worker currently owns a running Node process."""
+        process = self._process
+        return process is not None and process.poll() is None
+
+    def start(self) -> None:
+        """Start the Node process eagerly instead of on the first request."""
+        with self._lock:
+            self._ensure_process_locked()
+
+    def close(self) -> None:
+        """Stop the Node process and fail any requests still in flight."""
+        with self._lock:
+            self._closed = True
+            process = self._process
+            self._process = None
+        if process is None:
+            return
+        try:
+            if process.stdin is not None:
+                process.stdin.close()
+            process.wait(timeout=_SHUTDOWN_GRACE_SECONDS)
+        except OSError, subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        self._fail_pending(
+            ElkEngineSubprocessError("ELK worker was shut down."), process=process
+        )
+
+    def __enter__(self) -> ElkWorker:
+        """Start the worker for use as a context manager."""
+        self.start()
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Shut the worker down when leaving the context."""
+        self.close()
+
+    def _ensure_process_locked(self) -> subprocess.Popen[str]:
+        if self._closed:
+            raise ElkRuntimeUnavailableError("ELK worker has been closed.")
+        process = self._process
+        if process is not None and process.poll() is None:
+            return process
+        if process is not None:
+            self._discard_process_locked(process)
+        return self._spawn_locked()
+
+    def _spawn_locked(self) -> subprocess.Popen[str]:
+        if not shutil.which(self.node_command):
+            raise ElkRuntimeUnavailableError(
+                f"Node.js executable '{self.node_command}' not found on PATH."
+            )
+        if not self.script_path.exists():
+            raise ElkRuntimeUnavailableError(
+                f"ELK runtime script not found at '{self.script_path}'."
+            )
+
+        try:
+            process = subprocess.Popen(
+                [self.node_command, str(self.script_path), "--serve"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                bufsize=1,
+            )
+        except OSError as exc:
+            raise ElkRuntimeUnavailableError(
+                f"Failed to invoke Node.js runtime '{self.node_command}': {exc}"
+            ) from exc
+
+        ready = threading.Event()
+        self._stderr_tail.clear()
+        threading.Thread(
+            target=self._read_stdout, args=(process, ready), daemon=True
+        ).start()
+        stderr_reader = threading.Thread(
+            target=self._read_stderr, args=(process,), daemon=True
+        )
+        stderr_reader.start()
+
+        if not ready.wait(self.startup_timeout_seconds):
+            process.kill()
+            process.wait()
+            raise ElkEngineTimeoutError(
+                f"ELK worker did not become ready within {self.startup_timeout_seconds:g}s."
+            )
+        if process.poll() is not None:
+            process.wait()
+            stderr_reader.join(_SHUTDOWN_GRACE_SECONDS)
+            raise ElkEngineSubprocessError(self._exit_message(process))
+
+        if self._started_once:
+            self.restart_count += 1
+        self._started_once = True
+        self._process = process
+        return process
+
+    def _discard_process_locked(self, process: subprocess.Popen[str]) -> None:
+        if self._process is process:
+            self._process = None
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+    def _read_stdout(
+        self, process: subprocess.Popen[str], ready: threading.Event
+    ) -> None:
+        stream = process.stdout
+        if stream is None:
+            return
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                # Kill first so a request writing under the lock fails fast
+                # instead of blocking while this thread waits for the lock.
+                process.kill()
+                self._fail_pending(
+                    ElkEngineProtocolError("ELK worker returned invalid JSON."),
+                    process=process,
+                )
+                break
+            if not isinstance(message, dict):
+                continue
+            if message.get("ready") is True:
+                ready.set()
+                continue
+            self._resolve(message)
+
+        process.wait()
+        # Unblock a startup wait; the spawner inspects the exit status itself.
+        ready.set()
+        self._fail_pending(
+            ElkEngineSubprocessError(self._exit_message(process)), process=process
+        )
+
+    def _read_stderr(self, process: subprocess.Popen[str]) -> None:
+        stream = process.stderr
+        if stream is None:
+            return
+        for line in stream:
+            if line.strip():
+                self._stderr_tail.append(line.strip())
+
+    def _resolve(self, message: dict[str, Any]) -> None:
+        pending = self._pending.pop(str(message.get("id")), None)
+        if pending is None:
+            return
+        if "error" in message:
+            pending.error = ElkEngineSubprocessError(
+                f"ELK worker failed to lay out request: {message.get('error')}"
+            )
+        else:
+            pending.response = message.get("result")
+        pending.event.set()
+
+    def _fail_pending(
+        self, error: ElkEngineError, *, process: subprocess.Popen[str]
+    ) -> None:
+        with self._lock:
+            failed = [
+                self._pending.pop(request_id)
+                for request_id, pending in list(self._pending.items())
+                if pending.process is process
+            ]
+        for pending in failed:
+            pending.error = error
+            pending.event.set()
+
+    def _exit_message(self, process: subprocess.Popen[str]) -> str:
+        stderr = " ".join(self._stderr_tail)
+        return f"ELK worker exited with code {process.returncode}" + (
+            f": {stderr}" if stderr else ""
+        )
+
+
+def _write_message(stream: IO[str] | None, message: dict[str, Any]) -> None:
+    if stream is None:
+        raise ValueError("worker stdin is not available")
+    stream.write(json.dumps(message) + "\n")
+    stream.flush()
+
+
+_shared_worker: ElkWorker | None = None
+_shared_worker_lock = threading.Lock()
+
+
+def shared_elk_worker() -> ElkWorker:
+    """Return the process-wide ELK worker, creating it on first use."""
+    global _shared_worker
+    with _shared_worker_lock:
+        if _shared_worker is None:
+            _shared_worker = ElkWorker()
+            atexit.register(shutdown_shared_elk_worker)
+        return _shared_worker
+
+
+def shutdown_shared_elk_worker() -> None:
+    """Stop the process-wide ELK worker if one was started."""
+    global _shared_worker
+    with _shared_worker_lock:
+        worker = _shared_worker
+        _shared_worker = None
+    if worker is not None:
+        worker.close()
+
+
+__all__ = ["ElkWorker", "shared_elk_worker", "shutdown_shared_elk_worker"]
@@ -0,0 +1,304 @@
+"""Pool of persistent ELK workers for concurrent layout requests."""
+
+from __future__ import annotations
+
+import atexit
+from dataclasses import dataclass, field
+import os
+from pathlib import Path
+import queue
+import threading
+from typing import Any
+
+from .elk_errors import (
+    ElkEngineError,
+    ElkEngineProtocolError,
+    ElkEngineTimeoutError,
+    ElkRuntimeUnavailableError,
+)
+from .elk_worker import ElkWorker
+
+_ENV_POOL_SIZE = "FLO_ELK_POOL_SIZE"
+_DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS = 30.0
+_QUEUE_DEPTH_PER_WORKER = 4
+_HEALTH_PROBE_PAYLOAD: dict[str, Any] = {"id": "flo-health-probe", "children": []}
+
+
+@dataclass(eq=False)
+class _PoolJob:
+    payload: dict[str, Any]
+    event: threading.Event = field(default_factory=threading.Event)
+    response: dict[str, Any] | None = None
+    error: BaseException | None = None
+
+
+@dataclass
+class _PoolSlot:
+    index: int
+    worker: ElkWorker
+    thread: threading.Thread | None = None
+    completed: int = 0
+    failures: int = 0
+    replacements: int = 0
+    healthy: bool = True
+
+
+class ElkWorkerPool:
+    """ELK engine that fans layouts out over several ``ElkWorker`` processes.
+
+    Requests enter one bounded FIFO queue and each worker is driven by its own
+    dispatcher thread, so layouts are served first-come-first-served. Because
+    every caller blocks until its layout returns, a caller holds at most one
+    queue slot and cannot starve others. When the queue is full, submissions
+    block (back-pressure) for up to ``submit_timeout_seconds`` before failing
+    with ``ElkEngineTimeoutError``. A queued caller waits at most as long as
+    every request ahead of it could take at the configured ELK timeout. Idle
+    workers are probed every ``health_check_interval_seconds`` and replaced
+    when the probe fails.
+    """
+
+    def __init__(
+        self,
+        *,
+        size: int | None = None,
+        max_pending: int | None = None,
+        submit_timeout_seconds: float | None = None,
+        health_check_interval_seconds: float = _DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS,
+        node_command: str = "node",
+        timeout_seconds: float | None = None,
+        startup_timeout_seconds: float | None = None,
+        script_path: Path | None = None,
+    ) -> None:
+        """Configure the pool; workers start on first use or ``start()``."""
+        self.size = max(1, size or os.cpu_count() or 1)
+        self.max_pending = max(1, max_pending or self.size * _QUEUE_DEPTH_PER_WORKER)
+        self.submit_timeout_seconds = submit_timeout_seconds
+        self.health_check_interval_seconds = health_check_interval_seconds
+        worker_options: dict[str, Any] = {
+            "node_command": node_command,
+            "script_path": script_path,
+        }
+        if timeout_seconds is not None:
+            worker_options["timeout_seconds"] = timeout_seconds
+        if startup_timeout_seconds is not None:
+            worker_options["startup_timeout_seconds"] = startup_timeout_seconds
+        self._worker_options = worker_options
+        self._queue: queue.Queue[_PoolJob | None] = queue.Queue(self.max_pending)
+        self._slots = [
+            _PoolSlot(index=index, worker=ElkWorker(**worker_options))
+            for index in range(self.size)
+        ]
+        worker = self._slots[0].worker
+        # Each worker may serve a full queue share (plus one health probe)
+        # ahead of this job, each bounded by the ELK timeout.
+        rounds = -(-self.max_pending // self.size) + 1
+        self._wait_timeout_seconds = (
+            worker.startup_timeout_seconds + worker.timeout_seconds * rounds
+        )
+        self._pending: set[_PoolJob] = set()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self.submitted = 0
+
+    def __call__(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Queue one ELK payload and block until a worker has laid it out."""
+        job = _PoolJob(payload=payload)
+        self._ensure_started(job)
+        try:
+            self._queue.put(job, timeout=self.submit_timeout_seconds)
+        except queue.Full as exc:
+            self._forget(job)
+            raise ElkEngineTimeoutError(
+                f"ELK worker pool queue stayed full ({self.max_pending} pending)"
+                f" for {self.submit_timeout_seconds:g}s."
+            ) from exc
+        with self._lock:
+            self.submitted += 1
+        try:
+            if not job.event.wait(self._wait_timeout_seconds):
+                raise ElkEngineTimeoutError(
+                    "ELK worker pool did not answer within"
+                    f" {self._wait_timeout_seconds:g}s."
+                )
+        finally:
+            self._forget(job)
+        if job.error is not None:
+            raise job.error
+        if not isinstance(job.response, dict):
+            raise ElkEngineProtocolError("ELK worker pool produced no layout response.")
+        return job.response
+
+    def start(self) -> None:
+        """Start dispatcher threads and warm every worker process."""
+        self._ensure_started()
+
+    def close(self) -> None:
+        """Fail queued requests, stop dispatchers, and shut every worker down."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            started = self._started
+            # Every admitted job is failed here, including one whose caller
+            # has not reached the queue yet, so no caller is left waiting.
+            error = ElkRuntimeUnavailableError("ELK worker pool was shut down.")
+            for job in self._pending:
+                if not job.event.is_set():
+                    job.error = error
+                    job.event.set()
+            self._pending.clear()
+        self._discard_queued()
+        if started:
+            for _slot in self._slots:
+                self._queue.put(None)
+            for slot in self._slots:
+                if slot.thread is not None:
+                    slot.thread.join()
+        for slot in self._slots:
+            slot.worker.close()
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth, throughput counters, and per-worker health."""
+        return {
+            "size": self.size,
+            "max_pending": self.max_pending,
+            "queued": self._queue.qsize(),
+            "submitted": self.submitted,
+            "completed": sum(slot.completed for slot in self._slots),
+            "failed": sum(slot.failures for slot in self._slots),
+            "workers": [
+                {
+                    "index": slot.index,
+                    "alive": slot.worker.is_alive,
+                    "healthy": slot.healthy,
+                    "completed": slot.completed,
+                    "failures": slot.failures,
+                    "restarts": slot.worker.restart_count + slot.replacements,
+                }
+                for slot in self._slots
+            ],
+        }
+
+    def __enter__(self) -> ElkWorkerPool:
+        """Start the pool for use as a context manager."""
+        self.start()
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Shut the pool down when leaving the context."""
+        self.close()
+
+    def _ensure_started(self, job: _PoolJob | None = None) -> None:
+        with self._lock:
+            if self._closed:
+                raise ElkRuntimeUnavailableError("ELK worker pool has been closed.")
+            if job is not None:
+                self._pending.add(job)
+            if self._started:
+                return
+            self._started = True
+            for slot in self._slots:
+                slot.thread = threading.Thread(
+                    target=self._serve,
+                    args=(slot,),
+                    name=f"flo-elk-pool-{slot.index}",
+                    daemon=True,
+                )
+                slot.thread.start()
+
+    def _serve(self, slot: _PoolSlot) -> None:
+        self._warm(slot)
+        while True:
+            try:
+                job = self._queue.get(timeout=self.health_check_interval_seconds)
+            except queue.Empty:
+                self._check_health(slot)
+                continue
+            if job is None:
+                return
+            if job.event.is_set():  # failed by close() while queued
+                continue
+            try:
+                job.response = slot.worker(job.payload)
+                slot.completed += 1
+            except Exception as exc:  # surfaced to the submitting caller
+                job.error = exc
+                slot.failures += 1
+            finally:
+                job.event.set()
+
+    def _warm(self, slot: _PoolSlot) -> None:
+        try:
+            slot.worker.start()
+        except ElkEngineError:
+            # Startup errors resurface on the first real request for this slot.
+            slot.healthy = False
+
+    def _check_health(self, slot: _PoolSlot) -> None:
+        if self._closed:
+            return
+        try:
+            slot.worker(dict(_HEALTH_PROBE_PAYLOAD))
+        except ElkEngineError:
+            slot.worker.close()
+            slot.worker = ElkWorker(**self._worker_options)
+            slot.replacements += 1
+            slot.healthy = False
+            self._warm(slot)
+            return
+        slot.healthy = True
+
+    def _forget(self, job: _PoolJob) -> None:
+        with self._lock:
+            self._pending.discard(job)
+
+    def _discard_queued(self) -> None:
+        # Queued jobs were already failed by close(); make room for sentinels.
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+
+_shared_pool: ElkWorkerPool | None = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_elk_worker_pool() -> ElkWorkerPool:
+    """Return the process-wide ELK worker pool, creating it on first use.
+
+    ``FLO_ELK_POOL_SIZE`` overrides the default of one worker per CPU.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = ElkWorkerPool(size=_env_pool_size())
+            atexit.register(shutdown_shared_elk_worker_pool)
+        return _shared_pool
+
+
+def shutdown_shared_elk_worker_pool() -> None:
+    """Stop the process-wide ELK worker pool if one was started."""
+    global _shared_pool
+    with _shared_pool_lock:
+        pool = _shared_pool
+        _shared_pool = None
+    if pool is not None:
+        pool.close()
+
+
+def _env_pool_size() -> int | None:
+    raw = os.getenv(_ENV_POOL_SIZE, "").strip()
+    try:
+        return int(raw) if raw else None
+    except ValueError:
+        return None
+
+
+__all__ = [
+    "ElkWorkerPool",
+    "shared_elk_worker_pool",
+    "shutdown_shared_elk_worker_pool",
+]
@@ -0,0 +1,38 @@
+"""Pure-Python layered layout engine for ELK-shaped layout payloads.
+
+``layered_layout_engine`` accepts the payload that ``run_elkjs_layout`` would
+send to elkjs and answers with an ELK-shaped response, so it plugs into
+``execute_elk_layout`` and ``normalize_elk_layout_result`` unchanged. It runs
+the classic Sugiyama phases (``layered_graph``) followed by lane-banded
+coordinate assignment and orthogonal routing (``layered_geometry``). It needs
+no Node.js runtime and is deterministic, at the cost of ELK's more refined
+placement heuristics.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .elk_errors import ElkEngineProtocolError
+from .layered_geometry import emit_layered_response, place_layered_graph
+from .layered_graph import (
+    assign_layers,
+    insert_dummy_nodes,
+    order_layers,
+    parse_layered_graph,
+)
+
+
+def layered_layout_engine(payload: dict[str, Any]) -> dict[str, Any]:
+    """Lay out an ELK-shaped payload in-process and return an ELK-shaped response."""
+    if not isinstance(payload, dict):
+        raise ElkEngineProtocolError("Layered layout payload must be a dictionary.")
+    graph = parse_layered_graph(payload)
+    assign_layers(graph)
+    insert_dummy_nodes(graph)
+    order_layers(graph)
+    placement = place_layered_graph(graph)
+    return emit_layered_response(payload, graph, placement)
+
+
+__all__ = ["layered_layout_engine"]
@@ -0,0 +1,551 @@
+"""Coordinates, orthogonal routing, and ELK-shaped output for layered layouts.
+
+Works in layout space: ``p`` runs along the layer direction (x for RIGHT, y
+for DOWN) and ``s`` across it. Lanes become bands along ``s``; within a band,
+each layer is placed by isotonic regression toward the centres of its
+neighbours so chains straighten while keeping minimum spacing. Edges route
+orthogonally through per-gap vertical tracks; feedback edges whose ports do not
+face backwards detour underneath the drawing.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+from .layered_graph import (
+    LayeredEdge,
+    LayeredGraph,
+    LayeredNode,
+    Side,
+    iter_raw_edges,
+)
+
+Point = tuple[float, float]
+
+_PADDING = 12.0
+_LANE_PADDING = 12.0
+_EDGE_SPACING = 10.0
+_STUB = 10.0
+_PLACEMENT_ITERATIONS = 8
+_PORT_OFFSETS = {
+    "NORTH": (0.5, 0.0),
+    "EAST": (1.0, 0.5),
+    "SOUTH": (0.5, 1.0),
+    "WEST": (0.0, 0.5),
+}
+
+
+@dataclass(frozen=True)
+class LayeredPlacement:
+    """Placed geometry: edge routes by payload edge index, lane bands, extents."""
+
+    routes: dict[int, list[Point]]
+    bands: tuple[tuple[str | None, float, float], ...]
+    extent_p: float
+    extent_s: float
+
+
+def place_layered_graph(graph: LayeredGraph) -> LayeredPlacement:
+    """Assign node coordinates and route every edge of an ordered graph."""
+    bands = _assign_secondary(graph)
+    floor = sum(extent for _lane, _start, extent in bands)
+    tracks = _TrackAllocator()
+    router = _EdgeRouter(graph, tracks, floor=floor)
+    router.route_all()
+    widths = tracks.widths(graph.layer_spacing, len(graph.layers))
+    extent_p, starts = _assign_primary(graph, widths)
+    tracks.freeze(starts, widths)
+    detours = router.detour_count
+    return LayeredPlacement(
+        routes=router.route_all(),
+        bands=tuple(bands),
+        extent_p=extent_p,
+        extent_s=floor + ((detours + 1) * _EDGE_SPACING if detours else 0.0),
+    )
+
+
+def emit_layered_response(
+    payload: dict[str, Any], graph: LayeredGraph, placement: LayeredPlacement
+) -> dict[str, Any]:
+    """Copy ``payload`` and annotate it with ELK-style geometry."""
+    response = copy.deepcopy(payload)
+    width, height = _to_xy(graph, placement.extent_p, placement.extent_s)
+    response.update(
+        x=0,
+        y=0,
+        width=_round(width + 2 * _PADDING),
+        height=_round(height + 2 * _PADDING),
+    )
+    bands = {lane: (start, extent) for lane, start, extent in placement.bands}
+    for child in _dicts(response.get("children")):
+        if not isinstance(child.get("children"), list):
+            _emit_node(child, graph, origin=(0.0, 0.0))
+            continue
+        start, extent = bands.get(str(child.get("id") or ""), (0.0, 0.0))
+        lane_x, lane_y = _absolute_xy(graph, (0.0, start))
+        lane_width, lane_height = _to_xy(graph, placement.extent_p, extent)
+        child.update(
+            x=_round(lane_x),
+            y=_round(lane_y),
+            width=_round(lane_width),
+            height=_round(lane_height),
+        )
+        for member in _dicts(child["children"]):
+            _emit_node(member, graph, origin=(lane_x, lane_y))
+    for index, raw_edge in enumerate(iter_raw_edges(response)):
+        points = placement.routes.get(index)
+        if points:
+            _emit_edge(raw_edge, graph, points)
+    return response
+
+
+class _TrackAllocator:
+    """Hands out vertical track positions inside the gaps between layers.
+
+    Routing runs twice: the first pass only records which legs need a track in
+    which gap (gap ``i`` follows layer ``i``; gap ``-1`` precedes layer 0), so
+    gap widths can grow to fit them; the second pass reads frozen positions.
+    """
+
+    def __init__(self) -> None:
+        self.requests: dict[int, list[tuple[float, float, tuple[int, int]]]] = (
+            defaultdict(list)
+        )
+        self.positions: dict[tuple[int, tuple[int, int]], float] | None = None
+        self.midpoints: dict[int, float] = {}
+
+    def track(
+        self, gap: int, key: tuple[int, int], s_from: float, s_to: float
+    ) -> float:
+        if self.positions is None:
+            if s_from != s_to:
+                low, high = sorted((s_from, s_to))
+                self.requests[gap].append((low, high, key))
+            return 0.0
+        return self.positions.get((gap, key), self.midpoints.get(gap, 0.0))
+
+    def widths(self, layer_spacing: float, layer_count: int) -> dict[int, float]:
+        widths: dict[int, float] = {}
+        for gap in range(-1, layer_count):
+            needed = (len(self.requests.get(gap, ())) + 1) * _EDGE_SPACING
+            if 0 <= gap < layer_count - 1:
+                widths[gap] = max(layer_spacing, needed)
+            else:
+                widths[gap] = needed if self.requests.get(gap) else 0.0
+        return widths
+
+    def freeze(self, starts: dict[int, float], widths: dict[int, float]) -> None:
+        self.midpoints = {gap: starts[gap] + widths[gap] / 2 for gap in starts}
+        self.positions = {}
+        for gap, requests in self.requests.items():
+            ordered = sorted(requests)
+            for slot, (_low, _high, key) in enumerate(ordered):
+                self.positions[(gap, key)] = starts[gap] + widths[gap] * (
+                    (slot + 1) / (len(ordered) + 1)
+                )
+
+
+class _EdgeRouter:
+    """Builds orthogonal polylines for every edge kind in layout space."""
+
+    def __init__(
+        self, graph: LayeredGraph, tracks: _TrackAllocator, *, floor: float
+    ) -> None:
+        self.graph = graph
+        self.tracks = tracks
+        self.floor = floor
+        self.ends = _edge_ends(graph)
+        self.detour_count = 0
+
+    def route_all(self) -> dict[int, list[Point]]:
+        self.detour_count = 0
+        routes: dict[int, list[Point]] = {}
+        for edge in self.graph.edges:
+            if edge.kind == "self":
+                points = self._self_loop(edge)
+            elif edge.kind == "flat":
+                points = self._flat(edge)
+            elif edge.kind == "detour":
+                points = self._detour(edge)
+            elif edge.kind == "reversed":
+                points = self._chain(
+                    edge, self.ends[(edge.index, 1)], self.ends[(edge.index, 0)]
+                )[::-1]
+            else:
+                points = self._chain(
+                    edge, self.ends[(edge.index, 0)], self.ends[(edge.index, 1)]
+                )
+            routes[edge.index] = _simplify(points)
+        return routes
+
+    def _chain(
+        self,
+        edge: LayeredEdge,
+        out_end: tuple[Side, float],
+        in_end: tuple[Side, float],
+    ) -> list[Point]:
+        nodes = [self.graph.nodes[node_id] for node_id in edge.chain]
+        start = _anchor(nodes[0], *out_end)
+        end = _anchor(nodes[-1], *in_end)
+        cursor = start if out_end[0] == (1, 0) else _stub(start, out_end[0])
+        entry = end if in_end[0] == (-1, 0) else _stub(end, in_end[0])
+        points = [start, cursor]
+        for leg, (head, tail) in enumerate(zip(nodes, nodes[1:])):
+            target_s = entry[1] if tail is nodes[-1] else tail.s
+            track = self.tracks.track(
+                head.layer, (edge.index, leg), cursor[1], target_s
+            )
+            points.extend(((track, cursor[1]), (track, target_s)))
+            cursor = (track, target_s)
+        points.extend((entry, end))
+        return points
+
+    def _flat(self, edge: LayeredEdge) -> list[Point]:
+        source, target = self.graph.nodes[edge.source], self.graph.nodes[edge.target]
+        source_side, source_fraction = self.ends[(edge.index, 0)]
+        target_side, target_fraction = self.ends[(edge.index, 1)]
+        start = _anchor(source, source_side, source_fraction)
+        end = _anchor(target, target_side, target_fraction)
+        leave, enter = _stub(start, source_side), _stub(end, target_side)
+        if source_side[0] == 0 and target_side[0] == 0:
+            middle = (leave[1] + enter[1]) / 2
+            return [start, leave, (leave[0], middle), (enter[0], middle), enter, end]
+        gap = (
+            source.layer if 1 in (source_side[0], target_side[0]) else source.layer - 1
+        )
+        track = self.tracks.track(gap, (edge.index, 0), leave[1], enter[1])
+        return [start, leave, (track, leave[1]), (track, enter[1]), enter, end]
+
+    def _detour(self, edge: LayeredEdge) -> list[Point]:
+        source, target = self.graph.nodes[edge.source], self.graph.nodes[edge.target]
+        source_side, source_fraction = self.ends[(edge.index, 0)]
+        target_side, target_fraction = self.ends[(edge.index, 1)]
+        self.detour_count += 1
+        floor = self.floor + self.detour_count * _EDGE_SPACING
+        start = _anchor(source, source_side, source_fraction)
+        end = _anchor(target, target_side, target_fraction)
+        cursor = start if source_side == (1, 0) else _stub(start, source_side)
+        entry = end if target_side == (-1, 0) else _stub(end, target_side)
+        leave = self.tracks.track(source.layer, (edge.index, 0), cursor[1], floor)
+        enter = self.tracks.track(target.layer - 1, (edge.index, 1), floor, entry[1])
+        return [
+            start,
+            cursor,
+            (leave, cursor[1]),
+            (leave, floor),
+            (enter, floor),
+            (enter, entry[1]),
+            entry,
+            end,
+        ]
+
+    def _self_loop(self, edge: LayeredEdge) -> list[Point]:
+        node = self.graph.nodes[edge.source]
+        right = node.p + node.extent_p
+        middle_s = node.s + node.extent_s / 2
+        middle_p = node.p + node.extent_p / 2
+        top = node.s - _STUB
+        track = self.tracks.track(node.layer, (edge.index, 0), middle_s, top)
+        return [
+            (right, middle_s),
+            (track, middle_s),
+            (track, top),
+            (middle_p, top),
+            (middle_p, node.s),
+        ]
+
+
+def _edge_ends(graph: LayeredGraph) -> dict[tuple[int, int], tuple[Side, float]]:
+    """Resolve the side and along-side fraction of both ends of every edge.
+
+    Explicit ports sit at their side's centre, matching ELK's FIXED_ORDER port
+    placement; implicit ends sharing a side are spread evenly, ordered by the
+    position of the node at the far end to avoid needless crossings.
+    """
+    ends: dict[tuple[int, int], tuple[Side, float]] = {}
+    shared: dict[tuple[str, Side], list[tuple[float, int, int]]] = defaultdict(list)
+    position = {
+        node_id: index for layer in graph.layers for index, node_id in enumerate(layer)
+    }
+    for edge in graph.edges:
+        defaults = _default_sides(edge, position)
+        for role, (node_id, other_id, explicit) in enumerate(
+            (
+                (edge.source, edge.target, edge.source_side),
+                (edge.target, edge.source, edge.target_side),
+            )
+        ):
+            side = explicit or defaults[role]
+            ends[(edge.index, role)] = (side, 0.5)
+            if explicit is None:
+                other = graph.nodes[other_id]
+                along = other.s if side[0] else float(other.layer)
+                shared[(node_id, side)].append((along, edge.index, role))
+    for (_node_id, side), members in shared.items():
+        for slot, (_along, edge_index, role) in enumerate(sorted(members)):
+            ends[(edge_index, role)] = (side, (slot + 1) / (len(members) + 1))
+    return ends
+
+
+def _default_sides(edge: LayeredEdge, position: dict[str, int]) -> tuple[Side, Side]:
+    if edge.kind == "reversed":
+        return (-1, 0), (1, 0)
+    if edge.kind == "self":
+        return (1, 0), (0, -1)
+    if edge.kind == "flat":
+        if position.get(edge.source, 0) <= position.get(edge.target, 0):
+            return (0, 1), (0, -1)
+        return (0, -1), (0, 1)
+    return (1, 0), (-1, 0)
+
+
+def _assign_secondary(graph: LayeredGraph) -> list[tuple[str | None, float, float]]:
+    """Place nodes across layers, one lane band after another."""
+    neighbors = _same_lane_neighbors(graph)
+    lane_keys: list[str | None] = list(graph.lanes)
+    if not graph.lanes or any(node.lane is None for node in graph.nodes.values()):
+        lane_keys.append(None)
+    padding = _LANE_PADDING if graph.lanes else 0.0
+    bands: list[tuple[str | None, float, float]] = []
+    offset = 0.0
+    for lane in lane_keys:
+        rows = [
+            [
+                graph.nodes[node_id]
+                for node_id in layer
+                if graph.nodes[node_id].lane == lane
+            ]
+            for layer in graph.layers
+        ]
+        _place_band(graph, rows, neighbors)
+        extent = max(
+            (node.s + node.extent_s for row in rows for node in row), default=0.0
+        )
+        for row in rows:
+            for node in row:
+                node.s += offset + padding
+        bands.append((lane, offset, extent + 2 * padding))
+        offset += extent + 2 * padding
+    return bands
+
+
+def _same_lane_neighbors(graph: LayeredGraph) -> dict[str, list[str]]:
+    """Map nodes to the same-lane nodes whose centres should pull on them.
+
+    Real nodes follow their chain neighbours; dummies follow both real ends of
+    their chain so long edges settle straight instead of sagging.
+    """
+    neighbors: dict[str, list[str]] = defaultdict(list)
+    for edge in graph.edges:
+        if edge.kind not in {"forward", "reversed"}:
+            continue
+        chain = edge.chain
+        for head, tail in zip(chain, chain[1:]):
+            if graph.nodes[head].lane != graph.nodes[tail].lane:
+                continue
+            if not graph.nodes[head].dummy:
+                neighbors[head].append(tail)
+            if not graph.nodes[tail].dummy:
+                neighbors[tail].append(head)
+        for dummy in chain[1:-1]:
+            neighbors[dummy].extend(
+                end
+                for end in (chain[0], chain[-1])
+                if graph.nodes[end].lane == graph.nodes[dummy].lane
+            )
+    return neighbors
+
+
+def _place_band(
+    graph: LayeredGraph,
+    rows: list[list[LayeredNode]],
+    neighbors: dict[str, list[str]],
+) -> None:
+    for row in rows:
+        _pav_place(graph, row, [0.0] * len(row))
+    for iteration in range(_PLACEMENT_ITERATIONS):
+        indexes = (
+            range(len(rows)) if iteration % 2 == 0 else range(len(rows) - 1, -1, -1)
+        )
+        for index in indexes:
+            row = rows[index]
+            if row:
+                _pav_place(
+                    graph, row, [_desired_center(graph, n, neighbors) for n in row]
+                )
+
+
+def _desired_center(
+    graph: LayeredGraph, node: LayeredNode, neighbors: dict[str, list[str]]
+) -> float:
+    adjacent = [graph.nodes[other] for other in neighbors.get(node.id, ())]
+    if not adjacent:
+        return node.s + node.extent_s / 2
+    return sum(other.s + other.extent_s / 2 for other in adjacent) / len(adjacent)
+
+
+def _pav_place(
+    graph: LayeredGraph, row: list[LayeredNode], desired_centers: list[float]
+) -> None:
+    """Fit ``row`` to desired centres under ordering, spacing, and ``s >= 0``.
+
+    Subtracting each node's minimum offset turns the spacing constraints into a
+    plain monotonicity constraint, which pool-adjacent-violators solves exactly
+    in the least-squares sense; clamping the pooled values keeps the band's
+    first node inside the band.
+    """
+    offsets: list[float] = []
+    cursor = 0.0
+    for index, node in enumerate(row):
+        if index:
+            previous = row[index - 1]
+            dummy = node.dummy or previous.dummy
+            cursor += _EDGE_SPACING if dummy else graph.node_spacing
+        offsets.append(cursor)
+        cursor += node.extent_s
+    blocks: list[list[float]] = []
+    for node, offset, center in zip(row, offsets, desired_centers):
+        blocks.append([center - node.extent_s / 2 - offset, 1.0])
+        while len(blocks) > 1 and (
+            blocks[-2][0] / blocks[-2][1] > blocks[-1][0] / blocks[-1][1]
+        ):
+            total, count = blocks.pop()
+            blocks[-1][0] += total
+            blocks[-1][1] += count
+    values = [
+        max(0.0, total / count) for total, count in blocks for _ in range(int(count))
+    ]
+    for node, offset, value in zip(row, offsets, values):
+        node.s = offset + value
+
+
+def _assign_primary(
+    graph: LayeredGraph, widths: dict[int, float]
+) -> tuple[float, dict[int, float]]:
+    """Centre nodes in their layer column; return extent and gap start offsets."""
+    starts = {-1: 0.0}
+    cursor = widths[-1]
+    for index, layer in enumerate(graph.layers):
+        size = max((graph.nodes[node_id].extent_p for node_id in layer), default=0.0)
+        for node_id in layer:
+            node = graph.nodes[node_id]
+            node.p = cursor + (size - node.extent_p) / 2
+        cursor += size
+        starts[index] = cursor
+        cursor += widths[index]
+    return cursor, starts
+
+
+def _anchor(node: LayeredNode, side: Side, fraction: float) -> Point:
+    along_p, along_s = side
+    if along_p:
+        edge_p = node.p + (node.extent_p if along_p > 0 else 0.0)
+        return edge_p, node.s + fraction * node.extent_s
+    edge_s = node.s + (node.extent_s if along_s > 0 else 0.0)
+    return node.p + fraction * node.extent_p, edge_s
+
+
+def _stub(point: Point, side: Side) -> Point:
+    return point[0] + side[0] * _STUB, point[1] + side[1] * _STUB
+
+
+def _simplify(points: list[Point]) -> list[Point]:
+    """Drop repeated points and interior points on straight runs."""
+    deduped: list[Point] = []
+    for point in points:
+        if not deduped or deduped[-1] != point:
+            deduped.append(point)
+    simplified = deduped[:1]
+    for index in range(1, len(deduped) - 1):
+        before, here, after = simplified[-1], deduped[index], deduped[index + 1]
+        collinear = (before[0] == here[0] == after[0]) or (
+            before[1] == here[1] == after[1]
+        )
+        if not collinear:
+            simplified.append(here)
+    if len(deduped) > 1:
+        simplified.append(deduped[-1])
+    return simplified
+
+
+def _emit_node(
+    raw: dict[str, Any], graph: LayeredGraph, *, origin: tuple[float, float]
+) -> None:
+    node = graph.nodes.get(str(raw.get("id") or ""))
+    if node is None:
+        return
+    x, y = _absolute_xy(graph, (node.p, node.s))
+    raw.update(x=_round(x - origin[0]), y=_round(y - origin[1]))
+    width, height = _to_xy(graph, node.extent_p, node.extent_s)
+    for port in _dicts(raw.get("ports")):
+        options = port.get("layoutOptions")
+        side = (
+            str(options.get("elk.port.side") or "").upper()
+            if isinstance(options, dict)
+            else ""
+        )
+        fraction_x, fraction_y = _PORT_OFFSETS.get(side, (0.5, 0.5))
+        port.update(x=_round(width * fraction_x), y=_round(height * fraction_y))
+
+
+def _emit_edge(raw: dict[str, Any], graph: LayeredGraph, points: list[Point]) -> None:
+    absolute = [_absolute_xy(graph, point) for point in points]
+    xy = [{"x": _round(x), "y": _round(y)} for x, y in absolute]
+    edge_id = str(raw.get("id") or "edge")
+    raw["sections"] = [
+        {
+            "id": f"{edge_id}_s0",
+            "startPoint": xy[0],
+            "endPoint": xy[-1],
+            "bendPoints": xy[1:-1],
+        }
+    ]
+    raw["container"] = graph.root_id
+    center = _label_center(absolute)
+    for label in _dicts(raw.get("labels")):
+        width = float(label.get("width") or 0.0)
+        height = float(label.get("height") or 0.0)
+        label.update(
+            x=_round(center[0] - width / 2),
+            y=_round(center[1] - height / 2),
+            width=width,
+            height=height,
+        )
+
+
+def _label_center(points: list[Point]) -> Point:
+    """Return the midpoint of the longest segment of an orthogonal polyline."""
+    best = (points[0], points[-1])
+    best_length = -1.0
+    for start, end in zip(points, points[1:]):
+        length = abs(end[0] - start[0]) + abs(end[1] - start[1])
+        if length > best_length:
+            best, best_length = (start, end), length
+    return (best[0][0] + best[1][0]) / 2, (best[0][1] + best[1][1]) / 2
+
+
+def _to_xy(graph: LayeredGraph, p: float, s: float) -> Point:
+    return (p, s) if graph.direction == "RIGHT" else (s, p)
+
+
+def _absolute_xy(graph: LayeredGraph, point: Point) -> Point:
+    x, y = _to_xy(graph, *point)
+    return x + _PADDING, y + _PADDING
+
+
+def _round(value: float) -> float:
+    return round(value, 3)
+
+
+def _dicts(raw: Any) -> list[dict[str, Any]]:
+    return (
+        [item for item in raw if isinstance(item, dict)]
+        if isinstance(raw, list)
+        else []
+    )
+
+
+__all__ = ["LayeredPlacement", "emit_layered_response", "place_layered_graph"]
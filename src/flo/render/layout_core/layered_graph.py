@@ -0,0 +1,511 @@
+"""Graph model, layering, and ordering phases of the layered layout engine.
+
+Reads an ELK-shaped payload into a ``LayeredGraph``, reverses feedback edges,
+assigns layers (honouring ``elk.partitioning.partition`` and FIRST/LAST layer
+constraints), splits long edges with dummy nodes, and orders each layer by
+barycentric sweeps. Coordinates and routing live in ``layered_geometry``.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right, insort
+from collections import defaultdict
+from dataclasses import dataclass, field
+import heapq
+from typing import Any, Callable, Iterator
+
+Side = tuple[int, int]
+"""Unit direction ``(primary, secondary)`` in layout space."""
+
+_SIDE_VECTORS: dict[str, dict[str, Side]] = {
+    "RIGHT": {"EAST": (1, 0), "WEST": (-1, 0), "SOUTH": (0, 1), "NORTH": (0, -1)},
+    "DOWN": {"SOUTH": (1, 0), "NORTH": (-1, 0), "EAST": (0, 1), "WEST": (0, -1)},
+}
+_DEFAULT_NODE_SPACING = 20.0
+_DEFAULT_LAYER_SPACING = 20.0
+_ORDERING_SWEEPS = 8
+
+
+@dataclass
+class LayeredNode:
+    """One real or dummy node with layout-space extents and placement."""
+
+    id: str
+    extent_p: float
+    extent_s: float
+    lane: str | None
+    order: float
+    partition: int | None = None
+    constraint: str | None = None
+    dummy: bool = False
+    layer: int = 0
+    p: float = 0.0
+    s: float = 0.0
+
+
+@dataclass
+class LayeredEdge:
+    """One payload edge resolved to node endpoints and a layered route kind."""
+
+    index: int
+    source: str
+    target: str
+    source_side: Side | None
+    target_side: Side | None
+    kind: str = "forward"
+    chain: list[str] = field(default_factory=list)
+
+
+@dataclass
+class LayeredGraph:
+    """Working graph shared by the layering, ordering, and geometry phases."""
+
+    root_id: str
+    direction: str
+    node_spacing: float
+    layer_spacing: float
+    partitioned: bool
+    model_order: bool
+    lanes: list[str] = field(default_factory=list)
+    lane_ranks: dict[str, int] = field(default_factory=dict)
+    nodes: dict[str, LayeredNode] = field(default_factory=dict)
+    edges: list[LayeredEdge] = field(default_factory=list)
+    layers: list[list[str]] = field(default_factory=list)
+
+    def lane_rank(self, node: LayeredNode) -> int:
+        """Return the band index of ``node``; lane-less nodes sort last."""
+        if node.lane is None:
+            return len(self.lanes)
+        return self.lane_ranks[node.lane]
+
+
+def parse_layered_graph(payload: dict[str, Any]) -> LayeredGraph:
+    """Read nodes, lanes, ports, and edges out of an ELK-shaped payload."""
+    options = _layout_options(payload)
+    graph = LayeredGraph(
+        root_id=str(payload.get("id") or "root"),
+        direction="DOWN" if _option(options, "elk.direction") == "DOWN" else "RIGHT",
+        node_spacing=_float_option(
+            options, "elk.spacing.nodeNode", _DEFAULT_NODE_SPACING
+        ),
+        layer_spacing=_float_option(
+            options,
+            "elk.layered.spacing.nodeNodeBetweenLayers",
+            _DEFAULT_LAYER_SPACING,
+        ),
+        partitioned=_option(options, "elk.partitioning.activate") == "TRUE",
+        model_order=(
+            _option(options, "elk.layered.crossingMinimization.forceNodeModelOrder")
+            == "TRUE"
+        ),
+    )
+    ports: dict[str, tuple[str, Side | None]] = {}
+    for child in _dicts(payload.get("children")):
+        if isinstance(child.get("children"), list):
+            lane_id = str(child.get("id") or "")
+            graph.lane_ranks.setdefault(lane_id, len(graph.lanes))
+            graph.lanes.append(lane_id)
+            for member in _dicts(child["children"]):
+                _add_node(graph, member, lane=lane_id, ports=ports)
+        else:
+            _add_node(graph, child, lane=None, ports=ports)
+    for index, raw_edge in enumerate(iter_raw_edges(payload)):
+        _add_edge(graph, index, raw_edge, ports=ports)
+    return graph
+
+
+def iter_raw_edges(payload: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Yield root edges, then edges nested in lane containers, in payload order."""
+    yield from _dicts(payload.get("edges"))
+    for child in _dicts(payload.get("children")):
+        yield from _dicts(child.get("edges"))
+
+
+def assign_layers(graph: LayeredGraph) -> None:
+    """Assign every node a layer and classify edges by their layer relation."""
+    if graph.partitioned and any(
+        node.partition is not None for node in graph.nodes.values()
+    ):
+        partitions = sorted({node.partition or 0 for node in graph.nodes.values()})
+        rank = {partition: index for index, partition in enumerate(partitions)}
+        for node in graph.nodes.values():
+            node.layer = rank[node.partition or 0]
+    else:
+        _longest_path_layers(graph)
+    for edge in graph.edges:
+        edge.kind = _edge_kind(graph, edge)
+
+
+def insert_dummy_nodes(graph: LayeredGraph) -> None:
+    """Split edges spanning several layers into chains through dummy nodes."""
+    for edge in graph.edges:
+        if edge.kind in {"self", "flat", "detour"}:
+            edge.chain = [edge.source, edge.target]
+            continue
+        start, end = (
+            (edge.source, edge.target)
+            if edge.kind == "forward"
+            else (edge.target, edge.source)
+        )
+        head = graph.nodes[start]
+        chain = [start]
+        for layer in range(head.layer + 1, graph.nodes[end].layer):
+            dummy_id = f"__layered_dummy_{edge.index}_{layer}"
+            graph.nodes[dummy_id] = LayeredNode(
+                id=dummy_id,
+                extent_p=0.0,
+                extent_s=0.0,
+                lane=head.lane,
+                order=head.order + 0.5,
+                dummy=True,
+                layer=layer,
+            )
+            chain.append(dummy_id)
+        chain.append(end)
+        edge.chain = chain
+
+
+def order_layers(graph: LayeredGraph) -> None:
+    """Order nodes within layers, reducing crossings unless model order is forced."""
+    layer_count = 1 + max((node.layer for node in graph.nodes.values()), default=-1)
+    layers: list[list[str]] = [[] for _ in range(layer_count)]
+    for node in sorted(graph.nodes.values(), key=lambda item: item.order):
+        layers[node.layer].append(node.id)
+    flat_successors = _flat_successors(graph)
+
+    def model_key(node_id: str) -> tuple[Any, ...]:
+        node = graph.nodes[node_id]
+        return (graph.lane_rank(node), node.order, node_id)
+
+    graph.layers = [
+        _constrained_sort(layer, model_key, flat_successors) for layer in layers
+    ]
+    if graph.model_order or layer_count < 2:
+        return
+    upper, lower = _layer_neighbors(graph)
+    best = [list(layer) for layer in graph.layers]
+    best_crossings = count_crossings(graph, lower)
+    for sweep in range(_ORDERING_SWEEPS):
+        downward = sweep % 2 == 0
+        indexes = range(1, layer_count) if downward else range(layer_count - 2, -1, -1)
+        neighbors = upper if downward else lower
+        for index in indexes:
+            _reorder_layer(graph, index, neighbors, flat_successors)
+        crossings = count_crossings(graph, lower)
+        if crossings < best_crossings:
+            best, best_crossings = [list(layer) for layer in graph.layers], crossings
+        if best_crossings == 0:
+            break
+    graph.layers = best
+
+
+def count_crossings(graph: LayeredGraph, lower: dict[str, list[str]]) -> int:
+    """Count straight-line crossings between consecutive layers."""
+    total = 0
+    position = _positions(graph)
+    for layer in graph.layers[:-1]:
+        segments = sorted(
+            (position[upper_id], position[lower_id])
+            for upper_id in layer
+            for lower_id in lower.get(upper_id, ())
+        )
+        seen: list[int] = []
+        for _upper_pos, lower_pos in segments:
+            total += len(seen) - bisect_right(seen, lower_pos)
+            insort(seen, lower_pos)
+    return total
+
+
+def _add_node(
+    graph: LayeredGraph,
+    raw: dict[str, Any],
+    *,
+    lane: str | None,
+    ports: dict[str, tuple[str, Side | None]],
+) -> None:
+    node_id = str(raw.get("id") or "")
+    if not node_id:
+        return
+    options = _layout_options(raw)
+    width, height = _float(raw.get("width")), _float(raw.get("height"))
+    constraint = _option(options, "elk.layered.layering.layerConstraint")
+    graph.nodes[node_id] = LayeredNode(
+        id=node_id,
+        extent_p=width if graph.direction == "RIGHT" else height,
+        extent_s=height if graph.direction == "RIGHT" else width,
+        lane=lane,
+        order=float(len(graph.nodes)),
+        partition=_int_option(options, "elk.partitioning.partition"),
+        constraint=constraint if constraint in {"FIRST", "LAST"} else None,
+    )
+    side_vectors = _SIDE_VECTORS[graph.direction]
+    for port in _dicts(raw.get("ports")):
+        side = _option(_layout_options(port), "elk.port.side")
+        ports[str(port.get("id") or "")] = (node_id, side_vectors.get(side))
+
+
+def _add_edge(
+    graph: LayeredGraph,
+    index: int,
+    raw: dict[str, Any],
+    *,
+    ports: dict[str, tuple[str, Side | None]],
+) -> None:
+    source_ref = _first_reference(raw.get("sources"))
+    target_ref = _first_reference(raw.get("targets"))
+    source, source_side = ports.get(source_ref, (source_ref, None))
+    target, target_side = ports.get(target_ref, (target_ref, None))
+    if source not in graph.nodes or target not in graph.nodes:
+        return
+    graph.edges.append(
+        LayeredEdge(
+            index=index,
+            source=source,
+            target=target,
+            source_side=source_side,
+            target_side=target_side,
+        )
+    )
+
+
+def _longest_path_layers(graph: LayeredGraph) -> None:
+    successors, indegree = _acyclic_successors(graph)
+    has_first = any(node.constraint == "FIRST" for node in graph.nodes.values())
+    for node in graph.nodes.values():
+        node.layer = 1 if has_first and node.constraint != "FIRST" else 0
+    ready = [node_id for node_id, degree in indegree.items() if degree == 0]
+    while ready:
+        node_id = ready.pop()
+        for successor in successors[node_id]:
+            node = graph.nodes[successor]
+            node.layer = max(node.layer, graph.nodes[node_id].layer + 1)
+            indegree[successor] -= 1
+            if indegree[successor] == 0:
+                ready.append(successor)
+    _pin_last_layer_and_compact(graph)
+
+
+def _pin_last_layer_and_compact(graph: LayeredGraph) -> None:
+    last_layer = 1 + max(
+        (node.layer for node in graph.nodes.values() if node.constraint != "LAST"),
+        default=-1,
+    )
+    for node in graph.nodes.values():
+        if node.constraint == "LAST":
+            node.layer = last_layer
+    used = sorted({node.layer for node in graph.nodes.values()})
+    compact = {layer: index for index, layer in enumerate(used)}
+    for node in graph.nodes.values():
+        node.layer = compact[node.layer]
+
+
+def _acyclic_successors(
+    graph: LayeredGraph,
+) -> tuple[dict[str, list[str]], dict[str, int]]:
+    """Return successor lists and in-degrees with feedback edges reversed."""
+    reversed_edges = _feedback_edges(graph)
+    successors: dict[str, list[str]] = defaultdict(list)
+    indegree = dict.fromkeys(graph.nodes, 0)
+    for edge in graph.edges:
+        if edge.source == edge.target:
+            continue
+        start, end = (
+            (edge.target, edge.source)
+            if edge.index in reversed_edges
+            else (edge.source, edge.target)
+        )
+        successors[start].append(end)
+        indegree[end] += 1
+    return successors, indegree
+
+
+def _feedback_edges(graph: LayeredGraph) -> set[int]:
+    """Pick edges to reverse: constraint violations, then DFS back edges."""
+    reversed_edges: set[int] = set()
+    successors: dict[str, list[tuple[str, int]]] = defaultdict(list)
+    for edge in graph.edges:
+        source, target = graph.nodes[edge.source], graph.nodes[edge.target]
+        if edge.source == edge.target:
+            continue
+        if (target.constraint == "FIRST" and source.constraint != "FIRST") or (
+            source.constraint == "LAST" and target.constraint != "LAST"
+        ):
+            reversed_edges.add(edge.index)
+            continue
+        successors[edge.source].append((edge.target, edge.index))
+    state: dict[str, int] = {}
+    for root in sorted(graph.nodes, key=lambda node_id: graph.nodes[node_id].order):
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            node_id, pending = stack[-1]
+            step = next(pending, None)
+            if step is None:
+                state[node_id] = 2
+                stack.pop()
+                continue
+            target, edge_index = step
+            if state.get(target) == 1:
+                reversed_edges.add(edge_index)
+            elif target not in state:
+                state[target] = 1
+                stack.append((target, iter(successors[target])))
+    return reversed_edges
+
+
+def _edge_kind(graph: LayeredGraph, edge: LayeredEdge) -> str:
+    if edge.source == edge.target:
+        return "self"
+    source_layer = graph.nodes[edge.source].layer
+    target_layer = graph.nodes[edge.target].layer
+    if source_layer < target_layer:
+        return "forward"
+    if source_layer == target_layer:
+        return "flat"
+    leaves_backward = (edge.source_side or (1, 0))[0] <= 0
+    enters_backward = (edge.target_side or (-1, 0))[0] >= 0
+    return "reversed" if leaves_backward and enters_backward else "detour"
+
+
+def _flat_successors(graph: LayeredGraph) -> dict[str, list[str]]:
+    """Map each flat-edge node to the same-layer nodes that must follow it.
+
+    Flat edges normally run forward across the layer, but one leaving through
+    a north port (or entering through a south port) asks for its target to
+    sit before its source.
+    """
+    successors: dict[str, list[str]] = defaultdict(list)
+    for edge in graph.edges:
+        if edge.kind != "flat":
+            continue
+        upward = (edge.source_side or (0, 1))[1] < 0 or (edge.target_side or (0, -1))[
+            1
+        ] > 0
+        if upward:
+            successors[edge.target].append(edge.source)
+        else:
+            successors[edge.source].append(edge.target)
+    return successors
+
+
+def _layer_neighbors(
+    graph: LayeredGraph,
+) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    upper: dict[str, list[str]] = defaultdict(list)
+    lower: dict[str, list[str]] = defaultdict(list)
+    for edge in graph.edges:
+        if edge.kind not in {"forward", "reversed"}:
+            continue
+        for start, end in zip(edge.chain, edge.chain[1:]):
+            lower[start].append(end)
+            upper[end].append(start)
+    return upper, lower
+
+
+def _reorder_layer(
+    graph: LayeredGraph,
+    index: int,
+    neighbors: dict[str, list[str]],
+    flat_successors: dict[str, list[str]],
+) -> None:
+    position = _positions(graph)
+    layer = graph.layers[index]
+
+    def barycenter_key(node_id: str) -> tuple[Any, ...]:
+        node = graph.nodes[node_id]
+        adjacent = neighbors.get(node_id, ())
+        center = (
+            sum(position[other] for other in adjacent) / len(adjacent)
+            if adjacent
+            else float(position[node_id])
+        )
+        return (graph.lane_rank(node), center, node.order, node_id)
+
+    graph.layers[index] = _constrained_sort(layer, barycenter_key, flat_successors)
+
+
+def _constrained_sort(
+    layer: list[str],
+    key: Callable[[str], tuple[Any, ...]],
+    successors: dict[str, list[str]],
+) -> list[str]:
+    """Sort by ``key`` while keeping flat-edge sources ahead of their targets."""
+    members = set(layer)
+    indegree = dict.fromkeys(layer, 0)
+    for node_id in layer:
+        for target in successors.get(node_id, ()):
+            if target in members and target != node_id:
+                indegree[target] += 1
+    heap = [(key(node_id), node_id) for node_id in layer if indegree[node_id] == 0]
+    heapq.heapify(heap)
+    ordered: list[str] = []
+    while heap:
+        _, node_id = heapq.heappop(heap)
+        ordered.append(node_id)
+        for target in successors.get(node_id, ()):
+            if target in members and target != node_id:
+                indegree[target] -= 1
+                if indegree[target] == 0:
+                    heapq.heappush(heap, (key(target), target))
+    if len(ordered) < len(layer):
+        placed = set(ordered)
+        ordered.extend(sorted((n for n in layer if n not in placed), key=key))
+    return ordered
+
+
+def _positions(graph: LayeredGraph) -> dict[str, int]:
+    return {
+        node_id: index for layer in graph.layers for index, node_id in enumerate(layer)
+    }
+
+
+def _layout_options(raw: dict[str, Any]) -> dict[str, Any]:
+    options = raw.get("layoutOptions")
+    return options if isinstance(options, dict) else {}
+
+
+def _option(options: dict[str, Any], key: str) -> str:
+    return str(options.get(key) or "").strip().upper()
+
+
+def _float_option(options: dict[str, Any], key: str, default: float) -> float:
+    try:
+        return float(options.get(key, default))
+    except TypeError, ValueError:
+        return default
+
+
+def _int_option(options: dict[str, Any], key: str) -> int | None:
+    try:
+        return int(options[key])
+    except KeyError, TypeError, ValueError:
+        return None
+
+
+def _float(raw_value: Any) -> float:
+    return float(raw_value) if isinstance(raw_value, (int, float)) else 0.0
+
+
+def _first_reference(raw: Any) -> str:
+    return str(raw[0]).strip() if isinstance(raw, list) and raw else ""
+
+
+def _dicts(raw: Any) -> Iterator[dict[str, Any]]:
+    if isinstance(raw, list):
+        yield from (item for item in raw if isinstance(item, dict))
+
+
+__all__ = [
+    "LayeredEdge",
+    "LayeredGraph",
+    "LayeredNode",
+    "Side",
+    "assign_layers",
+    "count_crossings",
+    "insert_dummy_nodes",
+    "iter_raw_edges",
+    "order_layers",
+    "parse_layered_graph",
+]
@@ -0,0 +1,87 @@
+"""Per-render graph records shared by request builders and SVG renderers.
+
+One SPPM render used to extract node and edge records from the process three
+times (for the ELK request, the raw-node lookup, and the publication plan),
+and to re-apply the subprocess projection each time. ``RenderContext`` does
+the extraction and projection once, derives the id lookup and node-kind map
+from the projected records, and memoizes the measured SPPM layout nodes.
+
+The records are private copies made for this render; consumers treat them as
+read-only so they can be shared.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from flo.render.options import RenderOptions
+
+from .elk_contracts import ElkLayoutNode
+from .elk_sppm_helpers import _node_kind_map
+from .elk_support import (
+    extract_nodes_and_edges,
+    ordered_sppm_nodes,
+    project_parent_only_subprocess_view,
+)
+
+
+@dataclass(frozen=True)
+class RenderContext:
+    """Extracted and projected graph records for one render of one process."""
+
+    process: Any
+    options: RenderOptions
+    source_nodes: list[dict[str, Any]]
+    source_edges: list[dict[str, Any]]
+    nodes: list[dict[str, Any]]
+    edges: list[dict[str, Any]]
+    node_by_id: dict[str, dict[str, Any]]
+    node_kinds: dict[str, str]
+    _memo: dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def build(cls, process: Any, options: RenderOptions) -> RenderContext:
+        """Extract ``process`` once and apply the configured subprocess view."""
+        source_nodes, source_edges = extract_nodes_and_edges(process)
+        nodes, edges = source_nodes, source_edges
+        if options.subprocess_view == "parent_only":
+            nodes, edges = project_parent_only_subprocess_view(nodes, edges)
+        return cls(
+            process=process,
+            options=options,
+            source_nodes=source_nodes,
+            source_edges=source_edges,
+            nodes=nodes,
+            edges=edges,
+            node_by_id={
+                node_id: node
+                for node in nodes
+                if (node_id := str(node.get("id") or ""))
+            },
+            node_kinds=_node_kind_map(nodes),
+        )
+
+    def matches(self, process: Any, options: RenderOptions) -> bool:
+        """Return whether this context was built for ``process`` and ``options``."""
+        return self.process is process and self.options == options
+
+    def sppm_layout_nodes(self) -> tuple[ElkLayoutNode, ...]:
+        """Return the measured SPPM ELK nodes, computed on first use."""
+        nodes = self._memo.get("sppm_layout_nodes")
+        if nodes is None:
+            nodes = ordered_sppm_nodes(self.nodes, options=self.options)
+            self._memo["sppm_layout_nodes"] = nodes
+        return nodes
+
+
+def render_context(
+    process: Any, options: RenderOptions, context: RenderContext | None = None
+) -> RenderContext:
+    """Return ``context`` when it fits ``process``/``options``, else a new one."""
+    if context is not None and context.matches(process, options):
+        return context
+    return RenderContext.build(process, options)
+
+
+__all__ = ["RenderContext", "render_context"]
@@ -0,0 +1,131 @@
+"""Uniform-grid spatial index over layout bounds.
+
+Edge labels and callouts are placed one edge at a time, and every candidate
+placement must avoid all node boxes, lane headers, and annotations placed so
+far. Scanning that growing list for every candidate is quadratic on dense
+diagrams. ``BoundsGrid`` buckets each box into the fixed-size cells it
+touches, so an overlap query only looks at boxes sharing a cell with the
+query rectangle; annotations are inserted as they are placed.
+
+Overlap semantics match a linear scan exactly: rectangles that only touch
+along an edge do not overlap. Two rectangles that overlap with positive area
+share an interior point, and the cell containing that point is in both cell
+ranges, so no overlap is missed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import math
+from typing import Any
+
+_DEFAULT_CELL_PX = 96.0
+# Boxes covering more cells than this (e.g. full-width lane headers) are
+# checked linearly instead of being copied into every cell they span.
+_MAX_CELLS_PER_BOX = 64
+
+_Rect = tuple[float, float, float, float]
+
+
+class BoundsGrid:
+    """Boxes bucketed by grid cell, optionally layered over a parent grid.
+
+    A layered grid (see ``layered``) answers queries against its own boxes and
+    every box of its parent without copying them, which lets one edge's label
+    be avoided by its callout without leaking into the shared grid.
+    """
+
+    __slots__ = ("cell_px", "parent", "_cells", "_oversized", "_count")
+
+    def __init__(
+        self,
+        bounds: Iterable[Any] = (),
+        *,
+        cell_px: float = _DEFAULT_CELL_PX,
+        parent: BoundsGrid | None = None,
+    ) -> None:
+        """Index ``bounds`` (objects with ``x_px``/``y_px``/size attributes)."""
+        self.cell_px = float(cell_px)
+        self.parent = parent
+        self._cells: dict[tuple[int, int], list[_Rect]] = {}
+        self._oversized: list[_Rect] = []
+        self._count = 0
+        self.extend(bounds)
+
+    def __len__(self) -> int:
+        """Return the number of boxes, including those of the parent grid."""
+        inherited = len(self.parent) if self.parent is not None else 0
+        return self._count + inherited
+
+    def add(self, bounds: Any) -> None:
+        """Insert one box."""
+        rect = (
+            float(bounds.x_px),
+            float(bounds.y_px),
+            float(bounds.x_px + bounds.width_px),
+            float(bounds.y_px + bounds.height_px),
+        )
+        self._count += 1
+        cols, rows = self._span(rect)
+        if len(cols) * len(rows) > _MAX_CELLS_PER_BOX:
+            self._oversized.append(rect)
+            return
+        for col in cols:
+            for row in rows:
+                self._cells.setdefault((col, row), []).append(rect)
+
+    def extend(self, bounds: Iterable[Any]) -> None:
+        """Insert every box in ``bounds``."""
+        for item in bounds:
+            self.add(item)
+
+    def layered(self, bounds: Iterable[Any] = ()) -> BoundsGrid:
+        """Return a grid holding ``bounds`` on top of this one."""
+        return BoundsGrid(bounds, cell_px=self.cell_px, parent=self)
+
+    def overlaps(self, left: float, top: float, right: float, bottom: float) -> bool:
+        """Return whether the rectangle overlaps any indexed box with positive area."""
+        grid: BoundsGrid | None = self
+        while grid is not None:
+            if grid._overlaps_own(left, top, right, bottom):
+                return True
+            grid = grid.parent
+        return False
+
+    def _overlaps_own(
+        self, left: float, top: float, right: float, bottom: float
+    ) -> bool:
+        for rect in self._oversized:
+            if _intersects(rect, left, top, right, bottom):
+                return True
+        if not self._cells:
+            return False
+        cols, rows = self._span((left, top, right, bottom))
+        cells = self._cells
+        if len(cols) * len(rows) > len(cells):
+            buckets = cells.values()
+        else:
+            buckets = (cells.get((col, row), ()) for col in cols for row in rows)
+        for bucket in buckets:
+            for rect in bucket:
+                if _intersects(rect, left, top, right, bottom):
+                    return True
+        return False
+
+    def _span(self, rect: _Rect) -> tuple[range, range]:
+        left, top, right, bottom = (value / self.cell_px for value in rect)
+        return (
+            range(math.floor(min(left, right)), math.floor(max(left, right)) + 1),
+            range(math.floor(min(top, bottom)), math.floor(max(top, bottom)) + 1),
+        )
+
+
+def _intersects(
+    rect: _Rect, left: float, top: float, right: float, bottom: float
+) -> bool:
+    if right <= rect[0] or left >= rect[2]:
+        return False
+    return not (bottom <= rect[1] or top >= rect[3])
+
+
+__all__ = ["BoundsGrid"]
@@ -21,6 +21,7 @@ SppmThemeName = str
 LayoutWrap = Literal["auto", "off"]
 LayoutFit = Literal["fit-preferred", "fit-strict"]
 LayoutSpacing = Literal["standard", "compact"]
+LayoutEngineName = Literal["elk", "layered"]
 SppmStepNumbering = Literal["off", "node", "edge"]
 SppmLabelDensity = Literal["full", "compact", "teaching"]
 SppmWrapStrategy = Literal["word", "balanced", "hard"]
@@ -157,6 +158,8 @@ class RenderOptions:
     sppm_max_label_ctwt: int | None = None
     sppm_footer_metrics: tuple[tuple[str, str], ...] = ()
     sppm_footer_notes: tuple[str, ...] = ()
+    layout_cache: bool = True
+    layout_engine: LayoutEngineName = "elk"
 
     @classmethod
     def from_mapping(cls, options: Mapping[str, Any] | None) -> "RenderOptions":
@@ -226,6 +229,10 @@ class RenderOptions:
             sppm_footer_notes=_parse_footer_notes(
                 _footer_note_source(effective_options)
             ),
+            layout_cache=not _parse_bool(
+                effective_options.get("no_layout_cache", False)
+            ),
+            layout_engine=_parse_layout_engine(effective_options),
         )
 
 
@@ -383,6 +390,13 @@ def _parse_layout_spacing(options: Mapping[str, Any]) -> LayoutSpacing:
     return "standard"
 
 
+def _parse_layout_engine(options: Mapping[str, Any]) -> LayoutEngineName:
+    raw = _normalized_option(options, "layout_engine", "elk")
+    if raw in {"layered", "python"}:
+        return "layered"
+    return "elk"
+
+
 def _parse_sppm_step_numbering(options: Mapping[str, Any]) -> SppmStepNumbering:
     raw = _normalized_option(options, "sppm_step_numbering", "off")
     if raw in {"node", "nodes"}:
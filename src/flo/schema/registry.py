@@ -0,0 +1,109 @@
+"""Process-wide registry of compiled JSON Schema validators.
+
+Each FLO schema (``flo_ir.json``, ``flo_types.json``, ``flo_trace.json``) is
+located and parsed once, checked against its metaschema once, and wrapped in a
+validator instance with format checking enabled; every later validation reuses
+that instance. ``iter_schema_errors`` exposes all violations in one pass for
+callers that want a full report instead of the first error.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import json
+from pathlib import Path
+from typing import Any, Iterator, Literal
+
+try:
+    import jsonschema  # type: ignore
+    from jsonschema.exceptions import best_match  # type: ignore
+
+    JSONSCHEMA_AVAILABLE = True
+except Exception:  # pragma: no cover - optional
+    jsonschema = None  # type: ignore
+    best_match = None  # type: ignore
+    JSONSCHEMA_AVAILABLE = False
+
+SchemaName = Literal["flo_ir.json", "flo_types.json", "flo_trace.json"]
+KNOWN_SCHEMAS: tuple[SchemaName, ...] = (
+    "flo_ir.json",
+    "flo_types.json",
+    "flo_trace.json",
+)
+
+
+class SchemaNotFoundError(LookupError):
+    """Raised when a schema file cannot be found in any known location."""
+
+
+def locate_schema(name: str) -> Path:
+    """Return the path of schema ``name``, preferring the packaged copy."""
+    here = Path(__file__).resolve()
+    candidates = [
+        # Preferred: packaged schema payload at flo/schema/*.json
+        here.parent / name,
+        # Legacy wheel layout used by earlier lookup logic.
+        here.parents[2] / "schema" / name,
+        # Local repo layout when running from source tree.
+        here.parents[3] / "schema" / name,
+    ]
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+    raise SchemaNotFoundError(f"schema file not found: {candidates[0]}")
+
+
+@lru_cache(maxsize=None)
+def load_schema(name: str) -> dict[str, Any]:
+    """Return the parsed schema document ``name`` (read from disk once)."""
+    with locate_schema(name).open("r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+@lru_cache(maxsize=None)
+def schema_validator(name: str) -> Any:
+    """Return the shared, format-checking validator instance for ``name``.
+
+    The validator class follows the schema's ``$schema`` dialect, and the
+    schema itself is checked against that metaschema on first use only.
+    """
+    if not JSONSCHEMA_AVAILABLE:
+        raise RuntimeError("jsonschema package not available for schema validation")
+    schema = load_schema(name)
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema, format_checker=validator_cls.FORMAT_CHECKER)
+
+
+def iter_schema_errors(instance: Any, name: str) -> Iterator[Any]:
+    """Yield every schema violation of ``instance``, ordered by location."""
+    errors = schema_validator(name).iter_errors(instance)
+    yield from sorted(
+        errors,
+        key=lambda error: [(type(part).__name__, part) for part in error.absolute_path],
+    )
+
+
+def first_schema_error(instance: Any, name: str) -> Any | None:
+    """Return the most relevant violation (as ``jsonschema.validate`` would)."""
+    return best_match(schema_validator(name).iter_errors(instance))
+
+
+def clear_schema_registry() -> None:
+    """Forget loaded schemas and validators (for tests and schema reloads)."""
+    load_schema.cache_clear()
+    schema_validator.cache_clear()
+
+
+__all__ = [
+    "JSONSCHEMA_AVAILABLE",
+    "KNOWN_SCHEMAS",
+    "SchemaName",
+    "SchemaNotFoundError",
+    "clear_schema_registry",
+    "first_schema_error",
+    "iter_schema_errors",
+    "load_schema",
+    "locate_schema",
+    "schema_validator",
+]
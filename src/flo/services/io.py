@@ -6,8 +6,14 @@ canonical location for IO code in the services layer.
 
 from __future__ import annotations
 
+from contextlib import contextmanager
+import gzip
+import io
+import os
+from pathlib import Path
 import sys
-from typing import Tuple
+import tempfile
+from typing import Iterator, TextIO, Tuple
 
 from flo.services.errors import EXIT_RENDER_ERROR
 
@@ -46,3 +52,69 @@ def write_output(out: str, path: str | None) -> Tuple[int, str]:
     except OSError as e:
         return EXIT_RENDER_ERROR, f"I/O error writing {path}: {e}"
     return 0, ""
+
+
+def write_output_atomic(out: str, path: str) -> Tuple[int, str]:
+    """Write `out` to `path` via a sibling temp file and `os.replace`.
+
+    Readers of `path` see either the previous content or the new content,
+    never a partially written file. Returns `(rc, err)` like `write_output`.
+    """
+    target = Path(path)
+    tmp_name: str | None = None
+    try:
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=f".{target.name}.", suffix=".tmp", dir=target.parent
+        )
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(out)
+        os.chmod(tmp_name, _replacement_mode(target))
+        os.replace(tmp_name, target)
+    except OSError as e:
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+        return EXIT_RENDER_ERROR, f"I/O error writing {path}: {e}"
+    return 0, ""
+
+
+@contextmanager
+def atomic_output_stream(
+    path: str, *, compress: bool = False, buffer_size: int = 1 << 20
+) -> Iterator[TextIO]:
+    """Yield a buffered UTF-8 text stream that replaces `path` on success.
+
+    Text is written to a sibling temp file, optionally gzip-compressed (with a
+    zero header timestamp so output is reproducible), and moved over `path`
+    with `os.replace` only when the block exits cleanly; on any exception the
+    temp file is removed and `path` is left untouched. `OSError` propagates.
+    """
+    target = Path(path)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{target.name}.", suffix=".tmp", dir=target.parent
+    )
+    try:
+        with os.fdopen(fd, "wb", buffering=buffer_size) as raw:
+            binary: io.BufferedIOBase = raw
+            if compress:
+                binary = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0)
+            with io.TextIOWrapper(binary, encoding="utf-8", newline="") as text:
+                yield text
+        os.chmod(tmp_name, _replacement_mode(target))
+        os.replace(tmp_name, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _replacement_mode(target: Path) -> int:
+    # mkstemp creates 0600 files; keep the mode of the file being replaced.
+    try:
+        return target.stat().st_mode & 0o777
+    except OSError:
+        return 0o644
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Iterator, Mapping, Optional
 
 try:
     # Optional OpenTelemetry SDK imports
@@ -40,6 +40,10 @@ class _NoOpSpan:
         """No-op attribute setter."""
         return None
 
+    def is_recording(self) -> bool:
+        """No-op spans never record."""
+        return False
+
     def record_exception(self, exception: BaseException, **kwargs: Any) -> None:
         """No-op exception recorder."""
         _unused = (exception, kwargs)
@@ -64,6 +68,9 @@ class _NoOpTracer:
         yield _NoOpSpan()
 
 
+# Span attribute namespace for per-rule IR validation timings.
+VALIDATION_RULE_SPAN_PREFIX = "flo.validate.rule"
+
 # module-level provider state
 _provider: Optional[object] = None
 
@@ -156,6 +163,79 @@ def get_tracer(name: str):
     return _NoOpTracer()
 
 
+def current_span() -> Any:
+    """Return the active span, or a no-op span when OTEL is missing."""
+    if OTEL_AVAILABLE and trace is not None:
+        return trace.get_current_span()
+    return _NoOpSpan()
+
+
+def span_is_recording(span: Any) -> bool:
+    """Return True when *span* records attributes (False for no-op spans)."""
+    is_recording = getattr(span, "is_recording", None)
+    if not callable(is_recording):
+        return False
+    try:
+        return bool(is_recording())
+    except Exception:
+        return False
+
+
+def record_rule_timings(
+    span: Any, timings: Mapping[str, float], *, prefix: str
+) -> None:
+    """Attach per-rule durations to *span* as ``{prefix}.<rule>.duration_ms``.
+
+    A ``{prefix}.slowest`` attribute names the rule that took longest. Safe to
+    call on no-op spans.
+    """
+    set_attribute = getattr(span, "set_attribute", None)
+    if not callable(set_attribute) or not timings:
+        return
+    try:
+        for rule, seconds in timings.items():
+            set_attribute(f"{prefix}.{rule}.duration_ms", round(seconds * 1000, 3))
+        set_attribute(f"{prefix}.slowest", max(timings, key=timings.__getitem__))
+    except Exception:
+        pass
+
+
+@contextmanager
+def collect_rule_timings(prefix: str) -> Iterator[dict[str, float] | None]:
+    """Yield a timings dict to fill when the current span is recording.
+
+    Yields None otherwise, so callers can skip timing overhead entirely. The
+    collected timings are attached to the span on exit, also after errors.
+    """
+    span = current_span()
+    if not span_is_recording(span):
+        yield None
+        return
+    timings: dict[str, float] = {}
+    try:
+        yield timings
+    finally:
+        record_rule_timings(span, timings, prefix=prefix)
+
+
+def validate_with_rule_timings(
+    validate: Callable[..., None],
+    ir: Any,
+    *,
+    prefix: str = VALIDATION_RULE_SPAN_PREFIX,
+) -> None:
+    """Run ``validate(ir)``, reporting per-rule timings on a recording span.
+
+    ``validate`` is ``validate_ir`` or a stand-in with the same signature;
+    ``timings`` is only passed when the current span is recording.
+    """
+    with collect_rule_timings(prefix) as timings:
+        if timings is None:
+            validate(ir)
+        else:
+            validate(ir, timings=timings)
+
+
 def shutdown() -> None:
     """Shut down the configured provider (if any)."""
     global _provider
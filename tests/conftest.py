@@ -50,3 +50,22 @@ def services():
             svc.telemetry.shutdown()
         except Exception:
             pass
+
+
+@pytest.fixture(autouse=True)
+def isolated_elk_layout_cache(tmp_path_factory, monkeypatch):
+    """Point the ELK layout cache at a per-test directory.
+
+    Keeps tests from reading or polluting the developer's real cache.
+    """
+    cache_dir = tmp_path_factory.mktemp("elk-layout-cache")
+    monkeypatch.setenv("FLO_ELK_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_ir_cache(tmp_path_factory, monkeypatch):
+    """Point the compiled-IR cache at a per-test directory."""
+    cache_dir = tmp_path_factory.mktemp("ir-cache")
+    monkeypatch.setenv("FLO_IR_CACHE_DIR", str(cache_dir))
+    return cache_dir
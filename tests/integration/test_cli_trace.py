@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+
+from click.testing import CliRunner
+
+from flo.core.cli import cli
+
+_FLO = """\
+spec_version: "0.1"
+process:
+  id: orders
+  name: Orders
+steps:
+  - id: start
+    kind: start
+  - id: pick
+    kind: task
+    name: Pick
+  - id: finish
+    kind: end
+"""
+
+
+def _write_inputs(tmp_path, activities):
+    model = tmp_path / "orders.flo"
+    model.write_text(_FLO, encoding="utf-8")
+    events = [
+        {
+            "event_id": f"e{index}",
+            "process_id": "orders",
+            "process_version": "1",
+            "case_id": "c1",
+            "activity_key": activity,
+            "timestamp": f"2026-08-09T15:00:0{index}Z",
+            "lifecycle": "complete",
+        }
+        for index, activity in enumerate(activities)
+    ]
+    trace = tmp_path / "orders.trace.json"
+    trace.write_text(
+        json.dumps({"schema_version": "0.1", "events": events}), encoding="utf-8"
+    )
+    return model, trace
+
+
+def test_trace_import_then_align_prints_the_report(tmp_path):
+    model, trace = _write_inputs(tmp_path, ["start", "PICK", "finish"])
+    mapping = tmp_path / "mapping.json"
+    mapping.write_text('{"PICK": "pick"}', encoding="utf-8")
+    runner = CliRunner()
+
+    imported = runner.invoke(cli, ["trace", "import", str(trace)])
+    assert imported.exit_code == 0, imported.output
+    store = tmp_path / "orders.trace.flotrace"
+    assert store.exists() and "Imported 3 event(s)" in imported.output
+
+    aligned = runner.invoke(
+        cli, ["trace", "align", str(model), str(store), "--mapping", str(mapping)]
+    )
+    assert aligned.exit_code == 0, aligned.output
+    report = json.loads(aligned.output)
+    assert (report["process_id"], report["resolved_events"]) == ("orders", 3)
+
+
+def test_trace_align_strict_reports_then_exits_with_validation_code(tmp_path):
+    model, trace = _write_inputs(tmp_path, ["start", "PICK"])
+
+    result = CliRunner().invoke(
+        cli, ["trace", "align", str(model), str(trace), "--strict"]
+    )
+
+    assert result.exit_code == 4
+    report = json.loads(result.stdout)
+    assert report["unknown_activity_keys"] == ["PICK"]
+    assert "1 of 2 selected events unresolved" in result.stderr
+
+
+def test_trace_normalize_sorts_and_drops_exact_copies(tmp_path):
+    _, trace = _write_inputs(tmp_path, ["finish", "start"])
+    document = json.loads(trace.read_text("utf-8"))
+    document["events"].reverse()
+    document["events"].append(document["events"][0])
+    trace.write_text(json.dumps(document), encoding="utf-8")
+    output = tmp_path / "sorted.json"
+
+    result = CliRunner().invoke(
+        cli, ["trace", "normalize", str(trace), "-o", str(output)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "1 exact copies dropped" in result.output
+    events = json.loads(output.read_text("utf-8"))["events"]
+    assert [event["event_id"] for event in events] == ["e0", "e1"]
+
+
+def test_trace_transitions_exports_json_through_the_registry(tmp_path):
+    model, trace = _write_inputs(tmp_path, ["start", "pick", "finish"])
+
+    result = CliRunner().invoke(
+        cli, ["trace", "transitions", str(model), str(trace), "-j", "2"]
+    )
+
+    assert result.exit_code == 0, result.output
+    transitions = json.loads(result.output)["transitions"]
+    assert transitions["cases"] == 1
+    assert transitions["observed_transitions"] == transitions["modeled_transitions"]
+    assert transitions["unobserved_edges"] == []
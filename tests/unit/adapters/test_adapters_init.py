@@ -5,21 +5,16 @@ def test_parse_adapter_uses_model_dump(monkeypatch):
             return {"a": 1}
 
     monkeypatch.setattr(
-        "flo.adapters.load_adapter_from_yaml",
-        lambda content: DummyModel(),
+        "flo.adapters.adapter_model_from_mapping",
+        lambda data: DummyModel(),
     )
 
     from flo.adapters import parse_adapter
 
-    assert parse_adapter("irrelevant") == {"a": 1}
+    assert parse_adapter("name: n\ncontent: c\n") == {"a": 1}
 
 
-def test_parse_adapter_falls_back_on_value_error(monkeypatch):
-    monkeypatch.setattr(
-        "flo.adapters.load_adapter_from_yaml",
-        lambda content: (_ for _ in ()).throw(ValueError("bad yaml")),
-    )
-
+def test_parse_adapter_keeps_text_fallback_for_non_mappings():
     from flo.adapters import parse_adapter
 
     assert parse_adapter("rawtext") == {"name": "parsed", "content": "rawtext"}
@@ -35,10 +30,41 @@ def test_parse_adapter_dict_fallback(monkeypatch):
             yield ("x", 42)
 
     monkeypatch.setattr(
-        "flo.adapters.load_adapter_from_yaml",
-        lambda content: FallbackModel(),
+        "flo.adapters.adapter_model_from_mapping",
+        lambda data: FallbackModel(),
     )
 
     from flo.adapters import parse_adapter
 
-    assert parse_adapter("irrelevant") == {"x": 42}
+    assert parse_adapter("name: n\ncontent: c\n") == {"x": 42}
+
+
+def test_parse_adapter_parses_each_document_once(monkeypatch, tmp_path):
+    import flo.adapters.yaml_loader as yaml_loader
+    from flo.adapters import parse_adapter
+
+    part = tmp_path / "part.yaml"
+    part.write_text("steps:\n  - id: a\n", encoding="utf-8")
+    calls: list[str] = []
+    original = yaml_loader.load_yaml
+
+    def counting_load(content):
+        calls.append(content)
+        return original(content)
+
+    monkeypatch.setattr("flo.adapters.load_yaml", counting_load)
+    monkeypatch.setattr("flo.adapters.composition.load_yaml", counting_load)
+
+    parse_adapter("process: {id: p}\nincludes: [part.yaml]\n", str(tmp_path / "m.flo"))
+
+    assert len(calls) == 2
+
+
+def test_load_yaml_falls_back_to_pure_python_loader(monkeypatch):
+    import yaml
+
+    import flo.adapters.yaml_loader as yaml_loader
+
+    monkeypatch.setattr(yaml_loader, "_SAFE_LOADER", yaml.SafeLoader)
+
+    assert yaml_loader.load_yaml("a: [1, yes]\n") == {"a": [1, True]}
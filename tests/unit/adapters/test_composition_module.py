@@ -8,39 +8,38 @@ import flo.adapters.composition as composition
 
 
 def test_normalize_include_entries_supports_empty_string_string_and_list():
-    assert composition._normalize_include_entries({}) == []
-    assert composition._normalize_include_entries({"include": "   "}) == []
-    assert composition._normalize_include_entries({"include": "  part.yaml  "}) == [
-        "part.yaml"
+    assert composition.include_refs({}) == []
+    assert composition.include_refs({"include": "   "}) == []
+    assert composition.include_refs({"include": "  part.yaml  "}) == ["part.yaml"]
+    assert composition.include_refs({"includes": [" a.yaml ", "b.yaml"]}) == [
+        "a.yaml",
+        "b.yaml",
     ]
-    assert composition._normalize_include_entries(
-        {"includes": [" a.yaml ", "b.yaml"]}
-    ) == ["a.yaml", "b.yaml"]
 
 
 def test_normalize_include_entries_rejects_invalid_shapes():
     with pytest.raises(
         ValueError, match="include/includes must be a string or list of strings"
     ):
-        composition._normalize_include_entries({"includes": 42})
+        composition.include_refs({"includes": 42})
 
     with pytest.raises(
         ValueError, match=r"includes\[1\] must be a non-empty string path"
     ):
-        composition._normalize_include_entries({"includes": ["ok.yaml", ""]})
+        composition.include_refs({"includes": ["ok.yaml", ""]})
 
 
 def test_resolve_include_path_supports_absolute_and_cwd_relative(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ):
     absolute_target = tmp_path / "abs.yaml"
-    resolved_abs = composition._resolve_include_path(
+    resolved_abs = composition.resolve_include_path(
         str(absolute_target), current_path=tmp_path / "root.flo"
     )
     assert resolved_abs == absolute_target.resolve()
 
     monkeypatch.chdir(tmp_path)
-    resolved_rel = composition._resolve_include_path(
+    resolved_rel = composition.resolve_include_path(
         "parts/flow.yaml", current_path=None
     )
     assert resolved_rel == (tmp_path / "parts" / "flow.yaml").resolve()
@@ -173,3 +172,26 @@ def test_resolve_includes_without_source_path_uses_current_working_directory(
     composed = composition.resolve_includes({"include": "fragment.yaml"})
 
     assert composed["steps"] == [{"id": "s1"}]
+
+
+def test_include_closure_lists_nested_includes_once(tmp_path: Path):
+    (tmp_path / "parts").mkdir()
+    (tmp_path / "parts" / "shared.yaml").write_text(
+        "materials:\n  - id: flour\n", encoding="utf-8"
+    )
+    (tmp_path / "parts" / "steps.yaml").write_text(
+        "includes: [shared.yaml]\nsteps:\n  - id: mix\n", encoding="utf-8"
+    )
+    (tmp_path / "lanes.yaml").write_text(
+        "includes: [parts/shared.yaml]\nlanes:\n  - id: kitchen\n", encoding="utf-8"
+    )
+    root = tmp_path / "root.flo"
+    document = {"includes": ["parts/steps.yaml", "lanes.yaml"]}
+
+    closure = composition.include_closure(document, source_path=str(root))
+
+    assert closure == [
+        (tmp_path / "parts" / "steps.yaml").resolve(),
+        (tmp_path / "parts" / "shared.yaml").resolve(),
+        (tmp_path / "lanes.yaml").resolve(),
+    ]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+import pickle
+
+import pytest
+
+from flo.adapters import include_closure, resolve_includes
+from flo.adapters.include_cache import (
+    FrozenList,
+    FrozenMapping,
+    IncludeCache,
+    default_include_cache,
+    freeze,
+    thaw,
+)
+
+
+def _diamond(tmp_path: Path, fanout: int = 4) -> dict:
+    (tmp_path / "shared.flo").write_text(
+        "materials:\n  - id: flour\n    name: Flour\n", encoding="utf-8"
+    )
+    for index in range(fanout):
+        (tmp_path / f"part{index}.flo").write_text(
+            "includes:\n  - shared_ref.flo\n"
+            f"steps:\n  - id: s{index}\n    kind: task\n",
+            encoding="utf-8",
+        )
+    (tmp_path / "shared_ref.flo").write_text(
+        "includes:\n  - shared.flo\n", encoding="utf-8"
+    )
+    return {"includes": [f"part{index}.flo" for index in range(fanout)]}
+
+
+def test_cache_parses_each_shared_include_once(tmp_path: Path):
+    cache = IncludeCache()
+    document = _diamond(tmp_path)
+    source = str(tmp_path / "main.flo")
+
+    composed = resolve_includes(document, source, include_cache=cache)
+
+    assert [step["id"] for step in composed["steps"]] == ["s0", "s1", "s2", "s3"]
+    assert len(composed["materials"]) == 4
+    assert cache.stats.misses == 6
+    assert cache.stats.hits == 6
+
+    resolve_includes(document, source, include_cache=cache)
+
+    assert cache.stats.misses == 6
+    assert cache.describe()["entries"] == 6
+
+
+def test_composed_document_does_not_share_containers_with_cache(tmp_path: Path):
+    cache = IncludeCache()
+    document = _diamond(tmp_path, fanout=1)
+    source = str(tmp_path / "main.flo")
+
+    composed = resolve_includes(document, source, include_cache=cache)
+    composed["materials"][0]["name"] = "Rye"
+    composed["steps"].append({"id": "extra"})
+    again = resolve_includes(document, source, include_cache=cache)
+
+    assert type(composed["materials"][0]) is dict
+    assert again["materials"][0]["name"] == "Flour"
+    assert [step["id"] for step in again["steps"]] == ["s0"]
+
+
+def test_cache_reloads_a_rewritten_include(tmp_path: Path):
+    cache = IncludeCache()
+    path = tmp_path / "shared.flo"
+    path.write_text("name: a\n", encoding="utf-8")
+    assert cache.load(path) == {"name": "a"}
+
+    path.write_text("name: b\n", encoding="utf-8")
+
+    assert cache.load(path) == {"name": "b"}
+    assert (cache.stats.misses, cache.stats.reloads) == (2, 1)
+
+
+def test_cache_evicts_least_recently_used_files(tmp_path: Path):
+    cache = IncludeCache(max_entries=2)
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.flo"
+        path.write_text(f"name: {name}\n", encoding="utf-8")
+        paths.append(path)
+
+    cache.load(paths[0])
+    cache.load(paths[1])
+    cache.load(paths[0])
+    cache.load(paths[2])
+
+    assert cache.stats.evictions == 1
+    cache.load(paths[0])
+    assert cache.stats.hits == 2
+
+
+def test_frozen_documents_reject_mutation_and_round_trip_as_plain_data():
+    frozen = freeze({"steps": [{"id": "a"}], "name": "x"})
+
+    assert isinstance(frozen, FrozenMapping)
+    assert isinstance(frozen["steps"], FrozenList)
+    with pytest.raises(TypeError):
+        frozen["name"] = "y"
+    with pytest.raises(TypeError):
+        frozen["steps"].append({})
+    with pytest.raises(TypeError):
+        frozen["steps"][0].update(id="b")
+    assert type(pickle.loads(pickle.dumps(frozen))) is dict
+    assert type(copy.copy(frozen["steps"])) is list
+    assert type(thaw(frozen)["steps"][0]) is dict
+
+
+def test_missing_include_reports_not_found_with_cache(tmp_path: Path):
+    with pytest.raises(ValueError, match="include file not found"):
+        include_closure({"includes": ["missing.flo"]}, str(tmp_path / "main.flo"))
+
+
+def test_default_include_cache_can_be_disabled(monkeypatch: pytest.MonkeyPatch):
+    assert default_include_cache() is default_include_cache()
+
+    monkeypatch.setenv("FLO_INCLUDE_CACHE", "off")
+
+    assert default_include_cache() is None
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import tracemalloc
+
+import pytest
+
+from flo.errors import EXIT_PARSE_ERROR, EXIT_VALIDATION_ERROR
+from flo.schema import registry
+from flo.adapters.trace import (
+    TraceEventError,
+    TraceFormatError,
+    TraceImportStats,
+    iter_trace_events,
+    parse_rfc3339_us,
+)
+
+
+def _event(index: int, **overrides):
+    event = {
+        "event_id": f"evt-{index:06d}",
+        "process_id": "order-fulfillment",
+        "case_id": f"case-{index // 4}",
+        "activity_key": ("receive", "pick", "pack", "ship")[index % 4],
+        "timestamp": f"2026-08-09T15:{index // 60 % 60:02d}:{index % 60:02d}Z",
+        "lifecycle": "complete",
+    }
+    event.update(overrides)
+    return event
+
+
+def _dataset(events, **envelope) -> str:
+    return json.dumps({"schema_version": "0.1", "events": events, **envelope})
+
+
+class _LazyTrace(io.TextIOBase):
+    """Text stream that renders a synthetic dataset only as it is read."""
+
+    def __init__(self, count: int) -> None:
+        self._parts = self._render(count)
+        self._pending = ""
+
+    @staticmethod
+    def _render(count: int):
+        yield '{"events": ['
+        for index in range(count):
+            yield ("," if index else "") + json.dumps(_event(index))
+        yield '], "schema_version": "0.1"}'
+
+    def read(self, size: int = -1) -> str:
+        while len(self._pending) < size:
+            part = next(self._parts, None)
+            if part is None:
+                break
+            self._pending += part
+        chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+
+def test_small_chunks_decode_the_same_events_as_json_load():
+    events = [
+        _event(i, attributes={"weight": 12345.5, "tags": ["a"]}) for i in range(9)
+    ]
+    events[3]["process_version"] = "2026.1"
+    text = _dataset(events)
+
+    streamed = list(iter_trace_events(io.StringIO(text), chunk_size=5))
+
+    assert [event.event_id for event in streamed] == [e["event_id"] for e in events]
+    assert streamed[0].attributes == {"weight": 12345.5, "tags": ["a"]}
+    assert streamed[3].process_version == "2026.1"
+    assert streamed[0].timestamp_us == parse_rfc3339_us("2026-08-09T15:00:00+00:00")
+
+
+def test_gzip_paths_and_empty_event_arrays(tmp_path):
+    path = tmp_path / "trace.json.gz"
+    path.write_bytes(gzip.compress(_dataset([_event(1)]).encode("utf-8")))
+    empty = tmp_path / "empty.json"
+    empty.write_text('{"events": [], "schema_version": "0.1"}', encoding="utf-8")
+    stats = TraceImportStats()
+
+    assert [event.event_id for event in iter_trace_events(path)] == ["evt-000001"]
+    assert list(iter_trace_events(empty, stats=stats)) == []
+    assert (stats.schema_version, stats.events) == ("0.1", 0)
+
+
+@pytest.mark.parametrize(
+    ("overrides", "field"),
+    [
+        ({"event_id": ""}, "event_id"),
+        ({"case_id": 7}, "case_id"),
+        ({"lifecycle": "resume"}, "lifecycle"),
+        ({"timestamp": "2026-08-09T15:04:05"}, "timestamp"),
+        ({"timestamp": "2026-02-30T15:04:05Z"}, "timestamp"),
+        ({"source": ""}, "source"),
+        ({"attributes": []}, "attributes"),
+        ({"extra": 1}, "extra"),
+    ],
+)
+def test_checker_rejects_what_the_schema_rejects(overrides, field):
+    document = {"schema_version": "0.1", "events": [_event(1, **overrides)]}
+
+    with pytest.raises(TraceEventError) as excinfo:
+        list(iter_trace_events(io.StringIO(json.dumps(document))))
+
+    assert excinfo.value.issue.field == field
+    assert excinfo.value.issue.event_id == "evt-000001" or field == "event_id"
+    if field != "timestamp":
+        assert list(registry.iter_schema_errors(document, "flo_trace.json"))
+
+
+def test_missing_required_field_is_reported_by_name():
+    event = _event(1)
+    del event["activity_key"]
+
+    with pytest.raises(TraceEventError, match="activity_key: is required"):
+        list(iter_trace_events(io.StringIO(_dataset([event]))))
+
+
+def test_timestamps_normalize_offsets_to_utc_microseconds():
+    utc = parse_rfc3339_us("2026-08-09T15:04:05.25Z")
+
+    assert parse_rfc3339_us("2026-08-09T17:04:05.250+02:00") == utc
+    assert parse_rfc3339_us("2026-08-09t15:04:05.25z") == utc
+    assert parse_rfc3339_us("2016-12-31T23:59:60Z") == parse_rfc3339_us(
+        "2017-01-01T00:00:00Z"
+    )
+    assert parse_rfc3339_us("2016-12-31T18:59:60-05:00") == parse_rfc3339_us(
+        "2017-01-01T00:00:00Z"
+    )
+    assert parse_rfc3339_us("1969-12-31T23:59:59.9999999Z") == -1
+    for invalid in ("2016-12-31T12:59:60Z", "2026-08-09T15:04:61Z"):
+        with pytest.raises(ValueError, match="leap seconds"):
+            parse_rfc3339_us(invalid)
+    with pytest.raises(ValueError, match="not a valid date-time"):
+        parse_rfc3339_us("2026-08-09T24:00:00+01:00")
+
+
+def test_strict_mode_raises_and_lenient_mode_records_issues():
+    text = _dataset([_event(0), _event(1, lifecycle="bogus"), _event(2)])
+
+    with pytest.raises(TraceEventError) as excinfo:
+        list(iter_trace_events(io.StringIO(text)))
+    assert excinfo.value.exit_code == EXIT_VALIDATION_ERROR
+    assert str(excinfo.value).startswith("events[1].lifecycle: must be one of")
+
+    stats = TraceImportStats(max_issues=0)
+    kept = list(iter_trace_events(io.StringIO(text), strict=False, stats=stats))
+
+    assert [event.event_id for event in kept] == ["evt-000000", "evt-000002"]
+    assert (stats.events, stats.invalid_events, stats.issues) == (2, 1, [])
+
+
+@pytest.mark.parametrize(
+    ("text", "message"),
+    [
+        ('{"schema_version": "0.2", "events": []}', "unsupported trace"),
+        ('{"schema_version": "0.1", "events": [], "x": 1}', "unexpected dataset"),
+        ('{"schema_version": "0.1"}', "missing required key 'events'"),
+        ('{"schema_version": "0.1", "events": [{"a": 1}', "expected ',' or ']'"),
+        ('{"schema_version": "0.1", "events": [{"a": }]}', "invalid JSON"),
+        ('{"schema_version": "0.1", "events": []} []', "unexpected content"),
+    ],
+)
+def test_envelope_errors_raise_parse_errors(text, message):
+    with pytest.raises(TraceFormatError, match=message) as excinfo:
+        list(iter_trace_events(io.StringIO(text), strict=False))
+
+    assert excinfo.value.exit_code == EXIT_PARSE_ERROR
+
+
+def test_oversized_values_are_rejected_without_buffering_the_rest():
+    text = '{"schema_version": "0.1", "events": [{"event_id": "' + "x" * 500
+
+    with pytest.raises(TraceFormatError, match="larger than 64 characters"):
+        list(iter_trace_events(io.StringIO(text), chunk_size=16, max_event_chars=64))
+
+
+class _CountingReads(io.StringIO):
+    def __init__(self, text: str) -> None:
+        super().__init__(text)
+        self.reads = 0
+
+    def read(self, size: int | None = -1) -> str:
+        self.reads += 1
+        return super().read(size)
+
+
+def test_values_spanning_many_chunks_refill_geometrically():
+    event = _event(0, attributes={"note": "x" * 20_000})
+    stream = _CountingReads(_dataset([event]))
+
+    streamed = list(iter_trace_events(stream, chunk_size=16))
+
+    assert streamed[0].attributes == event["attributes"]
+    assert stream.reads < 40
+
+
+def test_memory_stays_bounded_as_the_dataset_grows():
+    stats = TraceImportStats()
+    tracemalloc.start()
+    try:
+        count = sum(
+            1
+            for _ in iter_trace_events(_LazyTrace(10_000), stats=stats, chunk_size=4096)
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert count == stats.events == 10_000
+    assert stats.characters > 1_500_000
+    assert peak < 500_000
+    assert stats.events_per_second > 0
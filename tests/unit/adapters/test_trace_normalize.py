@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import random
+import tracemalloc
+
+import pytest
+
+from flo.adapters.trace import (
+    TraceEvent,
+    TraceNormalizeStats,
+    TraceStore,
+    iter_sorted_events,
+    iter_trace_events,
+    normalize_trace,
+    parse_rfc3339_us,
+)
+
+
+def _event(index: int, **overrides) -> TraceEvent:
+    # Offsets vary so text order and instant order disagree.
+    offset = ("Z", "+01:00", "-02:00")[index % 3]
+    hour = (15, 16, 13)[index % 3]
+    timestamp = f"2026-08-09T{hour}:{index // 60 % 60:02d}:{index % 60:02d}{offset}"
+    fields = {
+        "event_id": f"evt-{index:05d}",
+        "process_id": "order-fulfillment",
+        "case_id": f"case-{index // 4}",
+        "activity_key": ("receive", "pick", "pack", "ship")[index % 4],
+        "timestamp": timestamp,
+        "timestamp_us": parse_rfc3339_us(timestamp),
+        "lifecycle": "complete",
+        "attributes": {"n": index} if index % 5 == 0 else None,
+    }
+    fields.update(overrides)
+    return TraceEvent(**fields)
+
+
+def _events() -> list[TraceEvent]:
+    events = [_event(index) for index in range(600)]
+    events += [_event(7), _event(42)]  # exact replays
+    events.append(_event(9, activity_key="cancelled"))  # conflicting copy
+    events.append(_event(100, event_id="evt-00003"))  # reused ID, other time
+    random.Random(7).shuffle(events)
+    return events
+
+
+def _key(event: TraceEvent) -> tuple[int, str]:
+    return event.timestamp_us, event.event_id
+
+
+def test_in_memory_sort_orders_and_dedupes():
+    stats = TraceNormalizeStats()
+
+    ordered = list(iter_sorted_events(_events(), stats=stats))
+
+    assert [_key(event) for event in ordered] == sorted(map(_key, ordered))
+    assert (stats.events, stats.written, stats.dropped_copies) == (604, 602, 2)
+    assert stats.runs == 0
+    assert (stats.duplicate_event_id_count, stats.duplicate_event_ids) == (
+        2,
+        ["evt-00003", "evt-00009"],
+    )
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_spilled_runs_merge_to_the_in_memory_result(tmp_path, jobs):
+    expected = list(iter_sorted_events(_events()))
+    stats = TraceNormalizeStats()
+
+    merged = list(
+        iter_sorted_events(
+            _events(),
+            max_events_in_memory=90,
+            jobs=jobs,
+            spill_dir=tmp_path,
+            stats=stats,
+        )
+    )
+
+    assert merged == expected
+    assert stats.runs > 5 and stats.dropped_copies == 2
+    assert stats.duplicate_event_id_count == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("name", ["sorted.json", "sorted.json.gz"])
+def test_normalized_dataset_round_trips_in_canonical_order(tmp_path, name):
+    target = tmp_path / name
+
+    stats = normalize_trace(_events(), target, max_events_in_memory=100)
+
+    reimported = list(iter_trace_events(target))
+    assert reimported == list(iter_sorted_events(_events()))
+    assert stats.written == len(reimported) == 602
+    assert [path.name for path in tmp_path.iterdir()] == [name]
+
+
+def test_normalize_to_store_writes_a_trace_store(tmp_path):
+    normalize_trace(_events(), tmp_path / "t.flotrace", max_events_in_memory=100)
+
+    with TraceStore(tmp_path / "t.flotrace") as store:
+        assert len(store) == 602
+        assert store.event_ids[0] == min(_events(), key=_key).event_id
+
+
+def _peak_bytes(target, count: int) -> int:
+    tracemalloc.start()
+    try:
+        events = (_event(index) for index in range(count))
+        normalize_trace(events, target, max_events_in_memory=100)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize("name", ["t.json", "t.flotrace"])
+def test_normalize_peak_memory_follows_the_budget_not_the_input(tmp_path, name):
+    _peak_bytes(tmp_path / f"warm-{name}", 100)
+
+    small = _peak_bytes(tmp_path / f"small-{name}", 1000)
+    large = _peak_bytes(tmp_path / f"large-{name}", 6000)
+
+    assert large < small * 1.2
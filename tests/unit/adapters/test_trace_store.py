@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import pytest
+
+from flo.adapters.trace import (
+    MISSING_CODE,
+    TraceEvent,
+    TraceFormatError,
+    TraceStore,
+    parse_rfc3339_us,
+    write_trace_store,
+)
+
+
+def _event(event_id: str, timestamp: str, activity: str, **fields) -> TraceEvent:
+    return TraceEvent(
+        event_id=event_id,
+        process_id="orders",
+        case_id=fields.pop("case_id", "case-1"),
+        activity_key=activity,
+        timestamp=timestamp,
+        timestamp_us=parse_rfc3339_us(timestamp),
+        lifecycle=fields.pop("lifecycle", "complete"),
+        **fields,
+    )
+
+
+def _events() -> list[TraceEvent]:
+    return [
+        _event("e3", "2026-08-09T15:00:02Z", "pack", source="wms"),
+        _event("e2", "2026-08-09T17:00:01+02:00", "pick", lifecycle="start"),
+        _event("e1", "2026-08-09T15:00:01Z", "pick", case_id="case-2"),
+        _event("e0", "2026-08-09T15:00:03Z", "ship", process_version="2026.1"),
+    ]
+
+
+def test_store_round_trips_events_in_canonical_order(tmp_path):
+    path = write_trace_store(_events(), tmp_path / "orders.flotrace")
+
+    with TraceStore(path) as store:
+        events = list(store.iter_events())
+        activity = store.columns["activity_key"]
+
+        assert [event.event_id for event in events] == ["e1", "e2", "e3", "e0"]
+        assert list(activity.values) == ["pack", "pick", "ship"]
+        assert [activity.values.code_of(key) for key in ("pick", "zzz")] == [
+            1,
+            MISSING_CODE,
+        ]
+        assert list(store.columns["source"].codes) == [MISSING_CODE] * 2 + [0] + [
+            MISSING_CODE
+        ]
+        assert events[1].timestamp == "2026-08-09T15:00:01Z"
+        assert events[1].lifecycle == "start"
+        assert events[0].case_id == "case-2"
+        assert events[2].source == "wms"
+        assert events[3].process_version == "2026.1"
+
+
+def test_columns_are_read_only_views_over_the_mapping(tmp_path):
+    path = write_trace_store(_events(), tmp_path / "orders.flotrace")
+
+    store = TraceStore(path)
+    timestamps = store.timestamps_us
+    assert isinstance(timestamps, memoryview) and timestamps.readonly
+    assert timestamps.format == "q" and list(timestamps) == sorted(timestamps)
+    assert store.lifecycles.itemsize == 1
+    assert store.columns["case_id"].codes.itemsize == 4
+    store.close()
+
+    with pytest.raises(ValueError):
+        timestamps[0]
+
+
+def test_empty_and_foreign_files(tmp_path):
+    with TraceStore(write_trace_store([], tmp_path / "empty.flotrace")) as store:
+        assert len(store) == 0
+        assert list(store.iter_events()) == []
+        assert "pick" not in store.columns["activity_key"].values
+
+    foreign = tmp_path / "trace.json"
+    foreign.write_text('{"schema_version": "0.1", "events": []}', encoding="utf-8")
+    with pytest.raises(TraceFormatError, match="not a FLO trace store"):
+        TraceStore(foreign)
+
+
+def test_presorted_stream_writes_the_same_store_as_the_sorting_builder(tmp_path):
+    events = sorted(_events(), key=lambda event: (event.timestamp_us, event.event_id))
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+
+    sorted_path = write_trace_store(events, tmp_path / "sorted.flotrace")
+    streamed = write_trace_store(
+        events,
+        tmp_path / "streamed.flotrace",
+        presorted=True,
+        max_rows_in_memory=3,
+        spill_dir=spill_dir,
+    )
+
+    assert streamed.read_bytes() == sorted_path.read_bytes()
+    assert list(spill_dir.iterdir()) == []
+    with pytest.raises(TraceFormatError, match="out of canonical order"):
+        write_trace_store(_events(), tmp_path / "bad.flotrace", presorted=True)
+    assert not (tmp_path / "bad.flotrace").exists()
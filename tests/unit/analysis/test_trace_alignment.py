@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from flo.adapters.trace import (
+    DuplicateIdFinder,
+    TraceEvent,
+    TraceImportStats,
+    TraceStore,
+    parse_rfc3339_us,
+    write_trace_store,
+)
+from flo.adapters.trace import duplicates
+from flo.adapters.trace.importer import TraceEventIssue
+from flo.compiler.analysis import (
+    ActivityIndex,
+    TraceAlignmentError,
+    align_trace_store,
+)
+from flo.compiler.analysis.trace_alignment import EXCLUDED, UNRESOLVED, UNVERSIONED
+from flo.compiler.ir import IR, Node
+from flo.errors import ValidationError
+
+
+def _ir() -> IR:
+    return IR(
+        name="orders",
+        nodes=[Node("receive", "task"), Node("pick", "task"), Node("pack", "task")],
+        process_metadata={"process_id": "order-fulfillment"},
+    )
+
+
+def _event(index: int, activity: str, **fields) -> TraceEvent:
+    timestamp = f"2026-08-09T15:00:{index:02d}Z"
+    return TraceEvent(
+        event_id=fields.pop("event_id", f"e{index:02d}"),
+        process_id=fields.pop("process_id", "order-fulfillment"),
+        case_id="case-1",
+        activity_key=activity,
+        timestamp=timestamp,
+        timestamp_us=parse_rfc3339_us(timestamp),
+        lifecycle="complete",
+        process_version=fields.pop("process_version", "2026.1"),
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    events = [
+        _event(0, "receive"),
+        _event(1, "PICK"),
+        _event(2, "pack"),
+        _event(3, "label"),
+        _event(4, "gift-wrap"),
+        _event(5, "pick", process_id="returns"),
+        _event(6, "pick", process_version="2025.4"),
+        _event(7, "pick", process_version=None),
+        _event(8, "pack", event_id="e02"),
+    ]
+    with TraceStore(write_trace_store(events, tmp_path / "t.flotrace")) as opened:
+        yield opened
+
+
+def test_mapping_must_target_nodes_and_conflicts_are_ambiguous():
+    index = ActivityIndex.build(_ir(), {"PICK": "pick", "pack": "receive"})
+
+    assert index.by_key["PICK"] == 1
+    assert "pack" not in index.by_key and index.ambiguous == {"pack"}
+    with pytest.raises(ValidationError, match="unknown node 'ship'"):
+        ActivityIndex.build(_ir(), {"SHIP": "ship"})
+
+
+def test_alignment_report_counts_and_orders_every_outcome(store):
+    stats = TraceImportStats()
+    stats.record(TraceEventIssue(4, "bad", "timestamp", "must carry an offset"))
+
+    alignment = align_trace_store(
+        store,
+        _ir(),
+        process_version="2026.1",
+        mapping={"PICK": "pick"},
+        import_stats=stats,
+        batch_size=4,
+    )
+    report = alignment.report.to_dict()
+
+    assert report["process_id"] == "order-fulfillment"
+    assert (report["total_events"], report["selected_events"]) == (9, 7)
+    assert (report["resolved_events"], report["unresolved_events"]) == (5, 2)
+    assert report["unknown_activity_keys"] == ["gift-wrap", "label"]
+    assert (report["duplicate_event_id_count"], report["duplicate_event_ids"]) == (
+        1,
+        ["e02"],
+    )
+    assert report["validation_failures"] == [
+        "events[4].timestamp: must carry an offset"
+    ]
+    assert list(alignment.node_indices) == [0, 1, 2, UNRESOLVED, UNRESOLVED] + [
+        EXCLUDED,
+        EXCLUDED,
+        1,
+        2,
+    ]
+    assert json.loads(alignment.report.to_json()) == report
+
+
+def test_unversioned_events_never_guess_a_version(store):
+    alignment = align_trace_store(store, _ir(), process_id="order-fulfillment")
+
+    assert alignment.report.unversioned_events == 1
+    assert alignment.node_indices[7] == UNVERSIONED
+    assert alignment.node_indices[6] == 1
+
+
+def test_strict_alignment_fails_with_the_report(store):
+    with pytest.raises(TraceAlignmentError) as excinfo:
+        align_trace_store(store, _ir(), process_version="2026.1", strict=True)
+
+    assert excinfo.value.report.unknown_activity_keys == ["PICK", "gift-wrap", "label"]
+    assert "3 of 7 selected events unresolved" in str(excinfo.value)
+
+
+def test_duplicate_finder_spills_without_changing_the_result(tmp_path):
+    ids = [f"id-{n % 700}".encode() for n in range(1000)] + [b"id-5"]
+    in_memory = DuplicateIdFinder()
+    in_memory.update(ids)
+
+    with DuplicateIdFinder(
+        max_in_memory=50, partitions=4, spill_dir=tmp_path
+    ) as spilled:
+        spilled.update(ids)
+        assert spilled.spilled
+        assert spilled.result(limit=3) == in_memory.result(limit=3)
+        assert spilled.result() == in_memory.result()
+    assert in_memory.result(limit=2) == (300, ["id-0", "id-1"])
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_duplicate_finder_splits_partitions_over_the_budget(tmp_path, monkeypatch):
+    ids = [f"id-{n % 700}".encode() for n in range(1000)] + [b"same"] * 200
+    loads: list[tuple[int, int]] = []
+    original = duplicates._repeated_ids
+
+    def recording(event_ids):
+        event_ids = list(event_ids)
+        loads.append((len(event_ids), len(set(event_ids))))
+        return original(event_ids)
+
+    monkeypatch.setattr(duplicates, "_repeated_ids", recording)
+    with DuplicateIdFinder(
+        max_in_memory=50, partitions=2, spill_dir=tmp_path
+    ) as finder:
+        finder.update(ids)
+        assert finder.result(limit=2) == (301, ["id-0", "id-1"])
+
+    assert sum(records for records, _ in loads) == len(ids)
+    assert max(distinct for _, distinct in loads) <= 50
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import pytest
+
+from flo.adapters.trace import (
+    TraceEvent,
+    TraceStore,
+    parse_rfc3339_us,
+    write_trace_store,
+)
+from flo.compiler.analysis import (
+    TransitionCounts,
+    TransitionFrequency,
+    align_trace_store,
+    count_transitions,
+    transition_frequencies,
+)
+from flo.compiler.ir.models import IR, Edge, Node
+
+
+def _ir() -> IR:
+    return IR(
+        name="orders",
+        nodes=[Node("receive", "task"), Node("pick", "task"), Node("pack", "task")],
+        edges=[
+            Edge("receive", "pick"),
+            Edge("pick", "pack"),
+            Edge("pick", "pack", outcome="rush"),
+            Edge("pack", "receive"),
+        ],
+    )
+
+
+def _events() -> list[TraceEvent]:
+    # case-a reports starts and completions and reworks pick once; case-b
+    # is completion-only with an unmapped activity. Cases interleave.
+    steps = [
+        ("case-a", "receive", "complete"),
+        ("case-b", "receive", "complete"),
+        ("case-a", "pick", "start"),
+        ("case-b", "unknown", "complete"),
+        ("case-a", "pick", "complete"),
+        ("case-a", "pick", "start"),
+        ("case-b", "pick", "complete"),
+        ("case-a", "pick", "fail"),
+        ("case-c", "pack", "complete"),
+        ("case-b", "pack", "complete"),
+        ("case-a", "pack", "complete"),
+    ]
+    events = []
+    for index, (case_id, activity, lifecycle) in enumerate(steps):
+        timestamp = f"2026-08-09T15:00:{index:02d}Z"
+        events.append(
+            TraceEvent(
+                f"e{index:02d}",
+                "orders",
+                case_id,
+                activity,
+                timestamp,
+                parse_rfc3339_us(timestamp),
+                lifecycle,
+                process_version="1",
+            )
+        )
+    return events
+
+
+@pytest.fixture
+def store(tmp_path):
+    with TraceStore(write_trace_store(_events(), tmp_path / "t.flotrace")) as opened:
+        yield opened
+
+
+def test_transitions_count_visits_and_compare_against_edges(store):
+    alignment = align_trace_store(store, _ir())
+
+    report = transition_frequencies(store, alignment, _ir())
+
+    assert (report.cases, report.visits) == (3, 8)
+    assert (report.observed_transitions, report.modeled_transitions) == (5, 4)
+    assert report.edges == [
+        TransitionFrequency("receive", "pick", 2),
+        TransitionFrequency("pick", "pack", 2),
+        TransitionFrequency("pack", "receive", 0),
+    ]
+    assert report.unobserved_edges == [TransitionFrequency("pack", "receive", 0)]
+    assert report.unmodeled_transitions == [TransitionFrequency("pick", "pick", 1)]
+    assert report.to_dict()["unmodeled_transitions"] == [
+        {"source": "pick", "target": "pick", "count": 1}
+    ]
+
+
+def test_hash_partitioned_workers_merge_to_the_serial_counts(store, tmp_path):
+    nodes = align_trace_store(store, _ir()).node_indices
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+
+    serial = count_transitions(store, nodes, 3)
+    parallel = count_transitions(store, nodes, 3, jobs=2, spill_dir=spill_dir)
+
+    assert parallel == serial
+    assert count_transitions(store, list(nodes), 3, jobs=2) == serial
+    assert list(spill_dir.iterdir()) == []
+    with pytest.raises(ValueError, match="different models"):
+        serial.merge(TransitionCounts(4))
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import sys
+
+import pytest
+
+from flo.adapters import load_yaml, parse_adapter_document
+from flo.compiler import compile_adapter
+from flo.compiler.ir import validate_ir
+
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _load_script(name: str):
+    path = _REPO_ROOT / "scripts" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Could not load script from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+_synthetic = _load_script("synthetic_flo")
+_bench = _load_script("benchmark_pipeline")
+
+
+def test_generator_is_deterministic_and_seed_sensitive():
+    spec = _synthetic.SyntheticSpec(steps=60, include_fanin=3, subprocess_depth=2)
+
+    first = _synthetic.generate_model(spec)
+    again = _synthetic.generate_model(spec)
+    reseeded = _synthetic.generate_model(
+        _synthetic.SyntheticSpec(steps=60, include_fanin=3, subprocess_depth=2, seed=1)
+    )
+
+    assert (first.main, first.includes) == (again.main, again.includes)
+    assert first.includes != reseeded.includes
+    assert sorted(first.includes) == [
+        "parts/part_000.flo",
+        "parts/part_001.flo",
+        "parts/part_002.flo",
+        "shared/resources.flo",
+    ]
+
+
+def test_generated_models_compile_and_validate(tmp_path: Path):
+    spec = _synthetic.SyntheticSpec(
+        steps=120,
+        lanes=3,
+        decision_fanout=4,
+        rework_loops=3,
+        subprocess_depth=3,
+        include_fanin=5,
+        metadata_density=1.0,
+    )
+    path = _synthetic.generate_model(spec).write(tmp_path)
+    content = path.read_text(encoding="utf-8")
+
+    model = parse_adapter_document(
+        load_yaml(content), content=content, source_path=str(path)
+    )
+    ir = compile_adapter(model)
+    validate_ir(ir)
+
+    kinds = {node.type for node in ir.nodes}
+    assert {"start", "end", "decision", "queue", "subprocess", "task"} <= kinds
+    assert any(edge.edge_type == "rework" for edge in ir.edges)
+
+
+def test_run_suite_reports_every_stage():
+    spec = _synthetic.SyntheticSpec(steps=30, lanes=2)
+
+    results = _bench.run_suite(
+        [spec], repeat=1, diagram="swimlane", layout_engine="layered", memory=True
+    )
+
+    case = results["cases"][spec.label]
+    assert results["format"] == _bench.FORMAT_VERSION
+    assert case["nodes"] == 30
+    assert tuple(case["stages"]) == _bench.STAGES
+    assert all(stats["peak_bytes"] is not None for stats in case["stages"].values())
+
+
+def _result(calibration: float, seconds: float, peak: int) -> dict:
+    return {
+        "calibration_seconds": calibration,
+        "cases": {"c": {"stages": {"elk": {"seconds": seconds, "peak_bytes": peak}}}},
+    }
+
+
+def test_compare_flags_regressions_beyond_threshold_and_noise_floor():
+    baseline = _result(0.05, 0.100, 10_000_000)
+
+    assert (
+        _bench.compare_results(
+            _result(0.05, 0.120, 11_000_000), baseline, threshold=0.25
+        )
+        == []
+    )
+    assert (
+        _bench.compare_results(
+            _result(0.10, 0.240, 10_000_000), baseline, threshold=0.25
+        )
+        == []
+    )
+    regressions = _bench.compare_results(
+        _result(0.05, 0.200, 20_000_000), baseline, threshold=0.25
+    )
+    assert regressions == [
+        "c elk: 200.0 ms vs 100.0 ms expected",
+        "c elk: peak 19.1 MiB vs 9.5 MiB",
+    ]
+    assert (
+        _bench.compare_results(
+            _result(0.05, 0.002, 100), _result(0.05, 0.001, 10), threshold=0.25
+        )
+        == []
+    )
+
+
+def test_compare_refuses_a_baseline_recorded_with_another_configuration():
+    baseline = _result(0.05, 0.100, 10_000) | {
+        "diagram": "swimlane",
+        "layout_engine": "elk",
+        "python": "3.14.0",
+    }
+    patched = baseline | {"python": "3.14.2"}
+    other = baseline | {"diagram": "sppm", "layout_engine": "layered"}
+
+    assert _bench.compare_results(patched, baseline, threshold=0.25) == []
+    with pytest.raises(ValueError) as excinfo:
+        _bench.compare_results(other, baseline, threshold=0.25)
+    assert "diagram 'swimlane' in the baseline, 'sppm' now" in str(excinfo.value)
+    assert "layout_engine 'elk' in the baseline, 'layered' now" in str(excinfo.value)
@@ -159,13 +159,12 @@ def test_run_content_render_to_writes_svg_directly(
     )
     monkeypatch.setattr("flo.core.validate_ir", lambda i: None)
     monkeypatch.setattr("flo.core.scc_condense", lambda i: i)
-    monkeypatch.setattr(
-        "flo.core.render_artifact_and_contract",
-        lambda i, options=None: (
-            RenderArtifact(kind="svg", content="<svg>ok</svg>", backend="svg"),
-            None,
-        ),
-    )
+
+    def fake_stream(i, sink, options=None):
+        sink.write("<svg>ok</svg>")
+        return RenderArtifact(kind="svg", content="", backend="svg"), None
+
+    monkeypatch.setattr("flo.core.render_artifact_to_stream", fake_stream)
 
     out_path = tmp_path / "out.svg"
     rc, out, err = run_content(
@@ -184,6 +183,45 @@ def test_run_content_render_to_writes_svg_directly(
     assert out_path.read_text(encoding="utf-8") == "<svg>ok</svg>"
 
 
+def test_run_content_render_to_svgz_streams_gzip_and_keeps_old_file_on_failure(
+    monkeypatch, ir_factory, node_factory, tmp_path
+):
+    import gzip
+
+    monkeypatch.setattr(
+        "flo.core.parse_adapter",
+        lambda c, source_path=None: ir_factory(name="t", nodes=[node_factory("n")]),
+    )
+    monkeypatch.setattr(
+        "flo.core.compile_adapter",
+        lambda a: ir_factory(name="t", nodes=[node_factory("n")]),
+    )
+    monkeypatch.setattr("flo.core.validate_ir", lambda i: None)
+    monkeypatch.setattr("flo.core.scc_condense", lambda i: i)
+
+    def fake_stream(i, sink, options=None):
+        sink.write("<svg>ok</svg>")
+        return RenderArtifact(kind="svg", content="", backend="svg"), None
+
+    monkeypatch.setattr("flo.core.render_artifact_to_stream", fake_stream)
+    out_path = tmp_path / "out.svgz"
+    options = {"export": "svg", "render_to": str(out_path)}
+
+    assert run_content("some content", options=options)[0] == 0
+    assert gzip.decompress(out_path.read_bytes()) == b"<svg>ok</svg>"
+
+    def failing_stream(i, sink, options=None):
+        sink.write("<svg>partial")
+        raise RuntimeError("layout exploded")
+
+    monkeypatch.setattr("flo.core.render_artifact_to_stream", failing_stream)
+
+    with pytest.raises(RenderError, match="layout exploded"):
+        run_content("some content", options=options)
+    assert gzip.decompress(out_path.read_bytes()) == b"<svg>ok</svg>"
+    assert [path.name for path in tmp_path.iterdir()] == ["out.svgz"]
+
+
 def test_run_content_render_to_rejects_non_svg_target_for_svg_artifact(
     monkeypatch, ir_factory, node_factory
 ):
@@ -205,7 +243,7 @@ def test_run_content_render_to_rejects_non_svg_target_for_svg_artifact(
         ),
     )
 
-    with pytest.raises(RenderError, match=r"only \.svg output paths"):
+    with pytest.raises(RenderError, match=r"only \.svg and \.svgz output paths"):
         run_content(
             "some content",
             options={
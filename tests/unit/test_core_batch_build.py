@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import shutil
+
+from click.testing import CliRunner
+import pytest
+
+import flo.core.cli as cli_mod
+from flo.core.batch_build import build_tree, discover_flo_sources
+from flo.core.build_manifest import MANIFEST_FILENAME, BuildManifest
+
+_REFERENCE = Path("examples/reference")
+_OPTIONS = {"layout_engine": "layered"}
+
+
+@pytest.fixture
+def source_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "models"
+    (root / "nested").mkdir(parents=True)
+    shutil.copy(_REFERENCE / "linear.flo", root / "linear.flo")
+    shutil.copy(_REFERENCE / "rework_loop.flo", root / "nested" / "rework_loop.flo")
+    shutil.copy(
+        _REFERENCE / "chocolate_chip_cookies.flo", root / "chocolate_chip_cookies.flo"
+    )
+    shutil.copytree(
+        _REFERENCE / "chocolate_chip_cookies", root / "chocolate_chip_cookies"
+    )
+    return root
+
+
+def test_discover_skips_include_only_fragments(source_tree: Path):
+    sources = discover_flo_sources(source_tree)
+
+    assert [path.relative_to(source_tree).as_posix() for path in sources] == [
+        "chocolate_chip_cookies.flo",
+        "linear.flo",
+        "nested/rework_loop.flo",
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_build_tree_writes_mirrored_outputs(
+    source_tree: Path, tmp_path: Path, jobs: int
+):
+    out_root = tmp_path / "out"
+
+    report = build_tree(source_tree, out_root, jobs=jobs, options=_OPTIONS)
+
+    assert report.ok, report.to_dict()
+    assert [result.source for result in report.results] == [
+        "chocolate_chip_cookies.flo",
+        "linear.flo",
+        "nested/rework_loop.flo",
+    ]
+    for name in ("linear.svg", "nested/rework_loop.svg", "chocolate_chip_cookies.svg"):
+        assert (out_root / name).read_text(encoding="utf-8").startswith("<svg")
+    assert not (out_root / "chocolate_chip_cookies" / "process.svg").exists()
+
+
+def test_build_tree_reports_failures_without_stopping(
+    source_tree: Path, tmp_path: Path
+):
+    (source_tree / "broken.flo").write_text("steps: [unterminated\n", encoding="utf-8")
+
+    report = build_tree(source_tree, tmp_path / "out", options=_OPTIONS)
+
+    by_source = {result.source: result for result in report.results}
+    assert not report.ok
+    assert by_source["broken.flo"].status == "failed"
+    assert by_source["broken.flo"].error
+    assert by_source["linear.flo"].status == "ok"
+    summary = report.to_dict()
+    assert (summary["total"], summary["succeeded"], summary["failed"]) == (4, 3, 1)
+
+
+def test_build_tree_reports_include_cache_lookups(source_tree: Path, tmp_path: Path):
+    report = build_tree(source_tree, tmp_path / "out", options=_OPTIONS)
+
+    by_source = {result.source: result for result in report.results}
+    cookies = by_source["chocolate_chip_cookies.flo"]
+    assert cookies.include_cache_hits + cookies.include_cache_misses >= 3
+    assert by_source["linear.flo"].include_cache_misses == 0
+    totals = report.to_dict()["include_cache"]
+    assert totals["hits"] + totals["misses"] >= 3
+
+
+def test_build_command_prints_summary_and_writes_json_report(
+    source_tree: Path, tmp_path: Path
+):
+    report_path = tmp_path / "report.json"
+
+    result = CliRunner().invoke(
+        cli_mod.cli,
+        [
+            "build",
+            str(source_tree),
+            "--out-dir",
+            str(tmp_path / "out"),
+            "--report",
+            str(report_path),
+            "--layout-engine",
+            "layered",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "nested/rework_loop.flo" in result.output
+    assert "Built 3/3 file(s)" in result.output
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["failed"] == 0
+    assert {entry["status"] for entry in report["results"]} == {"ok"}
+
+
+def test_console_main_routes_build_to_click(
+    source_tree: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+):
+    (source_tree / "broken.flo").write_text("steps: [unterminated\n", encoding="utf-8")
+
+    rc = cli_mod.console_main(
+        [
+            "build",
+            str(source_tree),
+            "-o",
+            str(tmp_path / "out"),
+            "--json",
+            "--layout-engine",
+            "layered",
+        ]
+    )
+
+    assert rc == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["failed"] == 1
+
+
+def _statuses(report) -> dict[str, str]:
+    return {result.source: result.status for result in report.results}
+
+
+def test_manifest_skips_unchanged_sources_and_tracks_includes(
+    source_tree: Path, tmp_path: Path
+):
+    out_root = tmp_path / "out"
+    manifest = BuildManifest(tmp_path / "manifest.json", toolchain="test")
+    build_tree(source_tree, out_root, options=_OPTIONS, manifest=manifest)
+    manifest.save()
+
+    manifest = BuildManifest.load(tmp_path / "manifest.json", toolchain="test")
+    second = build_tree(source_tree, out_root, options=_OPTIONS, manifest=manifest)
+    assert set(_statuses(second).values()) == {"skipped"}
+
+    fragment = source_tree / "chocolate_chip_cookies" / "materials.flo"
+    fragment.write_text(
+        fragment.read_text(encoding="utf-8") + "\n# tweak\n", encoding="utf-8"
+    )
+    third = build_tree(source_tree, out_root, options=_OPTIONS, manifest=manifest)
+    assert _statuses(third) == {
+        "chocolate_chip_cookies.flo": "ok",
+        "linear.flo": "skipped",
+        "nested/rework_loop.flo": "skipped",
+    }
+
+
+def test_config_options_and_missing_outputs_invalidate_entries(
+    source_tree: Path, tmp_path: Path
+):
+    out_root = tmp_path / "out"
+    manifest = BuildManifest(tmp_path / "manifest.json", toolchain="test")
+    build_tree(source_tree, out_root, options=_OPTIONS, manifest=manifest)
+
+    (source_tree / "nested" / "diagrams.toml").write_text("[sppm]\n", encoding="utf-8")
+    (out_root / "linear.svg").unlink()
+    report = build_tree(source_tree, out_root, options=_OPTIONS, manifest=manifest)
+    assert _statuses(report) == {
+        "chocolate_chip_cookies.flo": "skipped",
+        "linear.flo": "ok",
+        "nested/rework_loop.flo": "ok",
+    }
+
+    changed = build_tree(
+        source_tree,
+        out_root,
+        options={**_OPTIONS, "orientation": "tb"},
+        manifest=manifest,
+    )
+    assert set(_statuses(changed).values()) == {"ok"}
+
+
+def test_build_command_writes_depfile_and_skips_on_rerun(
+    source_tree: Path, tmp_path: Path
+):
+    out_root = tmp_path / "out"
+    depfile = tmp_path / "build.d"
+    argv = [
+        "build",
+        str(source_tree),
+        "-o",
+        str(out_root),
+        "--depfile",
+        str(depfile),
+        "--layout-engine",
+        "layered",
+    ]
+
+    first = CliRunner().invoke(cli_mod.cli, argv)
+    second = CliRunner().invoke(cli_mod.cli, argv)
+
+    assert first.exit_code == 0, first.output
+    assert (out_root / MANIFEST_FILENAME).is_file()
+    assert "3 up to date" in second.output
+    rules = depfile.read_text(encoding="utf-8")
+    target = f"{out_root / 'chocolate_chip_cookies.svg'}:"
+    assert target in rules
+    cookie_rule = rules.split(target, 1)[1].split(".svg:", 1)[0]
+    assert "process.flo" in cookie_rule
+    assert "materials.flo" in cookie_rule
+
+
+def test_edit_during_render_is_not_recorded_as_up_to_date(
+    source_tree: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    import flo.core
+
+    out_root = tmp_path / "out"
+    manifest = BuildManifest(tmp_path / "manifest.json", toolchain="test")
+    fragment = source_tree / "chocolate_chip_cookies" / "materials.flo"
+    render = flo.core.run_content
+
+    def render_then_edit(content, **kwargs):
+        result = render(content, **kwargs)
+        if "chocolate_chip_cookies" in kwargs["options"]["source_path"]:
+            fragment.write_text(
+                fragment.read_text(encoding="utf-8") + "\n# mid-render\n",
+                encoding="utf-8",
+            )
+        return result
+
+    monkeypatch.setattr(flo.core, "run_content", render_then_edit)
+    build_tree(source_tree, out_root, options=_OPTIONS, manifest=manifest)
+    monkeypatch.setattr(flo.core, "run_content", render)
+
+    again = build_tree(source_tree, out_root, options=_OPTIONS, manifest=manifest)
+    assert _statuses(again)["chocolate_chip_cookies.flo"] == "ok"
+
+
+def test_depfile_targets_and_inputs_are_absolute(
+    source_tree: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.chdir(tmp_path)
+
+    result = CliRunner().invoke(
+        cli_mod.cli,
+        [
+            "build",
+            "models",
+            "-o",
+            "out",
+            "--depfile",
+            "build.d",
+            "--layout-engine",
+            "layered",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    rules = (tmp_path / "build.d").read_text(encoding="utf-8")
+    paths = [
+        line.strip().rstrip("\\").strip().rstrip(":")
+        for line in rules.splitlines()
+        if line.strip() not in {"", "\\"}
+    ]
+    assert f"{tmp_path.resolve() / 'out' / 'linear.svg'}" in paths
+    assert all(Path(path).is_absolute() for path in paths)
+
+
+def test_malformed_include_directive_is_reported_not_dropped(
+    source_tree: Path, tmp_path: Path
+):
+    (source_tree / "bad_include.flo").write_text("includes: 42\n", encoding="utf-8")
+
+    report = build_tree(source_tree, tmp_path / "out", options=_OPTIONS)
+
+    by_source = {result.source: result for result in report.results}
+    assert by_source["bad_include.flo"].status == "failed"
+    assert "include/includes must be a string" in by_source["bad_include.flo"].error
+
+
+def test_unexpected_render_errors_are_not_swallowed(
+    source_tree: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    import flo.core
+
+    def broken_render(content, **kwargs):
+        raise RuntimeError("renderer bug")
+
+    monkeypatch.setattr(flo.core, "run_content", broken_render)
+
+    with pytest.raises(RuntimeError, match="renderer bug"):
+        build_tree(source_tree, tmp_path / "out", options=_OPTIONS)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import datetime
+from pathlib import Path
+
+import pytest
+
+import flo.core as core
+from flo.adapters import parse_adapter
+from flo.compiler.ir.models import IR, Edge, Node
+from flo.core.ir_cache import IRCache, default_ir_cache
+
+_REFERENCE = Path("examples/reference")
+
+
+def _failing_compile(_adapter_model):
+    raise AssertionError("compile must not run on a cache hit")
+
+
+def test_repeat_parse_is_served_from_cache(monkeypatch: pytest.MonkeyPatch):
+    path = _REFERENCE / "sppm_feature_showcase.flo"
+    content = path.read_text(encoding="utf-8")
+    first = core._parse_compile_validate(content, source_path=str(path))
+
+    monkeypatch.setattr(core, "compile_adapter", _failing_compile)
+    second = core._parse_compile_validate(content, source_path=str(path))
+
+    assert second == first
+    assert second is not first
+
+
+def test_disk_tier_is_shared_between_cache_instances(tmp_path: Path):
+    ir = IR(
+        name="demo",
+        nodes=[Node(id="a", type="task", attrs={"lane": "x"}), Node("b", "end")],
+        edges=[Edge(source="a", target="b", rework=True)],
+    )
+    writer = IRCache(tmp_path, fingerprint="test")
+    key = writer.key_for({"name": "demo"})
+    writer.put(key, ir)
+
+    restored = IRCache(tmp_path, fingerprint="test").get(key)
+
+    assert restored == ir
+    assert restored.process_metadata is None
+    other = IRCache(tmp_path, fingerprint="other")
+    assert other.get(other.key_for({"name": "demo"})) is None
+
+
+def test_key_covers_included_documents(tmp_path: Path):
+    part = tmp_path / "part.yaml"
+    part.write_text("steps:\n  - id: a\n    kind: task\n", encoding="utf-8")
+    source = str(tmp_path / "model.flo")
+    content = "process:\n  id: demo\nincludes: [part.yaml]\n"
+    cache = IRCache(tmp_path / "cache", fingerprint="test")
+
+    before = cache.key_for(parse_adapter(content, source_path=source))
+    part.write_text("steps:\n  - id: b\n    kind: task\n", encoding="utf-8")
+    after = cache.key_for(parse_adapter(content, source_path=source))
+
+    assert before is not None and after is not None
+    assert before != after
+
+
+def test_yaml_scalars_survive_the_round_trip(tmp_path: Path):
+    cache = IRCache(tmp_path, fingerprint="test")
+    assert cache.key_for({"due": datetime.date(2026, 1, 1)}) != cache.key_for(
+        {"due": "2026-01-01"}
+    )
+    attrs = {
+        "outcomes": {True: "ship", False: "rework"},
+        "pair": (1, 2),
+        "due": datetime.date(2026, 1, 1),
+        "\u0000odd": 1,
+    }
+    ir = IR(name="demo", nodes=[Node("a", "decision", attrs=attrs)])
+
+    cache.put("k" * 64, ir)
+    IRCache(tmp_path, fingerprint="test").put("j" * 64, ir)
+
+    assert cache.get("k" * 64) == ir
+    assert IRCache(tmp_path, fingerprint="test").get("j" * 64) == ir
+
+
+def test_unsupported_values_are_not_stored(tmp_path: Path):
+    cache = IRCache(tmp_path, fingerprint="test")
+    ir = IR(name="demo", nodes=[Node("a", "task", attrs={"blob": object()})])
+
+    cache.put("k" * 64, ir)
+
+    assert cache.get("k" * 64) is None
+
+
+@pytest.mark.parametrize("value", ["off", "0", "false"])
+def test_env_toggle_disables_the_cache(monkeypatch: pytest.MonkeyPatch, value: str):
+    monkeypatch.setenv("FLO_IR_CACHE", value)
+
+    assert default_ir_cache() is None
+
+
+def test_cached_ir_renders_identically():
+    path = _REFERENCE / "rework_loop.flo"
+    content = path.read_text(encoding="utf-8")
+    options = {"diagram": "sppm", "layout_engine": "layered", "source_path": str(path)}
+
+    cold = core.run_content(content, command="render", options=options)
+    warm = core.run_content(content, command="render", options=options)
+
+    assert cold == warm
+
+
+def test_fingerprint_covers_the_installed_distribution_version(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    import importlib.metadata
+
+    from flo.core import _version, ir_cache
+
+    versions = {"flo-lang": "1.0.0"}
+    monkeypatch.setattr(importlib.metadata, "version", versions.__getitem__)
+    digests = []
+    for version in ("1.0.0", "1.0.1"):
+        versions["flo-lang"] = version
+        _version.flo_version.cache_clear()
+        ir_cache.ir_cache_fingerprint.cache_clear()
+        assert _version.flo_version() == version
+        digests.append(ir_cache.ir_cache_fingerprint())
+    _version.flo_version.cache_clear()
+    ir_cache.ir_cache_fingerprint.cache_clear()
+
+    assert digests[0] != digests[1]
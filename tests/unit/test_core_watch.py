@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import shutil
+
+import pytest
+
+from flo.core.watch import WatchSession, format_watch_cycle
+from flo.services.io import write_output_atomic
+
+_REFERENCE = Path("examples/reference")
+_OPTIONS = {"layout_engine": "layered"}
+
+
+def _edit(path: Path, text: str) -> None:
+    # Bump mtime explicitly so equal-sized rewrites within one tick still count.
+    previous = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(text, encoding="utf-8")
+    stamp = max(previous + 1_000_000_000, path.stat().st_mtime_ns)
+    os.utime(path, ns=(stamp, stamp))
+
+
+@pytest.fixture
+def session(tmp_path: Path) -> WatchSession:
+    source = tmp_path / "linear.flo"
+    shutil.copy(_REFERENCE / "linear.flo", source)
+    watch = WatchSession(source, tmp_path / "linear.svg", options=_OPTIONS)
+    watch.poll()
+    return watch
+
+
+def test_first_rebuild_runs_every_stage_and_writes_svg(session: WatchSession):
+    cycle = session.rebuild()
+
+    assert cycle.ok, cycle.error
+    assert cycle.written
+    assert list(cycle.stages) == ["parse", "compile", "options", "render", "write"]
+    assert session.output.read_text(encoding="utf-8").startswith("<svg")
+    assert session.poll() == ()
+    assert not list(session.output.parent.glob(".linear.svg.*"))
+
+
+def test_comment_only_edit_reuses_ir_and_skips_render(session: WatchSession):
+    session.rebuild()
+    before = session.output.read_text(encoding="utf-8")
+    _edit(session.source, session.source.read_text() + "# trailing comment\n")
+
+    changed = session.poll()
+    cycle = session.rebuild(changed)
+
+    assert changed == (session.source,)
+    assert cycle.ok, cycle.error
+    assert list(cycle.stages) == ["parse"]
+    assert cycle.reused == ("compile", "options", "render", "write")
+    assert not cycle.written
+    assert session.output.read_text(encoding="utf-8") == before
+    assert format_watch_cycle(cycle).startswith("same")
+
+
+def test_label_edit_recompiles_and_rewrites_output(session: WatchSession):
+    session.rebuild()
+    _edit(
+        session.source,
+        session.source.read_text().replace("Verify Documents", "Check Paperwork"),
+    )
+
+    cycle = session.rebuild(session.poll())
+
+    assert cycle.ok, cycle.error
+    assert cycle.written
+    assert {"parse", "compile", "render", "write"} <= set(cycle.stages)
+    assert "Check Paperwork" in session.output.read_text(encoding="utf-8")
+    line = format_watch_cycle(cycle)
+    assert line.startswith("ok")
+    assert "compile" in line and "linear.flo" in line
+
+
+def test_diagrams_toml_change_reuses_parse_and_compile(session: WatchSession):
+    session.rebuild()
+    config = session.source.parent / "diagrams.toml"
+    _edit(config, "[sppm]\nlayout_spacing = 'compact'\n")
+
+    changed = session.poll()
+    cycle = session.rebuild(changed)
+
+    assert changed == (config,)
+    assert cycle.ok, cycle.error
+    assert cycle.reused[:2] == ("parse", "compile")
+    assert "options" in cycle.stages
+
+
+def test_include_edits_are_watched(tmp_path: Path):
+    root = tmp_path / "models"
+    root.mkdir()
+    shutil.copy(
+        _REFERENCE / "chocolate_chip_cookies.flo", root / "chocolate_chip_cookies.flo"
+    )
+    shutil.copytree(
+        _REFERENCE / "chocolate_chip_cookies", root / "chocolate_chip_cookies"
+    )
+    watch = WatchSession(
+        root / "chocolate_chip_cookies.flo", tmp_path / "out.svg", options=_OPTIONS
+    )
+    assert watch.rebuild().ok
+    include = (root / "chocolate_chip_cookies" / "process.flo").resolve()
+    assert include in watch.watched_paths()
+    assert watch.poll() == ()
+
+    _edit(include, include.read_text() + "\n# note\n")
+    changed = watch.poll()
+    cycle = watch.rebuild(changed)
+
+    assert changed == (include,)
+    assert cycle.changed == ("process.flo",)
+    assert "parse" in cycle.stages
+
+
+def test_failed_rebuild_keeps_output_and_recovers(session: WatchSession):
+    session.rebuild()
+    good = session.source.read_text()
+    before = session.output.read_text(encoding="utf-8")
+    _edit(session.source, "steps: [unterminated\n")
+
+    failed = session.rebuild(session.poll())
+
+    assert not failed.ok
+    assert format_watch_cycle(failed).startswith("FAIL")
+    assert session.output.read_text(encoding="utf-8") == before
+
+    _edit(session.source, good)
+    recovered = session.rebuild(session.poll())
+
+    assert recovered.ok, recovered.error
+    assert "compile" in recovered.reused
+    assert not recovered.written
+
+
+def test_run_debounces_a_burst_of_edits_into_one_rebuild(session: WatchSession):
+    cycles = []
+    text = session.source.read_text()
+    edits = iter(
+        [
+            text.replace("Verify Documents", "Verify A"),
+            text.replace("Verify Documents", "Verify AB"),
+            text.replace("Verify Documents", "Verify ABC"),
+        ]
+    )
+    ticks = []
+
+    def fake_sleep(seconds: float) -> None:
+        ticks.append(seconds)
+        edit = next(edits, None)
+        if edit is not None:
+            _edit(session.source, edit)
+
+    session.run(
+        on_cycle=cycles.append,
+        interval=1.0,
+        debounce=0.5,
+        should_stop=lambda: len(cycles) >= 2,
+        sleep=fake_sleep,
+    )
+
+    assert [cycle.ok for cycle in cycles] == [True, True]
+    assert ticks == [1.0, 0.5, 0.5, 0.5]
+    assert "Verify ABC" in session.output.read_text(encoding="utf-8")
+
+
+def test_write_output_atomic_replaces_file_and_keeps_mode(tmp_path: Path):
+    target = tmp_path / "out.svg"
+    target.write_text("old", encoding="utf-8")
+    target.chmod(0o640)
+
+    rc, err = write_output_atomic("new", str(target))
+
+    assert (rc, err) == (0, "")
+    assert target.read_text(encoding="utf-8") == "new"
+    assert target.stat().st_mode & 0o777 == 0o640
+    assert [path.name for path in tmp_path.iterdir()] == ["out.svg"]
+
+
+def test_write_output_atomic_reports_missing_directory(tmp_path: Path):
+    rc, err = write_output_atomic("x", str(tmp_path / "missing" / "out.svg"))
+
+    assert rc != 0
+    assert "I/O error writing" in err
@@ -209,3 +209,30 @@ def test_export_ir_movement_mode_prefers_canonical_relations():
     assert "items=dough" in out
     assert "Inferred People Movement" in out
     assert "workers=baker" in out
+
+
+def test_export_ir_transitions_mode_aligns_the_trace_from_options(tmp_path):
+    from flo.adapters.trace import TraceEvent, parse_rfc3339_us, write_trace_store
+
+    ir = IR(
+        name="p",
+        nodes=[Node(id="a", type="task"), Node(id="b", type="task")],
+        edges=[Edge(source="a", target="b")],
+    )
+    events = [
+        TraceEvent(f"e{n}", "p", "c1", key, ts, parse_rfc3339_us(ts), "complete", "1")
+        for n, key in enumerate(["a", "b", "a"])
+        for ts in [f"2026-08-09T15:00:0{n}Z"]
+    ]
+    store = write_trace_store(events, tmp_path / "t.flotrace")
+
+    out = export_ir(ir, options={"export": "transitions", "trace": str(store)})
+
+    payload = json.loads(out)
+    assert payload["alignment"]["resolved_events"] == 3
+    assert payload["transitions"]["edges"] == [
+        {"source": "a", "target": "b", "count": 1}
+    ]
+    assert payload["transitions"]["unmodeled_transitions"] == [
+        {"source": "b", "target": "a", "count": 1}
+    ]
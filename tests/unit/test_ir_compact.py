@@ -0,0 +1,72 @@
+import copy
+import pickle
+from pathlib import Path
+
+import pytest
+
+import flo.core as core
+from flo.compiler.ir import compact_ir, validate_ir
+from flo.compiler.ir.compact import EMPTY_ATTRS
+from flo.compiler.ir.models import IR, Edge, Node
+
+_REFERENCE = Path("examples/reference")
+
+
+def _ir() -> IR:
+    return IR(
+        name="p",
+        nodes=[
+            Node(id="start", type="start"),
+            Node(id="work", type="task", attrs={"lane": "ops", "metadata": {}}),
+            Node(id="end", type="end"),
+        ],
+        edges=[
+            Edge(source="start", target="work", metadata={}),
+            Edge(source="work", target="end", label="done"),
+        ],
+    )
+
+
+def test_models_are_slotted_and_intern_identifiers():
+    ir = _ir()
+
+    assert not hasattr(ir.nodes[0], "__dict__")
+    assert not hasattr(ir.edges[0], "__dict__")
+    assert ir.edges[0].target is ir.nodes[1].id
+
+
+def test_compact_ir_shares_empty_attrs_and_interns_strings():
+    ir = compact_ir(_ir())
+    other = compact_ir(_ir())
+
+    assert ir.nodes[0].attrs is EMPTY_ATTRS and ir.nodes[2].attrs is EMPTY_ATTRS
+    assert ir.nodes[1].attrs["lane"] is other.nodes[1].attrs["lane"]
+    assert ir.edges[0].metadata is None
+    validate_ir(ir)
+
+
+def test_shared_empty_attrs_are_read_only_but_copyable():
+    ir = compact_ir(_ir())
+
+    with pytest.raises(TypeError):
+        ir.nodes[0].attrs["lane"] = "ops"
+    with pytest.raises(TypeError):
+        ir.nodes[0].attrs.update(lane="ops")
+
+    assert copy.deepcopy(ir).nodes[0].attrs == {}
+    restored = pickle.loads(pickle.dumps(ir))
+    restored.nodes[0].attrs["lane"] = "ops"
+    assert EMPTY_ATTRS == {}
+
+
+def test_compact_mode_renders_identically(monkeypatch):
+    path = _REFERENCE / "rework_loop.flo"
+    content = path.read_text(encoding="utf-8")
+    options = {"diagram": "sppm", "layout_engine": "layered", "source_path": str(path)}
+    monkeypatch.setenv("FLO_IR_CACHE", "off")
+
+    default = core.run_content(content, command="render", options=options)
+    monkeypatch.setenv("FLO_IR_COMPACT", "on")
+    compact = core.run_content(content, command="render", options=options)
+
+    assert compact == default
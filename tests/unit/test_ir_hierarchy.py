@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import pytest
+
+from flo.compiler.ir import IR, Node, validate_ir
+from flo.compiler.ir.hierarchy import SubprocessHierarchy, subprocess_hierarchy
+from flo.compiler.ir.index import ir_index
+from flo.errors import ValidationError
+from flo.render._sppm_projection import project_sppm_subprocess_view
+from flo.render.options import RenderOptions
+
+
+def _hierarchy() -> SubprocessHierarchy:
+    return SubprocessHierarchy(
+        [
+            ("start", None),
+            ("outer", None),
+            ("inner", "outer"),
+            ("leaf_a", "inner"),
+            ("leaf_b", "outer"),
+            ("orphan", "missing"),
+            ("end", None),
+        ]
+    )
+
+
+def test_hierarchy_maps_parents_children_and_depth():
+    hierarchy = _hierarchy()
+
+    assert hierarchy.parent("inner") == "outer"
+    assert hierarchy.parent("orphan") == "missing"
+    assert hierarchy.children("outer") == ("inner", "leaf_b")
+    assert hierarchy.children("leaf_a") == ()
+    assert [hierarchy.depth(n) for n in ("outer", "inner", "leaf_a", "orphan")] == [
+        0,
+        1,
+        2,
+        0,
+    ]
+    assert hierarchy.nested_ids() == ("inner", "leaf_a", "leaf_b", "orphan")
+    assert not hierarchy.has_cycles
+
+
+def test_hierarchy_interval_index_answers_descendant_queries():
+    hierarchy = _hierarchy()
+
+    assert hierarchy.descendants("outer") == ("inner", "leaf_a", "leaf_b")
+    assert hierarchy.descendants("inner") == ("leaf_a",)
+    assert hierarchy.descendants("leaf_b") == ()
+    assert hierarchy.descendants("unknown") == ()
+    assert hierarchy.is_descendant("leaf_a", "outer")
+    assert not hierarchy.is_descendant("outer", "outer")
+    assert not hierarchy.is_descendant("leaf_b", "inner")
+    assert not hierarchy.is_descendant("end", "outer")
+
+
+def test_hierarchy_flags_loops_and_chains_that_enter_them():
+    hierarchy = SubprocessHierarchy(
+        [("feeder", "a"), ("a", "b"), ("b", "a"), ("self", "self"), ("ok", None)]
+    )
+
+    assert hierarchy.cyclic_ids == ("feeder", "a", "b", "self")
+    assert hierarchy.depth("a") is None
+    assert hierarchy.descendants("a") == ()
+    assert hierarchy.depth("ok") == 0
+
+
+def test_hierarchy_handles_deep_nesting_without_recursion():
+    depth = 50_000
+    pairs = [("s0", None)] + [(f"s{i}", f"s{i - 1}") for i in range(1, depth)]
+
+    hierarchy = SubprocessHierarchy(reversed(pairs))
+
+    assert hierarchy.depth(f"s{depth - 1}") == depth - 1
+    assert len(hierarchy.descendants("s0")) == depth - 1
+    assert hierarchy.is_descendant(f"s{depth - 1}", "s1")
+
+
+def test_subprocess_hierarchy_is_memoized_on_the_ir_index():
+    ir = IR(
+        name="p",
+        nodes=[
+            Node(id="sub", type="subprocess"),
+            Node(id="child", type="task", attrs={"subprocess_parent": " sub "}),
+        ],
+    )
+    index = ir_index(ir)
+
+    hierarchy = subprocess_hierarchy(index)
+
+    assert hierarchy is subprocess_hierarchy(index)
+    assert hierarchy.descendants("sub") == ("child",)
+
+
+def test_validate_reports_first_node_of_a_cycle_in_deep_models():
+    nodes = [Node(id="start", type="start")]
+    nodes += [
+        Node(
+            id=f"sp{i}",
+            type="subprocess",
+            attrs={"subprocess_parent": f"sp{(i + 1) % 3000}"},
+        )
+        for i in range(3000)
+    ]
+
+    with pytest.raises(ValidationError, match="E1334: node 'sp0'"):
+        validate_ir(IR(name="deep", nodes=nodes))
+
+
+def test_child_map_projection_keeps_nested_subtree():
+    nodes = [
+        {"id": "start", "kind": "start"},
+        {"id": "outer", "kind": "subprocess"},
+        {"id": "inner", "kind": "subprocess", "subprocess_parent": "outer"},
+        {"id": "leaf", "kind": "task", "subprocess_parent": "inner"},
+        {"id": "end", "kind": "end"},
+    ]
+    edges = [
+        {"source": "start", "target": "outer"},
+        {"source": "inner", "target": "leaf"},
+        {"source": "outer", "target": "end"},
+    ]
+    options = RenderOptions(
+        diagram="sppm", sppm_projection="child_map", sppm_focus_subprocess="outer"
+    )
+
+    projected, _, context = project_sppm_subprocess_view(nodes, edges, options=options)
+
+    assert [node["id"] for node in projected] == [
+        "start",
+        "outer",
+        "inner",
+        "leaf",
+        "end",
+    ]
+    assert context.effective_mode == "child_map"
+    assert context.entry_context == ("start",)
+    assert context.exit_context == ("end",)
@@ -0,0 +1,91 @@
+from flo.compiler.ir import validate_ir
+from flo.compiler.ir.index import IRIndex, invalidate_ir_index, ir_index
+from flo.compiler.ir.models import IR, Edge, Node
+from flo.render.layout_core.elk_support import extract_nodes_and_edges
+
+
+def _ir() -> IR:
+    return IR(
+        name="p",
+        nodes=[
+            Node(id="start", type="start", attrs={"lane": "ops"}),
+            Node(id="sub", type="subprocess", attrs={"lane": "ops"}),
+            Node(id="child", type="task", attrs={"subprocess_parent": " sub "}),
+            Node(id="end", type="End", attrs={"lane": "qa"}),
+        ],
+        edges=[
+            Edge(source="start", target="sub"),
+            Edge(source="sub", target="child"),
+            Edge(source="child", target="end"),
+            Edge(source="child", target="sub"),
+            Edge(source="child", target="ghost"),
+        ],
+    )
+
+
+def test_index_builds_csr_adjacency_degrees_and_buckets():
+    index = IRIndex(_ir())
+    child = index.positions["child"]
+    sub = index.positions["sub"]
+
+    assert list(index.successors(child)) == [index.positions["end"], sub]
+    assert list(index.predecessors(sub)) == [index.positions["start"], child]
+    assert (index.in_degree(sub), index.out_degree(child)) == (2, 2)
+    assert index.unresolved_edges == (4,)
+    assert index.ids_of_type("end") == ["end"]
+    assert index.lane_members == {"ops": (0, 1), "qa": (3,)}
+    assert index.subprocess_children == {"sub": (child,)}
+    assert index.subprocess_parents[child] == "sub"
+    assert list(index.reachable([sub], reverse=True)) == [1, 1, 1, 0]
+
+
+def test_ir_index_is_cached_until_nodes_or_edges_change():
+    ir = _ir()
+    first = ir_index(ir)
+
+    assert ir_index(ir) is first
+
+    ir.edges.append(Edge(source="start", target="end"))
+    second = ir_index(ir)
+    assert second is not first and second.out_degree(0) == 2
+
+    ir.nodes = list(ir.nodes)
+    assert ir_index(ir) is not second
+
+    third = ir_index(ir)
+    invalidate_ir_index(ir)
+    assert ir_index(ir) is not third
+
+
+def test_reassigning_same_length_node_lists_rebuilds_the_index():
+    ir = _ir()
+    ir.nodes = [Node(id=f"a{position}", type="task") for position in range(4)]
+    ir_index(ir)
+
+    # Freeing the indexed list lets CPython hand its id to the next list.
+    ir.nodes = [Node(id=f"b{position}", type="task") for position in range(4)]
+    ir.nodes = [Node(id=f"c{position}", type="task") for position in range(4)]
+
+    assert ir_index(ir).node_ids == ("c0", "c1", "c2", "c3")
+
+
+def test_validation_and_render_extraction_share_one_index(monkeypatch):
+    builds: list[int] = []
+    original_init = IRIndex.__init__
+
+    def counting_init(self, ir):
+        builds.append(1)
+        original_init(self, ir)
+
+    monkeypatch.setattr(IRIndex, "__init__", counting_init)
+    ir = _ir()
+    ir.edges.pop()
+
+    validate_ir(ir)
+    nodes, edges = extract_nodes_and_edges(ir)
+    nodes[0]["lane"] = "changed"
+    again, _ = extract_nodes_and_edges(ir)
+
+    assert len(builds) == 1
+    assert again[0]["lane"] == "ops"
+    assert [edge["target"] for edge in edges] == ["sub", "child", "end", "sub"]
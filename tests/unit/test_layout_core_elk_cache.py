@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from click.testing import CliRunner
+import pytest
+
+from flo.core import cli as cli_mod
+from flo.render.layout_core.elk_cache import (
+    CachingElkEngine,
+    ElkLayoutCache,
+    cached_elk_engine,
+    default_elk_layout_cache,
+    elk_layout_cache_enabled,
+)
+from flo.render.options import RenderOptions
+
+
+def _counting_engine(calls: list[dict]):
+    def _engine(payload: dict) -> dict:
+        calls.append(payload)
+        return {"id": payload["id"], "width": 10, "height": 20, "children": []}
+
+    return _engine
+
+
+def test_key_is_stable_across_key_order_and_sensitive_to_fingerprint(tmp_path: Path):
+    cache = ElkLayoutCache(tmp_path, fingerprint="a")
+
+    assert cache.key_for({"id": "root", "x": 1}) == cache.key_for(
+        {"x": 1, "id": "root"}
+    )
+    assert cache.key_for({"id": "root"}) != cache.key_for({"id": "other"})
+    assert cache.key_for({"id": "root"}) != ElkLayoutCache(
+        tmp_path, fingerprint="b"
+    ).key_for({"id": "root"})
+
+
+def test_caching_engine_serves_repeat_payloads_from_cache(tmp_path: Path):
+    calls: list[dict] = []
+    cache = ElkLayoutCache(tmp_path, fingerprint="test")
+
+    first = CachingElkEngine(_counting_engine(calls), cache)
+    second = CachingElkEngine(_counting_engine(calls), cache)
+    first_response = first({"id": "root"})
+    second_response = second({"id": "root"})
+
+    assert len(calls) == 1
+    assert first_response == second_response
+    assert (first.lookup, second.lookup) == ("miss", "hit")
+    assert second.metadata() == {"status": "hit", "hits": 1, "misses": 1}
+
+
+def test_disk_tier_survives_a_fresh_process_cache(tmp_path: Path):
+    calls: list[dict] = []
+    CachingElkEngine(
+        _counting_engine(calls), ElkLayoutCache(tmp_path, fingerprint="test")
+    )({"id": "root"})
+
+    reloaded = ElkLayoutCache(tmp_path, fingerprint="test")
+    engine = CachingElkEngine(_counting_engine(calls), reloaded)
+    engine({"id": "root"})
+
+    assert len(calls) == 1
+    assert reloaded.stats.disk_hits == 1
+
+
+def test_cached_responses_are_independent_copies(tmp_path: Path):
+    cache = ElkLayoutCache(tmp_path, fingerprint="test")
+    key = cache.key_for({"id": "root"})
+    cache.put(key, {"id": "root", "children": []})
+
+    cache.get(key)["children"].append("mutated")
+
+    assert cache.get(key) == {"id": "root", "children": []}
+
+
+def test_disk_tier_evicts_least_recently_used_entries(tmp_path: Path):
+    cache = ElkLayoutCache(tmp_path, max_bytes=250, memory_entries=0, fingerprint="t")
+    keys = [cache.key_for({"id": f"g{index}"}) for index in range(3)]
+    for index, key in enumerate(keys[:2]):
+        cache.put(key, {"id": f"g{index}", "pad": "x" * 80})
+        path = tmp_path / key[:2] / f"{key}.json"
+        os.utime(path, (1_000 + index, 1_000 + index))
+    assert cache.get(keys[0]) is not None  # refreshes g0's recency
+
+    cache.put(keys[2], {"id": "g2", "pad": "x" * 80})
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+    assert cache.stats.evictions == 1
+    assert cache.usage()[1] <= 250
+
+
+def test_replacing_an_entry_does_not_inflate_tracked_disk_usage(tmp_path: Path):
+    cache = ElkLayoutCache(tmp_path, memory_entries=0, fingerprint="test")
+    key = cache.key_for({"id": "root"})
+    cache.put(cache.key_for({"id": "other"}), {"id": "other"})
+
+    for pad in ("x" * 40, "x" * 10, "x" * 10):
+        cache.put(key, {"id": "root", "pad": pad})
+
+    assert cache._disk_bytes == cache._scan_usage()[1]
+
+
+def test_corrupt_disk_entries_degrade_to_misses(tmp_path: Path):
+    cache = ElkLayoutCache(tmp_path, memory_entries=0, fingerprint="test")
+    key = cache.key_for({"id": "root"})
+    path = tmp_path / key[:2] / f"{key}.json"
+    path.parent.mkdir(parents=True)
+    path.write_text("{not json", encoding="utf-8")
+
+    assert cache.get(key) is None
+    assert not path.exists()
+    assert cache.stats.misses == 1
+
+
+def test_clear_removes_all_entries(tmp_path: Path):
+    cache = ElkLayoutCache(tmp_path, fingerprint="test")
+    for index in range(3):
+        cache.put(cache.key_for({"id": str(index)}), {"id": str(index)})
+
+    assert cache.clear() == 3
+    assert cache.usage() == (0, 0)
+    assert cache.get(cache.key_for({"id": "0"})) is None
+
+
+@pytest.mark.parametrize("value", ["off", "0", "false", "NO"])
+def test_env_opt_out_disables_cache(monkeypatch: pytest.MonkeyPatch, value: str):
+    monkeypatch.setenv("FLO_ELK_CACHE", value)
+    calls: list[dict] = []
+
+    engine = cached_elk_engine(_counting_engine(calls))
+    engine({"id": "root"})
+    engine({"id": "root"})
+
+    assert not elk_layout_cache_enabled()
+    assert len(calls) == 2
+    assert engine.metadata() == {"status": "disabled"}
+
+
+def test_render_option_opt_out_disables_cache():
+    options = RenderOptions.from_mapping({"no_layout_cache": True})
+
+    assert RenderOptions().layout_cache is True
+    assert options.layout_cache is False
+    assert cached_elk_engine(lambda payload: payload, enabled=False).cache is None
+
+
+def test_default_cache_honors_directory_override(isolated_elk_layout_cache: Path):
+    cache = default_elk_layout_cache()
+
+    assert cache.directory == isolated_elk_layout_cache
+    assert cached_elk_engine(lambda payload: payload).cache is cache
+
+
+def test_cache_cli_reports_stats_and_clears_entries(isolated_elk_layout_cache: Path):
+    cache = default_elk_layout_cache()
+    cache.put(cache.key_for({"id": "root"}), {"id": "root"})
+    runner = CliRunner()
+
+    stats = runner.invoke(cli_mod.cli, ["cache", "stats", "--json"])
+    cleared = runner.invoke(cli_mod.cli, ["cache", "clear"])
+
+    assert stats.exit_code == 0
+    assert '"entries": 1' in stats.output
+    assert str(isolated_elk_layout_cache) in stats.output
+    assert cleared.exit_code == 0
+    assert "Removed 1 cached layout(s)" in cleared.output
+    assert cache.usage() == (0, 0)
+
+
+def test_console_main_routes_cache_command(capsys: pytest.CaptureFixture[str]):
+    assert cli_mod.console_main(["cache", "stats"]) == 0
+    assert "entries:" in capsys.readouterr().out
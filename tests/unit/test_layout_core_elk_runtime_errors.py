@@ -131,3 +131,27 @@ def test_run_elkjs_layout_returns_decoded_object_on_success(
 
     assert result["id"] == "flo:ok"
     assert result["children"] == []
+
+
+def test_run_elkjs_layout_skips_installed_engine_for_explicit_timeout(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    calls: list[float] = []
+    monkeypatch.setattr(elk_runtime.shutil, "which", lambda _cmd: "/usr/bin/node")
+    monkeypatch.setattr(elk_runtime.Path, "exists", lambda _self: True)
+
+    def _run(*_args, timeout, **_kwargs):
+        calls.append(timeout)
+        return SimpleNamespace(returncode=0, stdout='{"id": "one-shot"}', stderr="")
+
+    monkeypatch.setattr(elk_runtime.subprocess, "run", _run)
+
+    with elk_runtime.use_elk_engine(lambda payload: {"id": "engine"}):
+        assert elk_runtime.run_elkjs_layout({"id": "root"})["id"] == "engine"
+        result = elk_runtime.run_elkjs_layout({"id": "root"}, timeout_seconds=5)
+        explicit_default = elk_runtime.run_elkjs_layout(
+            {"id": "root"}, node_command="node"
+        )
+
+    assert result["id"] == explicit_default["id"] == "one-shot"
+    assert calls == [5, 10.0]
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from pathlib import Path
+import shutil
+import threading
+
+import pytest
+
+from flo.render.layout_core import elk_runtime
+from flo.render.layout_core.elk_errors import (
+    ElkEngineSubprocessError,
+    ElkEngineTimeoutError,
+    ElkRuntimeUnavailableError,
+)
+from flo.render.layout_core.elk_worker import ElkWorker
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("node") is None, reason="Node.js is required for ELK worker tests"
+)
+
+_FAKE_SERVE_SCRIPT = """
+import readline from 'node:readline';
+
+const lines = readline.createInterface({ input: process.stdin, terminal: false });
+process.stdout.write(JSON.stringify({ ready: true }) + '\\n');
+for await (const line of lines) {
+  const message = JSON.parse(line);
+  const graph = message.graph;
+  if (graph.id === 'crash') {
+    process.stderr.write('simulated crash');
+    process.exit(3);
+  }
+  if (graph.id === 'hang') {
+    continue;
+  }
+  if (graph.id === 'fail') {
+    process.stdout.write(JSON.stringify({ id: message.id, error: 'bad graph' }) + '\\n');
+    continue;
+  }
+  const result = { id: graph.id, pid: process.pid, width: 10, height: 20 };
+  process.stdout.write(JSON.stringify({ id: message.id, result }) + '\\n');
+}
+"""
+
+_FAKE_BROKEN_SCRIPT = """
+process.stderr.write('Unable to resolve elkjs runtime.');
+process.exit(1);
+"""
+
+
+@pytest.fixture
+def serve_script(tmp_path: Path) -> Path:
+    path = tmp_path / "fake_elk_runtime.mjs"
+    path.write_text(_FAKE_SERVE_SCRIPT, encoding="utf-8")
+    return path
+
+
+def test_elk_worker_reuses_one_process_across_requests(serve_script: Path):
+    with ElkWorker(script_path=serve_script) as worker:
+        first = worker({"id": "a"})
+        second = worker({"id": "b"})
+
+    assert first["id"] == "a"
+    assert second["id"] == "b"
+    assert first["pid"] == second["pid"]
+    assert worker.restart_count == 0
+
+
+def test_elk_worker_matches_concurrent_responses_by_request_id(serve_script: Path):
+    results: dict[str, dict] = {}
+
+    with ElkWorker(script_path=serve_script) as worker:
+
+        def _layout(graph_id: str) -> None:
+            results[graph_id] = worker({"id": graph_id})
+
+        threads = [
+            threading.Thread(target=_layout, args=(f"g{index}",)) for index in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert {graph_id: result["id"] for graph_id, result in results.items()} == {
+        f"g{index}": f"g{index}" for index in range(8)
+    }
+
+
+def test_elk_worker_surfaces_layout_errors_without_restarting(serve_script: Path):
+    with ElkWorker(script_path=serve_script) as worker:
+        with pytest.raises(ElkEngineSubprocessError, match="bad graph"):
+            worker({"id": "fail"})
+        assert worker({"id": "ok"})["id"] == "ok"
+
+    assert worker.restart_count == 0
+
+
+def test_elk_worker_restarts_after_crash(serve_script: Path):
+    with ElkWorker(script_path=serve_script) as worker:
+        before = worker({"id": "a"})["pid"]
+        with pytest.raises(ElkEngineSubprocessError, match="code 3: simulated crash"):
+            worker({"id": "crash"})
+        after = worker({"id": "b"})["pid"]
+
+    assert before != after
+    assert worker.restart_count == 1
+
+
+def test_elk_worker_times_out_and_replaces_stuck_process(serve_script: Path):
+    with ElkWorker(script_path=serve_script, timeout_seconds=0.5) as worker:
+        before = worker({"id": "a"})["pid"]
+        with pytest.raises(ElkEngineTimeoutError, match="timed out after 0.5s"):
+            worker({"id": "hang"})
+        after = worker({"id": "b"})["pid"]
+
+    assert before != after
+
+
+def test_elk_worker_reports_startup_failure(tmp_path: Path):
+    script = tmp_path / "broken.mjs"
+    script.write_text(_FAKE_BROKEN_SCRIPT, encoding="utf-8")
+
+    worker = ElkWorker(script_path=script)
+    with pytest.raises(ElkEngineSubprocessError, match="code 1: Unable to resolve"):
+        worker({"id": "root"})
+
+
+def test_elk_worker_rejects_requests_after_close(serve_script: Path):
+    worker = ElkWorker(script_path=serve_script)
+    worker.start()
+    assert worker.is_alive
+    worker.close()
+
+    assert not worker.is_alive
+    with pytest.raises(ElkRuntimeUnavailableError, match="closed"):
+        worker({"id": "root"})
+
+
+def test_elk_worker_raises_when_node_binary_missing(
+    monkeypatch: pytest.MonkeyPatch, serve_script: Path
+):
+    monkeypatch.setattr(
+        "flo.render.layout_core.elk_worker.shutil.which", lambda _: None
+    )
+
+    with pytest.raises(ElkRuntimeUnavailableError, match="not found"):
+        ElkWorker(script_path=serve_script)({"id": "root"})
+
+
+def test_run_elkjs_layout_delegates_to_installed_engine(serve_script: Path):
+    with (
+        ElkWorker(script_path=serve_script) as worker,
+        elk_runtime.use_elk_engine(worker),
+    ):
+        response = elk_runtime.run_elkjs_layout({"id": "routed"})
+
+    assert response["id"] == "routed"
+    assert elk_runtime.install_elk_engine(None) is None
+
+
+def test_elk_runtime_script_serve_mode_answers_line_delimited_requests(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    stub = tmp_path / "elk_stub.mjs"
+    stub.write_text(
+        "export default class { async layout(graph) { return { ...graph, width: 5 }; } }",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("FLO_ELKJS_PATH", str(stub))
+
+    with ElkWorker() as worker:
+        first = worker({"id": "first", "children": []})
+        second = worker({"id": "second", "children": []})
+
+    assert first["id"] == "first"
+    assert second["id"] == "second"
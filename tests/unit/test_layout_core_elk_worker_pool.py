@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from pathlib import Path
+import shutil
+import threading
+import time
+
+import pytest
+
+from flo.render.layout_core import elk_runtime
+from flo.render.layout_core.elk_errors import (
+    ElkEngineSubprocessError,
+    ElkEngineTimeoutError,
+    ElkRuntimeUnavailableError,
+)
+from flo.render.layout_core.elk_worker_pool import ElkWorkerPool
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("node") is None, reason="Node.js is required for ELK pool tests"
+)
+
+_FAKE_SERVE_SCRIPT = """
+import readline from 'node:readline';
+
+const lines = readline.createInterface({ input: process.stdin, terminal: false });
+process.stdout.write(JSON.stringify({ ready: true }) + '\\n');
+for await (const line of lines) {
+  const message = JSON.parse(line);
+  const graph = message.graph;
+  if (graph.id === 'fail') {
+    process.stdout.write(JSON.stringify({ id: message.id, error: 'bad graph' }) + '\\n');
+    continue;
+  }
+  if (graph.id.startsWith('slow')) {
+    await new Promise((resolve) => setTimeout(resolve, 300));
+  }
+  const result = { id: graph.id, pid: process.pid };
+  process.stdout.write(JSON.stringify({ id: message.id, result }) + '\\n');
+}
+"""
+
+
+@pytest.fixture
+def serve_script(tmp_path: Path) -> Path:
+    path = tmp_path / "fake_elk_runtime.mjs"
+    path.write_text(_FAKE_SERVE_SCRIPT, encoding="utf-8")
+    return path
+
+
+def _submit_all(pool: ElkWorkerPool, graph_ids: list[str]) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+
+    def _layout(graph_id: str) -> None:
+        results[graph_id] = pool({"id": graph_id})
+
+    threads = [threading.Thread(target=_layout, args=(gid,)) for gid in graph_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_pool_spreads_concurrent_layouts_across_workers(serve_script: Path):
+    with ElkWorkerPool(size=2, script_path=serve_script) as pool:
+        results = _submit_all(pool, [f"slow{index}" for index in range(4)])
+        stats = pool.stats()
+
+    assert {gid: result["id"] for gid, result in results.items()} == {
+        f"slow{index}": f"slow{index}" for index in range(4)
+    }
+    assert len({result["pid"] for result in results.values()}) == 2
+    assert stats["submitted"] == 4
+    assert stats["completed"] == 4
+    assert [worker["completed"] for worker in stats["workers"]] == [2, 2]
+
+
+def test_pool_surfaces_worker_errors_to_the_submitting_caller(serve_script: Path):
+    with ElkWorkerPool(size=1, script_path=serve_script) as pool:
+        with pytest.raises(ElkEngineSubprocessError, match="bad graph"):
+            pool({"id": "fail"})
+        assert pool({"id": "ok"})["id"] == "ok"
+        assert pool.stats()["failed"] == 1
+
+
+def test_pool_applies_back_pressure_when_queue_is_full(serve_script: Path):
+    with ElkWorkerPool(
+        size=1, max_pending=1, submit_timeout_seconds=0.1, script_path=serve_script
+    ) as pool:
+        background = [
+            threading.Thread(target=pool, args=({"id": f"slow{index}"},))
+            for index in range(2)
+        ]
+        for thread in background:
+            thread.start()
+            time.sleep(0.05)
+
+        with pytest.raises(ElkEngineTimeoutError, match="queue stayed full"):
+            pool({"id": "overflow"})
+        for thread in background:
+            thread.join()
+
+
+def test_pool_health_check_restarts_dead_workers(serve_script: Path):
+    with ElkWorkerPool(
+        size=1, health_check_interval_seconds=0.1, script_path=serve_script
+    ) as pool:
+        before = pool({"id": "a"})["pid"]
+        process = pool._slots[0].worker._process
+        assert process is not None
+        process.kill()
+        process.wait()
+
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline and not pool.stats()["workers"][0]["alive"]:
+            time.sleep(0.05)
+
+        assert pool.stats()["workers"][0]["alive"]
+        assert pool({"id": "b"})["pid"] != before
+        assert pool.stats()["workers"][0]["restarts"] >= 1
+
+
+def test_pool_rejects_requests_after_close(serve_script: Path):
+    pool = ElkWorkerPool(size=1, script_path=serve_script)
+    pool.start()
+    pool.close()
+
+    with pytest.raises(ElkRuntimeUnavailableError, match="closed"):
+        pool({"id": "root"})
+
+
+def test_run_elkjs_layout_uses_shared_pool_when_requested(
+    monkeypatch: pytest.MonkeyPatch, serve_script: Path
+):
+    from flo.render.layout_core import elk_worker_pool
+
+    monkeypatch.setenv("FLO_ELK_ENGINE", "pool")
+    pool = ElkWorkerPool(size=1, script_path=serve_script)
+    monkeypatch.setattr(elk_worker_pool, "_shared_pool", pool)
+    try:
+        assert elk_runtime.run_elkjs_layout({"id": "pooled"})["id"] == "pooled"
+    finally:
+        elk_worker_pool.shutdown_shared_elk_worker_pool()
+
+
+def test_close_fails_a_submission_that_races_it(serve_script: Path):
+    pool = ElkWorkerPool(size=1, script_path=serve_script)
+    pool.start()
+    original_put = pool._queue.put
+    raced: list[bool] = []
+
+    def close_then_put(job, timeout=None):
+        if not raced:
+            raced.append(True)
+            closer = threading.Thread(target=pool.close)
+            closer.start()
+            closer.join()
+        original_put(job, timeout=timeout)
+
+    pool._queue.put = close_then_put
+
+    with pytest.raises(ElkRuntimeUnavailableError, match="shut down"):
+        pool({"id": "late"})
+
+
+class _HungWorker:
+    is_alive = True
+    restart_count = 0
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+
+    def start(self) -> None:
+        pass
+
+    def __call__(self, payload: dict) -> dict:
+        self.release.wait()
+        return payload
+
+    def close(self) -> None:
+        self.release.set()
+
+
+def test_pool_bounds_the_wait_by_the_elk_timeout(serve_script: Path):
+    pool = ElkWorkerPool(
+        size=1,
+        max_pending=1,
+        timeout_seconds=0.1,
+        startup_timeout_seconds=0.1,
+        script_path=serve_script,
+    )
+    hung = _HungWorker()
+    pool._slots[0].worker = hung
+    try:
+        with pytest.raises(ElkEngineTimeoutError, match="did not answer"):
+            pool({"id": "stuck"})
+    finally:
+        hung.release.set()
+        pool.close()
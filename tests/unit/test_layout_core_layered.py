@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from flo.adapters import parse_adapter
+from flo.compiler import compile_adapter
+from flo.render import _svg_sppm, _svg_swimlane, render_artifact
+from flo.render.layout_core import (
+    build_sppm_elk_layout_request,
+    build_swimlane_elk_layout_request,
+    execute_elk_layout,
+    layered_layout_engine,
+    serialize_elk_layout_request,
+)
+from flo.render.layout_core.models import LayoutBounds, LayoutResult
+from flo.render.options import RenderOptions
+
+
+def _reference_ir(name: str):
+    path = Path("examples/reference") / name
+    return compile_adapter(
+        parse_adapter(path.read_text(encoding="utf-8"), source_path=str(path))
+    )
+
+
+def _layout(name: str, *, diagram: str, orientation: str = "lr") -> LayoutResult:
+    options = RenderOptions.from_mapping(
+        {"diagram": diagram, "orientation": orientation, "layout_engine": "layered"}
+    )
+    build = (
+        build_swimlane_elk_layout_request
+        if diagram == "swimlane"
+        else build_sppm_elk_layout_request
+    )
+    request = build(_reference_ir(name), options=options)
+    return execute_elk_layout(request, engine=layered_layout_engine)
+
+
+def _overlaps(first: LayoutBounds, second: LayoutBounds) -> bool:
+    return (
+        first.x_px < second.x_px + second.width_px
+        and second.x_px < first.x_px + first.width_px
+        and first.y_px < second.y_px + second.height_px
+        and second.y_px < first.y_px + first.height_px
+    )
+
+
+def _contains(outer: LayoutBounds, inner: LayoutBounds) -> bool:
+    return (
+        outer.x_px <= inner.x_px
+        and outer.y_px <= inner.y_px
+        and inner.x_px + inner.width_px <= outer.x_px + outer.width_px
+        and inner.y_px + inner.height_px <= outer.y_px + outer.height_px
+    )
+
+
+@pytest.mark.parametrize("orientation", ["lr", "tb"])
+def test_reference_swimlane_layout_normalizes_cleanly(orientation: str):
+    result = _layout("swimlane.flo", diagram="swimlane", orientation=orientation)
+
+    assert result.diagnostics == ()
+    assert [lane.id for lane in result.lanes] == [
+        "requester",
+        "manager",
+        "finance",
+        "procurement",
+        "vendor",
+    ]
+    assert len(result.edge_paths) == 10
+    for lane in result.lanes:
+        for node_id in lane.node_ids:
+            assert _contains(lane.bounds, result.node_bounds[node_id])
+    bounds = list(result.node_bounds.values())
+    assert not any(
+        _overlaps(first, second)
+        for index, first in enumerate(bounds)
+        for second in bounds[index + 1 :]
+    )
+
+
+def test_lanes_stack_across_the_flow_direction():
+    lr = _layout("swimlane.flo", diagram="swimlane", orientation="lr")
+    tb = _layout("swimlane.flo", diagram="swimlane", orientation="tb")
+
+    assert len({lane.bounds.x_px for lane in lr.lanes}) == 1
+    assert [lane.bounds.y_px for lane in lr.lanes] == sorted(
+        lane.bounds.y_px for lane in lr.lanes
+    )
+    assert len({lane.bounds.y_px for lane in tb.lanes}) == 1
+    assert [lane.bounds.x_px for lane in tb.lanes] == sorted(
+        lane.bounds.x_px for lane in tb.lanes
+    )
+
+
+def test_edges_are_orthogonal_and_start_on_their_nodes():
+    result = _layout("swimlane.flo", diagram="swimlane")
+
+    for (source_id, target_id), path in result.edge_paths.items():
+        points = path.points
+        for start, end in zip(points, points[1:]):
+            assert start.x_px == end.x_px or start.y_px == end.y_px
+        for point, node_id in ((points[0], source_id), (points[-1], target_id)):
+            bounds = result.node_bounds[node_id]
+            assert bounds.x_px <= point.x_px <= bounds.x_px + bounds.width_px
+            assert bounds.y_px <= point.y_px <= bounds.y_px + bounds.height_px
+
+
+def test_feedback_edge_flows_against_the_layer_direction():
+    result = _layout("swimlane.flo", diagram="swimlane")
+    bounds = result.node_bounds
+
+    assert bounds["request_revision"].x_px > bounds["draft_request"].x_px
+    path = result.edge_paths[("request_revision", "draft_request")]
+    assert path.points[0].x_px >= bounds["request_revision"].x_px
+    assert path.points[-1].x_px <= bounds["draft_request"].x_px + 1.0
+
+
+def test_sppm_partitions_become_columns_with_rework_rows_below():
+    result = _layout("sppm_feature_showcase.flo", diagram="sppm")
+    bounds = result.node_bounds
+
+    assert not result.diagnostics
+    assert bounds["rework_intake"].y_px > bounds["intake"].y_px
+    assert bounds["rework_intake_wait_queue"].y_px > bounds["triage"].y_px
+    intake_center = bounds["intake"].x_px + bounds["intake"].width_px / 2
+    rework_center = bounds["rework_intake"].x_px + bounds["rework_intake"].width_px / 2
+    assert intake_center == pytest.approx(rework_center)
+
+
+def test_engine_output_is_deterministic():
+    request = build_sppm_elk_layout_request(
+        _reference_ir("rework_loop.flo"), options=RenderOptions(diagram="sppm")
+    )
+    payload = serialize_elk_layout_request(request)
+
+    assert layered_layout_engine(payload) == layered_layout_engine(payload)
+
+
+@pytest.mark.parametrize(
+    ("module", "diagram", "name"),
+    [
+        (_svg_swimlane, "swimlane", "swimlane.flo"),
+        (_svg_sppm, "sppm", "rework_loop.flo"),
+    ],
+)
+def test_layout_engine_option_renders_without_elkjs(
+    monkeypatch: pytest.MonkeyPatch, module, diagram: str, name: str
+):
+    def _no_elk(_payload: dict) -> dict:
+        raise AssertionError("elkjs must not run for the layered engine")
+
+    monkeypatch.setattr(module, "run_elkjs_layout", _no_elk)
+
+    artifact = render_artifact(
+        _reference_ir(name),
+        options={"diagram": diagram, "layout_engine": "layered"},
+    )
+
+    assert 'data-flo-layout-engine="layered"' in artifact.content
+    assert RenderOptions().layout_engine == "elk"
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+
+from flo.compiler.ir import IR, Node
+from flo.compiler.ir.models import Edge
+from flo.render import render_artifact
+from flo.render.layout_core import render_context as context_module
+from flo.render.layout_core.render_context import RenderContext, render_context
+from flo.render.options import RenderOptions
+
+
+def _ir() -> IR:
+    return IR(
+        name="ctx",
+        nodes=[
+            Node(id="start", type="start"),
+            Node(id="outer", type="subprocess", attrs={"name": "Outer"}),
+            Node(id="inner", type="task", attrs={"subprocess_parent": "outer"}),
+            Node(id="finish", type="end"),
+        ],
+        edges=[
+            Edge(source="start", target="outer"),
+            Edge(source="outer", target="inner"),
+            Edge(source="inner", target="finish"),
+        ],
+    )
+
+
+def test_context_projects_subprocess_view_once_and_indexes_nodes():
+    ir = _ir()
+    options = RenderOptions(diagram="sppm", subprocess_view="parent_only")
+
+    context = RenderContext.build(ir, options)
+
+    assert [node["id"] for node in context.source_nodes] == [
+        "start",
+        "outer",
+        "inner",
+        "finish",
+    ]
+    assert sorted(context.node_by_id) == ["finish", "outer", "start"]
+    assert context.node_kinds["outer"] == "subprocess"
+    assert context.sppm_layout_nodes() is context.sppm_layout_nodes()
+
+
+def test_render_context_reuses_only_a_matching_context():
+    ir = _ir()
+    options = RenderOptions(diagram="sppm")
+    context = RenderContext.build(ir, options)
+
+    assert render_context(ir, options, context) is context
+    assert render_context(ir, RenderOptions(diagram="sppm"), context) is context
+    assert render_context(_ir(), options, context) is not context
+    assert render_context(ir, RenderOptions(diagram="swimlane"), context) is not (
+        context
+    )
+
+
+@pytest.mark.parametrize("diagram", ["sppm", "swimlane"])
+def test_render_extracts_graph_records_once(monkeypatch, diagram: str):
+    calls = []
+    extract = context_module.extract_nodes_and_edges
+
+    def counting_extract(process):
+        calls.append(process)
+        return extract(process)
+
+    monkeypatch.setattr(context_module, "extract_nodes_and_edges", counting_extract)
+
+    render_artifact(_ir(), {"diagram": diagram, "layout_engine": "layered"})
+
+    assert len(calls) == 1
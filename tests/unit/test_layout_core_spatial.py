@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import random
+
+from flo.render.layout_core import BoundsGrid, LayoutBounds
+
+
+def _linear_overlaps(bounds, left, top, right, bottom) -> bool:
+    for box in bounds:
+        if right <= box.x_px or left >= box.x_px + box.width_px:
+            continue
+        if bottom <= box.y_px or top >= box.y_px + box.height_px:
+            continue
+        return True
+    return False
+
+
+def test_grid_matches_linear_scan_on_random_boxes():
+    rng = random.Random(7)
+    boxes = [
+        LayoutBounds(
+            x_px=rng.uniform(-300, 3000),
+            y_px=rng.uniform(-300, 2000),
+            width_px=rng.choice([0.0, rng.uniform(4, 240), 4000.0]),
+            height_px=rng.uniform(0, 120),
+        )
+        for _ in range(300)
+    ]
+    grid = BoundsGrid(boxes[:150], cell_px=64.0)
+    grid.extend(boxes[150:])
+
+    for _ in range(2000):
+        left = rng.uniform(-400, 3100)
+        top = rng.uniform(-400, 2100)
+        right = left + rng.uniform(10, 300)
+        bottom = top + rng.uniform(10, 90)
+        assert grid.overlaps(left, top, right, bottom) == _linear_overlaps(
+            boxes, left, top, right, bottom
+        )
+    assert len(grid) == 300
+
+
+def test_touching_edges_do_not_overlap():
+    grid = BoundsGrid(
+        [LayoutBounds(x_px=96.0, y_px=0.0, width_px=96.0, height_px=96.0)]
+    )
+
+    assert not grid.overlaps(0.0, 0.0, 96.0, 96.0)
+    assert not grid.overlaps(96.0, 96.0, 192.0, 120.0)
+    assert grid.overlaps(95.0, 10.0, 97.0, 20.0)
+
+
+def test_layered_grid_sees_parent_without_changing_it():
+    base = BoundsGrid([LayoutBounds(x_px=0.0, y_px=0.0, width_px=10.0, height_px=10.0)])
+    layer = base.layered(
+        [LayoutBounds(x_px=500.0, y_px=500.0, width_px=10.0, height_px=10.0)]
+    )
+
+    assert layer.overlaps(1.0, 1.0, 2.0, 2.0)
+    assert layer.overlaps(501.0, 501.0, 502.0, 502.0)
+    assert not base.overlaps(501.0, 501.0, 502.0, 502.0)
+    assert (len(base), len(layer)) == (1, 2)
+    assert not BoundsGrid()
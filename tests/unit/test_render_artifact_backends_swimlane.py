@@ -16,6 +16,8 @@ def test_reference_swimlane_svg_artifact_is_deterministic():
     assert artifact.kind == "svg"
     assert artifact.backend == "svg"
     assert artifact.content == rerun_artifact.content
+    assert artifact.metadata["layout_cache"]["status"] == "miss"
+    assert rerun_artifact.metadata["layout_cache"]["status"] == "hit"
     assert _swimlane_svg_signature(artifact.content) == {
         "diagram": "swimlane",
         "backend": "svg",
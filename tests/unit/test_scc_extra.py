@@ -77,3 +77,65 @@ def test_scc_dag_with_no_cycle_returns_same_ir(ir_factory, node_factory):
 def test_condense_scc_raises_for_non_ir():
     with pytest.raises(NotImplementedError):
         condense_scc({"not": "an ir"})
+
+
+def test_condense_graph_uses_ir_edges_and_builds_dag(node_factory):
+    from flo.compiler.analysis.scc import condense_graph
+    from flo.compiler.ir.models import IR, Edge
+
+    ir = IR(
+        name="rework",
+        nodes=[node_factory(n) for n in ("start", "a", "b", "end")],
+        edges=[
+            Edge(source="start", target="a"),
+            Edge(source="a", target="b"),
+            Edge(source="b", target="a"),
+            Edge(source="b", target="end"),
+            Edge(source="b", target="missing"),
+        ],
+    )
+
+    result = condense_graph(ir)
+    by_node = result.component_map()
+
+    assert by_node["a"] == by_node["b"] == result.component_for("b")
+    assert len(set(by_node.values())) == 3
+    assert result.cyclic_components() == [by_node["a"]]
+    assert set(result.dag_edges) == {
+        (by_node["start"], by_node["a"]),
+        (by_node["a"], by_node["end"]),
+    }
+    order = result.topological_order()
+    assert all(order.index(s) < order.index(t) for s, t in result.dag_edges)
+
+
+def test_condense_edges_flags_self_loops_as_cyclic():
+    from flo.compiler.analysis.scc import condense_edges
+
+    result = condense_edges(["a", "b"], [("a", "a"), ("a", "b")])
+
+    assert result.cyclic_components() == [result.component_for("a")]
+    assert not result.is_cyclic(result.component_for("b"))
+    with pytest.raises(ValueError, match="'c' is not a node"):
+        result.component_for("c")
+
+
+def test_deep_graphs_do_not_hit_recursion_limit(ir_factory, node_factory):
+    from flo.compiler.analysis.scc import condense_edges
+
+    count = 100_000
+    ids = [f"n{i}" for i in range(count)]
+    chain = [(ids[i], ids[i + 1]) for i in range(count - 1)]
+
+    acyclic = condense_edges(ids, chain)
+    assert len(acyclic.components) == count
+
+    ring = condense_edges(ids, chain + [(ids[-1], ids[0])])
+    assert len(ring.components) == 1
+
+    nodes = [node_factory("a", attrs={"edges": ["0"]})]
+    nodes += [node_factory(str(i), attrs={"edges": [str(i + 1)]}) for i in range(5000)]
+    nodes += [node_factory("5000", attrs={"edges": ["0"]})]
+    out = scc_condense(ir_factory(name="deep", nodes=nodes))
+    assert [n.id for n in out.nodes] == ["scc_0", "a"]
+    assert len(out.nodes[0].attrs["members"]) == 5001
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from flo.adapters import parse_adapter
+from flo.compiler import compile_adapter
+from flo.render import render_artifact_and_contract, render_artifact_to_stream
+from flo.render._svg_stream import SvgWriter
+
+_FLO = """\
+spec_version: "0.1"
+process:
+  id: stream
+  name: Stream
+lanes:
+  - id: ops
+    name: Ops
+steps:
+  - id: start
+    kind: start
+  - id: work
+    kind: task
+    name: Work
+    lane: ops
+  - id: check
+    kind: decision
+    name: Check
+    lane: ops
+    outcomes:
+      ok: finish
+      redo: work
+  - id: finish
+    kind: end
+"""
+
+
+def test_svg_writer_matches_newline_join():
+    fragments = ["<svg>", "", "<g>", "</g>", "</svg>"]
+    sink = io.StringIO()
+
+    streamed = SvgWriter(sink)
+    streamed.extend(fragments)
+    buffered = SvgWriter()
+    buffered.extend(fragments)
+
+    assert sink.getvalue() == "\n".join(fragments)
+    assert buffered.content() == "\n".join(fragments)
+    assert streamed.content() == ""
+
+
+@pytest.mark.parametrize("diagram", ["swimlane", "sppm"])
+def test_streamed_render_matches_in_memory_render(diagram: str):
+    ir = compile_adapter(parse_adapter(_FLO))
+    options = {"diagram": diagram, "layout_engine": "layered"}
+    sink = io.StringIO()
+
+    expected, _ = render_artifact_and_contract(ir, options=options)
+    streamed, _ = render_artifact_to_stream(ir, sink, options=options)
+
+    assert sink.getvalue() == expected.content
+    assert streamed.content == ""
+    assert streamed.metadata == expected.metadata
@@ -0,0 +1,79 @@
+import pytest
+
+import flo.compiler.ir.validate_rules as validate_rules
+from flo.compiler.ir.models import IR, Edge, Node
+from flo.compiler.ir.validate import validate_ir, validation_rule_names
+from flo.pipeline import ValidateStep
+from flo.services.errors import ValidationError
+from flo.services.telemetry import VALIDATION_RULE_SPAN_PREFIX
+
+
+def _ir(**task_attrs) -> IR:
+    return IR(
+        name="p",
+        nodes=[
+            Node(id="start", type="start"),
+            Node(id="work", type="task", attrs=task_attrs),
+            Node(id="end", type="end"),
+        ],
+        edges=[
+            Edge(source="start", target="work"),
+            Edge(source="work", target="end"),
+        ],
+    )
+
+
+def test_timings_cover_every_registered_rule():
+    timings: dict[str, float] = {}
+
+    validate_ir(
+        _ir(metadata={"cycle_time": {"value": 1, "unit": "s"}}), timings=timings
+    )
+
+    assert sorted(timings) == sorted(validation_rule_names())
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_node_metadata_is_extracted_once_per_node(monkeypatch):
+    calls: list[str] = []
+    original = validate_rules.extract_node_metadata
+
+    def counting(node):
+        calls.append(node.id)
+        return original(node)
+
+    monkeypatch.setattr(validate_rules, "extract_node_metadata", counting)
+
+    validate_ir(_ir(metadata={"value_class": "VA"}))
+
+    assert calls == ["start", "work", "end"]
+
+
+def test_timings_are_kept_for_rules_run_before_a_failure():
+    timings: dict[str, float] = {}
+
+    with pytest.raises(ValidationError, match="E1320"):
+        validate_ir(_ir(metadata={"value_class": "bogus"}), timings=timings)
+
+    assert "node_value_class" in timings
+    assert "global_reachability" not in timings
+
+
+def test_validate_step_records_rule_timings_on_recording_span(monkeypatch):
+    attributes: dict[str, object] = {}
+
+    class RecordingSpan:
+        def is_recording(self):
+            return True
+
+        def set_attribute(self, key, value):
+            attributes[key] = value
+
+    monkeypatch.setattr("flo.services.telemetry.current_span", lambda: RecordingSpan())
+
+    rc, _, err = ValidateStep().run((0, _ir(), None), services=None)
+
+    assert (rc, err) == (0, None)
+    prefix = VALIDATION_RULE_SPAN_PREFIX
+    assert f"{prefix}.node_time_metadata.duration_ms" in attributes
+    assert attributes[f"{prefix}.slowest"] in validation_rule_names()
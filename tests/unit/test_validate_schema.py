@@ -1,13 +1,27 @@
 import json
-import io
-import pytest
 from pathlib import Path
 
+import pytest
+
 import flo.compiler.ir.validate as validate_mod
+import flo.schema.registry as registry
 from flo.compiler.ir.models import IR
 from flo.services.errors import ValidationError
 
 
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    registry.clear_schema_registry()
+    yield
+    registry.clear_schema_registry()
+
+
+def _stub_schema(monkeypatch, tmp_path: Path, schema: dict) -> None:
+    path = tmp_path / "flo_ir.json"
+    path.write_text(json.dumps(schema), encoding="utf-8")
+    monkeypatch.setattr(registry, "locate_schema", lambda name: path)
+
+
 def test_validate_against_schema_missing_schema(monkeypatch, node_factory):
     # force schema path to appear missing
     monkeypatch.setattr(Path, "exists", lambda self: False)
@@ -17,47 +31,83 @@ def test_validate_against_schema_missing_schema(monkeypatch, node_factory):
 
 
 def test_validate_against_schema_jsonschema_missing(monkeypatch, node_factory):
-    # ensure schema file exists but jsonschema is reported unavailable
-    monkeypatch.setattr(Path, "exists", lambda self: True)
     monkeypatch.setattr(validate_mod, "_JSONSCHEMA_AVAILABLE", False)
     ir = IR(name="x", nodes=[node_factory("n")])
     with pytest.raises(RuntimeError):
         validate_mod.validate_against_schema(ir)
 
 
-def test_validate_against_schema_validate_raises(monkeypatch, node_factory):
-    # simulate jsonschema.validate raising an error -> ValidationError
-    monkeypatch.setattr(Path, "exists", lambda self: True)
-    monkeypatch.setattr(validate_mod, "_JSONSCHEMA_AVAILABLE", True)
-
-    class DummyJS:
-        @staticmethod
-        def validate(instance=None, schema=None):
-            raise Exception("boom")
-
-    monkeypatch.setattr(validate_mod, "jsonschema", DummyJS)
-
+def test_validate_against_schema_violation_raises(monkeypatch, tmp_path, node_factory):
+    _stub_schema(monkeypatch, tmp_path, {"type": "object", "required": ["missing"]})
     ir = IR(name="x", nodes=[node_factory("n")])
-    # ensure open returns a valid JSON schema stub
-    monkeypatch.setattr(Path, "open", lambda self, *a, **k: io.StringIO(json.dumps({})))
-    with pytest.raises(ValidationError):
+    with pytest.raises(ValidationError, match="'missing' is a required property"):
         validate_mod.validate_against_schema(ir)
 
 
 def test_validate_against_schema_success(monkeypatch, tmp_path, node_factory):
-    # simulate successful jsonschema.validate (no exception)
-    monkeypatch.setattr(Path, "exists", lambda self: True)
-    monkeypatch.setattr(validate_mod, "_JSONSCHEMA_AVAILABLE", True)
+    _stub_schema(monkeypatch, tmp_path, {"type": "object"})
+    ir = IR(name="x", nodes=[node_factory("n")])
+    # should not raise
+    validate_mod.validate_against_schema(ir)
+
+
+def test_schema_is_loaded_and_compiled_once(monkeypatch, node_factory):
+    loads: list[str] = []
+    original = registry.locate_schema
 
-    class DummyJS:
-        @staticmethod
-        def validate(instance=None, schema=None):
-            return None
+    def counting_locate(name: str) -> Path:
+        loads.append(name)
+        return original(name)
 
-    monkeypatch.setattr(validate_mod, "jsonschema", DummyJS)
+    monkeypatch.setattr(registry, "locate_schema", counting_locate)
+    ir = IR(name="x", nodes=[node_factory("n", type="start")])
 
+    for _ in range(3):
+        validate_mod.validate_against_schema(ir)
+
+    assert loads == ["flo_ir.json"]
+    assert registry.schema_validator("flo_ir.json") is registry.schema_validator(
+        "flo_ir.json"
+    )
+
+
+def test_collect_all_reports_every_violation(monkeypatch, tmp_path, node_factory):
+    _stub_schema(
+        monkeypatch,
+        tmp_path,
+        {"type": "object", "required": ["first", "second"]},
+    )
     ir = IR(name="x", nodes=[node_factory("n")])
-    # should not raise
-    # ensure open returns a valid JSON schema stub
-    monkeypatch.setattr(Path, "open", lambda self, *a, **k: io.StringIO(json.dumps({})))
-    validate_mod.validate_against_schema(ir)
+
+    with pytest.raises(ValidationError, match="2 error\\(s\\)") as excinfo:
+        validate_mod.validate_against_schema(ir, collect_all=True)
+
+    assert "'first'" in str(excinfo.value) and "'second'" in str(excinfo.value)
+
+
+@pytest.mark.parametrize("name", registry.KNOWN_SCHEMAS)
+def test_every_known_schema_compiles(name: str):
+    validator = registry.schema_validator(name)
+
+    assert validator.format_checker is not None
+    # Installed wheels only carry the package directory, not schema/.
+    assert (
+        registry.locate_schema(name).parent == Path(registry.__file__).resolve().parent
+    )
+
+
+def test_trace_schema_reports_all_event_errors():
+    document = {
+        "schema_version": "0.1",
+        "events": [
+            {"event_id": "e1", "lifecycle": "start"},
+            {"event_id": "", "lifecycle": "bogus"},
+        ],
+    }
+
+    errors = list(registry.iter_schema_errors(document, "flo_trace.json"))
+
+    assert len(errors) >= 4
+    assert [list(error.absolute_path)[:2] for error in errors] == sorted(
+        list(error.absolute_path)[:2] for error in errors
+    )